@@ -0,0 +1,81 @@
+"""Benchmark for the time taken by ``import tables``.
+
+Every sample imports PyTables in a fresh interpreter.  The best time of
+all the samples is reported, along with the time of a bare interpreter
+and of importing NumPy for reference, and the heavy modules which were
+imported with PyTables (which should be none of them).  A budget in
+milliseconds for the import of PyTables alone can be given, and the
+script exits with an error when it is exceeded.
+
+Usage: python import-time.py [-n nsamples] [-b budget_ms]
+
+"""
+
+from __future__ import print_function
+import sys
+import getopt
+import subprocess
+
+# Modules which should only be imported on first use
+LAZY_MODULES = ['numexpr', 'tables.table', 'tables.index',
+                'tables.expression', 'tables.readerpool', 'tables.tests']
+
+TIMER = """\
+import time
+t0 = time.time()
+%s
+t1 = time.time()
+import sys
+print(t1 - t0)
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+def sample(statement):
+    """Return the time taken by `statement` and the modules it loaded."""
+
+    out = subprocess.check_output([sys.executable, '-c', TIMER % statement])
+    lines = out.decode('ascii').splitlines()
+    return float(lines[0]), set(lines[1].split())
+
+
+def best_time(statement, nsamples):
+    times = []
+    for i in range(nsamples):
+        t, modules = sample(statement)
+        times.append(t)
+    return min(times), modules
+
+
+if __name__ == '__main__':
+    usage = "usage: %s [-n nsamples] [-b budget_ms]" % sys.argv[0]
+    try:
+        opts, pargs = getopt.getopt(sys.argv[1:], 'n:b:')
+    except getopt.GetoptError:
+        sys.stderr.write(usage + '\n')
+        sys.exit(1)
+
+    nsamples = 10
+    budget = None
+    for option, value in opts:
+        if option == '-n':
+            nsamples = int(value)
+        elif option == '-b':
+            budget = float(value)
+
+    tbare = best_time('pass', nsamples)[0]
+    tnumpy = best_time('import numpy', nsamples)[0]
+    ttables, modules = best_time('import tables', nsamples)
+
+    print("Best of %d samples:" % nsamples)
+    print("  bare interpreter: %8.1f ms" % (tbare * 1e3))
+    print("  import numpy:     %8.1f ms" % (tnumpy * 1e3))
+    print("  import tables:    %8.1f ms" % (ttables * 1e3))
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    print("Heavy modules imported by tables: %s" % (loaded or 'none'))
+
+    if loaded:
+        sys.exit(2)
+    if budget is not None and ttables * 1e3 > budget:
+        print("Import time exceeds the budget of %.1f ms" % budget)
+        sys.exit(3)
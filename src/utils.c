@@ -185,6 +185,38 @@ PyObject *get_filter_names( hid_t loc_id,
                             const char *dset_name)
 {
   hid_t    dset;
+  PyObject *filters;
+
+  /* Open the dataset. */
+  if ( (dset = H5Dopen( loc_id, dset_name, H5P_DEFAULT )) < 0 ) {
+    goto out;
+  }
+
+  filters = get_dataset_filter_names(dset);
+  H5Dclose(dset);
+
+  return filters;
+
+out:
+  H5Dclose(dset);
+  Py_INCREF(Py_None);
+  return Py_None;        /* Not chunked, so return None */
+}
+
+
+/*-------------------------------------------------------------------------
+ * Function: get_dataset_filter_names
+ *
+ * Purpose: Get the filter names for the chunks in an open dataset
+ *
+ * Return: A dictionary mapping filter names to their client values,
+ *         or None if the dataset is not chunked.
+ *
+ *-------------------------------------------------------------------------
+ */
+
+PyObject *get_dataset_filter_names( hid_t dset )
+{
   hid_t    dcpl;           /* dataset creation property list */
   /*  hsize_t  chsize[64];     /\* chunk size in elements *\/ */
   int      i, j;
@@ -196,11 +228,6 @@ PyObject *get_filter_names( hid_t loc_id,
   PyObject *filters;
   PyObject *filter_values;
 
-  /* Open the dataset. */
-  if ( (dset = H5Dopen( loc_id, dset_name, H5P_DEFAULT )) < 0 ) {
-    goto out;
-  }
-
   /* Get the properties container */
   dcpl = H5Dget_create_plist(dset);
   /* Collect information about filters on chunked storage */
@@ -226,14 +253,8 @@ PyObject *get_filter_names( hid_t loc_id,
   }
 
   H5Pclose(dcpl);
-  H5Dclose(dset);
 
   return filters;
-
-out:
-  H5Dclose(dset);
-  Py_INCREF(Py_None);
-  return Py_None;        /* Not chunked, so return None */
 }
 
 
@@ -394,6 +415,156 @@ PyObject *Giterate(hid_t parent_id, hid_t loc_id, const char *name) {
   return t;
 }
 
+/****************************************************************
+**
+**  litercb_page(): Link iteration callback stopping after a page.
+**
+****************************************************************/
+typedef struct {
+  PyObject **out_info;
+  hsize_t  count;
+  hsize_t  nlinks;
+  PyObject *last;
+} litercb_page_t;
+
+herr_t litercb_page(hid_t loc_id, const char *name, const H5L_info_t *info,
+                    void *data) {
+  litercb_page_t *page=(litercb_page_t *)data;
+
+  if (litercb(loc_id, name, info, page->out_info) < 0)
+    return -1;
+  /* Remember the name of the last link in the page */
+  Py_XDECREF(page->last);
+  page->last = PyString_FromString(name);
+  if (page->last == NULL)
+    return -1;
+  /* Stop the iteration when the page is complete */
+  if (++page->nlinks >= page->count)
+    return 1;
+  return 0;
+}
+
+/****************************************************************
+**
+**  find_link_after(): Position of the first link after a name.
+**
+**  The position in the name index of the group of the first link
+**  whose name sorts after `after` is found by bisection, whether or
+**  not a link named `after` still exists.
+**
+****************************************************************/
+static herr_t find_link_after(hid_t parent_id, const char *name,
+                              const char *after, hsize_t *pos) {
+  H5G_info_t ginfo;
+  hsize_t lo=0, hi, mid;
+  ssize_t size, bufsize=0;
+  char *buf=NULL, *newbuf;
+  int cmp;
+
+  if (H5Gget_info_by_name(parent_id, name, &ginfo, H5P_DEFAULT) < 0)
+    return -1;
+  hi = ginfo.nlinks;
+  while (lo < hi) {
+    mid = lo + (hi - lo) / 2;
+    size = H5Lget_name_by_idx(parent_id, name, H5_INDEX_NAME, H5_ITER_INC,
+                              mid, NULL, 0, H5P_DEFAULT);
+    if (size < 0)
+      goto out;
+    if (size + 1 > bufsize) {
+      newbuf = (char *)realloc(buf, size + 1);
+      if (newbuf == NULL)
+        goto out;
+      buf = newbuf;
+      bufsize = size + 1;
+    }
+    if (H5Lget_name_by_idx(parent_id, name, H5_INDEX_NAME, H5_ITER_INC,
+                           mid, buf, size + 1, H5P_DEFAULT) < 0)
+      goto out;
+    /* HDF5 sorts link names by their bytes as well */
+    cmp = strcmp(buf, after);
+    if (cmp <= 0)
+      lo = mid + 1;
+    else
+      hi = mid;
+  }
+  free(buf);
+  *pos = lo;
+  return 0;
+
+out:
+  free(buf);
+  return -1;
+}
+
+/****************************************************************
+**
+**  Giterate_page(): Group iteration routine for a page of links.
+**
+**  At most `count` links are iterated in name order, starting at
+**  the first link whose name sorts after `after` (or at the first
+**  link if `after` is NULL).  Resuming from a name instead of from a
+**  position makes pages consistent when links are created or removed
+**  between them.  The names of the links are returned as in
+**  Giterate(), along with the name of the last link in the page
+**  (None if no links were left).
+**
+****************************************************************/
+PyObject *Giterate_page(hid_t parent_id, hid_t loc_id, const char *name,
+                        const char *after, hsize_t count) {
+  hsize_t i=0;
+  herr_t ret=0;
+  PyObject  *t, *tgroup, *tleave, *tlink, *tunknown;
+  PyObject *info[4];
+  litercb_page_t page;
+
+  info[0] = tgroup = PyList_New(0);
+  info[1] = tleave = PyList_New(0);
+  info[2] = tlink = PyList_New(0);
+  info[3] = tunknown = PyList_New(0);
+
+  page.out_info = info;
+  page.count = count;
+  page.nlinks = 0;
+  page.last = NULL;
+
+  if (count > 0) {
+    /* Links are iterated in increasing name order, so that the position
+     * of a link does not depend on the storage of the group */
+    H5E_BEGIN_TRY {
+      if (after != NULL)
+        ret = find_link_after(parent_id, name, after, &i);
+      if (ret >= 0)
+        ret = H5Literate_by_name(parent_id, name, H5_INDEX_NAME,
+                                 H5_ITER_INC, &i, litercb_page, &page,
+                                 H5P_DEFAULT);
+    } H5E_END_TRY;
+  }
+  if (ret < 0) {
+    Py_DECREF(tgroup);
+    Py_DECREF(tleave);
+    Py_DECREF(tlink);
+    Py_DECREF(tunknown);
+    Py_XDECREF(page.last);
+    if (!PyErr_Occurred())
+      PyErr_SetString(PyExc_RuntimeError, "Unable to iterate over the links");
+    return NULL;
+  }
+  if (page.last == NULL) {
+    Py_INCREF(Py_None);
+    page.last = Py_None;
+  }
+
+  /* Create the tuple with the lists of names and the last name */
+  t = PyTuple_New(5);
+  PyTuple_SetItem(t, 0, tgroup);
+  PyTuple_SetItem(t, 1, tleave);
+  PyTuple_SetItem(t, 2, tlink);
+  PyTuple_SetItem(t, 3, tunknown);
+  PyTuple_SetItem(t, 4, page.last);
+
+  return t;
+}
+
 /****************************************************************
 **
 **  aitercb(): Custom attribute iteration callback routine.
@@ -1001,9 +1172,128 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len) {
  return -1;
 }
 
+herr_t pt_H5Pset_file_image_nocopy(hid_t fapl_id, void *buf_ptr,
+                                   size_t buf_len) {
+ return -1;
+}
+
+#else /* (H5_HAVE_IMAGE_FILE != 1) */
+/* HDF5 version >= 1.8.9 */
+
+/* File image callbacks using the buffer of the application in place.
+ *
+ * HDF5 asks for a new buffer and copies the image into it when the image
+ * is set in (or copied from) a property list and when a file is opened
+ * from it.  These callbacks return the buffer of the application instead
+ * and skip the copies of it into itself, so files can be opened from
+ * images in read-only mode without copying them.  The buffer can not be
+ * resized, and it must be kept alive by the application until the file
+ * is closed.
+ */
+
+typedef struct {
+  void   *buf;
+  size_t  size;
+  int     ref_count;
+} pt_image_udata_t;
+
+static void *pt_image_malloc(size_t size, H5FD_file_image_op_t op,
+                             void *udata)
+{
+  pt_image_udata_t *image = (pt_image_udata_t *)udata;
+
+  if (size != image->size)
+    return NULL;
+  return image->buf;
+}
+
+static void *pt_image_memcpy(void *dest, const void *src, size_t size,
+                             H5FD_file_image_op_t op, void *udata)
+{
+  /* Only copies of the buffer into itself are expected */
+  if (dest != src)
+    return NULL;
+  return dest;
+}
+
+static void *pt_image_realloc(void *ptr, size_t size,
+                              H5FD_file_image_op_t op, void *udata)
+{
+  return NULL;
+}
+
+static herr_t pt_image_free(void *ptr, H5FD_file_image_op_t op, void *udata)
+{
+  /* The buffer belongs to the application */
+  return 0;
+}
+
+static void *pt_image_udata_copy(void *udata)
+{
+  pt_image_udata_t *image = (pt_image_udata_t *)udata;
+
+  image->ref_count++;
+  return udata;
+}
+
+static herr_t pt_image_udata_free(void *udata)
+{
+  pt_image_udata_t *image = (pt_image_udata_t *)udata;
+
+  if (--image->ref_count == 0)
+    free(image);
+  return 0;
+}
+
+herr_t pt_H5Pset_file_image_nocopy(hid_t fapl_id, void *buf_ptr,
+                                   size_t buf_len)
+{
+  H5FD_file_image_callbacks_t callbacks;
+  pt_image_udata_t *image;
+  herr_t ret;
+
+  image = (pt_image_udata_t *)malloc(sizeof(pt_image_udata_t));
+  if (image == NULL)
+    return -1;
+  image->buf = buf_ptr;
+  image->size = buf_len;
+  image->ref_count = 1;
+
+  callbacks.image_malloc = pt_image_malloc;
+  callbacks.image_memcpy = pt_image_memcpy;
+  callbacks.image_realloc = pt_image_realloc;
+  callbacks.image_free = pt_image_free;
+  callbacks.udata_copy = pt_image_udata_copy;
+  callbacks.udata_free = pt_image_udata_free;
+  callbacks.udata = image;
+
+  /* The callbacks must be set before the image */
+  ret = H5Pset_file_image_callbacks(fapl_id, &callbacks);
+  if (ret >= 0)
+    ret = H5Pset_file_image(fapl_id, buf_ptr, buf_len);
+
+  /* The property list keeps its own reference to the user data */
+  pt_image_udata_free(image);
+  return ret;
+}
+
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
 
 
+#if (H5_HAVE_SWMR_SUPPORT != 1)
+/* HDF5 version < 1.10 */
+
+herr_t pt_H5Fstart_swmr_write(hid_t file_id) {
+ return -1;
+}
+
+herr_t pt_H5Drefresh(hid_t dset_id) {
+ return -1;
+}
+
+#endif /* (H5_HAVE_SWMR_SUPPORT != 1) */
+
+
 #if H5_VERSION_LE(1,8,12)
 
 herr_t pt_H5free_memory(void *buf) {
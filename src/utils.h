@@ -44,6 +44,12 @@
 #define H5_HAVE_DIRECT_DRIVER 0
 #endif
 
+#ifdef H5_HAVE_THREADSAFE
+#define H5_HAVE_THREADSAFE_LIBRARY 1
+#else
+#define H5_HAVE_THREADSAFE_LIBRARY 0
+#endif
+
 #if (H5_VERS_MAJOR == 1 && H5_VERS_MINOR == 8 && H5_VERS_RELEASE >= 9) || (H5_VERS_MAJOR == 1 && H5_VERS_MINOR > 8)
 /* HDF5 version >= 1.8.9 */
 #define H5_HAVE_IMAGE_FILE 1
@@ -52,6 +58,16 @@
 #define H5_HAVE_IMAGE_FILE 0
 #endif
 
+#if (H5_VERS_MAJOR == 1 && H5_VERS_MINOR >= 10) || (H5_VERS_MAJOR > 1)
+/* HDF5 version >= 1.10 */
+#define H5_HAVE_SWMR_SUPPORT 1
+#define PT_H5F_ACC_SWMR_READ H5F_ACC_SWMR_READ
+#else
+/* HDF5 version < 1.10 */
+#define H5_HAVE_SWMR_SUPPORT 0
+#define PT_H5F_ACC_SWMR_READ 0
+#endif
+
 /* COMAPTIBILITY: H5_VERSION_LE has been introduced in HDF5 1.8.7 */
 #ifndef H5_VERSION_LE
 #define H5_VERSION_LE(Maj,Min,Rel) \
@@ -86,12 +102,17 @@ PyObject *createNamesTuple(char *buffer[], int nelements);
 
 PyObject *get_filter_names( hid_t loc_id, const char *dset_name);
 
+PyObject *get_dataset_filter_names( hid_t dset );
+
 int get_objinfo(hid_t loc_id, const char *name);
 
 int get_linkinfo(hid_t loc_id, const char *name);
 
 PyObject *Giterate(hid_t parent_id, hid_t loc_id, const char *name);
 
+PyObject *Giterate_page(hid_t parent_id, hid_t loc_id, const char *name,
+                        const char *after, hsize_t count);
+
 PyObject *Aiterate(hid_t loc_id);
 
 H5T_class_t getHDF5ClassID(hid_t loc_id,
@@ -152,6 +173,19 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len);
 #define pt_H5Pset_file_image H5Pset_file_image
 #define pt_H5Fget_file_image H5Fget_file_image
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
+herr_t pt_H5Pset_file_image_nocopy(hid_t fapl_id, void *buf_ptr,
+                                   size_t buf_len);
+
+
+#if (H5_HAVE_SWMR_SUPPORT != 1)
+/* HDF5 version < 1.10 */
+herr_t pt_H5Fstart_swmr_write(hid_t file_id);
+herr_t pt_H5Drefresh(hid_t dset_id);
+#else /* (H5_HAVE_SWMR_SUPPORT != 1) */
+/* HDF5 version >= 1.10 */
+#define pt_H5Fstart_swmr_write H5Fstart_swmr_write
+#define pt_H5Drefresh H5Drefresh
+#endif /* (H5_HAVE_SWMR_SUPPORT != 1) */
 
 
 #if H5_VERSION_LE(1,8,12)
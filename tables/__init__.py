@@ -22,6 +22,8 @@ from __future__ import absolute_import
 
 
 import os
+import sys
+import importlib
 
 # On Windows, pre-load the HDF5 DLLs into the process via Ctypes
 # to improve diagnostics and avoid issues when loading DLLs during runtime.
@@ -118,18 +120,51 @@ from .filters import Filters
 
 # Import the user classes from the proper modules
 from .exceptions import *
-from .file import File, open_file, copy_file
+from .file import File, NodeInfo, open_file, copy_file
 from .node import Node
 from .group import Group
 from .leaf import Leaf
-from .table import Table, Cols, Column
 from .array import Array
 from .carray import CArray
 from .earray import EArray
 from .vlarray import VLArray
 from .unimplemented import UnImplemented, Unknown
-from .expression import Expr
-from .tests import print_versions, test
+
+
+# Objects which are imported on first access, to keep ``import tables``
+# fast: tables and their query machinery (and thus Numexpr), expressions
+# and the test suite.  They map to their module and name in the module.
+_lazy_objects = {
+    'Table': ('.table', 'Table'),
+    'Cols': ('.table', 'Cols'),
+    'Column': ('.table', 'Column'),
+    'Expr': ('.expression', 'Expr'),
+    'MultiTable': ('.multitable', 'MultiTable'),
+    'ReaderPool': ('.readerpool', 'ReaderPool'),
+    'print_versions': ('.tests', 'print_versions'),
+    'test': ('.tests', 'test'),
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        try:
+            modname, objname = _lazy_objects[name]
+        except KeyError:
+            raise AttributeError("module ``%s`` has no attribute ``%s``"
+                                 % (__name__, name))
+        obj = getattr(importlib.import_module(modname, __name__), objname)
+        globals()[name] = obj
+        return obj
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_objects))
+else:
+    # Modules can not have lazy attributes
+    from .table import Table, Cols, Column
+    from .expression import Expr
+    from .multitable import MultiTable
+    from .readerpool import ReaderPool
+    from .tests import print_versions, test
 
 
 # List here only the objects we want to be publicly available
@@ -172,9 +207,13 @@ __all__ = [
     'Node', 'Group', 'Leaf', 'Table', 'Array', 'CArray', 'EArray', 'VLArray',
     'UnImplemented', 'Unknown',
     # The File class:
-    'File',
+    'File', 'NodeInfo',
     # Expr class
     'Expr',
+    # MultiTable class
+    'MultiTable',
+    # ReaderPool class
+    'ReaderPool',
 ]
 
 if 'Float16Atom' in locals():
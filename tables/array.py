@@ -18,9 +18,11 @@ import sys
 import numpy
 
 from . import hdf5extension
+from . import chunkcache
 from .filters import Filters
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
-from .leaf import Leaf
+from .leaf import Leaf, plan_blocks
+from .reduction import Reducible, iter_blocks
 from .utils import (is_idx, convert_to_np_atom2, SizeType, lazyattr,
                     byteorders, quantize)
 
@@ -38,7 +40,7 @@ import six
 obversion = "2.4"    # Numeric and numarray flavors are gone.
 
 
-class Array(hdf5extension.Array, Leaf, six.Iterator):
+class Array(hdf5extension.Array, Leaf, Reducible, six.Iterator):
     """This class represents homogeneous datasets in an HDF5 file.
 
     This class provides methods to write or read data to or from array objects
@@ -238,6 +240,9 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
 
         return oid
 
+    def _g_set_refreshed_shape(self, shape):
+        self.shape = shape
+
     def get_enum(self):
         """Get the enumerated type associated with this array.
 
@@ -753,12 +758,41 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
         # Protection against reading empty arrays
         if 0 not in shape:
             # Arrays that have non-zero dimensionality
-            self._g_read_slice(startl, stopl, stepl, nparr)
+            self._read_slice_into(startl, stopl, stepl, nparr)
         # For zero-shaped arrays, return the scalar
         if nparr.shape == ():
             nparr = nparr[()]
         return nparr
 
+    def _read_slice_into(self, startl, stopl, stepl, nparr):
+        """Read a slice based on `startl`, `stopl` and `stepl` into `nparr`.
+
+        The chunks of the slice are taken from the shared chunk cache
+        when the array can use it.
+
+        """
+
+        prefix = self._v_chunk_cache_key
+        if (prefix is not None and nparr.dtype == self.atom.dtype and
+                self.atom.shape == () and self.atom.kind != 'reference'):
+            starts, stops, steps = [[int(i) for i in seq]
+                                    for seq in (startl, stopl, stepl)]
+            shape = tuple(len(range(start, stop, step)) for start, stop, step
+                          in zip(starts, stops, steps))
+            out = nparr.reshape(shape)
+            # Non-contiguous buffers cannot be reshaped without a copy
+            if numpy.may_share_memory(out, nparr):
+                def read_chunk(origin, end, chunk):
+                    self._g_read_slice(
+                        numpy.array(origin, dtype=numpy.uint64),
+                        numpy.array(end, dtype=numpy.uint64),
+                        numpy.ones(len(origin), dtype=numpy.uint64), chunk)
+
+                chunkcache.read_slice(prefix, self.shape, self.chunkshape,
+                                      starts, stops, steps, out, read_chunk)
+                return
+        self._g_read_slice(startl, stopl, stepl, nparr)
+
     def _read_coords(self, coords):
         """Read a set of points defined by `coords`."""
 
@@ -856,6 +890,29 @@ class Array(hdf5extension.Array, Leaf, six.Iterator):
             arr.byteswap(True)
         return arr
 
+    def _g_reduction_blocks(self, start, stop, step):
+        """Get the blocks to be processed by reductions (see `Reducible`)."""
+
+        self._g_check_open()
+        params = self._v_file.params
+        if self.shape == ():
+            blocks = [(0, numpy.asarray(self._read(0, 1, 1)))]
+            return ((), None, self.atom.dtype, blocks,
+                    params['MAX_REDUCTION_THREADS'])
+        (start, stop, step) = self._process_range(start, stop, step)
+        maindim = self.maindim
+        shape = list(self.shape)
+        shape[maindim] = len(range(start, stop, step))
+        chunkshape = self.chunkshape
+        chunkrows = chunkshape[maindim] if chunkshape else None
+        plan = plan_blocks(self.nrowsinbuf, [self.rowsize], [chunkrows])
+
+        def read(bstart, bstop):
+            return self._read(bstart, bstop, step)
+        blocks = iter_blocks(read, plan, start, stop, step)
+        return (tuple(shape), maindim, self.atom.dtype, blocks,
+                params['MAX_REDUCTION_THREADS'])
+
     def read(self, start=None, stop=None, step=None, out=None):
         """Get data in the array as an object of the current flavor.
 
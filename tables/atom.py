@@ -21,6 +21,7 @@ import inspect
 
 import numpy
 
+from . import objcodec
 from .utils import SizeType
 from .misc.enum import Enum
 
@@ -1191,9 +1192,31 @@ class ObjectAtom(_BufferedAtom):
     fit *one object per row*. However, you can still group several objects in a
     single tuple or list and pass it to the :meth:`VLArray.append` method.
 
-    Object atoms do not accept parameters and they cause the reads of rows to
-    always return Python objects. You can regard object atoms as an easy way to
-    save an arbitrary number of generic Python objects in a VLArray dataset.
+    Object atoms cause the reads of rows to always return Python objects. You
+    can regard object atoms as an easy way to save an arbitrary number of
+    generic Python objects in a VLArray dataset.
+
+    Parameters
+    ----------
+    codec : str
+        The name of the serializer for objects.  ``'pickle'`` (the
+        default), ``'pickle5'`` (pickle protocol 5 with NumPy arrays
+        stored out of band, so that they are not copied) and
+        ``'tagged'`` (a fast binary format for dicts, lists and scalars)
+        are available, and more can be added with
+        :func:`tables.objcodec.register_codec`.
+    complevel : int
+        The compression level (0 to 9) for every row; 0 (the default)
+        means no compression.
+    complib : str
+        The compression library for rows, either ``'blosc'`` (the
+        default) or ``'zlib'``.
+
+    The codec and compression settings are saved in the attributes of the
+    VLArray, so they are recovered when the file is re-opened.
+
+    .. versionchanged:: 3.3
+       Added the *codec*, *complevel* and *complib* parameters.
 
     """
 
@@ -1201,8 +1224,32 @@ class ObjectAtom(_BufferedAtom):
     type = 'object'
     base = UInt8Atom()
 
+    def __init__(self, codec='pickle', complevel=0, complib='blosc'):
+        self._dumps, self._loads = objcodec.get_codec(codec)
+        if not 0 <= complevel <= 9:
+            raise ValueError("compression level must be between 0 and 9")
+        if complib not in objcodec.complibs:
+            raise ValueError("compression library ``%s`` is not supported "
+                             "for objects; use one of %s"
+                             % (complib, list(objcodec.complibs)))
+        self.codec = codec
+        """The name of the serializer for objects."""
+        self.complevel = complevel
+        """The compression level for rows."""
+        self.complib = complib
+        """The compression library for rows."""
+
+    def __repr__(self):
+        if self.codec == 'pickle' and not self.complevel:
+            return '%s()' % self.__class__.__name__
+        return '%s(codec=%r, complevel=%r, complib=%r)' % (
+            self.__class__.__name__, self.codec, self.complevel, self.complib)
+
     def _tobuffer(self, object_):
-        return six.moves.cPickle.dumps(object_, six.moves.cPickle.HIGHEST_PROTOCOL)
+        data = self._dumps(object_)
+        if self.complevel:
+            data = objcodec.compress(data, self.complib, self.complevel)
+        return data
 
     def fromarray(self, array):
         # We have to check for an empty array because of a possible
@@ -1210,4 +1257,6 @@ class ObjectAtom(_BufferedAtom):
         # record when in fact it is empty.
         if array.size == 0:
             return None
-        return six.moves.cPickle.loads(array.tostring())
+        if self.complevel:
+            array = objcodec.decompress(array, self.complib)
+        return self._loads(array)
@@ -36,7 +36,8 @@ SYS_ATTRS = ["CLASS", "VERSION", "TITLE", "NROWS", "EXTDIM",
              "ENCODING", "PYTABLES_FORMAT_VERSION",
              "FLAVOR", "FILTERS", "AUTO_INDEX",
              "DIRTY", "NODE_TYPE", "NODE_TYPE_VERSION",
-             "PSEUDOATOM"]
+             "PSEUDOATOM", "OBJECT_CODEC", "OBJECT_COMPLIB",
+             "OBJECT_COMPLEVEL"]
 # Prefixes of other system attributes
 SYS_ATTRS_PREFIXES = ["FIELD_"]
 # RO_ATTRS will be disabled and let the user modify them if they
@@ -189,7 +190,14 @@ class AttributeSet(hdf5extension.AttributeSet, object):
 
     .. attribute:: _v_unimplemented
 
-        A list of attribute names with unimplemented native HDF5 types.
+        A list of attribute names with unimplemented native HDF5 types
+        (among the attributes read so far).
+
+    .. versionchanged:: 3.3
+       The values of attributes are read from disk on first access,
+       instead of when the attribute set is created.  See
+       :meth:`AttributeSet._f_getmany` for reading several attributes
+       at once.
 
     """
 
@@ -204,7 +212,8 @@ class AttributeSet(hdf5extension.AttributeSet, object):
     def __init__(self, node):
         """Create the basic structures to keep the attribute information.
 
-        Reads all the HDF5 attributes (if any) on disk for the node "node".
+        Reads the names of the HDF5 attributes (if any) on disk for the
+        node "node".  Their values are read on first access.
 
         Parameters
         ----------
@@ -242,9 +251,6 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         dict_["_v_attrnamessys"] = []
         dict_["_v_attrnamesuser"] = []
         for attr in self._v_attrnames:
-            # put the attributes on the local dictionary to allow
-            # tab-completion
-            self.__getattr__(attr)
             if issysattrname(attr):
                 self._v_attrnamessys.append(attr)
             else:
@@ -282,6 +288,44 @@ class AttributeSet(hdf5extension.AttributeSet, object):
         elif attrset == "all":
             return self._v_attrnames[:]
 
+    def _f_getmany(self, names):
+        """Get the values of the attributes in `names` as a dictionary.
+
+        This is faster than getting the attributes one by one when
+        several of them have not been read yet, since the node is looked
+        up only once and the attributes are read from HDF5 in a single
+        pass, opening every one of them once.  An ``AttributeError`` is
+        raised if some attribute does not exist.
+
+        .. versionadded:: 3.3
+
+        """
+
+        dict_ = self.__dict__
+        attrnames = self._v_attrnames
+        values = {}
+        unread = []
+        for name in names:
+            if name in dict_:
+                values[name] = dict_[name]
+            elif name in attrnames:
+                unread.append(name)
+            else:
+                raise AttributeError("Attribute '%s' does not exist in node: "
+                                     "'%s'" % (name, self._v__nodepath))
+        if unread:
+            rawvalues = self._g_getattrs(self._v_node, unread)
+            for name in unread:
+                values[name] = self._g_decode(name, rawvalues[name])
+        return values
+
+    def __dir__(self):
+        # Make the attributes on disk available to tab-completion
+        names = set(dir(self.__class__))
+        names.update(self.__dict__)
+        names.update(self._v_attrnames)
+        return sorted(names)
+
     def __getattr__(self, name):
         """Get the attribute named "name"."""
 
@@ -290,12 +334,21 @@ class AttributeSet(hdf5extension.AttributeSet, object):
             raise AttributeError("Attribute '%s' does not exist in node: "
                                  "'%s'" % (name, self._v__nodepath))
 
+        return self._g_read(self._v_node, name)
+
+    def _g_read(self, node, name):
+        """Read the attribute `name` of `node` and keep its value."""
+
         # Read the attribute from disk. This is an optimization to read
         # quickly system attributes that are _string_ values, but it
         # takes care of other types as well as for example NROWS for
         # Tables and EXTDIM for EArrays
+        return self._g_decode(name, self._g_getattr(node, name))
+
+    def _g_decode(self, name, value):
+        """Decode the raw `value` of the attribute `name` and keep it."""
+
         format_version = self._v__format_version
-        value = self._g_getattr(self._v_node, name)
 
         # Check whether the value is pickled
         # Pickled values always seems to end with a "."
@@ -498,9 +551,10 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         else:
             self._v_attrnamesuser.remove(name)
 
-        # Delete the attribute from the local directory
+        # Delete the attribute from the local directory (if it has been
+        # read at all)
         # closes (#1049285)
-        del self.__dict__[name]
+        self.__dict__.pop(name, None)
 
     def __delattr__(self, name):
         """Delete a PyTables attribute.
@@ -606,9 +660,10 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
             set_attr = newset._g__setattr
 
         for attrname in self._v_attrnamesuser:
+            value = getattr(self, attrname)
             # Do not copy the unimplemented attributes.
             if attrname not in self._v_unimplemented:
-                set_attr(attrname, getattr(self, attrname))
+                set_attr(attrname, value)
         # Copy the system attributes that we are allowed to.
         if copysysattrs:
             for attrname in self._v_attrnamessys:
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""A process-wide cache of decompressed chunks shared by leaves.
+
+The HDF5 chunk cache of a dataset is private to the open dataset, so it
+is lost when the node is closed (e.g. when it leaves the node cache) and
+it is not shared by different handles of the same file.  The cache in
+this module keeps the decompressed chunks of the leaves in files opened
+in read-only mode, keyed by the identity of the file on disk, the
+address of the dataset in the file and the coordinates of the chunk.
+
+The cache is enabled by opening files with a positive
+:data:`tables.parameters.SHARED_CHUNK_CACHE_SIZE`, which sets its byte
+budget.  Least recently used chunks are evicted when the budget is
+exceeded.  With a positive
+:data:`tables.parameters.SHARED_CHUNK_CACHE_COMPRESSED_SIZE`, evicted
+chunks are compressed with Blosc and kept in a second tier of the cache,
+and decompressed when they are requested again.  For compressible data,
+this keeps several times more chunks in memory.  The cache is available
+as the `shared_cache` variable of this module.
+
+"""
+
+from __future__ import absolute_import
+
+import itertools
+import threading
+import collections
+
+import numpy
+
+from six.moves import range, zip
+
+from . import utilsextension
+from .utils import file_identity
+
+
+class ChunkCache(object):
+    """A thread-safe LRU cache of chunks with a byte budget.
+
+    Chunks are NumPy arrays which are made read-only when put in the
+    cache.  When `compressed_maxsize` is positive, the chunks evicted
+    from the cache are compressed with the `complib` Blosc compressor
+    (e.g. ``'blosc:lz4'``) at `complevel` and kept in a second LRU tier
+    with that byte budget.
+
+    """
+
+    def __init__(self, maxsize=0, compressed_maxsize=0,
+                 complib='blosc:lz4', complevel=5):
+        self.maxsize = maxsize
+        """The byte budget of the cache."""
+        self.nbytes = 0
+        """The number of bytes taken by the cached chunks."""
+        self.compressed_maxsize = 0
+        """The byte budget of the tier of compressed chunks."""
+        self.compressed_nbytes = 0
+        """The number of bytes taken by the compressed chunks."""
+        self.complib = complib
+        self.complevel = complevel
+        self.hits = 0
+        self.compressed_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._chunks = collections.OrderedDict()
+        # key -> (compressed data, dtype, shape)
+        self._cchunks = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.resize_compressed(compressed_maxsize, complib, complevel)
+
+    def __len__(self):
+        return len(self._chunks) + len(self._cchunks)
+
+    def __contains__(self, key):
+        return key in self._chunks or key in self._cchunks
+
+    def get(self, key):
+        """Return the chunk for `key` or None if it is not in the cache."""
+
+        with self._lock:
+            chunk = self._chunks.pop(key, None)
+            if chunk is not None:
+                self._chunks[key] = chunk
+                self.hits += 1
+                return chunk
+            cchunk = self._cchunks.pop(key, None)
+            if cchunk is None:
+                self.misses += 1
+                return None
+            self.compressed_nbytes -= len(cchunk[0])
+            self.compressed_hits += 1
+
+        # Decompress out of the lock and move the chunk to the first tier
+        cdata, dtype, shape = cchunk
+        chunk = numpy.frombuffer(utilsextension.blosc_decompress_(cdata),
+                                 dtype=dtype).reshape(shape)
+        self.put(key, chunk)
+        return chunk
+
+    def put(self, key, chunk):
+        """Put the `chunk` array in the cache under `key`."""
+
+        if chunk.nbytes > self.maxsize and self.compressed_maxsize <= 0:
+            return
+        chunk.flags.writeable = False
+        with self._lock:
+            oldchunk = self._chunks.pop(key, None)
+            if oldchunk is not None:
+                self.nbytes -= oldchunk.nbytes
+            oldcchunk = self._cchunks.pop(key, None)
+            if oldcchunk is not None:
+                self.compressed_nbytes -= len(oldcchunk[0])
+            self._chunks[key] = chunk
+            self.nbytes += chunk.nbytes
+            self._evict()
+
+    def resize(self, maxsize):
+        """Set the byte budget of the cache to `maxsize`."""
+
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def resize_compressed(self, maxsize, complib=None, complevel=None):
+        """Set the budget and compression of the tier of compressed chunks.
+
+        A `maxsize` of zero disables the tier.
+
+        """
+
+        if complib is None:
+            complib = self.complib
+        if complevel is None:
+            complevel = self.complevel
+        if maxsize > 0:
+            if complib.split(':')[0] != 'blosc':
+                raise ValueError("only Blosc compressors can be used in the "
+                                 "chunk cache: ``%s``" % complib)
+            if not 0 <= complevel <= 9:
+                raise ValueError("compression level must be between 0 and "
+                                 "9: %r" % (complevel,))
+        with self._lock:
+            self.compressed_maxsize = maxsize
+            self.complib = complib
+            self.complevel = complevel
+            self._evict()
+
+    def clear(self):
+        """Remove all the chunks from the cache."""
+
+        with self._lock:
+            self._chunks.clear()
+            self._cchunks.clear()
+            self.nbytes = 0
+            self.compressed_nbytes = 0
+
+    def stats(self):
+        """Return a dictionary with the statistics of the cache."""
+
+        hits = self.hits + self.compressed_hits
+        lookups = hits + self.misses
+        return {
+            'maxsize': self.maxsize,
+            'nbytes': self.nbytes,
+            'nchunks': len(self._chunks),
+            'compressed_maxsize': self.compressed_maxsize,
+            'compressed_nbytes': self.compressed_nbytes,
+            'ncompressed': len(self._cchunks),
+            'hits': self.hits,
+            'compressed_hits': self.compressed_hits,
+            'misses': self.misses,
+            'hit_ratio': float(hits) / lookups if lookups else numpy.nan,
+            'evictions': self.evictions,
+        }
+
+    def _compress(self, chunk):
+        cname = self.complib.partition(':')[2] or None
+        return utilsextension.blosc_compress_(
+            chunk, self.complevel, 1, chunk.dtype.itemsize, cname)
+
+    def _evict(self):
+        chunks, cchunks = self._chunks, self._cchunks
+        while self.nbytes > self.maxsize and chunks:
+            key, chunk = chunks.popitem(last=False)
+            self.nbytes -= chunk.nbytes
+            if self.compressed_maxsize > 0:
+                cdata = self._compress(chunk)
+                cchunks[key] = (cdata, chunk.dtype, chunk.shape)
+                self.compressed_nbytes += len(cdata)
+            else:
+                self.evictions += 1
+        while self.compressed_nbytes > self.compressed_maxsize and cchunks:
+            cdata = cchunks.popitem(last=False)[1][0]
+            self.compressed_nbytes -= len(cdata)
+            self.evictions += 1
+
+
+shared_cache = ChunkCache()
+"""The cache of chunks shared by all the files in the process."""
+
+
+def file_key(filename, mode, params):
+    """Return the key identifying the file in the shared cache.
+
+    None is returned when the chunks of the file cannot be shared: when
+    the cache is disabled in `params`, or when the file has no identity
+    on disk according to `tables.utils.file_identity()` (e.g. it is not
+    opened in read-only `mode`, so that cached chunks could get stale).
+    The budgets of the cache are raised to those of `params` when
+    needed.
+
+    """
+
+    maxsize = params['SHARED_CHUNK_CACHE_SIZE']
+    compressed_maxsize = params['SHARED_CHUNK_CACHE_COMPRESSED_SIZE']
+    if maxsize <= 0 and compressed_maxsize <= 0:
+        return None
+    key = file_identity(filename, mode, params)
+    if key is None:
+        return None
+
+    if maxsize > shared_cache.maxsize:
+        shared_cache.resize(maxsize)
+    if compressed_maxsize > shared_cache.compressed_maxsize:
+        shared_cache.resize_compressed(
+            compressed_maxsize, params['SHARED_CHUNK_CACHE_COMPLIB'],
+            params['SHARED_CHUNK_CACHE_COMPLEVEL'])
+    return key
+
+
+def _chunk_spans(start, stop, step, chunklen):
+    """Yield the chunks along a dimension touched by a selection.
+
+    For every chunk with some selected element, a tuple with the number
+    of the chunk, the slice of the selected elements in the chunk and
+    the slice of these elements in the selection is yielded.
+
+    """
+
+    outstart = 0
+    for nchunk in range(start // chunklen, (stop - 1) // chunklen + 1):
+        cstart = nchunk * chunklen
+        cstop = min(cstart + chunklen, stop)
+        # The first selected element in the chunk
+        first = start + max(0, -(-(cstart - start) // step)) * step
+        if first >= cstop:
+            continue
+        nsel = (cstop - first - 1) // step + 1
+        yield (nchunk, slice(first - cstart, cstop - cstart, step),
+               slice(outstart, outstart + nsel))
+        outstart += nsel
+
+
+def read_slice(prefix, shape, chunkshape, startl, stopl, stepl, out,
+               read_chunk):
+    """Read a selection of a leaf into `out` by chunks, using the cache.
+
+    `prefix` is the key of the leaf in `shared_cache`, `shape` and
+    `chunkshape` its dimensions, and the selection is defined by the
+    `startl`, `stopl` and `stepl` sequences.  Chunks not in the cache
+    are read with ``read_chunk(origin, end, chunk)``, which must fill
+    the `chunk` array with the elements from the `origin` to the `end`
+    coordinates.
+
+    """
+
+    spans = [list(_chunk_spans(start, stop, step, chunklen))
+             for start, stop, step, chunklen
+             in zip(startl, stopl, stepl, chunkshape)]
+    for chunkspans in itertools.product(*spans):
+        ncoords = tuple(span[0] for span in chunkspans)
+        key = (prefix, ncoords)
+        chunk = shared_cache.get(key)
+        if chunk is None:
+            origin = [n * chunklen for n, chunklen in zip(ncoords, chunkshape)]
+            end = [min(o + chunklen, dimlen) for o, chunklen, dimlen
+                   in zip(origin, chunkshape, shape)]
+            chunk = numpy.empty(
+                shape=[e - o for o, e in zip(origin, end)], dtype=out.dtype)
+            read_chunk(origin, end, chunk)
+            shared_cache.put(key, chunk)
+        out[tuple(span[2] for span in chunkspans)] = \
+            chunk[tuple(span[1] for span in chunkspans)]
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
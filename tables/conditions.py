@@ -32,9 +32,12 @@ Functions:
 from __future__ import absolute_import
 
 import re
+import sys
+
+import numpy
 from numexpr.necompiler import typecode_to_kind
 from numexpr.necompiler import expressionToAST, typeCompileAst
-from numexpr.necompiler import stringToExpression, NumExpr
+from numexpr.necompiler import stringToExpression, NumExpr, double
 from numexpr.expressions import ExpressionNode
 
 from .utilsextension import get_nested_field
@@ -42,6 +45,45 @@ from .utils import lazyattr
 
 from six.moves import zip
 
+try:
+    # int_, long_ are only available in numexpr >= 2.1
+    from numexpr.necompiler import int_, long_
+except ImportError:
+    int_ = int
+    long_ = int
+
+# Maps NumPy types to the types used by Numexpr.
+_nxtype_from_nptype = {
+    numpy.bool_: bool,
+    numpy.int8: int_,
+    numpy.int16: int_,
+    numpy.int32: int_,
+    numpy.int64: long_,
+    numpy.uint8: int_,
+    numpy.uint16: int_,
+    numpy.uint32: long_,
+    numpy.uint64: long_,
+    numpy.float32: float,
+    numpy.float64: double,
+    numpy.complex64: complex,
+    numpy.complex128: complex,
+    numpy.bytes_: bytes,
+}
+
+if sys.version_info[0] > 2:
+    _nxtype_from_nptype[numpy.str_] = str
+
+if hasattr(numpy, 'float16'):
+    _nxtype_from_nptype[numpy.float16] = float    # XXX: check
+if hasattr(numpy, 'float96'):
+    _nxtype_from_nptype[numpy.float96] = double   # XXX: check
+if hasattr(numpy, 'float128'):
+    _nxtype_from_nptype[numpy.float128] = double  # XXX: check
+if hasattr(numpy, 'complex192'):
+    _nxtype_from_nptype[numpy.complex192] = complex  # XXX: check
+if hasattr(numpy, 'complex256'):
+    _nxtype_from_nptype[numpy.complex256] = complex  # XXX: check
+
 _no_matching_opcode = re.compile(r"[^a-z]([a-z]+)_([a-z]+)[^a-z]")
 # E.g. "gt" and "bfc" from "couldn't find matching opcode for 'gt_bfc'".
 
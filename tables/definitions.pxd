@@ -98,6 +98,11 @@ cdef extern from "hdf5.h" nogil:
     H5F_SCOPE_GLOBAL    = 1     # entire virtual file
     H5F_SCOPE_DOWN      = 2     # for internal use only
 
+  # The versions of the library for the format of objects in files
+  cdef enum H5F_libver_t:
+    H5F_LIBVER_EARLIEST         # use the earliest possible format
+    H5F_LIBVER_LATEST           # use the latest possible format
+
   cdef enum H5FD_mem_t:
     H5FD_MEM_NOLIST     = -1,   # Data should not appear in the free list.
                                 # Must be negative.
@@ -305,6 +310,10 @@ cdef extern from "hdf5.h" nogil:
     #    H5_ih_info_t    attr
     #} meta_size
 
+  # group info
+  ctypedef struct H5G_info_t:
+    hsize_t             nlinks      # Number of links in group
+
 
   #------------------------------------------------------------------
 
@@ -336,6 +345,7 @@ cdef extern from "hdf5.h" nogil:
                    hid_t gapl_id)
   hid_t  H5Gopen(hid_t loc_id, char *name, hid_t gapl_id)
   herr_t H5Gclose(hid_t group_id)
+  herr_t H5Gget_info(hid_t loc_id, H5G_info_t *ginfo)
 
   # Operations with links
   herr_t H5Ldelete(hid_t file_id, char *name, hid_t lapl_id)
@@ -361,6 +371,7 @@ cdef extern from "hdf5.h" nogil:
   # Functions for dealing with dataspaces
   hid_t H5Screate_simple(int rank, hsize_t dims[], hsize_t maxdims[])
   int H5Sget_simple_extent_ndims(hid_t space_id)
+  hssize_t H5Sget_simple_extent_npoints(hid_t space_id)
   int H5Sget_simple_extent_dims(hid_t space_id, hsize_t dims[],
                                 hsize_t maxdims[])
   herr_t H5Sselect_all(hid_t spaceid)
@@ -389,6 +400,7 @@ cdef extern from "hdf5.h" nogil:
 
   # Operations defined on string data types
   htri_t H5Tis_variable_str(hid_t dtype_id)
+  H5T_cset_t H5Tget_cset(hid_t type_id)
 
   # Operations for compound data types
   int    H5Tget_nmembers(hid_t type_id)
@@ -415,6 +427,10 @@ cdef extern from "hdf5.h" nogil:
   int    H5Aget_num_attrs(hid_t loc_id)
   size_t H5Aget_name(hid_t attr_id, size_t buf_size, char *buf)
   hid_t  H5Aopen_idx(hid_t loc_id, unsigned int idx)
+  hid_t  H5Aopen_by_name(hid_t loc_id, char *obj_name, char *attr_name,
+                         hid_t aapl_id, hid_t lapl_id)
+  hid_t  H5Aget_type(hid_t attr_id)
+  hid_t  H5Aget_space(hid_t attr_id)
   herr_t H5Aread(hid_t attr_id, hid_t mem_type_id, void *buf)
   herr_t H5Aclose(hid_t attr_id)
 
@@ -464,6 +480,8 @@ cdef extern from "hdf5.h" nogil:
   herr_t H5Pset_file_image(hid_t fapl_id, void *buf_ptr, size_t buf_len)
   herr_t H5Pget_userblock(hid_t plist, hsize_t *size)
   herr_t H5Pset_userblock(hid_t plist, hsize_t size)
+  herr_t H5Pset_libver_bounds(hid_t fapl_id, H5F_libver_t low,
+                              H5F_libver_t high)
 
   # Error Handling Interface
   #herr_t H5Eget_auto(hid_t estack_id, H5E_auto_t *func, void** data)
@@ -549,14 +567,23 @@ cdef extern from "utils.h" nogil:
   herr_t pt_H5Pset_fapl_windows(hid_t fapl_id)
   herr_t pt_H5Pset_file_image(hid_t fapl_id, void *buf_ptr, size_t buf_len)
   ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len)
+  herr_t pt_H5Pset_file_image_nocopy(hid_t fapl_id, void *buf_ptr,
+                                     size_t buf_len)
   herr_t pt_H5free_memory(void *buf)
+  herr_t pt_H5Fstart_swmr_write(hid_t file_id)
+  herr_t pt_H5Drefresh(hid_t dset_id)
 
   int H5_HAVE_DIRECT_DRIVER, H5_HAVE_WINDOWS_DRIVER, H5_HAVE_IMAGE_FILE
+  int H5_HAVE_THREADSAFE_LIBRARY, H5_HAVE_SWMR_SUPPORT
+  unsigned PT_H5F_ACC_SWMR_READ
 
 
 cdef extern from "utils.h":
   object Giterate(hid_t parent_id, hid_t loc_id, char *name)
+  object Giterate_page(hid_t parent_id, hid_t loc_id, char *name,
+                      char *after, hsize_t count)
   object Aiterate(hid_t loc_id)
+  object get_dataset_filter_names(hid_t dataset_id)
   object H5UIget_info(hid_t loc_id, char *name, char *byteorder)
 
 
@@ -15,6 +15,7 @@
 from __future__ import print_function
 from __future__ import absolute_import
 import sys
+import threading
 import warnings
 
 import numpy as np
@@ -22,12 +23,44 @@ import tables as tb
 from numexpr.necompiler import getContext, getExprNames, getType, NumExpr
 from numexpr.expressions import functions as numexpr_functions
 from .exceptions import PerformanceWarning
-from .parameters import IO_BUFFER_SIZE, BUFFER_TIMES
+from .leaf import plan_blocks
+from .reduction import reduce_blocks
+from .utils import detect_cache_size, prefetch_blocks, BackgroundWriter
+from .parameters import IO_BUFFER_SIZE, BUFFER_TIMES, EXPR_PIPELINE
 import six
 from six.moves import range
 from six.moves import zip
 
 
+def _is_on_disk(obj):
+    """Whether `obj` needs I/O to be accessed."""
+
+    return isinstance(obj, (tb.Leaf, tb.Column))
+
+
+class _OutputSpec(object):
+    """The user-provided output container of an expression and its range."""
+
+    def __init__(self):
+        self.out = None
+        self.append_mode = False
+        self.o_start = None
+        self.o_stop = None
+        self.o_step = None
+
+
+def _output_property(name, doc):
+    """Build a property for the output settings of the first expression."""
+
+    def fget(self):
+        return getattr(self._outputs[0], name)
+
+    def fset(self, value):
+        setattr(self._outputs[0], name, value)
+
+    return property(fget, fset, doc=doc)
+
+
 class Expr(object):
     """A class for evaluating expressions with arbitrary array-like objects.
 
@@ -49,8 +82,11 @@ class Expr(object):
 
     Parameters
     ----------
-    expr : str
+    expr : str or sequence of str
         This specifies the expression to be evaluated, such as "2 * a + 3 * b".
+        A sequence of expressions can be passed as well; in that case, all
+        of them are evaluated over the same blocks of inputs, so that every
+        input is read just once (see below).
     uservars : dict
         This can be used to define the variable names appearing in *expr*.
         This mapping should consist of identifier-like strings pointing to any
@@ -94,12 +130,29 @@ class Expr(object):
         >>> sum(expr)
         array([ 8, 12])
 
+    Several expressions sharing the same inputs can be evaluated at once.
+    In that case, :meth:`Expr.eval` returns a list with the outcome of
+    every expression, and output containers can be set for each of them
+    by passing the *index* argument to :meth:`Expr.set_output`::
+
+        >>> expr = tb.Expr(["a * b", "a + b", "sqrt(a**2 + b**2)"])
+        >>> expr.set_output(out_prod, index=0)
+        >>> expr.set_output(out_sum, index=1)
+        >>> expr.set_output(out_hypot, index=2)
+        >>> expr.eval()
+
     .. rubric:: Expr attributes
 
     .. attribute:: append_mode
 
         The append mode for user-provided output containers.
 
+    .. attribute:: expressions
+
+        The expressions to be evaluated (list).
+
+        .. versionadded:: 3.3
+
     .. attribute:: maindim
 
         Common main dimension for inputs in expression.
@@ -111,6 +164,7 @@ class Expr(object):
     .. attribute:: out
 
         The user-provided container (if any) for the expression outcome.
+        For several expressions, this refers to the first one.
 
     .. attribute:: o_start
 
@@ -126,7 +180,8 @@ class Expr(object):
 
     .. attribute:: shape
 
-        Common shape for the arrays in expression.
+        Common shape for the arrays in expression.  For several
+        expressions, this is the shape of the outcome of the first one.
 
     .. attribute:: values
 
@@ -141,22 +196,32 @@ class Expr(object):
 
     """
 
+    append_mode = _output_property(
+        'append_mode', "The append mode for user-provided output containers.")
+    out = _output_property(
+        'out',
+        "The user-provided container (if any) for the expression outcome.")
+    o_start = _output_property(
+        'o_start', "The start range selection for the user-provided output.")
+    o_stop = _output_property(
+        'o_stop', "The stop range selection for the user-provided output.")
+    o_step = _output_property(
+        'o_step', "The step range selection for the user-provided output.")
+
     def __init__(self, expr, uservars=None, **kwargs):
 
-        self.append_mode = False
-        """The append mode for user-provided output containers."""
+        self._multiple = not isinstance(expr, six.string_types)
+        """Whether several expressions are being evaluated."""
+        self.expressions = list(expr) if self._multiple else [expr]
+        """The expressions to be evaluated (list)."""
+        if not self.expressions:
+            raise ValueError("at least one expression is needed")
+        self._outputs = [_OutputSpec() for e in self.expressions]
+        """The output settings for every expression."""
         self.maindim = 0
         """Common main dimension for inputs in expression."""
         self.names = []
         """The names of variables in expression (list)."""
-        self.out = None
-        """The user-provided container (if any) for the expression outcome."""
-        self.o_start = None
-        """The start range selection for the user-provided output."""
-        self.o_stop = None
-        """The stop range selection for the user-provided output."""
-        self.o_step = None
-        """The step range selection for the user-provided output."""
         self.shape = None
         """Common shape for the arrays in expression."""
         self.start, self.stop, self.step = (None,) * 3
@@ -169,15 +234,26 @@ class Expr(object):
         self.values = []
         """The values of variables in expression (list)."""
 
-        self._compiled_expr = None
-        """The compiled expression."""
-        self._single_row_out = None
-        """A sample of the output with just a single row."""
+        self._compiled_exprs = []
+        """The compiled expressions."""
+        self._args = []
+        """The positions in `values` of the arguments of every expression."""
+        self._shapes = []
+        """The shape of the outcome of every expression."""
+        self._single_row_outs = []
+        """A sample of the output of every expression with a single row."""
 
         # First, get the signature for the arrays in expression
-        vars_ = self._required_expr_vars(expr, uservars)
+        vars_ = {}
         context = getContext(kwargs)
-        self.names, _ = getExprNames(expr, context)
+        exprnames = []
+        for expr_ in self.expressions:
+            vars_.update(self._required_expr_vars(expr_, uservars))
+            names, _ = getExprNames(expr_, context)
+            exprnames.append(names)
+            for name in names:
+                if name not in self.names:
+                    self.names.append(name)
 
         # Raise a ValueError in case we have unsupported objects
         for name, var in six.iteritems(vars_):
@@ -208,28 +284,44 @@ class Expr(object):
 
         # Get the variables and types
         values = self.values
-        types_ = []
+        types_ = {}
         for name in self.names:
             value = vars_[name]
             if hasattr(value, 'atom'):
-                types_.append(value.atom)
+                types_[name] = value.atom
             elif hasattr(value, 'dtype'):
-                types_.append(value)
+                types_[name] = value
             else:
                 # try to convert into a NumPy array
                 value = np.array(value)
-                types_.append(value)
+                types_[name] = value
             values.append(value)
 
-        # Create a signature for the expression
-        signature = [(name, getType(type_))
-                     for (name, type_) in zip(self.names, types_)]
-
-        # Compile the expression
-        self._compiled_expr = NumExpr(expr, signature, **kwargs)
+        for expr_, names in zip(self.expressions, exprnames):
+            # Create a signature for the expression
+            signature = [(name, getType(types_[name])) for name in names]
+            # Compile the expression
+            self._compiled_exprs.append(NumExpr(expr_, signature, **kwargs))
+            self._args.append([self.names.index(name) for name in names])
 
         # Guess the shape for the outcome and the maindim of inputs
-        self.shape, self.maindim = self._guess_shape()
+        self._shapes, self.maindim = self._guess_shape()
+        self.shape = self._shapes[0]
+
+    @property
+    def _compiled_expr(self):
+        """The (first) compiled expression."""
+        return self._compiled_exprs[0]
+
+    @property
+    def _single_row_out(self):
+        """A sample of the (first) output with just a single row."""
+        return self._single_row_outs[0]
+
+    def _compute(self, i, vals):
+        """Compute the `i`-th expression over the `vals` of all inputs."""
+
+        return self._compiled_exprs[i](*[vals[pos] for pos in self._args[i]])
 
     # The next method is similar to their counterpart in `Table`, but
     # adapted to the `Expr` own requirements.
@@ -326,7 +418,7 @@ class Expr(object):
         self.stop = stop
         self.step = step
 
-    def set_output(self, out, append_mode=False):
+    def set_output(self, out, append_mode=False, index=0):
         """Set out as container for output as well as the append_mode.
 
         The out must be a container that is meant to keep the outcome of
@@ -345,20 +437,27 @@ class Expr(object):
         up the container are carried out.  If it is larger, the excess
         elements are unaffected.
 
+        When several expressions are evaluated, index selects the
+        expression whose outcome goes to out.
+
+        .. versionchanged:: 3.3
+           Added the *index* parameter.
+
         """
 
         if not (hasattr(out, "shape") and hasattr(out, "__setitem__")):
             raise ValueError(
                 "You need to pass a settable multidimensional container "
                 "as output")
-        self.out = out
+        spec = self._outputs[index]
         if append_mode and not hasattr(out, "append"):
             raise ValueError(
                 "For activating the ``append`` mode, you need a container "
                 "with an `append()` method (like the `EArray`)")
-        self.append_mode = append_mode
+        spec.out = out
+        spec.append_mode = append_mode
 
-    def set_output_range(self, start=None, stop=None, step=None):
+    def set_output_range(self, start=None, stop=None, step=None, index=0):
         """Define a range for user-provided output object.
 
         The output object will only be modified in the range specified by the
@@ -366,14 +465,21 @@ class Expr(object):
         leading one, if the object does not have the concept of main dimension,
         like a NumPy container).
 
+        When several expressions are evaluated, index selects the
+        expression whose output range is set.
+
+        .. versionchanged:: 3.3
+           Added the *index* parameter.
+
         """
 
-        if self.out is None:
+        spec = self._outputs[index]
+        if spec.out is None:
             raise IndexError(
                 "You need to pass an output object to `setOut()` first")
-        self.o_start = start
-        self.o_stop = stop
-        self.o_step = step
+        spec.o_start = start
+        spec.o_stop = stop
+        spec.o_step = step
 
     # Although the next code is similar to the method in `Leaf`, it
     # allows the use of pure NumPy objects.
@@ -381,11 +487,7 @@ class Expr(object):
         """Calculate the number of rows that will fit in a buffer."""
 
         # Compute the rowsize for the *leading* dimension
-        shape_ = list(object_.shape)
-        if shape_:
-            shape_[0] = 1
-
-        rowsize = np.prod(shape_) * object_.dtype.itemsize
+        rowsize = self._calc_rowsize(object_)
 
         # Compute the nrowsinbuf
         # Multiplying the I/O buffer size by 4 gives optimal results
@@ -410,8 +512,31 @@ value of dimensions that are orthogonal (and preferably close) to the
 
         return nrowsinbuf
 
+    @staticmethod
+    def _calc_rowsize(object_):
+        """Get the size (in bytes) of a row in the leading dimension."""
+
+        shape_ = list(object_.shape)
+        if shape_:
+            shape_[0] = 1
+        return int(np.prod(shape_)) * object_.dtype.itemsize
+
+    @staticmethod
+    def _get_chunkrows(object_, maindim):
+        """Get the chunk length of object_ in the `maindim` dimension."""
+
+        if isinstance(object_, tb.Column):
+            chunkshape = object_.table.chunkshape
+            if chunkshape and maindim == 0:
+                return chunkshape[0]
+            return None
+        chunkshape = getattr(object_, 'chunkshape', None)
+        if chunkshape and maindim is not None and maindim < len(chunkshape):
+            return chunkshape[maindim]
+        return None
+
     def _guess_shape(self):
-        """Guess the shape of the output of the expression."""
+        """Guess the shapes of the outputs of the expressions."""
 
         # First, compute the maximum dimension of inputs and maindim
         # (if it exists)
@@ -424,8 +549,10 @@ value of dimensions that are orthogonal (and preferably close) to the
             if hasattr(val, "maindim"):
                 maindims.append(val.maindim)
         if maxndim == 0:
-            self._single_row_out = out = self._compiled_expr(*self.values)
-            return (), None
+            self._single_row_outs = [
+                self._compute(i, self.values)
+                for i in range(len(self._compiled_exprs))]
+            return [()] * len(self._compiled_exprs), None
         if maindims and [maindims[0]] * len(maindims) == maindims:
             # If all maindims detected are the same, use this as maindim
             maindim = maindims[0]
@@ -452,11 +579,21 @@ value of dimensions that are orthogonal (and preferably close) to the
                 vals.append(val.__getitem__(slices))
                 lens.append(shape[maindim])
         minlen = min(lens)
-        self._single_row_out = out = self._compiled_expr(*vals)
-        shape = list(out.shape)
-        if minlen > 0:
-            shape.insert(maindim, minlen)
-        return shape, maindim
+        shapes = []
+        for i, expr in enumerate(self.expressions):
+            # All the outcomes must be traversed along the same dimension
+            if not any(len(self.values[pos].shape) == maxndim
+                       for pos in self._args[i]):
+                raise ValueError(
+                    "expression ``%s`` does not depend on the inputs with "
+                    "the largest number of dimensions" % expr)
+            out = self._compute(i, vals)
+            self._single_row_outs.append(out)
+            shape = list(out.shape)
+            if minlen > 0:
+                shape.insert(maindim, minlen)
+            shapes.append(shape)
+        return shapes, maindim
 
     def _get_info(self, shape, maindim, itermode=False):
         """Return various info needed for evaluating the computation loop."""
@@ -475,17 +612,14 @@ value of dimensions that are orthogonal (and preferably close) to the
             i_nrows = 0
 
         if not itermode:
-            # Create a container for output if not defined yet
-            o_maindim = 0    # Default maindim
-            if self.out is None:
-                out = np.empty(shape, dtype=self._single_row_out.dtype)
-                # Get the trivial values for start, stop and step
-                if maindim is not None:
-                    (o_start, o_stop, o_step) = (0, shape[maindim], 1)
-                else:
-                    (o_start, o_stop, o_step) = (0, 0, 1)
-            else:
-                out = self.out
+            # Check the user-provided containers first, as they may
+            # reduce the number of rows to be computed
+            outputs = [None] * len(self._outputs)
+            for i, spec in enumerate(self._outputs):
+                if spec.out is None:
+                    continue
+                out = spec.out
+                o_maindim = 0    # Default maindim
                 # Out container already provided.  Do some sanity checks.
                 if hasattr(out, "maindim"):
                     o_maindim = out.maindim
@@ -494,7 +628,7 @@ value of dimensions that are orthogonal (and preferably close) to the
                 # account new possible values of start, stop and step in
                 # the output range
                 o_shape = list(out.shape)
-                s = slice(self.o_start, self.o_stop, self.o_step)
+                s = slice(spec.o_start, spec.o_stop, spec.o_step)
                 o_start, o_stop, o_step = s.indices(o_shape[o_maindim])
                 o_shape[o_maindim] = min(o_shape[o_maindim],
                                          len(range(o_start, o_stop, o_step)))
@@ -502,7 +636,7 @@ value of dimensions that are orthogonal (and preferably close) to the
                 # Check that the shape of output is consistent with inputs
                 tr_oshape = list(o_shape)   # this implies a copy
                 olen_ = tr_oshape.pop(o_maindim)
-                tr_shape = list(shape)      # do a copy
+                tr_shape = self._out_shape(i, shape, maindim)
                 if maindim is not None:
                     len_ = tr_shape.pop(o_maindim)
                 else:
@@ -511,9 +645,24 @@ value of dimensions that are orthogonal (and preferably close) to the
                     raise ValueError(
                         "Shape for out container does not match expression")
                 # Force the input length to fit in `out`
-                if not self.append_mode and olen_ < len_:
+                if not spec.append_mode and olen_ < len_:
                     shape[o_maindim] = olen_
-                    stop = start + olen_
+                    stop = min(stop, start + olen_ * step)
+                outputs[i] = (out, spec.append_mode,
+                              o_maindim, o_start, o_stop, o_step)
+
+            # Create a container for the outputs not defined yet
+            for i, spec in enumerate(self._outputs):
+                if spec.out is not None:
+                    continue
+                out = np.empty(self._out_shape(i, shape, maindim),
+                               dtype=self._single_row_outs[i].dtype)
+                # Get the trivial values for start, stop and step
+                if maindim is not None:
+                    (o_start, o_stop, o_step) = (0, shape[maindim], 1)
+                else:
+                    (o_start, o_stop, o_step) = (0, 0, 1)
+                outputs[i] = (out, False, 0, o_start, o_stop, o_step)
 
         # Get the positions of inputs that should be sliced (the others
         # will be broadcasted)
@@ -523,19 +672,50 @@ value of dimensions that are orthogonal (and preferably close) to the
 
         # The size of the I/O buffer
         nrowsinbuf = 1
+        rowsizes, chunkrows = [], []
         for i, val in enumerate(self.values):
             # Skip scalar values in variables
             if i in slice_pos:
                 nrows = self._calc_nrowsinbuf(val)
                 if nrows > nrowsinbuf:
                     nrowsinbuf = nrows
+                rowsizes.append(self._calc_rowsize(val))
+                chunkrows.append(self._get_chunkrows(val, maindim))
+
+        # Align the blocks with the chunks of inputs, so that they are
+        # not decompressed more than once, and keep them in CPU caches
+        plan = plan_blocks(nrowsinbuf, rowsizes, chunkrows,
+                           detect_cache_size())
 
         if not itermode:
-            return (i_nrows, slice_pos, start, stop, step, nrowsinbuf,
-                    out, o_maindim, o_start, o_stop, o_step)
+            return (i_nrows, slice_pos, start, stop, step, plan, outputs)
         else:
             # For itermode, we don't need the out info
-            return (i_nrows, slice_pos, start, stop, step, nrowsinbuf)
+            return (i_nrows, slice_pos, start, stop, step, plan)
+
+    def _out_shape(self, i, shape, maindim):
+        """Return the shape of the `i`-th outcome for inputs of `shape`."""
+
+        o_shape = list(self._shapes[i])
+        if maindim is not None and o_shape:
+            o_shape[maindim] = shape[maindim]
+        return o_shape
+
+    def get_block_plan(self):
+        """Get the plan for traversing the inputs by blocks.
+
+        The returned :class:`tables.leaf.BlockPlan` instance tells the
+        number of rows that are read and computed at a time, as well as
+        whether block boundaries are aligned with the chunks of inputs.
+        Its ``chunk_reads()`` method can be used to estimate the number
+        of chunk decompressions done during an evaluation.
+
+        .. versionadded:: 3.3
+
+        """
+
+        shape = list(self.shape) if self.shape else []
+        return self._get_info(shape, self.maindim, itermode=True)[5]
 
     def eval(self):
         """Evaluate the expression and return the outcome.
@@ -562,6 +742,10 @@ value of dimensions that are orthogonal (and preferably close) to the
         already been called, the output is sent to this user-provided
         container.  If not, a fresh NumPy container is returned instead.
 
+        When several expressions are evaluated, a list with the outcome of
+        every expression is returned.  Each block of inputs is read only
+        once and shared by all the expressions.
+
         .. warning::
 
             When dealing with large on-disk inputs, failing to specify an
@@ -569,21 +753,35 @@ value of dimensions that are orthogonal (and preferably close) to the
 
         """
 
-        values, shape, maindim = self.values, self.shape, self.maindim
+        values, shape, maindim = self.values, list(self.shape), self.maindim
 
         # Get different info we need for the main computation loop
-        (i_nrows, slice_pos, start, stop, step, nrowsinbuf,
-         out, o_maindim, o_start, o_stop, o_step) = \
+        (i_nrows, slice_pos, start, stop, step, plan, outputs) = \
             self._get_info(shape, maindim)
 
         if i_nrows == 0:
             # No elements to compute
+            if self._multiple:
+                return list(self._single_row_outs)
             return self._single_row_out
 
-        # Create a key that selects every element in inputs and output
-        # (including the main dimension)
-        i_slices = [slice(None)] * (maindim + 1)
-        o_slices = [slice(None)] * (o_maindim + 1)
+        # Overlap I/O with computation when there are on-disk objects:
+        # input blocks are prefetched by a thread and the outcomes are
+        # stored by another one while Numexpr is busy with the current
+        # block.  Both threads share a lock so that HDF5 calls are
+        # always serialized.
+        io_lock = threading.Lock()
+        prefetch = EXPR_PIPELINE and any(
+            _is_on_disk(values[i]) for i in slice_pos)
+        writer = None
+        if EXPR_PIPELINE and any(_is_on_disk(o[0]) for o in outputs):
+            def write(out, key, rout):
+                with io_lock:
+                    if key is None:
+                        out.append(rout)
+                    else:
+                        out[key] = rout
+            writer = BackgroundWriter(write, name="Expr writer")
 
         # This is a hack to prevent doing unnecessary flavor conversions
         # while reading buffers
@@ -591,98 +789,277 @@ value of dimensions that are orthogonal (and preferably close) to the
             if hasattr(val, 'maindim'):
                 val._v_convert = False
 
-        # Start the computation itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
+        blocks = self._iter_blocks(values, slice_pos, maindim,
+                                   plan.iter_slices(start, stop, step), step,
+                                   io_lock)
+        if prefetch:
+            blocks = prefetch_blocks(blocks, name="Expr prefetch")
+
+        try:
+            # Start the computation itself
+            for start2, stop2, vals in blocks:
+                for i, output in enumerate(outputs):
+                    out, append_mode, o_maindim, o_start, o_stop, o_step = \
+                        output
+                    # Do the actual computation for this slice
+                    rout = self._compute(i, vals)
+                    # Set the values into the out buffer
+                    if append_mode:
+                        key = None
+                    else:
+                        # Compute the slice to be filled in output
+                        start3 = o_start + (start2 - start) // step * o_step
+                        stop3 = (start3 +
+                                 len(range(start2, stop2, step)) * o_step)
+                        if stop3 > o_stop:
+                            stop3 = o_stop
+                        # Select every element in output (including the
+                        # main dimension)
+                        o_slices = [slice(None)] * o_maindim
+                        o_slices.append(slice(start3, stop3, o_step))
+                        key = tuple(o_slices)
+                    if writer is not None and _is_on_disk(out):
+                        writer.put(out, key, rout)
+                    elif key is None:
+                        out.append(rout)
+                    else:
+                        out[key] = rout
+            if writer is not None:
+                writer.close()
+                writer = None
+        finally:
+            blocks.close()
+            if writer is not None:
+                # Some error happened; just wait for the pending writes
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            # Activate the conversion again (default)
+            for val in values:
+                if hasattr(val, 'maindim'):
+                    val._v_convert = True
+
+        if self._multiple:
+            return [output[0] for output in outputs]
+        return outputs[0][0]
+
+    def _iter_blocks(self, values, slice_pos, maindim, limits, step, lock):
+        """Yield ``(start, stop, values)`` for every block of inputs.
+
+        `limits` is an iterable of ``(start, stop)`` block limits in the
+        main dimension.  Reads of on-disk inputs are done while holding
+        `lock`.
+
+        """
+
+        # On-disk inputs which are not sliced (i.e. which are broadcast)
+        # are read once beforehand, so that Numexpr does not read them
+        # for every block without holding the lock.
+        values = list(values)
+        for i, val in enumerate(values):
+            if i not in slice_pos and _is_on_disk(val):
+                with lock:
+                    if isinstance(val, tb.Leaf):
+                        values[i] = val.read()
+                    else:
+                        values[i] = val[:]
+
+        # Create a key that selects every element in inputs
+        # (including the main dimension)
+        i_slices = [slice(None)] * (maindim + 1)
+        for start2, stop2 in limits:
             # Set the proper slice for inputs
             i_slices[maindim] = slice(start2, stop2, step)
             # Get the input values
             vals = []
             for i, val in enumerate(values):
                 if i in slice_pos:
-                    vals.append(val.__getitem__(tuple(i_slices)))
+                    with lock:
+                        vals.append(val.__getitem__(tuple(i_slices)))
                 else:
-                    # A read of values is not apparently needed, as PyTables
-                    # leaves seems to work just fine inside Numexpr
                     vals.append(val)
-            # Do the actual computation for this slice
-            rout = self._compiled_expr(*vals)
-            # Set the values into the out buffer
-            if self.append_mode:
-                out.append(rout)
-            else:
-                # Compute the slice to be filled in output
-                start3 = o_start + (start2 - start) // step
-                stop3 = start3 + nrowsinbuf * o_step
-                if stop3 > o_stop:
-                    stop3 = o_stop
-                o_slices[o_maindim] = slice(start3, stop3, o_step)
-                # Set the slice
-                out[tuple(o_slices)] = rout
-
-        # Activate the conversion again (default)
+            yield start2, stop2, vals
+
+    def _iter_outcomes(self, info):
+        """Yield ``(start, outcomes)`` for every block of the outcomes.
+
+        `info` is what :meth:`Expr._get_info` returns in iteration mode,
+        `start` is the position of the first row of the block in inputs
+        and `outcomes` is a list with the block of every expression.
+
+        """
+
+        values, maindim = self.values, self.maindim
+        (i_nrows, slice_pos, start, stop, step, plan) = info
+
+        if i_nrows == 0:
+            # No elements to compute
+            return
+
+        # This is a hack to prevent doing unnecessary flavor conversions
+        # while reading buffers
         for val in values:
             if hasattr(val, 'maindim'):
-                val._v_convert = True
+                val._v_convert = False
 
-        return out
+        blocks = self._iter_blocks(values, slice_pos, maindim,
+                                   plan.iter_slices(start, stop, step), step,
+                                   threading.Lock())
+        if EXPR_PIPELINE and any(_is_on_disk(values[i]) for i in slice_pos):
+            blocks = prefetch_blocks(blocks, name="Expr prefetch")
+
+        try:
+            # Start the computation itself
+            for start2, stop2, vals in blocks:
+                yield start2, [self._compute(i, vals)
+                               for i in range(len(self._compiled_exprs))]
+        finally:
+            blocks.close()
+            # Activate the conversion again (default)
+            for val in values:
+                if hasattr(val, 'maindim'):
+                    val._v_convert = True
 
     def __iter__(self):
         """Iterate over the rows of the outcome of the expression.
 
         This iterator always returns rows as NumPy objects, so a possible out
         container specified in :meth:`Expr.set_output` method is ignored here.
+        When several expressions are evaluated, a tuple with a row of every
+        outcome is returned in each iteration.
 
         """
 
-        values, shape, maindim = self.values, self.shape, self.maindim
+        info = self._get_info(list(self.shape), self.maindim, itermode=True)
+        for start2, routs in self._iter_outcomes(info):
+            if self._multiple:
+                # Return one row of every outcome per call
+                for rows in zip(*routs):
+                    yield rows
+            else:
+                # Return one row per call
+                for row in routs[0]:
+                    yield row
+
+    def _check_single(self, method):
+        """Check that there is a single expression for `method`."""
+
+        if self._multiple:
+            raise TypeError("``%s()`` needs a single expression; create an "
+                            "``Expr`` for every expression instead" % method)
+
+    def _reduce(self, op, axis, transform=None):
+        """Reduce the outcome of the expression block by block."""
+
+        self._check_single(op)
+        shape, maindim = list(self.shape), self.maindim
+        info = self._get_info(shape, maindim, itermode=True)
+        start, step = info[2], info[4]
+        dtype = self._single_row_out.dtype
+        if maindim is None:
+            # A scalar expression
+            blocks = iter([(0, self._single_row_out)])
+        else:
+            blocks = (((start2 - start) // step, rout)
+                      for start2, (rout,) in self._iter_outcomes(info))
+        if transform is not None:
+            blocks = ((offset, transform(block)) for offset, block in blocks)
+            dtype = transform(self._single_row_out).dtype
+        return reduce_blocks(op, blocks, self._out_shape(0, shape, maindim),
+                             maindim, dtype, axis)
 
-        # Get different info we need for the main computation loop
-        (i_nrows, slice_pos, start, stop, step, nrowsinbuf) = \
-            self._get_info(shape, maindim, itermode=True)
+    def sum(self, axis=None):
+        """Compute the sum of the outcome of the expression.
 
-        if i_nrows == 0:
-            # No elements to compute
-            return
+        The outcome is computed and reduced block by block, so it never
+        has to fit in memory.  The axis argument has the same meaning as
+        in :func:`numpy.sum`, and the input range selected with
+        :meth:`Expr.set_inputs_range` is honored.
 
-        # Create a key that selects every element in inputs
-        # (including the main dimension)
-        i_slices = [slice(None)] * (maindim + 1)
+        .. versionadded:: 3.3
 
-        # This is a hack to prevent doing unnecessary flavor conversions
-        # while reading buffers
-        for val in values:
-            if hasattr(val, 'maindim'):
-                val._v_convert = False
+        """
 
-        # Start the computation itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
-            # Set the proper slice in the main dimension
-            i_slices[maindim] = slice(start2, stop2, step)
-            # Get the values for computing the buffer
-            vals = []
-            for i, val in enumerate(values):
-                if i in slice_pos:
-                    vals.append(val.__getitem__(tuple(i_slices)))
-                else:
-                    # A read of values is not apparently needed, as PyTables
-                    # leaves seems to work just fine inside Numexpr
-                    vals.append(val)
-            # Do the actual computation
-            rout = self._compiled_expr(*vals)
-            # Return one row per call
-            for row in rout:
-                yield row
+        return self._reduce('sum', axis)
 
-        # Activate the conversion again (default)
-        for val in values:
-            if hasattr(val, 'maindim'):
-                val._v_convert = True
+    def count_nonzero(self, axis=None):
+        """Count the non-zero (true) elements of the outcome.
+
+        This is computed block by block, like :meth:`Expr.sum`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('sum', axis, transform=lambda x: x != 0)
+
+    def min(self, axis=None):
+        """Compute the minimum of the outcome of the expression.
+
+        This is computed block by block, like :meth:`Expr.sum`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('min', axis)
+
+    def max(self, axis=None):
+        """Compute the maximum of the outcome of the expression.
+
+        This is computed block by block, like :meth:`Expr.sum`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('max', axis)
+
+    def where(self):
+        """Return the coordinates of the elements where the expression is true.
+
+        The expression must have a boolean outcome, like ``(a > 0) & (b <
+        c)``.  The outcome is computed block by block, and only the
+        coordinates of the true elements are kept, so the complete mask
+        is never held in memory.  Coordinates refer to positions in the
+        inputs (i.e. the range selected with :meth:`Expr.set_inputs_range`
+        is taken into account).
+
+        For unidimensional outcomes, an array with the positions of the
+        true elements is returned.  Else, an array with one row per true
+        element and one column per dimension is returned, in the same
+        format as :func:`numpy.argwhere`.  Both can be used for selecting
+        the elements of inputs (e.g. ``a[expr.where()]`` for the former).
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._check_single('where')
+        if self._single_row_out.dtype.kind != 'b':
+            raise TypeError("``where()`` needs a boolean expression")
+        shape, maindim = list(self.shape), self.maindim
+        if maindim is None:
+            # A scalar expression
+            return np.argwhere(self._single_row_out).astype(np.int64)
+        ndim = len(shape)
+        info = self._get_info(shape, maindim, itermode=True)
+        step = info[4]
+        coords = []
+        for start2, (rout,) in self._iter_outcomes(info):
+            if ndim == 1:
+                coord = np.flatnonzero(rout).astype(np.int64)
+                coord *= step
+                coord += start2
+            else:
+                coord = np.argwhere(rout).astype(np.int64)
+                coord[:, maindim] *= step
+                coord[:, maindim] += start2
+            coords.append(coord)
+        if not coords:
+            return np.empty((0,) if ndim == 1 else (0, ndim), dtype=np.int64)
+        return np.concatenate(coords)
 
 
 if __name__ == "__main__":
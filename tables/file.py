@@ -26,10 +26,10 @@ import os
 import sys
 import time
 import weakref
+import threading
 import warnings
 import collections
 
-import numexpr
 import numpy
 
 from . import hdf5extension
@@ -38,8 +38,8 @@ from . import parameters
 from .exceptions import (ClosedFileError, FileModeError, NodeError,
                                NoSuchNodeError, UndoRedoError, ClosedNodeError,
                                PerformanceWarning)
-from .registry import get_class_by_name
-from .path import join_path, split_path
+from .registry import get_class_by_name, class_id_dict, class_name_dict
+from .path import join_path, split_path, isvisiblename
 from . import undoredo
 from .description import (IsDescription, UInt8Col, StringCol,
                                 descr_from_dtype, dtype_from_descr)
@@ -52,14 +52,17 @@ from .array import Array
 from .carray import CArray
 from .earray import EArray
 from .vlarray import VLArray
-from .table import Table
 from . import linkextension
 from .utils import detect_number_of_cores
 from . import lrucacheextension
+from . import chunkcache
+from . import indexcache
+from . import snapshot
 from .flavor import flavor_of, array_as_internal
 from .atom import Atom
 
 from .link import SoftLink, ExternalLink
+from .unimplemented import UnImplemented, Unknown
 
 import six
 from six.moves import map
@@ -140,6 +143,27 @@ class _FileRegistry(object):
 # Dict of opened files (keys are filenames and values filehandlers)
 _open_files = _FileRegistry()
 
+
+# Number of files open for concurrent reads which need the GIL to be
+# held during HDF5 calls (i.e. with a non thread-safe HDF5 library)
+_nconcurrent_files = 0
+_nconcurrent_files_lock = threading.Lock()
+
+
+def _register_concurrent_file(delta):
+    """Count a file opened (`delta` is 1) or closed (-1) for concurrent reads.
+
+    The GIL is only released during HDF5 calls while no such file is open.
+
+    """
+
+    global _nconcurrent_files
+
+    with _nconcurrent_files_lock:
+        _nconcurrent_files += delta
+        utilsextension.set_release_gil_in_hdf5(_nconcurrent_files == 0)
+
+
 # Opcodes for do-undo actions
 _op_to_code = {
     "MARK": 0,
@@ -335,6 +359,9 @@ class _NoCache(object):
     def __setitem__(self, key, value):
         pass
 
+    def get(self, key, d=None):
+        return d
+
     __marker = object()
 
     def pop(self, key, d=__marker):
@@ -361,14 +388,155 @@ class _DictCache(dict):
         super(_DictCache, self).__setitem__(key, value)
 
 
+# Rough memory cost of an open node without its I/O buffers, in bytes
+_NODE_OVERHEAD = 4096
+# Rough memory cost of every loaded child of a group, in bytes
+_CHILD_OVERHEAD = 256
+
+
+def _node_footprint(node):
+    """Return a rough estimate of the memory used by `node` in bytes."""
+
+    size = _NODE_OVERHEAD
+    children = node.__dict__.get('_v_children')
+    if children is not None:
+        size += len(children) * _CHILD_OVERHEAD
+    if isinstance(node, Leaf):
+        # Not looked up in groups, where it would end in a child lookup
+        nrowsinbuf = getattr(node, 'nrowsinbuf', None)
+        rowsize = getattr(node, 'rowsize', None)
+        if nrowsinbuf and rowsize:
+            size += nrowsinbuf * rowsize
+    return size
+
+
+class _TwoQueueCache(object):
+    """Scan-resistant node cache following the 2Q replacement policy.
+
+    Nodes loaded for the first time enter a FIFO queue (*A1in*) and are
+    only promoted to the main LRU queue (*Am*) when they are requested
+    again after being evicted from it, which is detected with a queue of
+    recently evicted keys (*A1out*).  This way, a scan over many nodes
+    only flushes *A1in*, while the frequently used nodes stay in *Am*.
+
+    Nodes are evicted when there are more than `nslots` of them or, if
+    `maxmemory` is not None, when their estimated footprint exceeds
+    `maxmemory` bytes.  The sizes of the queues follow the number of
+    nodes that actually fit in the cache.
+
+    """
+
+    def __init__(self, nslots, maxmemory=None):
+        if nslots < 1:
+            raise ValueError("Invalid number of slots: %d" % nslots)
+        if maxmemory is not None and maxmemory < 1:
+            raise ValueError("Invalid memory budget: %d" % maxmemory)
+        self.nslots = nslots
+        self.maxmemory = maxmemory
+        self.memory = 0
+        self.evictions = 0
+        self._a1in = collections.OrderedDict()
+        self._am = collections.OrderedDict()
+        self._a1out = collections.OrderedDict()
+        self._sizes = {}
+
+    def __len__(self):
+        return len(self._a1in) + len(self._am)
+
+    def __contains__(self, key):
+        return key in self._am or key in self._a1in
+
+    def __iter__(self):
+        # Return a copy since the cache can change during the iteration
+        return iter(list(self._a1in) + list(self._am))
+
+    def __repr__(self):
+        return "<%s (%d elements)>" % (str(self.__class__), len(self))
+
+    @property
+    def capacity(self):
+        """The number of nodes that fit in the cache."""
+
+        capacity = self.nslots
+        if self.maxmemory is not None and self._sizes:
+            meansize = self.memory / float(len(self._sizes))
+            capacity = min(capacity, int(self.maxmemory // meansize))
+        return max(1, capacity)
+
+    def get(self, key, d=None):
+        node = self._am.pop(key, None)
+        if node is not None:
+            self._am[key] = node
+            return node
+        # Hits in A1in do not change the order of nodes, since they are
+        # usually correlated references right after the load
+        return self._a1in.get(key, d)
+
+    def __setitem__(self, key, node):
+        if key in self._am:
+            del self._am[key]
+            self._am[key] = node
+        elif key in self._a1in:
+            self._a1in[key] = node
+        elif key in self._a1out:
+            del self._a1out[key]
+            self._am[key] = node
+        else:
+            self._a1in[key] = node
+
+        size = _node_footprint(node)
+        self.memory += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._evict()
+
+    __marker = object()
+
+    def pop(self, key, d=__marker):
+        if key in self._am:
+            node = self._am.pop(key)
+        elif key in self._a1in:
+            node = self._a1in.pop(key)
+        elif d is not self.__marker:
+            return d
+        else:
+            raise KeyError(key)
+        self.memory -= self._sizes.pop(key)
+        return node
+
+    def _evict(self):
+        maxmemory = self.maxmemory
+        while len(self) > 1 and (
+                len(self) > self.nslots or
+                (maxmemory is not None and self.memory > maxmemory)):
+            capacity = self.capacity
+            if len(self._a1in) > max(1, capacity // 4) or not self._am:
+                key = self._a1in.popitem(last=False)[0]
+                # Remember the key so that it can be promoted to Am
+                self._a1out[key] = None
+                while len(self._a1out) > max(1, capacity // 2):
+                    self._a1out.popitem(last=False)
+            else:
+                key = self._am.popitem(last=False)[0]
+            self.memory -= self._sizes.pop(key)
+            self.evictions += 1
+
+
 class NodeManager(object):
-    def __init__(self, nslots=64, node_factory=None):
+    def __init__(self, nslots=64, node_factory=None, policy='lru',
+                 maxmemory=None):
         super(NodeManager, self).__init__()
 
         self.registry = weakref.WeakValueDictionary()
 
+        if policy not in ('lru', '2q'):
+            raise ValueError("node cache policy must be 'lru' or '2q': %r"
+                             % (policy,))
+
         if nslots > 0:
-            cache = lrucacheextension.NodeCache(nslots)
+            if policy == '2q':
+                cache = _TwoQueueCache(nslots, maxmemory)
+            else:
+                cache = lrucacheextension.NodeCache(nslots)
         elif nslots == 0:
             cache = _NoCache()
         else:
@@ -376,10 +544,45 @@ class NodeManager(object):
             cache = _DictCache(-nslots)
 
         self.cache = cache
+        self.policy = policy
 
         # node_factory(node_path)
         self.node_factory = node_factory
 
+        # The depth of nested node loads
+        self._loading = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the counters of the node cache."""
+
+        self.hits = 0
+        self.misses = 0
+        self.reload_time = 0.0
+        self._evictions_base = getattr(self.cache, 'evictions', 0)
+
+    def cache_stats(self):
+        """Return a dictionary with statistics about the node cache.
+
+        The ``hits`` and ``misses`` entries count the requests of nodes
+        which were already loaded and those which had to be loaded from
+        the file, whose total time in seconds is ``reload_time``.
+        ``evictions`` counts the nodes removed from a full cache.
+
+        """
+
+        cache = self.cache
+        return {
+            'policy': self.policy,
+            'nslots': getattr(cache, 'nslots', 0),
+            'nnodes': len(cache),
+            'memory': getattr(cache, 'memory', None),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': getattr(cache, 'evictions', 0) - self._evictions_base,
+            'reload_time': self.reload_time,
+        }
+
     def register_node(self, node, key):
         if key is None:
             key = node._v_pathname
@@ -407,14 +610,17 @@ class NodeManager(object):
         self.cache[key] = node
 
     def get_node(self, key):
-        node = self.cache.pop(key, None)
+        # Nodes in the cache are always registered, so they can be
+        # returned right away
+        node = self.cache.get(key)
         if node is not None:
             if node._v_isopen:
-                self.cache_node(node, key)
+                self.hits += 1
                 return node
             else:
                 # this should not happen
                 warnings.warn("a closed node found in the cache: ``%s``" % key)
+                self.cache.pop(key, None)
 
         if key in self.registry:
             node = self.registry[key]
@@ -424,6 +630,7 @@ class NodeManager(object):
                 warnings.warn("None is stored in the registry for key: "
                               "``%s``" % key)
             elif node._v_isopen:
+                self.hits += 1
                 self.cache_node(node, key)
                 return node
             else:
@@ -434,7 +641,17 @@ class NodeManager(object):
                 node = None
 
         if self.node_factory:
-            node = self.node_factory(key)
+            self.misses += 1
+            # Loading a node may load its ancestors too, so only the
+            # outermost load is timed
+            self._loading += 1
+            t0 = time.time()
+            try:
+                node = self.node_factory(key)
+            finally:
+                self._loading -= 1
+                if not self._loading:
+                    self.reload_time += time.time() - t0
             self.cache_node(node, key)
 
         return node
@@ -576,6 +793,25 @@ class NodeManager(object):
                 node._f_close()
 
 
+class NodeInfo(collections.namedtuple(
+        'NodeInfo', ['path', 'classname', 'shape', 'dtype', 'chunkshape',
+                     'filters', 'size'])):
+    """Metadata of a node, as yielded by :meth:`File.walk_info`.
+
+    The fields are the `path` of the node, the `classname` of the node
+    class it is loaded as (e.g. ``'Group'``, ``'Table'`` or
+    ``'SoftLink'``) and, for leaves, its `shape`, the `dtype` of its
+    elements, its `chunkshape`, its `filters` (a `Filters` instance) and
+    the `size` in bytes of its storage.  The fields which do not apply
+    to a node are None.
+
+    .. versionadded:: 3.3
+
+    """
+
+    __slots__ = ()
+
+
 class File(hdf5extension.File, object):
     """The in-memory representation of a PyTables file.
 
@@ -777,8 +1013,26 @@ class File(hdf5extension.File, object):
         if params['MAX_BLOSC_THREADS'] is None:
             params['MAX_BLOSC_THREADS'] = detect_number_of_cores()
 
+        if params['MAX_REDUCTION_THREADS'] is None:
+            params['MAX_REDUCTION_THREADS'] = detect_number_of_cores()
+
         self.params = params
 
+        self._chunk_cache_key = chunkcache.file_key(filename, mode, params)
+        """The key of the file in the shared chunk cache (or None)."""
+        self._index_cache_key = indexcache.file_key(filename, mode, params)
+        """The key of the file for persistent index caches (or None)."""
+        self._snapshot = None
+        """The metadata snapshot of the file in use (or None)."""
+        if params['METADATA_SNAPSHOT']:
+            self._snapshot = snapshot.load(filename, mode, params)
+        self._lock = None
+        """The lock of a file shared by threads for reading (or None)."""
+        self._swmr_write = False
+        """Whether the file is being written in SWMR mode."""
+        self._nchildren_changes = 0
+        """The number of children created or removed in groups so far."""
+
         # Now, it is time to initialize the File extension
         self._g_new(filename, mode, **params)
 
@@ -793,11 +1047,20 @@ class File(hdf5extension.File, object):
         # initialization but the node_factory attribute is set onl later
         # because it is a bount method of the root grop itself.
         node_cache_slots = params['NODE_CACHE_SLOTS']
-        self._node_manager = NodeManager(nslots=node_cache_slots)
+        self._node_manager = NodeManager(
+            nslots=node_cache_slots, policy=params['NODE_CACHE_POLICY'],
+            maxmemory=params['NODE_CACHE_MEMORY'])
 
         # For the moment Undo/Redo is not enabled.
         self._undoEnabled = False
 
+        # Files opened for concurrent reads get a lock for their node
+        # manager and query machinery.
+        if params['CONCURRENT_READS'] and mode == 'r':
+            self._lock = threading.RLock()
+            if not hdf5extension.HAVE_THREADSAFE_LIBRARY:
+                _register_concurrent_file(+1)
+
         # Set the flag to indicate that the file has been opened.
         # It must be set before opening the root group
         # to allow some basic access to its attributes.
@@ -830,8 +1093,20 @@ class File(hdf5extension.File, object):
             # It does. Enable the undo.
             self.enable_undo()
 
-        # Set the maximum number of threads for Numexpr
-        numexpr.set_vml_num_threads(params['MAX_NUMEXPR_THREADS'])
+        # Existing files are ready to be written in SWMR mode
+        if params['SWMR'] and not new and self.mode != "r":
+            try:
+                self.start_swmr_write()
+            except Exception:
+                self.close()
+                raise
+
+        # Set the maximum number of threads for Numexpr.  It is only
+        # imported when conditions are first compiled, which sets it too
+        # (see `Table._compile_condition()`).
+        numexpr = sys.modules.get('numexpr')
+        if numexpr is not None:
+            numexpr.set_vml_num_threads(params['MAX_NUMEXPR_THREADS'])
 
     def __get_root_group(self, root_uep, title, filters):
         """Returns a Group instance which will act as the root group in the
@@ -1049,6 +1324,7 @@ class File(hdf5extension.File, object):
             raise ValueError("invalid table description: None")
         _checkfilters(filters)
 
+        from .table import Table
         ptobj = Table(parentnode, name,
                       description=description, title=title,
                       filters=filters, expectedrows=expectedrows,
@@ -1539,7 +1815,11 @@ class File(hdf5extension.File, object):
         if nodepath == '/':
             return self.root
 
-        node = self._node_manager.get_node(nodepath)
+        if self._lock is None:
+            node = self._node_manager.get_node(nodepath)
+        else:
+            with self._lock:
+                node = self._node_manager.get_node(nodepath)
         assert node is not None, "unable to instantiate node ``%s``" % nodepath
 
         return node
@@ -2091,6 +2371,164 @@ class File(hdf5extension.File, object):
         return group._f_walk_groups()
 
 
+    def walk_info(self, where="/", classname=None):
+        """Recursively iterate over the metadata of nodes hanging from where.
+
+        This is a fast version of :meth:`File.walk_nodes` for inventorying
+        large hierarchies: instead of nodes, lightweight
+        :class:`NodeInfo` records are yielded, with metadata read straight
+        from HDF5.  Nodes are neither loaded nor put in the node cache,
+        and their attribute sets are not created.
+
+        The where group itself is listed first, then each of its children
+        in alphanumerical order, and child groups are traversed as they
+        are listed (preorder).  Hidden nodes are skipped.  Records are
+        taken from the metadata snapshot of the file when it has been
+        opened with one (see :meth:`File.save_snapshot`).
+
+        Parameters
+        ----------
+        where : str or Group, optional
+            If supplied, the iteration starts from (and includes)
+            this group. It can be a path string or a
+            Group instance (see :ref:`GroupClassDescr`).
+        classname
+            If the name of a class derived from
+            Node (see :ref:`GroupClassDescr`) is supplied, only records of
+            nodes of that class (or subclasses of it) will be returned.
+
+        Examples
+        --------
+
+        ::
+
+            # Print the size on disk of all the leaves in the file.
+            for info in h5file.walk_info(classname='Leaf'):
+                print(info.path, info.shape, info.size)
+
+        .. versionadded:: 3.3
+
+        """
+
+        class_ = get_class_by_name(classname)
+        group = self.get_node(where)  # Does the parent exist?
+        self._check_group(group)  # Is it a group?
+
+        if issubclass(group.__class__, class_):
+            yield NodeInfo(group._v_pathname, group.__class__.__name__,
+                           None, None, None, None, None)
+        stack = [self._iter_children_info(group._v_pathname)]
+        while stack:
+            for (childclass, info) in stack[-1]:
+                if issubclass(childclass, class_):
+                    yield info
+                if issubclass(childclass, Group):
+                    # Traverse the child group before its siblings
+                    stack.append(self._iter_children_info(info.path))
+                    break
+            else:
+                stack.pop()
+
+
+    def save_snapshot(self):
+        """Save a metadata snapshot of the file for opening it quickly.
+
+        The :class:`NodeInfo` records of all the visible nodes in the
+        file (see :meth:`File.walk_info`) are saved to a sidecar file
+        named after this one with a ``.ptsnap`` suffix.  When the file
+        is later opened in read-only mode with the
+        :data:`tables.parameters.METADATA_SNAPSHOT` parameter, the
+        snapshot is read at once and used for looking up nodes and their
+        classes, and for :meth:`File.walk_info`, instead of reading
+        their metadata from HDF5 (see :mod:`tables.snapshot`).  The
+        snapshot is ignored after the file is modified.
+
+        The file must be opened in read-only mode, else a
+        `FileModeError` is raised.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._check_open()
+        if self.mode != 'r':
+            raise FileModeError("metadata snapshots can only be saved for "
+                                "files opened in read-only mode")
+        snap = snapshot.create(self)
+        if snap is None:
+            raise ValueError("metadata snapshots can not be used with "
+                             "the driver of file ``%s``" % self.filename)
+        snap.save(snapshot.sidecar_path(self.filename))
+
+
+    def _iter_children_info(self, path):
+        """Iterate over the metadata of the children of the group in `path`.
+
+        ``(class, info)`` pairs are yielded for the visible children in
+        alphanumerical order, where `class` is the node class the child
+        would be loaded as and `info` its `NodeInfo` record.
+
+        """
+
+        if self.root_uep != "/":
+            h5path = join_path(self.root_uep, path)
+        else:
+            h5path = path
+
+        if self._snapshot is not None:
+            infos = self._snapshot.get_children(h5path)
+            if infos is not None:
+                classes = [class_name_dict.get(info.classname)
+                           for info in infos]
+                if None not in classes:
+                    for (childclass, info) in zip(classes, infos):
+                        childpath = join_path(path, split_path(info.path)[1])
+                        yield childclass, info._replace(path=childpath)
+                    return
+
+        (group_names, leaf_names, link_names, unknown_names) = \
+            self._g_list_group_path(h5path)
+        children = [(name, kind)
+                    for (kind, names) in (('Group', group_names),
+                                          ('Leaf', leaf_names),
+                                          ('Link', link_names),
+                                          ('Unknown', unknown_names))
+                    for name in names if isvisiblename(name)]
+        children.sort()
+
+        use_sys_attrs = self.params['PYTABLES_SYS_ATTRS']
+        for (name, kind) in children:
+            childpath = join_path(path, name)
+            h5childpath = join_path(h5path, name)
+            shape = dtype = chunkshape = filters = size = None
+            if kind == 'Group':
+                classid = self._g_get_group_class_id(h5childpath)
+                if classid is not None and not isinstance(classid, str):
+                    classid = classid.decode('utf-8')
+                childclass = class_id_dict.get(classid, Group)
+            elif kind == 'Leaf':
+                (classid, shape, dtype, chunkshape, filters_dict, size) = \
+                    self._g_get_leaf_info(h5childpath)
+                filters = Filters._from_filters_dict(filters_dict)
+                if not use_sys_attrs:
+                    classid = None
+                elif classid is not None and not isinstance(classid, str):
+                    classid = classid.decode('utf-8')
+                if classid not in class_id_dict:
+                    # Unknown or no ``CLASS`` attribute, try a guess.
+                    classid = utilsextension.which_class(
+                        self._get_file_id(), h5childpath)
+                childclass = class_id_dict.get(classid, UnImplemented)
+            elif kind == 'Link':
+                childclass = get_class_by_name(
+                    self._g_get_link_class(h5childpath))
+            else:
+                childclass = Unknown
+            yield childclass, NodeInfo(childpath, childclass.__name__,
+                                       shape, dtype, chunkshape, filters,
+                                       size)
+
+
     def _check_open(self):
         """Check the state of the file.
 
@@ -2188,6 +2626,8 @@ class File(hdf5extension.File, object):
 
         maxundo = self.params['MAX_UNDO_PATH_LENGTH']
 
+        from .table import Table
+
         class ActionLog(NotLoggedMixin, Table):
             pass
 
@@ -2651,6 +3091,64 @@ class File(hdf5extension.File, object):
         self._node_manager.flush_nodes()
         self._flush_file(0)  # 0 means local scope, 1 global (virtual) scope
 
+    def start_swmr_write(self):
+        """Start writing the file in SWMR mode.
+
+        The file must have been opened in a writable mode with the
+        :data:`tables.parameters.SWMR` parameter.  This is done on
+        opening existing files, while new files should be switched to
+        SWMR mode once their nodes have been created.  From then on,
+        readers can open the file in SWMR mode and see the data appended
+        to its leaves after they have been flushed (see
+        :meth:`Leaf.refresh`), but new nodes and attributes can not be
+        created in the file.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._check_open()
+        self._check_writable()
+        if not self.params['SWMR']:
+            raise ValueError("the file is not opened in SWMR mode; "
+                             "please pass ``swmr=True`` to ``open_file()``")
+        if self._swmr_write:
+            return
+        if self.is_undo_enabled():
+            raise UndoRedoError("the Undo/Redo mechanism can not be used "
+                                "with files written in SWMR mode")
+
+        self.flush()
+        self._start_swmr_write()
+        self._swmr_write = True
+
+    def cache_stats(self):
+        """Return the statistics of the caches used by this file.
+
+        The result is a dictionary with the statistics of the node cache
+        under ``nodes`` (its ``policy``, size, ``hits``, ``misses``,
+        ``evictions`` and total ``reload_time`` of nodes) and, under
+        ``tables``, a dictionary with the result of
+        :meth:`Table.cache_stats` for every open table keyed by its
+        pathname.  The statistics of the process-wide cache of chunks
+        (see :data:`tables.parameters.SHARED_CHUNK_CACHE_SIZE`) are under
+        ``chunks``.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._check_open()
+        tables = {}
+        # Tables may only be open if their module has been imported
+        table_module = sys.modules.get('tables.table')
+        for path, node in list(self._node_manager.registry.items()):
+            if (table_module is not None and
+                    isinstance(node, table_module.Table) and node._v_isopen):
+                tables[path] = node.cache_stats()
+        return {'nodes': self._node_manager.cache_stats(), 'tables': tables,
+                'chunks': chunkcache.shared_cache.stats()}
+
     def close(self):
         """Flush all the alive leaves in object tree and close the file."""
 
@@ -2688,6 +3186,9 @@ class File(hdf5extension.File, object):
 
         # Close the file
         self._close_file()
+        if (self._lock is not None and
+                not hdf5extension.HAVE_THREADSAFE_LIBRARY):
+            _register_concurrent_file(-1)
 
         # After the objects are disconnected, destroy the
         # object dictionary using the brute force ;-)
@@ -165,6 +165,17 @@ class Filters(object):
         parent = leaf._v_parent
         filters_dict = utilsextension.get_filters(parent._v_objectid,
                                                   leaf._v_name)
+        return class_._from_filters_dict(filters_dict)
+
+    @classmethod
+    def _from_filters_dict(class_, filters_dict):
+        """Create a new `Filters` object from the filters of a dataset.
+
+        `filters_dict` maps the names of the HDF5 filters of the dataset
+        to their parameters, as returned by `utilsextension.get_filters()`.
+
+        """
+
         if filters_dict is None:
             filters_dict = {}  # not chunked
 
@@ -14,13 +14,14 @@
 from __future__ import absolute_import
 
 import os
+import uuid
 import weakref
 import warnings
 
 from .misc.proxydict import ProxyDict
 from . import hdf5extension
 from . import utilsextension
-from .registry import class_id_dict
+from .registry import class_id_dict, class_name_dict
 from .exceptions import NodeError, NoSuchNodeError, NaturalNameWarning, PerformanceWarning
 from .filters import Filters
 from .registry import get_class_by_name
@@ -35,6 +36,20 @@ import six
 
 obversion = "1.0"
 
+# The kinds of children in the lists of names of ``Group._g_list_group``
+# and the attributes of groups with the children of every kind.
+_children_kinds = ('Group', 'Leaf', 'Link', 'Unknown')
+_children_attrs_by_kind = {
+    'Group': '_v_groups', 'Leaf': '_v_leaves',
+    'Link': '_v_links', 'Unknown': '_v_unknown'}
+
+# The keyword arguments of ``Group._f_to_image`` which customize the copy
+# of nodes instead of the in-memory file.
+_copy_kwargs = (
+    'overwrite', 'createparents', 'copyuserattrs', 'stats', 'use_hardlinks',
+    'address_map', 'start', 'stop', 'step', 'chunkshape', 'sortby',
+    'propindexes', 'checkCSI')
+
 
 class _ChildrenDict(ProxyDict):
     def _get_value_from_container(self, container, key):
@@ -165,6 +180,10 @@ class Group(hdf5extension.Group, Node):
         '__members__', '_v_children', '_v_groups', '_v_leaves',
         '_v_links', '_v_unknown', '_v_hidden')
 
+    # Number of links listed at a time when iterating over children
+    # which have not been loaded (see ``Group._g_iter_child_names``).
+    _c_children_page_size = 1024
+
     # `_v_nchildren` is a direct read-only shorthand
     # for the number of *visible* children in a group.
     def _g_getnchildren(self):
@@ -376,7 +395,7 @@ class Group(hdf5extension.Group, Node):
                 # (Assigned values are entirely irrelevant.)
                 if isvisiblename(childname):
                     # Visible node.
-                    members.insert(0, childname)
+                    members.append(childname)
                     children[childname] = None
                     childdict[childname] = None
                 else:
@@ -384,11 +403,90 @@ class Group(hdf5extension.Group, Node):
                     hidden[childname] = None
 
 
+    def _g_iter_child_names(self, kinds=None):
+        """Iterate over the names of visible children, sorted.
+
+        Only the names of children of the given `kinds` (a sequence with
+        some of ``'Group'``, ``'Leaf'``, ``'Link'`` and ``'Unknown'``)
+        are yielded, or all of them if `kinds` is None.  When the
+        children of the group have not been loaded yet, their names are
+        read from HDF5 by pages instead of loading them, so that very
+        wide groups can be iterated over in constant memory.
+
+        Children may be created or removed while iterating.  Either way,
+        children which are removed before being reached are skipped, and
+        the other children are yielded once each and in order.
+
+        """
+
+        mydict = self.__dict__
+        if '_v_children' not in mydict:
+            names = self._g_iter_child_names_paged(kinds)
+        else:
+            if kinds is None:
+                names = list(mydict['_v_children'])
+            else:
+                names = []
+                for kind in kinds:
+                    names.extend(mydict[_children_attrs_by_kind[kind]])
+            names.sort()
+        return self._g_skip_removed_names(names)
+
+    def _g_skip_removed_names(self, names):
+        """Iterate over the `names` of children which still exist.
+
+        Names are only checked once children have been created or removed
+        somewhere in the file since the iteration started.
+
+        """
+
+        ptfile = self._v_file
+        nchanges = ptfile._nchildren_changes
+        for name in names:
+            if ptfile._nchildren_changes != nchanges and name not in self:
+                continue
+            yield name
+
+    def _g_iter_child_names_paged(self, kinds):
+        """Iterate over the names of visible children by pages.
+
+        See `Group._g_iter_child_names()`.
+
+        """
+
+        # The position of every kind in the lists of names of a page
+        selected = [ikind for (ikind, kind) in enumerate(_children_kinds)
+                    if kinds is None or kind in kinds]
+        parent = self._v_parent
+        pagesize = self._c_children_page_size
+        last = None
+        while True:
+            # Every page starts after the last name of the previous one,
+            # so children which are created or removed while iterating
+            # make no other children be skipped or yielded twice.
+            page = self._g_list_group_page(parent, last, pagesize)
+            last = page[4]
+            if last is None:
+                break  # no children left
+            # Links are listed in name order, so sorting every page
+            # keeps all the names sorted.
+            names = [name for ikind in selected for name in page[ikind]
+                     if isvisiblename(name)]
+            names.sort()
+            for name in names:
+                yield name
+
     def _g_check_has_child(self, name):
         """Check whether 'name' is a children of 'self' and return its type."""
 
-        # Get the HDF5 name matching the PyTables name.
-        node_type = self._g_get_objinfo(name)
+        # Ask the metadata snapshot of the file first, if any.
+        node_type = None
+        snapshot = self._v_file._snapshot
+        if snapshot is not None:
+            node_type = snapshot.get_node_type(self._g_get_h5path(name))
+        if node_type is None:
+            # Get the HDF5 name matching the PyTables name.
+            node_type = self._g_get_objinfo(name)
         if node_type == "NoSuchNode":
             raise NoSuchNodeError(
                 "group ``%s`` does not have a child named ``%s``"
@@ -396,6 +494,21 @@ class Group(hdf5extension.Group, Node):
         return node_type
 
 
+    def _g_get_h5path(self, name):
+        """Return the HDF5 path of the child `name` of this group.
+
+        As in HDF5, names starting with a slash are absolute paths.
+
+        """
+
+        if name.startswith('/'):
+            return name
+        root_uep = self._v_file.root_uep
+        pathname = self._v_pathname
+        if root_uep != '/':
+            pathname = join_path(root_uep, pathname)
+        return join_path(pathname, name)
+
     def __iter__(self):
         """Iterate over the child nodes hanging directly from the group.
 
@@ -523,17 +636,29 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                 "to access the child node"
                 % (self._v_pathname, childname), NaturalNameWarning)
 
-        # Check group width limits.
-        if (len(self._v_children) + len(self._v_hidden) >=
-                self._v_max_group_width):
+        # Check group width limits.  The children are not loaded just
+        # for this, HDF5 knows the number of links in the group.
+        if '_v_children' in self.__dict__:
+            nchildren = len(self._v_children) + len(self._v_hidden)
+        else:
+            nchildren = self._g_get_nlinks()
+        if nchildren >= self._v_max_group_width:
             self._g_width_warning()
 
-        # Update members information.
+        # Let iterations over children know about the new child.
+        self._v_file._nchildren_changes += 1
+
+        # Update members information, if needed.
+        # If the children have not been loaded yet, they will include
+        # the new child when they are.
+        if '_v_children' not in self.__dict__:
+            return
+
         # Insert references to the new child.
         # (Assigned values are entirely irrelevant.)
         if isvisiblename(childname):
             # Visible node.
-            self.__members__.insert(0, childname)  # enable completion
+            self.__members__.append(childname)  # enable completion
             self._v_children[childname] = None  # insert node
             if isinstance(childnode, Unknown):
                 self._v_unknown[childname] = None
@@ -560,6 +685,9 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
             ("group ``%s`` does not have a child node named ``%s``"
                 % (self._v_pathname, childname))
 
+        # Let iterations over children know about the removal.
+        self._v_file._nchildren_changes += 1
+
         # Update members information, if needed
         if '_v_children' in self.__dict__:
             if childname in self._v_children:
@@ -725,37 +853,19 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
 
         self._g_check_open()
 
-        if not classname:
-            # Returns all the children alphanumerically sorted
-            names = sorted(six.iterkeys(self._v_children))
-            for name in names:
-                yield self._v_children[name]
-        elif classname == 'Group':
-            # Returns all the groups alphanumerically sorted
-            names = sorted(six.iterkeys(self._v_groups))
-            for name in names:
-                yield self._v_groups[name]
-        elif classname == 'Leaf':
-            # Returns all the leaves alphanumerically sorted
-            names = sorted(six.iterkeys(self._v_leaves))
-            for name in names:
-                yield self._v_leaves[name]
-        elif classname == 'Link':
-            # Returns all the links alphanumerically sorted
-            names = sorted(six.iterkeys(self._v_links))
-            for name in names:
-                yield self._v_links[name]
+        if classname in ('Group', 'Leaf', 'Link'):
+            # Returns the children of that kind alphanumerically sorted
+            for name in self._g_iter_child_names((classname,)):
+                yield self._f_get_child(name)
         elif classname == 'IndexArray':
             raise TypeError(
                 "listing ``IndexArray`` nodes is not allowed")
         else:
-            class_ = get_class_by_name(classname)
-
-            children = self._v_children
-            childnames = sorted(six.iterkeys(children))
+            # Returns all the children alphanumerically sorted
+            class_ = get_class_by_name(classname) if classname else Node
 
-            for childname in childnames:
-                childnode = children[childname]
+            for childname in self._g_iter_child_names():
+                childnode = self._f_get_child(childname)
                 if isinstance(childnode, class_):
                     yield childnode
 
@@ -776,12 +886,11 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         # Iterate over the descendants
         while stack:
             objgroup = stack.pop()
-            groupnames = sorted(six.iterkeys(objgroup._v_groups))
-            # Sort the groups before delivering. This uses the groups names
-            # for groups in tree (in order to sort() can classify them).
-            for groupname in groupnames:
-                stack.append(objgroup._v_groups[groupname])
-                yield objgroup._v_groups[groupname]
+            # Groups are delivered sorted by name.
+            for groupname in objgroup._g_iter_child_names(('Group',)):
+                group = objgroup._f_get_child(groupname)
+                stack.append(group)
+                yield group
 
 
     def __delattr__(self, name):
@@ -1055,6 +1164,67 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
             for child in six.itervalues(self._v_children):
                 child._f_copy(dstparent, None, overwrite, recursive, **kwargs)
 
+    def _f_to_image(self, out=None, **kwargs):
+        """Return the image of an in-memory HDF5 file with this subtree.
+
+        A new file is built in memory (with the ``H5FD_CORE`` driver and
+        no backing store) whose root group gets a copy of the user
+        attributes and, recursively, of the children of this group.  The
+        image of the file is returned as a string of bytes, or it is
+        written into the writable `out` buffer and its size returned
+        (see :meth:`File.get_file_image`).  Images can be opened with
+        the :data:`tables.parameters.DRIVER_CORE_IMAGE` parameter, and
+        they are used in place in read-only mode, so they are handy for
+        passing small HDF5 results between processes.
+
+        Additional keyword arguments customize the copy as in
+        :meth:`File.copy_file` (e.g. title, filters or copyuserattrs;
+        a `stats` dictionary gets the counts of copied groups, leaves,
+        bytes and hard links), and the rest are parameters of the new
+        file (see :func:`open_file`), except for the ``driver*``
+        parameters.
+
+        .. note:: this method requires HDF5 >= 1.8.9.
+
+        .. versionadded:: 3.3
+
+        """
+
+        from .file import open_file
+
+        self._g_check_open()
+
+        # Compute default arguments (as in `File.copy_file()`).
+        filters = kwargs.pop('filters', None)
+        if filters is None:
+            filters = getattr(self._v_attrs, 'FILTERS', None)
+        title = kwargs.pop('title', self._v_title)
+        copykwargs = dict((name, kwargs.pop(name)) for name in _copy_kwargs
+                          if name in kwargs)
+        copyuserattrs = copykwargs.get('copyuserattrs', True)
+        stats = copykwargs.get('stats')
+        if stats is not None:
+            for key in ('groups', 'leaves', 'bytes', 'hardlinks'):
+                stats.setdefault(key, 0)
+        for name in kwargs:
+            if name.upper().startswith('DRIVER'):
+                raise ValueError("the driver of image files can not be "
+                                 "changed: ``%s``" % name)
+
+        # The file is never written to disk, but it needs a unique name
+        imagefile = open_file(
+            'image-%s.h5' % uuid.uuid4().hex, mode='w', title=title,
+            filters=filters, driver='H5FD_CORE',
+            driver_core_backing_store=0, **kwargs)
+        try:
+            if copyuserattrs:
+                self._v_attrs._f_copy(imagefile.root)
+            self._f_copy_children(imagefile.root, recursive=True,
+                                  **copykwargs)
+            return imagefile.get_file_image(out)
+        finally:
+            imagefile.close()
+
 
     def __str__(self):
         """Return a short string representation of the group.
@@ -1163,17 +1333,31 @@ class RootGroup(Group):
         if node_type == 'Unknown':
             return Unknown(self, childname)
 
+        # The metadata snapshot of the file may already tell the class.
+        SnapshotClass = None
+        snapshot = self._v_file._snapshot
+        if snapshot is not None and node_type in ("Group", "Leaf"):
+            info = snapshot.get_info(childname)
+            if info is not None:
+                SnapshotClass = class_name_dict.get(info.classname)
+
         # Guess the PyTables class suited to the node,
         # build a PyTables node and return it.
         if node_type == "Group":
-            if self._v_file.params['PYTABLES_SYS_ATTRS']:
+            if SnapshotClass is not None:
+                ChildClass = SnapshotClass
+            elif self._v_file.params['PYTABLES_SYS_ATTRS']:
                 ChildClass = self._g_get_child_group_class(childname)
             else:
                 # Default is a Group class
                 ChildClass = Group
             return ChildClass(self, childname, new=False)
         elif node_type == "Leaf":
-            ChildClass = self._g_get_child_leaf_class(childname, warn=True)
+            if SnapshotClass is not None:
+                ChildClass = SnapshotClass
+            else:
+                ChildClass = self._g_get_child_leaf_class(childname,
+                                                          warn=True)
             # Building a leaf may still fail because of unsupported types
             # and other causes.
             # return ChildClass(self, childname)  # uncomment for debugging
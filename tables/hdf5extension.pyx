@@ -37,6 +37,7 @@ ObjInfo = namedtuple('ObjInfo', ['addr', 'rc'])
 
 
 from cpython cimport PY_MAJOR_VERSION
+from cpython.pystate cimport PyThreadState
 if PY_MAJOR_VERSION < 3:
     import cPickle as pickle
 else:
@@ -61,10 +62,12 @@ from tables.utilsextension import (encode_filename, set_blosc_max_threads,
 
 # Types, constants, functions, classes & other objects from everywhere
 from libc.stdlib cimport malloc, free
-from libc.string cimport strdup, strlen
-from numpy cimport import_array, ndarray, npy_intp
+from libc.string cimport strdup, strlen, memcpy
+from numpy cimport import_array, ndarray, npy_intp, npy_int64
 from cpython.bytes cimport (PyBytes_AsString, PyBytes_FromStringAndSize,
     PyBytes_Check)
+from cpython.buffer cimport (PyObject_CheckBuffer, PyObject_GetBuffer,
+    PyBuffer_Release, PyBUF_SIMPLE, PyBUF_WRITABLE)
 from cpython.unicode cimport PyUnicode_DecodeUTF8
 
 
@@ -75,36 +78,47 @@ from definitions cimport (const_char, uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
   H5T_class_t, H5T_sign_t, H5T_NATIVE_INT,
   H5T_cset_t, H5T_CSET_ASCII, H5T_CSET_UTF8,
   H5F_SCOPE_GLOBAL, H5F_ACC_TRUNC, H5F_ACC_RDONLY, H5F_ACC_RDWR,
+  H5F_LIBVER_LATEST,
   H5P_DEFAULT, H5P_FILE_ACCESS, H5P_FILE_CREATE,
   H5S_SELECT_SET, H5S_SELECT_AND, H5S_SELECT_NOTB,
   H5Fcreate, H5Fopen, H5Fclose, H5Fflush, H5Fget_vfd_handle, H5Fget_filesize,
   H5Fget_create_plist,
-  H5Gcreate, H5Gopen, H5Gclose, H5Ldelete, H5Lmove,
+  H5Gcreate, H5Gopen, H5Gclose, H5Gget_info, H5G_info_t, H5Ldelete, H5Lmove,
   H5Dopen, H5Dclose, H5Dread, H5Dwrite, H5Dget_type,
   H5Dget_space, H5Dvlen_reclaim, H5Dget_storage_size, H5Dvlen_get_buf_size,
-  H5Tclose, H5Tis_variable_str, H5Tget_sign,
-  H5Adelete, H5T_BITFIELD, H5T_INTEGER, H5T_FLOAT, H5T_STRING, H5Tget_order,
+  H5Tclose, H5Tis_variable_str, H5Tget_sign, H5Tget_class, H5Tget_cset,
+  H5Adelete, H5Aopen_by_name, H5Aget_type, H5Aget_space, H5Aread, H5Aclose,
+  H5T_BITFIELD, H5T_INTEGER, H5T_FLOAT, H5T_STRING, H5Tget_order,
   H5Pcreate, H5Pset_cache, H5Pclose, H5Pget_userblock, H5Pset_userblock,
   H5Pset_fapl_sec2, H5Pset_fapl_log, H5Pset_fapl_stdio, H5Pset_fapl_core,
-  H5Pset_fapl_split,
+  H5Pset_fapl_split, H5Pset_libver_bounds,
   H5Sselect_all, H5Sselect_elements, H5Sselect_hyperslab,
   H5Screate_simple, H5Sclose,
+  H5Sget_simple_extent_ndims, H5Sget_simple_extent_dims,
+  H5Sget_simple_extent_npoints,
   H5Oget_info, H5O_info_t,
   H5ATTRset_attribute, H5ATTRset_attribute_string,
   H5ATTRget_attribute, H5ATTRget_attribute_string,
   H5ATTRget_attribute_vlen_string_array,
   H5ATTRfind_attribute, H5ATTRget_type_ndims, H5ATTRget_dims,
   H5ARRAYget_ndims, H5ARRAYget_info,
-  set_cache_size, get_objinfo, get_linkinfo, Giterate, Aiterate, H5UIget_info,
+  set_cache_size, get_objinfo, get_linkinfo, Giterate, Giterate_page, Aiterate,
+  get_dataset_filter_names,
+  H5UIget_info,
   get_len_of_range, conv_float64_timeval32, truncate_dset,
   H5_HAVE_DIRECT_DRIVER, pt_H5Pset_fapl_direct,
   H5_HAVE_WINDOWS_DRIVER, pt_H5Pset_fapl_windows,
   H5_HAVE_IMAGE_FILE, pt_H5Pset_file_image, pt_H5Fget_file_image,
+  pt_H5Pset_file_image_nocopy,
+  H5_HAVE_THREADSAFE_LIBRARY,
+  H5_HAVE_SWMR_SUPPORT, PT_H5F_ACC_SWMR_READ, pt_H5Fstart_swmr_write,
+  pt_H5Drefresh,
   H5Tget_size, hobj_ref_t)
 
 cdef int H5T_CSET_DEFAULT = 16
 
 from utilsextension cimport malloc_dims, get_native_type, cstr_to_pystr, load_reference
+from utilsextension cimport release_gil_for_hdf5, reacquire_gil
 
 
 #-------------------------------------------------------------------
@@ -158,6 +172,10 @@ cdef extern from "H5VLARRAY.h" nogil:
                                   int nobjects, hsize_t nrecords,
                                   void *data )
 
+  herr_t H5VLARRAYappend_ragged( hid_t dataset_id, hid_t type_id,
+                                 hsize_t nrows, hsize_t nrecords,
+                                 hvl_t *data )
+
   herr_t H5VLARRAYmodify_records( hid_t dataset_id, hid_t type_id,
                                   hsize_t nrow, int nobjects,
                                   void *data )
@@ -253,6 +271,26 @@ cdef object get_attribute_string_or_none(hid_t node_id, char* attr_name):
   return retvalue
 
 
+# Get the NumPy dtype of the elements of a dataset, or None
+cdef object get_dtype_or_none(hid_t type_id):
+  """Return the NumPy dtype for the native `type_id` of a dataset.
+
+  Variable length types give the dtype of their base type.  ``None`` is
+  returned for types without a NumPy equivalent.
+
+  """
+
+  try:
+    return atom_from_hdf5_type(type_id).dtype
+  except (TypeError, ValueError, KeyError):
+    pass
+  # Compound types other than complex ones are not atoms
+  try:
+    return numpy.dtype(hdf5_to_np_ext_type(type_id)[0])
+  except (TypeError, ValueError, KeyError):
+    return None
+
+
 # Get the numpy dtype scalar attribute from an HDF5 type as fast as possible
 cdef object get_dtype_scalar(hid_t type_id, H5T_class_t class_id,
                              size_t itemsize):
@@ -300,6 +338,8 @@ _supported_drivers = (
 
 HAVE_DIRECT_DRIVER = bool(H5_HAVE_DIRECT_DRIVER)
 HAVE_WINDOWS_DRIVER = bool(H5_HAVE_WINDOWS_DRIVER)
+HAVE_THREADSAFE_LIBRARY = bool(H5_HAVE_THREADSAFE_LIBRARY)
+HAVE_SWMR_SUPPORT = bool(H5_HAVE_SWMR_SUPPORT)
 
 # Type extensions declarations (these are subclassed by PyTables
 # Python classes)
@@ -308,6 +348,8 @@ cdef class File:
   cdef hid_t   file_id
   cdef hid_t   access_plist
   cdef object  name
+  cdef Py_buffer image_view  # the image used in place (read-only files)
+  cdef bint    has_image_view
 
   def _g_new(self, name, pymode, **params):
     cdef herr_t err = 0
@@ -348,16 +390,21 @@ cdef class File:
            "please report this to the authors" % pymode)
 
     image = params.get('DRIVER_CORE_IMAGE')
-    if image:
+    if image is not None:
       if driver != "H5FD_CORE":
         warnings.warn("The DRIVER_CORE_IMAGE parameter will be ignored by "
                       "the '%s' driver" % driver)
-      elif not PyBytes_Check(image):
-        raise TypeError("The DRIVER_CORE_IMAGE must be a string of bytes")
+      elif not PyObject_CheckBuffer(image):
+        raise TypeError("The DRIVER_CORE_IMAGE must be a string of bytes "
+                        "or an object supporting the buffer protocol")
       elif not H5_HAVE_IMAGE_FILE:
         raise RuntimeError("Support for image files is only availabe in "
                            "HDF5 >= 1.8.9")
 
+    swmr = params.get("SWMR", False)
+    if swmr and not H5_HAVE_SWMR_SUPPORT:
+      raise RuntimeError("The SWMR mode is only available in HDF5 >= 1.10")
+
     # After the following check we can be quite sure
     # that the file or directory exists and permissions are right.
     if driver == "H5FD_SPLIT":
@@ -369,7 +416,7 @@ cdef class File:
         check_file_access(name, pymode)
 
     # Should a new file be created?
-    if image:
+    if image is not None:
       exists = True
     elif driver == "H5FD_SPLIT":
       exists = os.path.exists(meta_name) and os.path.exists(raw_name)
@@ -438,11 +485,21 @@ cdef class File:
       err = H5Pset_fapl_core(access_plist,
                              params["DRIVER_CORE_INCREMENT"],
                              backing_store)
-      if image:
-        img_buf_len = len(image)
-        img_buf_p = <void *>PyBytes_AsString(image)
-        err = pt_H5Pset_file_image(access_plist, img_buf_p, img_buf_len)
+      if image is not None:
+        PyObject_GetBuffer(image, &self.image_view, PyBUF_SIMPLE)
+        self.has_image_view = True
+        img_buf_len = self.image_view.len
+        img_buf_p = self.image_view.buf
+        if pymode == 'r':
+          # The image is used in place, and kept until the file is closed
+          err = pt_H5Pset_file_image_nocopy(access_plist, img_buf_p,
+                                            img_buf_len)
+        else:
+          # HDF5 writes to (and resizes) its own copy of the image
+          err = pt_H5Pset_file_image(access_plist, img_buf_p, img_buf_len)
+          self._release_image()
         if err < 0:
+          self._release_image()
           H5Pclose(create_plist)
           H5Pclose(access_plist)
           raise HDF5ExtError("Unable to set the file image")
@@ -457,13 +514,20 @@ cdef class File:
     elif driver == "H5FD_SPLIT":
       err = H5Pset_fapl_split(access_plist, enc_meta_ext, meta_plist_id,
                               enc_raw_ext, raw_plist_id)
+    if swmr and err >= 0:
+      # SWMR needs the latest format (with checksummed metadata)
+      err = H5Pset_libver_bounds(access_plist, H5F_LIBVER_LATEST,
+                                 H5F_LIBVER_LATEST)
     if err < 0:
       e = HDF5ExtError("Unable to set the file access property list")
       H5Pclose(create_plist)
       H5Pclose(access_plist)
       raise e
 
-    if pymode == 'r':
+    if pymode == 'r' and swmr:
+      self.file_id = H5Fopen(encname, H5F_ACC_RDONLY | PT_H5F_ACC_SWMR_READ,
+                             access_plist)
+    elif pymode == 'r':
       self.file_id = H5Fopen(encname, H5F_ACC_RDONLY, access_plist)
     elif pymode == 'r+':
       self.file_id = H5Fopen(encname, H5F_ACC_RDWR, access_plist)
@@ -482,6 +546,7 @@ cdef class File:
 
     if self.file_id < 0:
         e = HDF5ExtError("Unable to open/create file '%s'" % name)
+        self._release_image()
         H5Pclose(create_plist)
         H5Pclose(access_plist)
         raise e
@@ -495,29 +560,47 @@ cdef class File:
     # Set the maximum number of threads for Blosc
     set_blosc_max_threads(params["MAX_BLOSC_THREADS"])
 
-  # XXX: add the possibility to pass a pre-allocated buffer
-  def get_file_image(self):
+  def get_file_image(self, out=None):
     """Retrieves an in-memory image of an existing, open HDF5 file.
 
+    By default, the image is returned in a new string of bytes.  If
+    `out` is given, the image is written into that writable buffer
+    instead (e.g. a ``bytearray``, a NumPy array or a shared memory
+    segment), which must be at least as large as the image (see
+    :meth:`File.get_file_image_size`), and the size of the image is
+    returned.
+
     .. note:: this method requires HDF5 >= 1.8.9.
 
     .. versionadded:: 3.0
 
+    .. versionchanged:: 3.3
+       Added the *out* argument.
+
     """
 
     cdef ssize_t size = 0
     cdef size_t buf_len = 0
     cdef bytes image
     cdef char* cimage
+    cdef Py_buffer view
 
-    self.flush()
+    size = self.get_file_image_size()
 
-    # retrieve the size of the buffer for the file image
-    size = pt_H5Fget_file_image(self.file_id, NULL, buf_len)
-    if size < 0:
-      raise HDF5ExtError("Unable to retrieve the size of the buffer for the "
-                         "file image.  Plese note that not all drivers "
-                         "provide support for image files.")
+    if out is not None:
+      PyObject_GetBuffer(out, &view, PyBUF_SIMPLE | PyBUF_WRITABLE)
+      try:
+        if view.len < size:
+          raise ValueError("The buffer is too small for the file image "
+                           "(%d bytes are needed)" % size)
+        size = pt_H5Fget_file_image(self.file_id, view.buf, view.len)
+      finally:
+        PyBuffer_Release(&view)
+      if size < 0:
+        raise HDF5ExtError("Unable to retrieve the file image. "
+                           "Plese note that not all drivers provide "
+                           "support for image files.")
+      return size
 
     # allocate the memory buffer
     image = PyBytes_FromStringAndSize(NULL, size)
@@ -534,6 +617,31 @@ cdef class File:
 
     return image
 
+  def get_file_image_size(self):
+    """Returns the size of the in-memory image of the HDF5 file.
+
+    This is the size of the buffer needed by
+    :meth:`File.get_file_image`.  The file is flushed first.
+
+    .. note:: this method requires HDF5 >= 1.8.9.
+
+    .. versionadded:: 3.3
+
+    """
+
+    cdef ssize_t size = 0
+
+    self.flush()
+
+    # retrieve the size of the buffer for the file image
+    size = pt_H5Fget_file_image(self.file_id, NULL, 0)
+    if size < 0:
+      raise HDF5ExtError("Unable to retrieve the size of the buffer for the "
+                         "file image.  Plese note that not all drivers "
+                         "provide support for image files.")
+
+    return size
+
   def get_filesize(self):
     """Returns the size of an HDF5 file.
 
@@ -583,6 +691,114 @@ cdef class File:
   def _get_file_id(self):
     return self.file_id
 
+  # Low-level metadata of nodes, without loading them
+  def _g_list_group_path(self, path):
+    """Return a tuple with the groups and the leaves hanging from `path`.
+
+    `path` is the HDF5 path of a group.  The lists of names of groups,
+    leaves, links and unknown nodes are returned.
+
+    """
+
+    cdef bytes encoded_path
+
+    encoded_path = path.encode('utf-8')
+
+    return Giterate(self.file_id, self.file_id, encoded_path)
+
+  def _g_get_link_class(self, path):
+    """Return the name of the class of the link in the HDF5 `path`."""
+
+    cdef int ret
+    cdef bytes encoded_path
+
+    encoded_path = path.encode('utf-8')
+    ret = get_linkinfo(self.file_id, encoded_path)
+    if ret == H5L_TYPE_SOFT:
+      return "SoftLink"
+    elif ret == H5L_TYPE_EXTERNAL:
+      return "ExternalLink"
+    return "Unknown"
+
+  def _g_get_group_class_id(self, path):
+    """Return the ``CLASS`` attribute of the group in the HDF5 `path`.
+
+    ``None`` is returned if the group has no such attribute.
+
+    """
+
+    cdef hid_t group_id
+    cdef object retvalue
+    cdef bytes encoded_path
+
+    encoded_path = path.encode('utf-8')
+    group_id = H5Gopen(self.file_id, encoded_path, H5P_DEFAULT)
+    if group_id < 0:
+      raise HDF5ExtError("Non-existing group ``%s``" % path)
+    retvalue = get_attribute_string_or_none(group_id, "CLASS")
+    H5Gclose(group_id)
+    return retvalue
+
+  def _g_get_leaf_info(self, path):
+    """Return the metadata of the dataset in the HDF5 `path`.
+
+    A tuple with the ``CLASS`` attribute of the dataset (``None`` if it
+    has no such attribute), its shape, the NumPy dtype of its elements
+    (``None`` if it has no NumPy equivalent), its chunkshape (``None``
+    if it is not chunked), a dictionary with its filters and its storage
+    size in bytes is returned.
+
+    """
+
+    cdef hid_t dataset_id, space_id, disk_type_id, type_id
+    cdef int rank
+    cdef hsize_t *dims
+    cdef object classid, shape, dtype, chunkshape, filters, size
+    cdef bytes encoded_path
+
+    encoded_path = path.encode('utf-8')
+    dataset_id = H5Dopen(self.file_id, encoded_path, H5P_DEFAULT)
+    if dataset_id < 0:
+      raise HDF5ExtError("Non-existing dataset ``%s``" % path)
+
+    try:
+      classid = get_attribute_string_or_none(dataset_id, "CLASS")
+
+      # Get the shape and the chunkshape
+      space_id = H5Dget_space(dataset_id)
+      rank = H5Sget_simple_extent_ndims(space_id)
+      if rank < 0:
+        H5Sclose(space_id)
+        raise HDF5ExtError("Problems getting ndims of ``%s``" % path)
+      dims = <hsize_t *>malloc((rank + 1) * sizeof(hsize_t))
+      try:
+        H5Sget_simple_extent_dims(space_id, dims, NULL)
+        H5Sclose(space_id)
+        shape = getshape(rank, dims)
+        if H5ARRAYget_chunkshape(dataset_id, rank, dims) < 0:
+          chunkshape = None  # not chunked
+        else:
+          chunkshape = getshape(rank, dims)
+      finally:
+        free(<void *>dims)
+
+      # Get the dtype
+      disk_type_id = H5Dget_type(dataset_id)
+      type_id = get_native_type(disk_type_id)
+      try:
+        dtype = get_dtype_or_none(type_id)
+      finally:
+        H5Tclose(type_id)
+        H5Tclose(disk_type_id)
+
+      # The filters are read from the dataset which is already open
+      filters = get_dataset_filter_names(dataset_id)
+      size = H5Dget_storage_size(dataset_id)
+    finally:
+      H5Dclose(dataset_id)
+
+    return classid, shape, dtype, chunkshape, filters, size
+
   def fileno(self):
     """Return the underlying OS integer file descriptor.
 
@@ -608,10 +824,26 @@ cdef class File:
     H5Fflush(self.file_id, scope)
 
 
+  def _start_swmr_write(self):
+    # Flush the file and switch it to SWMR writing
+    if pt_H5Fstart_swmr_write(self.file_id) < 0:
+      raise HDF5ExtError("Unable to start writing the file in SWMR mode.  "
+                         "Please note that no attributes must be open and "
+                         "that the file must be opened with SWMR enabled.")
+
+
   def _close_file(self):
     # Close the file
     H5Fclose( self.file_id )
     self.file_id = 0    # Means file closed
+    self._release_image()
+
+
+  cdef _release_image(self):
+    # Release the image used in place by the file (if any)
+    if self.has_image_view:
+      PyBuffer_Release(&self.image_view)
+      self.has_image_view = False
 
 
   # This method is moved out of scope, until we provide code to delete
@@ -621,6 +853,7 @@ cdef class File:
     if self.file_id > 0:
       # Close the HDF5 file because user didn't do that!
       ret = H5Fclose(self.file_id)
+      self._release_image()
       if ret < 0:
         raise HDF5ExtError("Problems closing the file '%s'" % self.name)
 
@@ -875,6 +1108,114 @@ cdef class AttributeSet:
     return retvalue
 
 
+  def _g_getattrs(self, node, attrnames):
+    """Get several HDF5 attributes in a single pass.
+
+    Every attribute is opened once, and its type and dataspace are got
+    once, instead of reopening it for every step as `_g_getattr()` does.
+    A dictionary with the values of the attributes (as returned by
+    `_g_getattr()`) is returned.  Variable length strings and values of
+    unsupported types are handed over to `_g_getattr()`.
+
+    """
+
+    cdef hsize_t *dims
+    cdef H5T_class_t class_id
+    cdef size_t type_size
+    cdef hid_t dset_id, attr_id, type_id, space_id, native_type_id
+    cdef int rank, ret
+    cdef char *str_value
+    cdef ndarray ndvalue
+    cdef char* cattrname = NULL
+    cdef bytes encoded_attrname
+
+    # The dataset id of the node
+    dset_id = node._v_objectid
+    values = {}
+    for attrname in attrnames:
+      encoded_attrname = attrname.encode('utf-8')
+      cattrname = encoded_attrname
+      attr_id = H5Aopen_by_name(dset_id, ".", cattrname,
+                                H5P_DEFAULT, H5P_DEFAULT)
+      if attr_id < 0:
+        raise HDF5ExtError("Can't open attribute %s in node %s." %
+                           (attrname, self.name))
+      type_id = space_id = native_type_id = -1
+      retvalue = None
+      try:
+        type_id = H5Aget_type(attr_id)
+        space_id = H5Aget_space(attr_id)
+        if type_id < 0 or space_id < 0:
+          raise HDF5ExtError("Can't get type info on attribute %s in "
+                             "node %s." % (attrname, self.name))
+        class_id = H5Tget_class(type_id)
+        type_size = H5Tget_size(type_id)
+        rank = H5Sget_simple_extent_ndims(space_id)
+        if (rank < 0 or H5Sget_simple_extent_npoints(space_id) <= 0 or
+            (class_id == H5T_STRING and H5Tis_variable_str(type_id))):
+          # Empty values and variable length strings
+          pass
+        elif rank == 0 and class_id == H5T_STRING:
+          str_value = <char *>malloc(type_size)
+          try:
+            if H5Aread(attr_id, type_id, str_value) < 0:
+              raise HDF5ExtError("Attribute %s exists in node %s, but "
+                                 "can't get it." % (attrname, self.name))
+            if H5Tget_cset(type_id) == H5T_CSET_UTF8:
+              retvalue = PyUnicode_DecodeUTF8(str_value, type_size, NULL)
+              retvalue = numpy.unicode_(retvalue)
+            else:
+              retvalue = PyBytes_FromStringAndSize(str_value, type_size)
+              # Strip the trailing zeros used for padding
+              retvalue = numpy.bytes_(retvalue.rstrip(b'\x00'))
+          finally:
+            free(str_value)
+        else:
+          if rank == 0 and class_id in (H5T_BITFIELD, H5T_INTEGER,
+                                        H5T_FLOAT):
+            dtype_ = get_dtype_scalar(type_id, class_id, type_size)
+            shape = ()
+          else:
+            try:
+              stype_, shape_ = hdf5_to_np_ext_type(type_id,
+                                                   pure_numpy_types=True)
+              dtype_ = numpy.dtype(stype_, shape_)
+            except TypeError:
+              dtype_ = None
+            dims = <hsize_t *>malloc(rank * sizeof(hsize_t))
+            try:
+              if H5Sget_simple_extent_dims(space_id, dims, NULL) < 0:
+                raise HDF5ExtError("Can't get dims info on attribute %s "
+                                   "in node %s." % (attrname, self.name))
+              shape = getshape(rank, dims)
+            finally:
+              free(<void *> dims)
+          if dtype_ is not None:
+            native_type_id = get_native_type(type_id)
+            ndvalue = numpy.empty(dtype=dtype_, shape=shape)
+            ret = H5Aread(attr_id, native_type_id, ndvalue.data)
+            if ret < 0:
+              raise HDF5ExtError("Attribute %s exists in node %s, but "
+                                 "can't get it." % (attrname, self.name))
+            if rank > 0:    # multidimensional case
+              retvalue = ndvalue
+            else:
+              retvalue = ndvalue[()]
+      finally:
+        if native_type_id >= 0:
+          H5Tclose(native_type_id)
+        if type_id >= 0:
+          H5Tclose(type_id)
+        if space_id >= 0:
+          H5Sclose(space_id)
+        H5Aclose(attr_id)
+      if retvalue is None:
+        # Let the general reader deal (and warn) with the value
+        retvalue = self._g_getattr(node, attrname)
+      values[attrname] = retvalue
+    return values
+
+
   def _g_remove(self, node, attrname):
     cdef int ret
     cdef hid_t dset_id
@@ -1008,6 +1349,29 @@ cdef class Group(Node):
 
     return Giterate(parent._v_objectid, self._v_objectid, encoded_name)
 
+  def _g_list_group_page(self, parent, after, hsize_t count):
+    """Return a page of the groups and the leaves hanging from self.
+
+    At most `count` children are listed in name order, starting after
+    the child named `after` (or at the first child if it is None),
+    whether that child still exists or not.  The lists of names of
+    groups, leaves, links and unknown nodes are returned, followed by
+    the name of the last child in the page (None if no children were
+    left).
+
+    """
+
+    cdef bytes encoded_name, encoded_after
+    cdef char *cafter = NULL
+
+    encoded_name = self.name.encode('utf-8')
+    if after is not None:
+      encoded_after = after.encode('utf-8')
+      cafter = encoded_after
+
+    return Giterate_page(parent._v_objectid, self._v_objectid, encoded_name,
+                         cafter, count)
+
 
   def _g_get_gchild_attr(self, group_name, attr_name):
     """Return an attribute of a child `Group`.
@@ -1063,6 +1427,16 @@ cdef class Group(Node):
     return retvalue
 
 
+  def _g_get_nlinks(self):
+    """Return the number of links (visible or hidden) in the group."""
+
+    cdef H5G_info_t ginfo
+
+    if H5Gget_info(self.group_id, &ginfo) < 0:
+      raise HDF5ExtError("Problems getting info for group ``%s``" %
+                         self._v_pathname)
+    return ginfo.nlinks
+
   def _g_flush_group(self):
     # Close the group
     H5Fflush(self.group_id, H5F_SCOPE_GLOBAL)
@@ -1174,6 +1548,30 @@ cdef class Leaf(Node):
     else:
       raise ValueError("Unexpected classname: %s" % classname)
 
+  def _g_refresh(self):
+    """Refresh the metadata of the dataset and return its new shape."""
+
+    cdef int i, rank
+    cdef hid_t space_id
+    cdef hsize_t *dims
+    cdef object shape
+
+    if pt_H5Drefresh(self.dataset_id) < 0:
+      raise HDF5ExtError("Problems refreshing the leaf: %s" % self)
+
+    space_id = H5Dget_space(self.dataset_id)
+    rank = H5Sget_simple_extent_ndims(space_id)
+    dims = <hsize_t *>malloc(max(rank, 1) * sizeof(hsize_t))
+    H5Sget_simple_extent_dims(space_id, dims, NULL)
+    H5Sclose(space_id)
+    if self.dims != NULL:
+      # Update the dimensionality of arrays
+      for i from 0 <= i < rank:
+        self.dims[i] = dims[i]
+    shape = getshape(rank, dims)
+    free(dims)
+    return shape
+
   def _g_flush(self):
     # Flush the dataset (in fact, the entire buffers in file!)
     if self.dataset_id >= 0:
@@ -1421,6 +1819,7 @@ cdef class Array(Leaf):
     cdef hsize_t *dims_arr
     cdef void *rbuf
     cdef object shape
+    cdef PyThreadState *state
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot append to the reference types")
@@ -1435,9 +1834,10 @@ cdef class Array(Leaf):
 
     # Append the records
     extdim = self.extdim
-    with nogil:
-        ret = H5ARRAYappend_records(self.dataset_id, self.type_id, self.rank,
-                                    self.dims, dims_arr, extdim, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYappend_records(self.dataset_id, self.type_id, self.rank,
+                                self.dims, dims_arr, extdim, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the elements")
@@ -1456,6 +1856,7 @@ cdef class Array(Leaf):
     cdef int extdim
     cdef size_t item_size = H5Tget_size(self.type_id)
     cdef void * refbuf = NULL
+    cdef PyThreadState *state
 
     # Number of rows to read
     nrows = get_len_of_range(start, stop, step)
@@ -1473,9 +1874,10 @@ cdef class Array(Leaf):
       extdim = -1
 
     # Do the physical read
-    with nogil:
-        ret = H5ARRAYread(self.dataset_id, self.type_id, start, nrows, step,
-                          extdim, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYread(self.dataset_id, self.type_id, start, nrows, step,
+                      extdim, rbuf)
+    reacquire_gil(state)
 
     try:
       if ret < 0:
@@ -1510,6 +1912,7 @@ cdef class Array(Leaf):
     cdef void *rbuf
     cdef size_t item_size = H5Tget_size(self.type_id)
     cdef void * refbuf = NULL
+    cdef PyThreadState *state
 
     # Get the pointer to the buffer data area of startl, stopl and stepl arrays
     start = <hsize_t *>startl.data
@@ -1524,9 +1927,10 @@ cdef class Array(Leaf):
       rbuf = nparr.data
 
     # Do the physical read
-    with nogil:
-        ret = H5ARRAYreadSlice(self.dataset_id, self.type_id,
-                               start, stop, step, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYreadSlice(self.dataset_id, self.type_id,
+                           start, stop, step, rbuf)
+    reacquire_gil(state)
     try:
       if ret < 0:
         raise HDF5ExtError("Problems reading the array data.")
@@ -1562,6 +1966,7 @@ cdef class Array(Leaf):
     cdef object mode
     cdef size_t item_size = H5Tget_size(self.type_id)
     cdef void * refbuf = NULL
+    cdef PyThreadState *state
 
     # Get the dataspace handle
     space_id = H5Dget_space(self.dataset_id)
@@ -1581,9 +1986,10 @@ cdef class Array(Leaf):
       rbuf = nparr.data
 
     # Do the actual read
-    with nogil:
-        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
-                      H5P_DEFAULT, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                  H5P_DEFAULT, rbuf)
+    reacquire_gil(state)
 
     try:
       if ret < 0:
@@ -1668,6 +2074,7 @@ cdef class Array(Leaf):
     cdef object mode
     cdef size_t item_size = H5Tget_size(self.type_id)
     cdef void * refbuf = NULL
+    cdef PyThreadState *state
 
     # Get the dataspace handle
     space_id = H5Dget_space(self.dataset_id)
@@ -1690,9 +2097,10 @@ cdef class Array(Leaf):
       rbuf = nparr.data
 
     # Do the actual read
-    with nogil:
-        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
-                      H5P_DEFAULT, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                  H5P_DEFAULT, rbuf)
+    reacquire_gil(state)
 
     try:
       if ret < 0:
@@ -1733,6 +2141,7 @@ cdef class Array(Leaf):
     cdef hsize_t *start
     cdef hsize_t *step
     cdef hsize_t *count
+    cdef PyThreadState *state
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot write reference types yet")
@@ -1748,9 +2157,10 @@ cdef class Array(Leaf):
       self._convert_time64(nparr, 0)
 
     # Modify the elements:
-    with nogil:
-        ret = H5ARRAYwrite_records(self.dataset_id, self.type_id, self.rank,
-                                   start, step, count, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYwrite_records(self.dataset_id, self.type_id, self.rank,
+                               start, step, count, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Internal error modifying the elements "
@@ -1768,6 +2178,7 @@ cdef class Array(Leaf):
     cdef hsize_t size
     cdef void *rbuf
     cdef object mode
+    cdef PyThreadState *state
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot write reference types yet")
@@ -1789,9 +2200,10 @@ cdef class Array(Leaf):
       self._convert_time64(nparr, 0)
 
     # Do the actual write
-    with nogil:
-        ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
-                       H5P_DEFAULT, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
+                   H5P_DEFAULT, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems writing the array data.")
@@ -1813,6 +2225,7 @@ cdef class Array(Leaf):
     cdef hsize_t size
     cdef void *rbuf
     cdef object mode
+    cdef PyThreadState *state
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot write reference types yet")
@@ -1837,9 +2250,10 @@ cdef class Array(Leaf):
       self._convert_time64(nparr, 0)
 
     # Do the actual write
-    with nogil:
-        ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
-                       H5P_DEFAULT, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
+                   H5P_DEFAULT, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems writing the array data.")
@@ -1975,6 +2389,7 @@ cdef class VLArray(Leaf):
   def _append(self, ndarray nparr, int nobjects):
     cdef int ret
     cdef void *rbuf
+    cdef PyThreadState *state
 
     # Get the pointer to the buffer data area
     if nobjects:
@@ -1986,18 +2401,64 @@ cdef class VLArray(Leaf):
       rbuf = NULL
 
     # Append the records:
-    with nogil:
-        ret = H5VLARRAYappend_records(self.dataset_id, self.type_id,
-                                      nobjects, self.nrecords, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5VLARRAYappend_records(self.dataset_id, self.type_id,
+                                  nobjects, self.nrecords, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the records.")
 
     self.nrecords = self.nrecords + 1
 
+  def _g_refresh(self):
+    shape = Leaf._g_refresh(self)
+    self.nrecords = shape[0]
+    return shape
+
+  def _append_ragged(self, ndarray nparr, ndarray offsets):
+    cdef int ret
+    cdef hsize_t i, nrows
+    cdef size_t atomicsize
+    cdef char *rbuf
+    cdef npy_int64 *coffsets
+    cdef hvl_t *wdata
+    cdef PyThreadState *state
+
+    # `offsets` is a contiguous int64 array with nrows + 1 entries
+    nrows = offsets.shape[0] - 1
+    if nrows == 0:
+      return
+
+    # Convert some NumPy types to HDF5 before storing.
+    if self.atom.type == 'time64' and nparr.size > 0:
+      self._convert_time64(nparr, 0)
+
+    # Build a VL descriptor pointing to the values of every row
+    atomicsize = self._atomicsize
+    rbuf = nparr.data
+    coffsets = <npy_int64 *>offsets.data
+    wdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
+    for i from 0 <= i < nrows:
+      wdata[i].len = <size_t>(coffsets[i+1] - coffsets[i])
+      wdata[i].p = rbuf + coffsets[i]*atomicsize
+
+    # Append all the records at once
+    state = release_gil_for_hdf5()
+    ret = H5VLARRAYappend_ragged(self.dataset_id, self.type_id,
+                                 nrows, self.nrecords, wdata)
+    reacquire_gil(state)
+    free(wdata)
+
+    if ret < 0:
+      raise HDF5ExtError("Problems appending the records.")
+
+    self.nrecords = self.nrecords + nrows
+
   def _modify(self, hsize_t nrow, ndarray nparr, int nobjects):
     cdef int ret
     cdef void *rbuf
+    cdef PyThreadState *state
 
     # Get the pointer to the buffer data area
     rbuf = nparr.data
@@ -2007,9 +2468,10 @@ cdef class VLArray(Leaf):
         self._convert_time64(nparr, 0)
 
     # Append the records:
-    with nogil:
-        ret = H5VLARRAYmodify_records(self.dataset_id, self.type_id,
-                                      nrow, nobjects, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5VLARRAYmodify_records(self.dataset_id, self.type_id,
+                                  nrow, nobjects, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems modifying the record.")
@@ -2048,6 +2510,7 @@ cdef class VLArray(Leaf):
     cdef hid_t space_id
     cdef hid_t mem_space_id
     cdef object buf, nparr, shape, datalist
+    cdef PyThreadState *state
 
     # Compute the number of rows to read
     nrows = get_len_of_range(start, stop, step)
@@ -2057,19 +2520,20 @@ cdef class VLArray(Leaf):
         h5bt=False)
 
     # Now, read the chunk of rows
-    with nogil:
-        # Allocate the necessary memory for keeping the row handlers
-        rdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
-        # Get the dataspace handle
-        space_id = H5Dget_space(self.dataset_id)
-        # Create a memory dataspace handle
-        mem_space_id = H5Screate_simple(1, &nrows, NULL)
-        # Select the data to be read
-        H5Sselect_hyperslab(space_id, H5S_SELECT_SET, &start, &step, &nrows,
-                            NULL)
-        # Do the actual read
-        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
-                      H5P_DEFAULT, rdata)
+    state = release_gil_for_hdf5()
+    # Allocate the necessary memory for keeping the row handlers
+    rdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
+    # Get the dataspace handle
+    space_id = H5Dget_space(self.dataset_id)
+    # Create a memory dataspace handle
+    mem_space_id = H5Screate_simple(1, &nrows, NULL)
+    # Select the data to be read
+    H5Sselect_hyperslab(space_id, H5S_SELECT_SET, &start, &step, &nrows,
+                        NULL)
+    # Do the actual read
+    ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                  H5P_DEFAULT, rdata)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError(
@@ -2121,6 +2585,90 @@ cdef class VLArray(Leaf):
     return datalist
 
 
+  def _read_ragged(self, hsize_t start, hsize_t stop, hsize_t step):
+    cdef hsize_t i
+    cdef size_t atomicsize
+    cdef herr_t ret
+    cdef hvl_t *rdata
+    cdef hsize_t nrows
+    cdef hid_t space_id
+    cdef hid_t mem_space_id
+    cdef char *rbuf
+    cdef npy_int64 *coffsets
+    cdef ndarray values, offsets
+    cdef PyThreadState *state
+
+    # Compute the number of rows to read
+    nrows = get_len_of_range(start, stop, step)
+    if start + nrows > self.nrows:
+      raise HDF5ExtError(
+        "Asking for a range of rows exceeding the available ones!.",
+        h5bt=False)
+
+    # Now, read the chunk of rows
+    state = release_gil_for_hdf5()
+    # Allocate the necessary memory for keeping the row handlers
+    rdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
+    # Get the dataspace handle
+    space_id = H5Dget_space(self.dataset_id)
+    # Create a memory dataspace handle
+    mem_space_id = H5Screate_simple(1, &nrows, NULL)
+    # Select the data to be read
+    H5Sselect_hyperslab(space_id, H5S_SELECT_SET, &start, &step, &nrows,
+                        NULL)
+    # Do the actual read
+    ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                  H5P_DEFAULT, rdata)
+    reacquire_gil(state)
+
+    if ret < 0:
+      H5Sclose(mem_space_id)
+      H5Sclose(space_id)
+      free(rdata)
+      raise HDF5ExtError(
+        "VLArray._read_ragged: Problems reading the array data.")
+
+    # Compute the offsets of rows
+    offsets = numpy.empty(nrows + 1, dtype=numpy.int64)
+    coffsets = <npy_int64 *>offsets.data
+    coffsets[0] = 0
+    for i from 0 <= i < nrows:
+      coffsets[i+1] = coffsets[i] + rdata[i].len
+
+    # Copy the values of all the rows in a single contiguous buffer
+    values = numpy.empty((coffsets[nrows],) + tuple(self._atomicshape),
+                         dtype=self._atomicdtype.base)
+    atomicsize = self._atomicsize
+    rbuf = values.data
+    with nogil:
+        for i from 0 <= i < nrows:
+          if rdata[i].len > 0:
+            memcpy(rbuf + coffsets[i]*atomicsize, rdata[i].p,
+                   rdata[i].len*atomicsize)
+
+    if self.atom.kind == 'time':
+      # Swap the byteorder by hand (this is not currently supported by HDF5)
+      if H5Tget_order(self.type_id) != platform_byteorder:
+        values.byteswap(True)
+    # Convert some HDF5 types to NumPy after reading.
+    if self.atom.type == 'time64' and values.size > 0:
+      self._convert_time64(values, 1)
+
+    # Release resources
+    # Reclaim all the (nested) VL data
+    ret = H5Dvlen_reclaim(self.type_id, mem_space_id, H5P_DEFAULT, rdata)
+    if ret < 0:
+      raise HDF5ExtError("VLArray._read_ragged: error freeing the data buffer.")
+    # Terminate access to the memory dataspace
+    H5Sclose(mem_space_id)
+    # Terminate access to the dataspace
+    H5Sclose(space_id)
+    # Free the amount of row pointers to VL row data
+    free(rdata)
+
+    return values, offsets
+
+
   def get_row_size(self, row):
     """Return the total size in bytes of all the elements contained in a given row."""
 
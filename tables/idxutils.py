@@ -503,6 +503,38 @@ def nextafter(x, direction, dtype, itemsize):
     raise TypeError("data type ``%s`` is not supported" % dtype)
 
 
+def compact_coords(coords):
+    """Return the sorted `coords` of rows in a compact form.
+
+    When the coordinates make few runs of consecutive rows, a 2-d array
+    with the starts and stops of the runs is returned.  Otherwise, the
+    coordinates are returned as a 1-d ``int64`` array.  Use
+    `expand_coords()` for getting the coordinates back.
+
+    """
+
+    coords = numpy.asarray(coords, dtype='int64')
+    if len(coords) == 0:
+        return coords
+    breaks = numpy.flatnonzero(numpy.diff(coords) != 1) + 1
+    if 2 * (len(breaks) + 1) >= len(coords):
+        return coords
+    starts = coords[numpy.concatenate(([0], breaks))]
+    stops = coords[numpy.concatenate((breaks - 1, [len(coords) - 1]))] + 1
+    return numpy.array([starts, stops])
+
+
+def expand_coords(data):
+    """Return the row coordinates kept in `data` by `compact_coords()`."""
+
+    if data.ndim == 1:
+        return data
+    starts, stops = data
+    lengths = stops - starts
+    return (numpy.repeat(stops - lengths.cumsum(), lengths) +
+            numpy.arange(lengths.sum(), dtype='int64'))
+
+
 ## Local Variables:
 ## mode: python
 ## py-indent-offset: 4
@@ -31,6 +31,7 @@ from .idxutils import (calc_chunksize, calcoptlevels,
                              get_reduction_level, nextafter, inftype)
 
 from . import indexesextension
+from . import indexcache
 from .node import NotLoggedMixin
 from .atom import UIntAtom, Atom
 from .earray import EArray
@@ -1242,7 +1243,7 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
         self.stopl = numpy.array([nslice + 1, start + buffer.size],
                                  numpy.uint64)
         self.stepl = numpy.ones(shape=2, dtype=numpy.uint64)
-        where._g_read_slice(self.startl, self.stopl, self.stepl, buffer)
+        where._read_slice_into(self.startl, self.stopl, self.stepl, buffer)
 
     def write_slice(self, where, nslice, buffer, start=0):
         """Write a `slice` to the `where` dataset with the `buffer` data."""
@@ -1261,7 +1262,7 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
         startl = numpy.array([start], dtype=numpy.uint64)
         stopl = numpy.array([start + buffer.size], dtype=numpy.uint64)
         stepl = numpy.array([1], dtype=numpy.uint64)
-        where._g_read_slice(startl, stopl, stepl, buffer)
+        where._read_slice_into(startl, stopl, stepl, buffer)
 
     # Write version for LastRow
     def write_sliceLR(self, where, buffer, start=0):
@@ -1792,7 +1793,7 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
     def restorecache(self):
         "Clean the limits cache and resize starts and lengths arrays"
 
-        params = self._v_file.params
+        params = self.table._get_cache_params()
         # The sorted IndexArray is absolutely required to be in memory
         # at the same time than the Index instance, so create a strong
         # reference to it.  We are not introducing leaks because the
@@ -1816,11 +1817,42 @@ class Index(NotLoggedMixin, indexesextension.Index, Group):
                                          'last row chunks')
         """A cache for the last row chunks. Only used for searches in
         the last row, and mainly useful for small indexes."""
+        for cache in (self.sorted.boundscache, self.limboundscache,
+                      self.sortedLRcache):
+            cache.setpolicy(params)
         self.starts = numpy.empty(shape=self.nrows, dtype=numpy.int32)
         self.lengths = numpy.empty(shape=self.nrows, dtype=numpy.int32)
         self.sorted._init_sorted_slice(self)
         self.dirtycache = False
 
+    def _g_bounds_caches(self):
+        """Return the ranges and bounds caches used by searches.
+
+        The ranges are always in memory (or memory-mapped), while the
+        bounds are only returned when they are memory-mapped (see
+        `tables.indexcache`); otherwise they are None and searches read
+        them row by row.
+
+        """
+
+        caches = indexcache.load(self)
+        if caches is None:
+            return self.ranges[:], None
+        return caches
+
+    def _g_cache_stats(self):
+        """Return the statistics of the caches used by this index."""
+
+        stats = {}
+        if 'limboundscache' not in self.__dict__:
+            # The caches have not been built yet
+            return stats
+        stats['bounds'] = self.sorted.boundscache.stats()
+        stats['limbounds'] = self.limboundscache.stats()
+        stats['sortedLR'] = self.sortedLRcache.stats()
+        stats.update(self.sorted._g_cache_stats())
+        return stats
+
     def search(self, item):
         """Do a binary search in this index for an item."""
 
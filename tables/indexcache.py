@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Persistent, memory-mapped bounds caches of indexes.
+
+Index searches need the first level cache (the ``ranges`` of the sorted
+slices) completely in memory, and the second level cache (the
+``bounds`` of the chunks in every slice) row by row.  Both are read from
+the HDF5 file the first time an index is searched in a process.
+
+When :data:`tables.parameters.INDEX_CACHE_DIR` is set, this module saves
+both arrays of the indexes in files opened in read-only mode as ``.npy``
+files in that directory, and memory-maps them afterwards.  Later
+searches, in this and in other processes, read them from the pages
+shared by the operating system instead.  The files are named after the
+identity of the HDF5 file on disk (see `tables.utils.file_identity()`)
+and the path of the index, so that a rewritten file never uses stale
+caches.
+
+"""
+
+from __future__ import absolute_import
+
+import os
+import hashlib
+import tempfile
+
+import numpy
+
+from .utils import file_identity
+
+
+def file_key(filename, mode, params):
+    """Return the key of the file for its index caches, or None.
+
+    None is returned when persistent caches are disabled in `params` or
+    when the file has no identity on disk.
+
+    """
+
+    if params['INDEX_CACHE_DIR'] is None:
+        return None
+    return file_identity(filename, mode, params)
+
+
+def _save(path, data):
+    """Save the `data` array to `path` atomically."""
+
+    dirname = os.path.dirname(path)
+    fd, tmppath = tempfile.mkstemp(suffix='.tmp', dir=dirname)
+    try:
+        with os.fdopen(fd, 'wb') as tmpfile:
+            numpy.save(tmpfile, data)
+        os.rename(tmppath, path)
+    except Exception:
+        os.remove(tmppath)
+        raise
+
+
+def _map(path, array):
+    """Return a read-only memory map of the `array` node saved in `path`.
+
+    The array is read and saved first when `path` does not hold it yet.
+    Empty arrays cannot be mapped, so they are read and returned.
+
+    """
+
+    if array.nrows == 0 or 0 in array.shape:
+        return array[:]
+    try:
+        data = numpy.load(path, mmap_mode='r')
+    except (IOError, OSError, ValueError):
+        data = None
+    if data is None or data.shape != array.shape:
+        _save(path, array[:])
+        data = numpy.load(path, mmap_mode='r')
+    return data
+
+
+def load(index):
+    """Return the ``(ranges, bounds)`` caches of `index` memory-mapped.
+
+    None is returned when persistent caches are not enabled for the file
+    of the index or the cache directory cannot be used.
+
+    """
+
+    file_ = index._v_file
+    key = file_._index_cache_key
+    if key is None:
+        return None
+    name = hashlib.sha1(
+        repr((key, index._v_pathname)).encode('utf-8')).hexdigest()
+    cachedir = file_.params['INDEX_CACHE_DIR']
+    try:
+        if not os.path.isdir(cachedir):
+            try:
+                os.makedirs(cachedir)
+            except OSError:
+                # Maybe created by another process in the meantime
+                if not os.path.isdir(cachedir):
+                    raise
+        return tuple(
+            _map(os.path.join(cachedir, '%s.%s.npy' % (name, part)),
+                 getattr(index, part))
+            for part in ('ranges', 'bounds'))
+    except (IOError, OSError):
+        # The directory cannot be written, use the in-memory caches
+        return None
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
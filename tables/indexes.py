@@ -146,16 +146,22 @@ class IndexArray(NotLoggedMixin, EArray, indexesextension.IndexArray):
         # Lookup in the middle of slice for item1
         chunksize = self.chunksize  # Number of elements/chunksize
         nchunk = -1
-        # Try to get the bounds row from the LRU cache
-        nslot = boundscache.getslot(nrow)
-        if nslot >= 0:
-            # Cache hit. Use the row kept there.
-            bounds = boundscache.getitem(nslot)
+        boundsmap = self._v_parent.boundsmap
+        if boundsmap is not None:
+            # The bounds are memory-mapped (see tables.indexcache)
+            bounds = boundsmap[nrow]
         else:
-            # No luck with cached data. Read the row and put it in the cache.
-            bounds = self._v_parent.bounds[nrow]
-            size = bounds.size * bounds.itemsize
-            boundscache.setitem(nrow, bounds, size)
+            # Try to get the bounds row from the LRU cache
+            nslot = boundscache.getslot(nrow)
+            if nslot >= 0:
+                # Cache hit. Use the row kept there.
+                bounds = boundscache.getitem(nslot)
+            else:
+                # No luck with cached data. Read the row and put it in
+                # the cache.
+                bounds = self._v_parent.bounds[nrow]
+                size = bounds.size * bounds.itemsize
+                boundscache.setitem(nrow, bounds, size)
         if result1 < 0:
             # Search the appropriate chunk in bounds cache
             nchunk = bisect_left(bounds, item1)
@@ -47,9 +47,11 @@ ctypedef npy_uint16 npy_float16
 
 from libc.stdlib cimport malloc, free
 from libc.string cimport memcpy, strncmp
+from cpython.pystate cimport PyThreadState
 
 from definitions cimport hid_t, herr_t, hsize_t, H5Screate_simple, H5Sclose
 from lrucacheextension cimport NumCache
+from utilsextension cimport release_gil_for_hdf5, reacquire_gil
 
 
 
@@ -597,20 +599,24 @@ cdef class IndexArray(Array):
   cdef void    *rbufrv
   cdef void    *rbufbc
   cdef void    *rbuflb
+  cdef char    *rbufbm
   cdef hid_t   mem_space_id
   cdef int     l_chunksize, l_slicesize, nbounds, indsize
+  cdef long    bmrowsize
   cdef CacheArray bounds_ext
   cdef NumCache boundscache, sortedcache
-  cdef ndarray bufferbc, bufferlb
+  cdef ndarray bufferbc, bufferlb, boundsmap
 
   def _read_index_slice(self, hsize_t irow, hsize_t start, hsize_t stop,
                       ndarray idx):
     cdef herr_t ret
+    cdef PyThreadState *state
 
     # Do the physical read
-    with nogil:
-        ret = H5ARRAYOread_readSlice(self.dataset_id, self.type_id,
-                                     irow, start, stop, idx.data)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYOread_readSlice(self.dataset_id, self.type_id,
+                                 irow, start, stop, idx.data)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index indices.")
@@ -648,23 +654,30 @@ cdef class IndexArray(Array):
     self.rbufst = starts.data
     self.rbufln = lengths.data
     # The 1st cache is loaded completely in memory and needs to be reloaded
-    rvcache = index.ranges[:]
+    # (unless it is memory-mapped, like the 2nd one, see tables.indexcache)
+    rvcache, boundsmap = index._g_bounds_caches()
     self.rbufrv = rvcache.data
     index.rvcache = <object>rvcache
+    index.boundsmap = boundsmap
     # Init the bounds array for reading
     self.nbounds = index.bounds.shape[1]
     self.bounds_ext = <CacheArray>index.bounds
     self.bounds_ext.initread(self.nbounds)
+    self.boundsmap = boundsmap
+    if boundsmap is not None:
+      self.rbufbm = self.boundsmap.data
+      self.bmrowsize = self.nbounds * dtype.itemsize
     if str(dtype) in self._v_parent.opt_search_types:
       # The next caches should be defined only for optimized search types.
       # The 2nd level cache will replace the already existing ObjectCache and
       # already bound to the boundscache attribute. This way, the cache will
       # not be duplicated (I know, this smells badly, but anyway).
-      params = self._v_file.params
+      params = index.table._get_cache_params()
       rowsize = (self.bounds_ext._v_chunkshape[1] * dtype.itemsize)
       maxslots = params['BOUNDS_MAX_SIZE'] / rowsize
       self.boundscache = <NumCache>NumCache(
         (maxslots, self.nbounds), dtype, 'non-opt types bounds')
+      self.boundscache.setpolicy(params)
       self.bufferbc = numpy.empty(dtype=dtype, shape=self.nbounds)
       # Get the pointer for the internal buffer for 2nd level cache
       self.rbufbc = self.bufferbc.data
@@ -673,6 +686,17 @@ cdef class IndexArray(Array):
       maxslots = params['SORTED_MAX_SIZE'] / (self.chunksize*dtype.itemsize)
       self.sortedcache = <NumCache>NumCache(
         (maxslots, self.chunksize), dtype, 'sorted')
+      self.sortedcache.setpolicy(params)
+
+  def _g_cache_stats(self):
+    """Return the statistics of the caches for optimized search types."""
+
+    stats = {}
+    if self.boundscache is not None:
+      stats['optbounds'] = self.boundscache.stats()
+    if self.sortedcache is not None:
+      stats['sorted'] = self.sortedcache.stats()
+    return stats
 
 
 
@@ -680,10 +704,13 @@ cdef class IndexArray(Array):
                                 hsize_t stop):
     """Read the sorted part of an index."""
 
-    with nogil:
-        ret = H5ARRAYOread_readSortedSlice(
-          self.dataset_id, self.mem_space_id, self.type_id,
-          irow, start, stop, self.rbuflb)
+    cdef PyThreadState *state
+
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYOread_readSortedSlice(
+      self.dataset_id, self.mem_space_id, self.type_id,
+      irow, start, stop, self.rbuflb)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the array data.")
@@ -707,6 +734,9 @@ cdef class IndexArray(Array):
     cdef void *vpointer
     cdef long nslot
 
+    if self.boundsmap is not None:
+      # The bounds are memory-mapped, so use them in place
+      return self.rbufbm + nrow * self.bmrowsize
     nslot = self.boundscache.getslot_(nrow)
     if nslot >= 0:
       vpointer = self.boundscache.getitem1_(nslot)
@@ -1500,9 +1530,12 @@ cdef class LastRowArray(Array):
   def _read_index_slice(self, hsize_t start, hsize_t stop, ndarray idx):
     """Read the reverse index part of an LR index."""
 
-    with nogil:
-        ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
-                                  start, stop, idx.data)
+    cdef PyThreadState *state
+
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
+                              start, stop, idx.data)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index data in Last Row.")
@@ -1512,11 +1545,13 @@ cdef class LastRowArray(Array):
     """Read the sorted part of an LR index."""
 
     cdef void  *rbuflb
+    cdef PyThreadState *state
 
     rbuflb = sorted.rbuflb  # direct access to rbuflb: very fast.
-    with nogil:
-        ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
-                                  start, stop, rbuflb)
+    state = release_gil_for_hdf5()
+    ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
+                              start, stop, rbuflb)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index data.")
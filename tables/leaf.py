@@ -73,6 +73,145 @@ def calc_chunksize(expected_mb):
     return chunksize * 8
 
 
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _lcm(a, b):
+    return a * b // _gcd(a, b)
+
+
+class BlockPlan(object):
+    """The way a set of datasets is traversed by blocks of rows.
+
+    Instances of this class are returned by :func:`plan_blocks` and
+    can be inspected to check how the main dimension of a set of inputs
+    is split in blocks and how these blocks relate to the chunkshapes of
+    the inputs.
+
+    .. attribute:: nrowsinbuf
+
+        The number of rows in every block.
+
+    .. attribute:: chunkrows
+
+        The chunk lengths in the main dimension for the inputs (a
+        tuple, with None for unchunked inputs).
+
+    .. attribute:: lcm
+
+        The least common multiple of the chunk lengths (None if no
+        input is chunked).
+
+    .. attribute:: aligned
+
+        Whether block boundaries never fall inside a chunk of any of
+        the inputs (for contiguous selections).
+
+    """
+
+    def __init__(self, nrowsinbuf, chunkrows, lcm):
+        self.nrowsinbuf = nrowsinbuf
+        self.chunkrows = tuple(chunkrows)
+        self.lcm = lcm
+        self.aligned = all(nrowsinbuf % c == 0 for c in chunkrows if c)
+
+    def iter_slices(self, start, stop, step=1):
+        """Yield the ``(start, stop)`` limits of every block.
+
+        For contiguous selections, block boundaries are placed at
+        multiples of `nrowsinbuf` so that they stay aligned with chunks
+        whatever the value of `start` is.
+
+        """
+
+        nrowsinbuf = self.nrowsinbuf
+        if step != 1:
+            for start2 in range(start, stop, step * nrowsinbuf):
+                yield start2, min(start2 + step * nrowsinbuf, stop)
+            return
+        start2 = start
+        while start2 < stop:
+            stop2 = min((start2 // nrowsinbuf + 1) * nrowsinbuf, stop)
+            yield start2, stop2
+            start2 = stop2
+
+    def chunk_reads(self, start, stop, step=1):
+        """Get the number of chunk reads done for every input.
+
+        This counts the chunks touched by every block, so a chunk
+        crossed by a block boundary is counted (i.e. possibly
+        decompressed) twice.  None is returned for unchunked inputs.
+
+        """
+
+        slices = list(self.iter_slices(start, stop, step))
+        reads = []
+        for c in self.chunkrows:
+            if not c:
+                reads.append(None)
+                continue
+            nreads = 0
+            for start2, stop2 in slices:
+                if step == 1:
+                    nreads += (stop2 - 1) // c - start2 // c + 1
+                else:
+                    nreads += len(set(i // c for i in
+                                      range(start2, stop2, step)))
+            reads.append(nreads)
+        return reads
+
+    def __repr__(self):
+        return ("BlockPlan(nrowsinbuf=%d, chunkrows=%r, lcm=%r, aligned=%r)"
+                % (self.nrowsinbuf, self.chunkrows, self.lcm, self.aligned))
+
+
+def plan_blocks(nrowsinbuf, rowsizes, chunkrows, cachesize=None):
+    """Plan the block size for traversing a set of inputs together.
+
+    `nrowsinbuf` is the desired number of rows per block, `rowsizes`
+    and `chunkrows` are the sizes (in bytes) of a row and the chunk
+    lengths in the main dimension for every input (None for unchunked
+    inputs).  When `cachesize` is given, blocks are shrunk so that the
+    rows for all the inputs fit in it.
+
+    Blocks are then made a multiple of the least common multiple of the
+    chunk lengths, so that no chunk is decompressed more than once.  If
+    this is not possible, the largest chunk gets priority: blocks are
+    made a multiple of it or, if the chunk does not fit in a block, an
+    exact divisor of it.  A :class:`BlockPlan` instance is returned.
+
+    """
+
+    nrowsinbuf = max(1, nrowsinbuf)
+    totalsize = sum(rowsizes)
+    if cachesize and totalsize:
+        nrowsinbuf = max(1, min(nrowsinbuf, cachesize // totalsize))
+
+    chunks = [int(c) for c in chunkrows if c]
+    lcm = None
+    if chunks:
+        lcm = 1
+        for c in chunks:
+            lcm = _lcm(lcm, c)
+        maxchunk = max(chunks)
+        if lcm <= nrowsinbuf:
+            nrowsinbuf -= nrowsinbuf % lcm
+        elif maxchunk <= nrowsinbuf:
+            nrowsinbuf -= nrowsinbuf % maxchunk
+        else:
+            # Split the largest chunk in equal parts, unless this would
+            # make blocks too small
+            nparts = -(-maxchunk // nrowsinbuf)
+            while maxchunk % nparts:
+                nparts += 1
+            if 2 * (maxchunk // nparts) >= nrowsinbuf:
+                nrowsinbuf = maxchunk // nparts
+    return BlockPlan(nrowsinbuf, chunkrows, lcm)
+
+
 class Leaf(Node):
     """Abstract base class for all PyTables leaves.
 
@@ -185,6 +324,20 @@ class Leaf(Node):
 
         return Filters._from_leaf(self)
 
+    @lazyattr
+    def _v_chunk_cache_key(self):
+        """The key of this leaf in the shared chunk cache.
+
+        None if the chunks of this leaf cannot be shared (see
+        :mod:`tables.chunkcache`).
+
+        """
+
+        filekey = self._v_file._chunk_cache_key
+        if filekey is None or self.chunkshape is None:
+            return None
+        return (filekey, self._get_obj_info().addr)
+
     # Other properties
     # ````````````````
 
@@ -390,6 +543,13 @@ dimension of this leave.  Alternatively, in case you have specified a
 very small/large chunksize, you may want to increase/decrease it."""
                               % (self._v_pathname, maxrowsize),
                               PerformanceWarning)
+
+        # Avoid buffers that cross chunk boundaries
+        chunkshape = self.chunkshape
+        if chunkshape and self.shape != ():
+            chunkrows = chunkshape[self.maindim]
+            nrowsinbuf = plan_blocks(nrowsinbuf, [rowsize],
+                                     [chunkrows]).nrowsinbuf
         return nrowsinbuf
 
     # This method is appropriate for calls to __getitem__ methods
@@ -670,6 +830,37 @@ very small/large chunksize, you may want to increase/decrease it."""
             raise TypeError("non-enlargeable datasets cannot be truncated")
         self._g_truncate(size)
 
+    def refresh(self):
+        """Refresh the size of the leaf from the file and return its nrows.
+
+        In files opened for reading in SWMR mode (see
+        :data:`tables.parameters.SWMR`), this makes the rows appended and
+        flushed by the writer visible without reopening the file.  Only
+        the metadata of the dataset is read, so it can be called often.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        self._g_set_refreshed_shape(self._g_refresh())
+        return self.nrows
+
+    def _g_set_refreshed_shape(self, shape):
+        """Update the leaf to the `shape` of its refreshed dataset.
+
+        The shape and the number of rows of the leaf are updated.
+        Subclasses keeping other information on the size of their data
+        override this.
+
+        """
+
+        self.shape = shape
+        if shape:
+            self.nrows = SizeType(shape[0])
+        else:
+            self.nrows = SizeType(0)
+
     def isvisible(self):
         """Is this node visible?
 
@@ -16,6 +16,7 @@ from numpy cimport ndarray
 # The NodeCache class is useful for caching general objects (like Nodes).
 cdef class NodeCache:
   cdef readonly long nslots
+  cdef readonly long evictions
   cdef long nextslot
   cdef object nodes, paths
   cdef object setitem(self, object path, object node)
@@ -29,6 +30,8 @@ cdef class BaseCache:
   cdef long setcount, getcount, containscount
   cdef long disablecyclecount, disableeverycycles
   cdef long enablecyclecount, enableeverycycles
+  cdef long long nlookups, nhits
+  cdef long ndisables, nenables
   cdef double nprobes, hitratio
   cdef long seqn_, nextslot, nslots
   cdef long *ratimes
@@ -38,6 +41,7 @@ cdef class BaseCache:
   cdef int checkhitratio(self)
   cdef int couldenablecache_(self)
   cdef long incseqn(self)
+  cdef long nbytes_(self)
 
 
 #  Helper class for ObjectCache
@@ -53,6 +57,7 @@ cdef class ObjectCache(BaseCache):
   cdef ndarray sizes
   cdef object __list, __dict
   cdef ObjectNode mrunode
+  cdef long nbytes_(self)
   cdef removeslot_(self, long nslot)
   cdef clearcache_(self)
   cdef updateslot_(self, long nslot, long size, object key, object value)
@@ -68,6 +73,7 @@ cdef class NumCache(BaseCache):
   cdef void *rcache
   cdef long long *rkeys
   cdef object __dict
+  cdef long nbytes_(self)
   cdef void *getaddrslot_(self, long nslot)
   cdef long setitem_(self, long long key, void *data, long start)
   cdef long setitem1_(self, long long key)
@@ -78,6 +78,7 @@ cdef class NodeCache:
     if nslots < 0:
       raise ValueError("Negative number (%s) of slots!" % nslots)
     self.nslots = nslots
+    self.evictions = 0
     self.nextslot = 0
     self.nodes = []
     self.paths = []
@@ -103,6 +104,7 @@ cdef class NodeCache:
       # Remove the LRU node and path (the start of the lists)
       del self.nodes[0]
       del self.paths[0]
+      self.evictions = self.evictions + 1
     # The equality protection has been put for situations in which a
     # node is being preempted and added simultaneously (with very small
     # caches).
@@ -158,6 +160,24 @@ cdef class NodeCache:
     else:
       return node
 
+  def get(self, path, d=None):
+    """Return the node for `path` (or `d`) marking it as most recently used."""
+
+    cdef long nslot
+
+    nslot = self.getslot(path)
+    if nslot == -1:
+      return d
+    node = self.nodes[nslot]
+    if nslot != self.nextslot - 1:
+      # Move the node and path to the end of its lists
+      path = self.paths[nslot]
+      del self.nodes[nslot]
+      del self.paths[nslot]
+      self.nodes.append(node)
+      self.paths.append(path)
+    return node
+
   cdef object cpop(self, object path):
     cdef long nslot
 
@@ -199,6 +219,8 @@ cdef class BaseCache:
     self.enableeverycycles = ENABLE_EVERY_CYCLES
     self.lowesthr = LOWEST_HIT_RATIO
     self.nprobes = 0.0;  self.hitratio = 0.0
+    self.nlookups = 0;  self.nhits = 0
+    self.ndisables = 0;  self.nenables = 0
     self.nslots = nslots
     self.seqn_ = 0;  self.nextslot = 0
     self.name = name
@@ -229,6 +251,9 @@ cdef class BaseCache:
       self.nprobes = self.nprobes + 1
       hitratio = <double>self.getcount / self.containscount
       self.hitratio = self.hitratio + hitratio
+      # Keep the totals before resetting the hit counters
+      self.nlookups = self.nlookups + self.containscount
+      self.nhits = self.nhits + self.getcount
       # Reset the hit counters
       self.setcount = 0;  self.getcount = 0;  self.containscount = 0
       if (not self.iscachedisabled and
@@ -237,12 +262,15 @@ cdef class BaseCache:
         if hitratio < self.lowesthr:
           # Hit ratio is low. Disable the cache.
           self.iscachedisabled = True
+          self.ndisables = self.ndisables + 1
         else:
           # Hit ratio is acceptable. (Re-)Enable the cache.
           self.iscachedisabled = False
         self.disablecyclecount = 0
       if self.enablecyclecount >= self.enableeverycycles:
         # We have reached the time for forcing the cache to act again
+        if self.iscachedisabled:
+          self.nenables = self.nenables + 1
         self.iscachedisabled = False
         self.enablecyclecount = 0
     return not self.iscachedisabled
@@ -250,6 +278,51 @@ cdef class BaseCache:
   def couldenablecache(self):
     return self.couldenablecache_()
 
+  def setpolicy(self, object params):
+    """Set the heuristics for disabling the cache from `params`.
+
+    `params` is a mapping with the ``DISABLE_EVERY_CYCLES``,
+    ``ENABLE_EVERY_CYCLES`` and ``LOWEST_HIT_RATIO`` parameters, like
+    the ``params`` attribute of files.
+
+    """
+
+    self.disableeverycycles = params['DISABLE_EVERY_CYCLES']
+    self.enableeverycycles = params['ENABLE_EVERY_CYCLES']
+    self.lowesthr = params['LOWEST_HIT_RATIO']
+
+  def stats(self):
+    """Return a dictionary with the statistics of this cache.
+
+    Besides the size of the cache, it counts the lookups and hits since
+    the creation of the cache and how many times it has been disabled
+    because of a low hit ratio (``disable_events``) or forced to be
+    enabled again (``enable_events``).
+
+    """
+
+    cdef long long nlookups, nhits
+
+    nlookups = self.nlookups + self.containscount
+    nhits = self.nhits + self.getcount
+    return {
+      'name': self.name,
+      'type': self.__class__.__name__,
+      'nslots': self.nslots,
+      'nused': self.nextslot,
+      'nbytes': self.nbytes_(),
+      'lookups': nlookups,
+      'hits': nhits,
+      'hit_ratio': <double>nhits / nlookups if nlookups else numpy.nan,
+      'disabled': bool(self.iscachedisabled),
+      'disable_events': self.ndisables,
+      'enable_events': self.nenables,
+      }
+
+  # The number of bytes taken by the cached data
+  cdef long nbytes_(self):
+    return 0
+
   # Check whether the cache is enabled or *could* be enabled in the next
   # setitem operation. This method can be used in order to probe whether
   # an (expensive) operation to be done before a .setitem() is worth the
@@ -345,6 +418,9 @@ cdef class ObjectCache(BaseCache):
     self.nextslot = 0
     self.seqn_ = 0
 
+  cdef long nbytes_(self):
+    return self.cachesize
+
   # Remove a slot (if it exists in cache)
   cdef removeslot_(self, long nslot):
     cdef ObjectNode node
@@ -396,6 +472,7 @@ cdef class ObjectCache(BaseCache):
   # size can be the exact size of the value object or an estimation.
   cdef long setitem_(self, object key, object value, long size):
     cdef long nslot
+    cdef ObjectNode node
 
     if self.nslots == 0:   # The cache has been set to empty
       return -1
@@ -408,6 +485,10 @@ cdef class ObjectCache(BaseCache):
     if size > self.maxobjsize:  # Check if the object is too large
       return -1
     if self.checkhitratio():
+      node = self.__dict.get(key)
+      if node is not <ObjectNode>None:
+        # Replace the object already in cache (this frees its slot)
+        self.removeslot_(node.nslot)
       nslot = self.nextslot
       self.updateslot_(nslot, size, key, value)
     else:
@@ -514,6 +595,9 @@ cdef class NumCache(BaseCache):
     self.keys = <ndarray>(-numpy.ones(shape=nslots, dtype=numpy.int64))
     self.rkeys = <long long *>self.keys.data
 
+  cdef long nbytes_(self):
+    return self.nslots * self.slotsize * self.itemsize
+
   # Returns the address of nslot
   cdef void *getaddrslot_(self, long nslot):
     if nslot >= 0:
@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Here is defined the MultiTable class.
+
+A `MultiTable` presents tables with the same description in many files
+(*shards*, e.g. one file per day) as a single read-only table with a
+global row numbering: the rows of every shard follow those of the
+previous one.  Reads, queries and reductions are routed to the shards
+in a pool of threads, and their results are put together in order.
+Queries skip the shards which can not hold matching rows according to
+the minimum and maximum values of columns in every shard.
+
+"""
+
+from __future__ import absolute_import
+
+import threading
+import contextlib
+import collections
+from multiprocessing.pool import ThreadPool
+
+import numpy
+
+import six
+from six.moves import range
+
+from . import parameters
+from . import hdf5extension
+from .exceptions import ClosedFileError
+from .reduction import Reducible, make_reduction, accumulate
+from .utils import detect_number_of_cores, get_frame_vars
+
+
+class _FilePool(object):
+    """A bounded pool of files opened in read-only mode.
+
+    At most `maxsize` files are kept open, and the least recently used
+    ones are closed first.  Files in use are never closed, so that more
+    files may be open while many of them are in use at the same time.
+    Every file has a lock, which is held while it is in use.  Unless
+    HDF5 is thread-safe, all the files share the same lock, so that
+    only one thread at a time enters HDF5.
+
+    """
+
+    def __init__(self, maxsize, open_kwargs):
+        self.maxsize = maxsize
+        self._open_kwargs = open_kwargs
+        # filename -> [file, lock, number of users]
+        self._files = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if hdf5extension.HAVE_THREADSAFE_LIBRARY:
+            self._hdf5_lock = None
+        else:
+            self._hdf5_lock = threading.Lock()
+
+    def _new_lock(self):
+        if self._hdf5_lock is not None:
+            return self._hdf5_lock
+        return threading.Lock()
+
+    @contextlib.contextmanager
+    def get_node(self, filename, path):
+        """Use the node in `path` of the file in `filename`."""
+
+        from .file import open_file
+
+        with self._lock:
+            entry = self._files.pop(filename, None)
+            if entry is None:
+                lock = self._new_lock()
+                with lock:
+                    h5file = open_file(filename, 'r', **self._open_kwargs)
+                entry = [h5file, lock, 0]
+            self._files[filename] = entry
+            entry[2] += 1
+            self._evict()
+        try:
+            with entry[1]:
+                yield entry[0].get_node(path)
+        finally:
+            with self._lock:
+                entry[2] -= 1
+                self._evict()
+
+    def _evict(self):
+        files = self._files
+        if len(files) <= self.maxsize:
+            return
+        for filename in list(files):
+            entry = files[filename]
+            if entry[2] == 0:
+                del files[filename]
+                with entry[1]:
+                    entry[0].close()
+                if len(files) <= self.maxsize:
+                    break
+
+    def close(self):
+        """Close all the files in the pool."""
+
+        with self._lock:
+            for entry in six.itervalues(self._files):
+                with entry[1]:
+                    entry[0].close()
+            self._files.clear()
+
+
+class MultiColumn(Reducible):
+    """A column of a `MultiTable`.
+
+    Instances of this class are returned by the ``cols`` accessor of
+    multi-tables, e.g. ``mtable.cols.energy``.  They offer the
+    reductions of :class:`Column` (like :meth:`Column.sum`), computed
+    over the same column in all the shards.  Shards are reduced in
+    parallel and their partial results are merged in order, so the
+    outcome does not depend on the number of threads.  Indices given
+    by `argmin()` and `argmax()` follow the global row numbering.
+
+    .. versionadded:: 3.3
+
+    """
+
+    def __init__(self, mtable, pathname):
+        self.mtable = mtable
+        """The parent `MultiTable` instance."""
+        self.pathname = pathname
+        """The complete pathname of the column."""
+        self._itemtype = mtable.coldtypes[pathname]
+        self.dtype = self._itemtype.base
+        """The NumPy dtype that most closely matches this column."""
+
+    def __repr__(self):
+        return "%s.cols.%s (%s)" % (self.mtable, self.pathname,
+                                    self.__class__.__name__)
+
+    def _reduce(self, op, axis, start, stop, step, ddof=0):
+        mtable = self.mtable
+        ranges = mtable._get_shard_ranges(start, stop, step)
+        nrows = sum(len(range(lstart, lstop, lstep))
+                    for (nshard, lstart, lstop, lstep, base) in ranges)
+        shape = (nrows,) + self._itemtype.shape
+        dtype = self.dtype
+        if 0 in shape:
+            # Let NumPy decide what to return for empty selections
+            kwargs = {'ddof': ddof} if op in ('var', 'std') else {}
+            return getattr(numpy, op)(numpy.empty(shape, dtype=dtype),
+                                      axis=axis, **kwargs)
+        reduction = make_reduction(op, shape, 0, dtype, axis, ddof)
+
+        def reduce_shard(args):
+            (nshard, lstart, lstop, lstep, base) = args
+            with mtable._get_shard(nshard) as table:
+                column = table.cols._f_col(self.pathname)
+                blocks = column._g_reduction_blocks(lstart, lstop, lstep)[3]
+                return accumulate(reduction, ((base + offset, block)
+                                              for (offset, block) in blocks))
+
+        acc = None
+        for shard_acc in mtable._map(reduce_shard, ranges):
+            acc = reduction.merge(acc, shard_acc)
+        return reduction.finalize(acc)
+
+
+class _MultiCols(object):
+    """Accessor for the columns of a `MultiTable`."""
+
+    def __init__(self, mtable):
+        self._v_mtable = mtable
+
+    def _f_col(self, colname):
+        """Get an accessor to the column `colname`."""
+
+        if colname not in self._v_mtable.coldtypes:
+            raise KeyError("multi-table ``%s`` does not have a column "
+                           "named ``%s``" % (self._v_mtable, colname))
+        return MultiColumn(self._v_mtable, colname)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._f_col(name)
+        except KeyError as exc:
+            raise AttributeError(exc.args[0])
+
+    def __dir__(self):
+        return list(self._v_mtable.colpathnames)
+
+
+class MultiTable(object):
+    """A read-only table made of same-schema tables in many files.
+
+    The tables (*shards*) are given by the `sources` sequence, either as
+    ``(filename, path)`` pairs or, when `path` is given, as file names
+    with the table in `path` in every file.  All the shards must have
+    the same description, or a `ValueError` is raised.  Rows are
+    numbered globally: the rows of every shard follow those of the
+    previous one in `sources`.
+
+    Files are opened in read-only mode with the additional keyword
+    arguments in `kwargs` (see :func:`open_file`), and at most
+    `max_open_files` of them are kept open at any time.  Shards are
+    processed in a pool of `nthreads` threads (by default,
+    :data:`parameters.MAX_REDUCTION_THREADS`), and files are used by
+    one thread at a time.  Shards are only read in parallel when HDF5
+    is thread-safe (see ``tables.hdf5extension.HAVE_THREADSAFE_LIBRARY``);
+    otherwise, the threads take turns in HDF5.
+
+    `bounds` tells which columns have per-shard minimum and maximum
+    values, which are used for skipping the shards which can not hold
+    rows fulfilling query conditions.  It is either a sequence of
+    column names, whose bounds are computed by reading the columns the
+    first time they are needed, or a mapping from column names to
+    ``(mins, maxs)`` pairs of sequences with one value per shard (e.g.
+    kept in a catalog).
+
+    Multi-tables can be used as context managers, which close the files
+    on exit.
+
+    Examples
+    --------
+
+    ::
+
+        filenames = ['day-%03d.h5' % day for day in range(365)]
+        with tables.MultiTable(filenames, '/events',
+                               bounds=['time']) as mtable:
+            hot = mtable.read_where('(time > t0) & (energy > 100)')
+            total = mtable.cols.energy.sum()
+
+    .. versionadded:: 3.3
+
+    """
+
+    def __init__(self, sources, path=None, bounds=None, max_open_files=16,
+                 nthreads=None, **kwargs):
+        if path is not None:
+            sources = [(filename, path) for filename in sources]
+        self.shards = [(filename, shardpath)
+                       for (filename, shardpath) in sources]
+        """The ``(filename, path)`` pairs of the shards."""
+        if not self.shards:
+            raise ValueError("a multi-table needs at least one table")
+        if nthreads is None:
+            nthreads = parameters.MAX_REDUCTION_THREADS
+            if nthreads is None:
+                nthreads = detect_number_of_cores()
+        self.nthreads = nthreads
+        """The maximum number of threads processing shards."""
+        self._pool = _FilePool(max_open_files, kwargs)
+
+        def describe(nshard):
+            with self._get_shard(nshard) as table:
+                return (table.nrows, table.dtype, table.coldtypes,
+                        table.colpathnames)
+
+        try:
+            descrs = self._map(describe, range(len(self.shards)))
+        except Exception:
+            self.close()
+            raise
+        (nrows, dtype, coldtypes, colpathnames) = descrs[0]
+        self.dtype = dtype
+        """The NumPy dtype of the rows."""
+        self.coldtypes = coldtypes
+        """Maps the pathnames of columns to their NumPy dtypes."""
+        self.colpathnames = colpathnames
+        """The pathnames of the non-nested columns."""
+        for (nshard, descr) in enumerate(descrs):
+            if descr[1] != dtype:
+                self.close()
+                raise ValueError("table ``%s`` in ``%s`` does not have the "
+                                 "same description as the first one"
+                                 % (self.shards[nshard][1],
+                                    self.shards[nshard][0]))
+        self._offsets = numpy.zeros(len(descrs) + 1, dtype=numpy.int64)
+        numpy.cumsum([descr[0] for descr in descrs], out=self._offsets[1:])
+
+        self._bounds = {}
+        """Maps column names to their ``(mins, maxs)`` shard bounds."""
+        self._bounded_cols = []
+        try:
+            for colname in (bounds or ()):
+                self._check_bounded(colname)
+                self._bounded_cols.append(colname)
+                if hasattr(bounds, 'items'):
+                    (mins, maxs) = bounds[colname]
+                    if len(mins) != self.nshards or \
+                            len(maxs) != self.nshards:
+                        raise ValueError("bounds of column ``%s`` must "
+                                         "have one value per shard"
+                                         % colname)
+                    self._bounds[colname] = (numpy.asarray(mins),
+                                             numpy.asarray(maxs))
+        except Exception:
+            self.close()
+            raise
+
+        self.cols = _MultiCols(self)
+        """An accessor to the columns as `MultiColumn` instances."""
+
+    @property
+    def nrows(self):
+        """The total number of rows in the shards."""
+
+        return int(self._offsets[-1])
+
+    @property
+    def nshards(self):
+        """The number of shards."""
+
+        return len(self.shards)
+
+    def __len__(self):
+        return self.nrows
+
+    def __repr__(self):
+        return "<%s with %d shards and %d rows>" % (
+            self.__class__.__name__, self.nshards, self.nrows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close all the files of the shards."""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _check_bounded(self, colname):
+        dtype = self.coldtypes.get(colname)
+        if dtype is None:
+            raise KeyError("multi-table does not have a column named "
+                           "``%s``" % colname)
+        if dtype.shape != () or dtype.kind not in 'biuf':
+            raise ValueError("bounds can only be used for numerical "
+                             "columns with scalar values: ``%s``" % colname)
+
+    def _get_shard(self, nshard):
+        """Use the table of shard number `nshard` (in a ``with``)."""
+
+        if self._pool is None:
+            raise ClosedFileError("the multi-table is closed")
+        filename, path = self.shards[nshard]
+        return self._pool.get_node(filename, path)
+
+    def _map(self, func, items):
+        """Apply `func` to `items` in the pool of threads, in order."""
+
+        items = list(items)
+        nthreads = min(self.nthreads, len(items))
+        if nthreads <= 1:
+            return [func(item) for item in items]
+        pool = ThreadPool(nthreads)
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _get_shard_ranges(self, start, stop, step):
+        """Split a global selection of rows among the shards.
+
+        A list of ``(nshard, start, stop, step, base)`` tuples is
+        returned for the shards with selected rows, with the range of
+        rows in the shard and the position in the selection of the
+        first selected row of the shard.
+
+        """
+
+        (start, stop, step) = slice(start, stop, step).indices(self.nrows)
+        if step <= 0:
+            raise ValueError("the step of multi-table selections must be "
+                             "positive")
+        offsets = self._offsets
+        ranges = []
+        first = numpy.searchsorted(offsets, start, side='right') - 1
+        for nshard in range(max(first, 0), self.nshards):
+            offset, end = int(offsets[nshard]), int(offsets[nshard + 1])
+            if offset >= stop:
+                break
+            lower, upper = max(start, offset), min(stop, end)
+            # The first selected row in the shard
+            row = start + -(-(lower - start) // step) * step
+            if row >= upper:
+                continue
+            ranges.append((nshard, row - offset, upper - offset, step,
+                           (row - start) // step))
+        return ranges
+
+    def get_bounds(self, colname):
+        """Get the minimum and maximum values of a column in every shard.
+
+        A ``(mins, maxs)`` pair of arrays with one value per shard is
+        returned, and kept for pruning shards in later queries.  Values
+        for empty shards are not meaningful.
+
+        """
+
+        bounds = self._bounds.get(colname)
+        if bounds is not None:
+            return bounds
+        self._check_bounded(colname)
+
+        def shard_bounds(nshard):
+            with self._get_shard(nshard) as table:
+                if table.nrows == 0:
+                    return None
+                column = table.cols._f_col(colname)
+                return (column.min(), column.max())
+
+        dtype = self.coldtypes[colname]
+        mins = numpy.zeros(self.nshards, dtype=dtype)
+        maxs = numpy.zeros(self.nshards, dtype=dtype)
+        for (nshard, minmax) in enumerate(
+                self._map(shard_bounds, range(self.nshards))):
+            if minmax is not None:
+                mins[nshard], maxs[nshard] = minmax
+        self._bounds[colname] = bounds = (mins, maxs)
+        return bounds
+
+    def _get_user_vars(self, condition, condvars, depth):
+        """Get the variables of `condition` which are not columns.
+
+        They are taken from the `condvars` mapping or, if it is None,
+        from the frame at `depth` in the stack, as tables do.
+
+        """
+
+        if condvars is not None:
+            return condvars
+        return get_frame_vars(condition, self.coldtypes, depth)
+
+    def _get_shard_mask(self, condition, uservars):
+        """Get which shards may have rows fulfilling `condition`.
+
+        A boolean array with an element per shard is returned.  Shards
+        are discarded when they are empty or from comparisons of columns
+        with bounds.
+
+        """
+
+        mask = numpy.diff(self._offsets) > 0
+        if not self._bounded_cols:
+            return mask
+
+        from numexpr.necompiler import getType as numexpr_getType
+        from .conditions import compile_condition, _nxtype_from_nptype
+
+        # Compile the condition with the bounded columns as indexed
+        # ones, so that comparisons with their values are extracted.
+        with self._get_shard(0) as table:
+            condvars = table._required_expr_vars(condition, uservars)
+            typemap = {}
+            colvars = {}
+            for (var, val) in six.iteritems(condvars):
+                if hasattr(val, 'pathname'):  # column
+                    typemap[var] = _nxtype_from_nptype[val.dtype.type]
+                    colvars[var] = val.pathname
+                else:
+                    typemap[var] = numexpr_getType(val)
+        bounded = frozenset(var for (var, pathname) in six.iteritems(colvars)
+                            if pathname in self._bounded_cols)
+        if not bounded:
+            return mask
+        compiled = compile_condition(condition, typemap, bounded)
+        compiled = compiled.with_replaced_vars(condvars)
+        if not compiled.index_expressions:
+            return mask
+
+        import numexpr
+        evars = {}
+        for (i, (var, ops, lims)) in enumerate(compiled.index_expressions):
+            mins, maxs = self.get_bounds(colvars[var])
+            evars['e%d' % i] = _may_match(mins, maxs, ops, lims)
+        return mask & numexpr.evaluate(compiled.string_expression, evars)
+
+    def _get_query_ranges(self, condition, condvars, start, stop, step,
+                          depth):
+        """Get the shard ranges and user variables of a query."""
+
+        uservars = self._get_user_vars(condition, condvars, depth + 1)
+        mask = self._get_shard_mask(condition, uservars)
+        ranges = [rng for rng in self._get_shard_ranges(start, stop, step)
+                  if mask[rng[0]]]
+        return ranges, uservars
+
+    def _empty(self, field):
+        dtype = self.dtype if field is None else self.coldtypes[field]
+        return numpy.empty(0, dtype=dtype)
+
+    def _concatenate(self, results, field=None):
+        results = [result for result in results if len(result) > 0]
+        if not results:
+            return self._empty(field)
+        return numpy.concatenate(results)
+
+    def read(self, start=None, stop=None, step=None, field=None):
+        """Get data in the multi-table as a (record) array.
+
+        The rows in the global range given by `start`, `stop` and `step`
+        (with a positive step) are read from the shards in parallel and
+        returned in order.  If `field` is given, only that column is
+        read.
+
+        """
+
+        def read_shard(args):
+            (nshard, lstart, lstop, lstep, base) = args
+            with self._get_shard(nshard) as table:
+                return table.read(lstart, lstop, lstep, field)
+
+        ranges = self._get_shard_ranges(start, stop, step)
+        return self._concatenate(self._map(read_shard, ranges), field)
+
+    def __getitem__(self, key):
+        """Get a row or a range of rows from the multi-table.
+
+        `key` can be an integer (with negative values counted from the
+        end) or a slice with a positive step.
+
+        """
+
+        if isinstance(key, slice):
+            return self.read(key.start, key.stop, key.step)
+        key = int(key)
+        if key < 0:
+            key += self.nrows
+        if not 0 <= key < self.nrows:
+            raise IndexError("index out of range")
+        return self.read(key, key + 1)[0]
+
+    def read_where(self, condition, condvars=None, field=None,
+                   start=None, stop=None, step=None):
+        """Read the rows fulfilling the given `condition`.
+
+        This works like :meth:`Table.read_where` over all the shards,
+        which are queried in parallel.  Shards are skipped when the
+        bounds of their columns show that no row can fulfill the
+        condition.
+
+        """
+
+        ranges, uservars = self._get_query_ranges(
+            condition, condvars, start, stop, step, depth=2)
+
+        def read_shard(args):
+            (nshard, lstart, lstop, lstep, base) = args
+            with self._get_shard(nshard) as table:
+                return table.read_where(condition, uservars, field,
+                                        lstart, lstop, lstep)
+
+        return self._concatenate(self._map(read_shard, ranges), field)
+
+    def get_where_list(self, condition, condvars=None, sort=False,
+                       start=None, stop=None, step=None):
+        """Get the global row coordinates fulfilling the `condition`.
+
+        This works like :meth:`Table.get_where_list` over all the
+        shards, which are queried in parallel, and the coordinates
+        follow the global row numbering.
+
+        """
+
+        ranges, uservars = self._get_query_ranges(
+            condition, condvars, start, stop, step, depth=2)
+
+        def query_shard(args):
+            (nshard, lstart, lstop, lstep, base) = args
+            with self._get_shard(nshard) as table:
+                coords = table.get_where_list(condition, uservars, sort,
+                                              lstart, lstop, lstep)
+            return numpy.asarray(coords, dtype=numpy.int64) + \
+                self._offsets[nshard]
+
+        coords = [coords for coords in self._map(query_shard, ranges)
+                  if len(coords) > 0]
+        if not coords:
+            return numpy.empty(0, dtype=numpy.int64)
+        return numpy.concatenate(coords)
+
+    def where(self, condition, condvars=None, start=None, stop=None,
+              step=None):
+        """Iterate over the rows fulfilling the given `condition`.
+
+        The matching rows are yielded in order as NumPy records.  They
+        are read shard by shard, with as many shards being read in
+        parallel as threads, so that only the results of those shards
+        are kept in memory.
+
+        """
+
+        ranges, uservars = self._get_query_ranges(
+            condition, condvars, start, stop, step, depth=2)
+        return self._iter_where(condition, uservars, ranges)
+
+    def _iter_where(self, condition, uservars, ranges):
+        def read_shard(args):
+            (nshard, lstart, lstop, lstep, base) = args
+            with self._get_shard(nshard) as table:
+                return table.read_where(condition, uservars, None,
+                                        lstart, lstop, lstep)
+
+        nthreads = max(self.nthreads, 1)
+        for i in range(0, len(ranges), nthreads):
+            for rows in self._map(read_shard, ranges[i:i + nthreads]):
+                for row in rows:
+                    yield row
+
+
+def _may_match(mins, maxs, ops, lims):
+    """Which of the ranges of values may fulfill an index expression.
+
+    The ranges are given by the `mins` and `maxs` arrays, and the
+    expression by its operators `ops` and limits `lims`, as extracted by
+    `tables.conditions.compile_condition()`.
+
+    """
+
+    if len(ops) == 1:
+        op, lim = ops[0], lims[0]
+        if op == 'lt':
+            match = mins < lim
+        elif op == 'le':
+            match = mins <= lim
+        elif op == 'gt':
+            match = maxs > lim
+        elif op == 'ge':
+            match = maxs >= lim
+        else:  # eq
+            match = (mins <= lim) & (maxs >= lim)
+    else:
+        (lop, rop), (lower, upper) = ops, lims
+        if lop == 'gt':
+            match = maxs > lower
+        else:
+            match = maxs >= lower
+        if rop == 'lt':
+            match &= mins < upper
+        else:
+            match &= mins <= upper
+    if mins.dtype.kind in 'fc':
+        # Bounds with NaN values say nothing
+        match |= numpy.isnan(mins) | numpy.isnan(maxs)
+    return match
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
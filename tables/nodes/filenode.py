@@ -39,7 +39,9 @@ import warnings
 import numpy as np
 
 import tables
+from tables.utils import prefetch_blocks, BackgroundWriter
 import six
+from six.moves import range
 
 
 NodeType = 'file'
@@ -85,6 +87,18 @@ class RawPyTablesIO(io.RawIOBase):
         self._vshape = self._size_to_shape[self._version]
         self._vtype = node.atom.dtype.base.type
 
+        # The read-ahead buffer (allocated on first use) always starts
+        # at a chunk boundary and spans a whole number of chunks, so
+        # that chunks are not decompressed several times by small reads.
+        # Since each row holds a byte, sizes in rows and bytes match.
+        chunkrows = node.chunkshape[0] if node.chunkshape else 1
+        self._chunkrows = chunkrows
+        self._bufsize = max(1, node.nrowsinbuf // chunkrows) * chunkrows
+        self._rbuf = None
+        self._rbufarr = None
+        self._rbufstart = 0
+        self._rbuflen = 0
+
     # read only attribute
     @property
     def mode(self):
@@ -174,6 +188,8 @@ class RawPyTablesIO(io.RawIOBase):
         finally:
             # Release node object to allow closing the file.
             self._node = None
+            self._rbuf = self._rbufarr = None
+            self._rbuflen = 0
 
     def flush(self):
         """Flush write buffers, if applicable.
@@ -233,6 +249,33 @@ class RawPyTablesIO(io.RawIOBase):
         mode = self._mode
         return 'w' in mode or 'a' in mode or '+' in mode
 
+    def _fill_buffer(self, pos):
+        """Fill the read-ahead buffer with the chunks from `pos` on."""
+
+        if self._rbuf is None:
+            self._rbuf = bytearray(self._bufsize)
+            self._rbufarr = np.frombuffer(self._rbuf, dtype=np.uint8)
+        start = pos - pos % self._chunkrows
+        stop = min(start + self._bufsize, self._node.nrows)
+        nbytes = max(0, stop - start)
+        if nbytes > 0:
+            self._node.read(start, stop, out=self._rbufarr[:nbytes])
+        self._rbufstart = start
+        self._rbuflen = nbytes
+
+    def _buffer_offset(self, pos):
+        """Return the offset of `pos` in the read-ahead buffer.
+
+        The buffer is refilled if `pos` is not in it.
+
+        """
+
+        offset = pos - self._rbufstart
+        if not 0 <= offset < self._rbuflen:
+            self._fill_buffer(pos)
+            offset = pos - self._rbufstart
+        return offset
+
     #def readinto(self, b: bytearray) -> int:
     def readinto(self, b):
         """Read up to len(b) bytes into b.
@@ -240,34 +283,54 @@ class RawPyTablesIO(io.RawIOBase):
         Returns number of bytes read (0 for EOF), or None if the object
         is set not to block as has no data to read.
 
+        Data is copied straight from the read-ahead buffer into b, and
+        large reads bypass that buffer and are done directly into b.
+
         """
 
         self._checkClosed()
         self._checkReadable()
 
-        if self._pos >= self._node.nrows:
+        pos = self._pos
+        nrows = self._node.nrows
+        if pos >= nrows or len(b) == 0:
             return 0
 
-        n = len(b)
-        start = self._pos
-        stop = self._pos + n
+        out = np.frombuffer(b, dtype=np.uint8)
+        n = min(len(out), nrows - pos)
+        done = 0
 
-        # XXX optimized path
-        #if stop <= self._node.nrows and isinstance(b, np.ndarray):
-        #    self._node.read(start, stop, out=b)
-        #    self._pos += n
-        #    return n
+        # Serve what is already in the read-ahead buffer
+        offset = pos - self._rbufstart
+        if 0 <= offset < self._rbuflen:
+            done = min(n, self._rbuflen - offset)
+            out[:done] = self._rbufarr[offset:offset + done]
 
-        if stop > self._node.nrows:
-            stop = self._node.nrows
-            n = stop - start
+        if n - done >= self._bufsize:
+            # Read large remainders directly into the caller buffer
+            self._node.read(pos + done, pos + n, out=out[done:n])
+            done = n
 
-        # XXX This ought to work with anything that supports the buffer API
-        b[:n] = self._node.read(start, stop).tostring()
+        while done < n:
+            offset = self._buffer_offset(pos + done)
+            size = min(n - done, self._rbuflen - offset)
+            out[done:done + size] = self._rbufarr[offset:offset + size]
+            done += size
 
-        self._pos += n
+        self._pos += done
 
-        return n
+        return done
+
+    def readall(self):
+        """Read and return all the bytes from the stream until EOF."""
+
+        self._checkClosed()
+        self._checkReadable()
+
+        buf = bytearray(max(0, self._node.nrows - self._pos))
+        if buf:
+            self.readinto(buf)
+        return bytes(buf)
 
     #def readline(self, limit: int = -1) -> bytes:
     def readline(self, limit=-1):
@@ -284,69 +347,27 @@ class RawPyTablesIO(io.RawIOBase):
         self._checkClosed()
         self._checkReadable()
 
-        chunksize = self._node.chunkshape[0] if self._node.chunkshape else -1
-
-        # XXX: check
-        lsep = b'\n'
-        lseplen = len(lsep)
-
-        # Set the remaining bytes to read to the specified size.
-        remsize = limit
+        pos = self._pos
+        end = self._node.nrows
+        if limit is not None and limit >= 0:
+            end = min(end, pos + limit)
 
+        # Look for the line terminator in the read-ahead buffer (the
+        # ``find()`` method of byte arrays uses memchr), refilling it as
+        # many times as needed.
         partial = []
-        finished = False
-
-        while not finished:
-            # Read a string limited by the remaining number of bytes.
-            if limit <= 0:
-                ibuff = self.read(chunksize)
-            else:
-                ibuff = self.read(min(remsize, chunksize))
-            ibufflen = len(ibuff)
-            remsize -= ibufflen
-
-            if ibufflen >= lseplen:
-                # Separator fits, look for EOL string.
-                eolindex = ibuff.find(lsep)
-            elif ibufflen == 0:
-                # EOF was immediately reached.
-                finished = True
-                continue
-            else:  # ibufflen < lseplen
-                # EOF was hit and separator does not fit. ;)
-                partial.append(ibuff)
-                finished = True
-                continue
-
+        while pos < end:
+            offset = self._buffer_offset(pos)
+            bufend = min(self._rbuflen, end - self._rbufstart)
+            eolindex = self._rbuf.find(b'\n', offset, bufend)
             if eolindex >= 0:
-                # Found an EOL. If there are trailing characters,
-                # cut the input buffer and seek back;
-                # else add the whole input buffer.
-                trailing = ibufflen - lseplen - eolindex  # Bytes beyond EOL.
-                if trailing > 0:
-                    obuff = ibuff[:-trailing]
-                    self.seek(-trailing, 1)
-                    remsize += trailing
-                else:
-                    obuff = ibuff
-                finished = True
-            elif lseplen > 1 and (limit <= 0 or remsize > 0):
-                # Seek back a little since the end of the read string
-                # may have fallen in the middle of the line separator.
-                obuff = ibuff[:-lseplen + 1]
-                self.seek(-lseplen + 1, 1)
-                remsize += lseplen - 1
-            else:  # eolindex<0 and (lseplen<=1 or (limit>0 and remsize<=0))
-                # Did not find an EOL, add the whole input buffer.
-                obuff = ibuff
-
-            # Append (maybe cut) buffer.
-            partial.append(obuff)
-
-            # If a limit has been specified and the remaining count
-            # reaches zero, the reading is finished.
-            if limit > 0 and remsize <= 0:
-                finished = True
+                bufend = eolindex + 1
+            partial.append(bytes(self._rbuf[offset:bufend]))
+            pos = self._rbufstart + bufend
+            if eolindex >= 0:
+                break
+
+        self._pos = pos
 
         return b''.join(partial)
 
@@ -703,11 +724,18 @@ def open_node(node, mode='r'):
 
 
 def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
-                     title="", filters=None):
+                     title="", filters=None, progress=None):
     """Save a file's contents to a filenode inside a PyTables file.
 
+    The file is streamed by chunk-aligned blocks: the next block is read
+    from disk in a background thread while the current one goes through
+    the HDF5 filter pipeline, so the whole file is never held in memory.
+
     .. versionadded:: 3.2
 
+    .. versionchanged:: 3.3
+       Data is streamed by blocks, and the *progress* parameter was added.
+
     Parameters
     ----------
     h5file
@@ -741,6 +769,11 @@ def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
        information about the desired I/O filters to be applied
        during the life of this object.
 
+    progress
+       A callable that is called as ``progress(done, total)`` after
+       every block is stored, with the number of bytes stored so far
+       and the size of the file.
+
     """
     # sanity checks
     if not os.access(filename, os.R_OK):
@@ -779,21 +812,30 @@ def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
     except tables.NoSuchNodeError:
         pass
 
-    # read data from disk
-    with open(filename, "rb") as fd:
-        data = fd.read()
-
     # remove existing filenode if present
     try:
         f.remove_node(where=where, name=name)
     except tables.NoSuchNodeError:
         pass
 
-    # write file's contents to filenode
-    fnode = new_node(f, where=where, name=name, title=title, filters=filters)
-    fnode.write(data)
-    fnode.attrs._filename = os.path.split(filename)[1]
-    fnode.close()
+    # write file's contents to filenode, reading the next block from
+    # disk while the current one is being compressed and stored
+    size = os.path.getsize(filename)
+    fnode = new_node(f, where=where, name=name, title=title, filters=filters,
+                     expectedsize=size)
+    try:
+        blocksize = fnode._bufsize
+        with open(filename, "rb") as fd:
+            blocks = iter(lambda: fd.read(blocksize), b'')
+            done = 0
+            for block in prefetch_blocks(blocks, name="FileNode reader"):
+                fnode.write(block)
+                done += len(block)
+                if progress is not None:
+                    progress(done, size)
+        fnode.attrs._filename = os.path.split(filename)[1]
+    finally:
+        fnode.close()
 
     # cleanup
     if new_h5file:
@@ -801,11 +843,18 @@ def save_to_filenode(h5file, filename, where, name=None, overwrite=False,
 
 
 def read_from_filenode(h5file, filename, where, name=None, overwrite=False,
-                       create_target=False):
+                       create_target=False, progress=None):
     """Read a filenode from a PyTables file and write its contents to a file.
 
+    The filenode is streamed by chunk-aligned blocks: every block is
+    written to disk in a background thread while the next one is read
+    and decompressed, so the whole file is never held in memory.
+
     .. versionadded:: 3.2
 
+    .. versionchanged:: 3.3
+       Data is streamed by blocks, and the *progress* parameter was added.
+
     Parameters
     ----------
     h5file
@@ -832,6 +881,11 @@ def read_from_filenode(h5file, filename, where, name=None, overwrite=False,
       Whether or not the folder hierarchy needed to accomodate the
       given target ``filename`` will be created.
 
+    progress
+       A callable that is called as ``progress(done, total)`` after
+       every block is read, with the number of bytes read so far and
+       the size of the filenode.
+
     """
     new_h5file = not isinstance(h5file, tables.file.File)
     f = tables.File(h5file, "r") if new_h5file else h5file
@@ -869,16 +923,33 @@ def read_from_filenode(h5file, filename, where, name=None, overwrite=False,
             f.close()
         raise IOError("The file '%s' cannot be written to" % filename)
 
-    # read data from filenode
-    data = fnode.read()
-    fnode.close()
-
-    # store data to file
-    with open(filename, "wb") as fd:
-        fd.write(data)
+    # read data from filenode by blocks, writing every block to the
+    # file while the next one is being decompressed
+    try:
+        node = fnode.node
+        total = node.nrows
+        blocksize = fnode._bufsize
+        with open(filename, "wb") as fd:
+            writer = BackgroundWriter(fd.write, name="FileNode writer")
+            try:
+                for start in range(0, total, blocksize):
+                    stop = min(start + blocksize, total)
+                    writer.put(node.read(start, stop))
+                    if progress is not None:
+                        progress(stop, total)
+                writer.close()
+                writer = None
+            finally:
+                if writer is not None:
+                    # Some error happened; just wait for the pending writes
+                    try:
+                        writer.close()
+                    except Exception:
+                        pass
+    finally:
+        fnode.close()
 
     # cleanup
-    del data
     if new_h5file:
         f.close()
 
@@ -1023,6 +1023,98 @@ class DirectReadWriteTestCase(TempFileMixin, TestCase):
                           self.testh5fname, self.testdir, "/",
                           name="THISNODEDOESNOTEXIST")
 
+    def test06_StreamingWithProgress(self):
+        """Storing and extracting a file by blocks, reporting progress."""
+
+        # a file spanning several blocks
+        data = os.urandom(1000) * 3000
+        with open(self.testfname, "wb") as fd:
+            fd.write(data)
+        stored, extracted = [], []
+        filenode.save_to_filenode(
+            self.h5file, self.testfname, "/test3",
+            progress=lambda done, total: stored.append((done, total)))
+        fnode = filenode.open_node(self.h5file.root.test3)
+        self.assertTrue(len(stored) > 1)
+        self.assertEqual(stored[-1], (len(data), len(data)))
+        self.assertEqual([done for done, total in stored],
+                         [min(len(data), (i + 1) * fnode._bufsize)
+                          for i in range(len(stored))])
+        fnode.close()
+        os.remove(self.testfname)
+
+        filenode.read_from_filenode(
+            self.h5file, self.testfname, "/test3",
+            progress=lambda done, total: extracted.append((done, total)))
+        self.assertEqual(extracted, stored)
+        with open(self.testfname, "rb") as fd:
+            self.assertEqual(fd.read(), data)
+        os.remove(self.testfname)
+
+
+class BufferedReadTestCase(TempFileMixin, TestCase):
+    """Tests for the read-ahead buffer of file nodes."""
+
+    def setUp(self):
+        super(BufferedReadTestCase, self).setUp()
+
+        self.data = b''.join(b'line %d ' % i + b'x' * (i % 97) + b'\n'
+                             for i in range(20000)) + b'no newline'
+        fnode = filenode.new_node(self.h5file, where='/', name='test',
+                                  expectedsize=1024)
+        fnode.write(self.data)
+        fnode.close()
+        self.fnode = filenode.open_node(self.h5file.get_node('/test'))
+
+    def tearDown(self):
+        self.fnode.close()
+        self.fnode = None
+        super(BufferedReadTestCase, self).tearDown()
+
+    def test00_readinto(self):
+        """Reading into NumPy arrays and byte arrays."""
+
+        import numpy
+        self.fnode.seek(3)
+        out = numpy.empty(len(self.data), dtype=numpy.uint8)
+        self.assertEqual(self.fnode.readinto(out), len(self.data) - 3)
+        self.assertEqual(out[:len(self.data) - 3].tobytes(), self.data[3:])
+
+        for size in (1, 10, 5000, 100000):
+            self.fnode.seek(size)
+            buf = bytearray(size)
+            self.assertEqual(self.fnode.readinto(buf), size)
+            self.assertEqual(bytes(buf), self.data[size:2 * size])
+            self.assertEqual(self.fnode.tell(), 2 * size)
+
+    def test01_readline(self):
+        """Reading lines (with limits) across chunk boundaries."""
+
+        import io
+        bio = io.BytesIO(self.data)
+        for pos in (0, 1, 1000, 123456, len(self.data) - 5):
+            for limit in (-1, 0, 3, 100):
+                self.fnode.seek(pos)
+                bio.seek(pos)
+                self.assertEqual(self.fnode.readline(limit),
+                                 bio.readline(limit))
+                self.assertEqual(self.fnode.tell(), bio.tell())
+
+    def test02_iterate(self):
+        """Iterating over lines."""
+
+        self.assertEqual(list(self.fnode), self.data.splitlines(True))
+
+    def test03_read(self):
+        """Mixing reads, seeks and lines."""
+
+        self.fnode.seek(10)
+        self.assertEqual(self.fnode.read(20), self.data[10:30])
+        self.fnode.readline()
+        pos = self.data.index(b'\n', 30) + 1
+        self.assertEqual(self.fnode.read(), self.data[pos:])
+        self.assertEqual(self.fnode.read(), b'')
+
 
 def suite():
     """suite() -> test suite
@@ -1044,6 +1136,7 @@ def suite():
     theSuite.addTest(unittest.makeSuite(AttrsTestCase))
     theSuite.addTest(unittest.makeSuite(ClosedH5FileTestCase))
     theSuite.addTest(unittest.makeSuite(DirectReadWriteTestCase))
+    theSuite.addTest(unittest.makeSuite(BufferedReadTestCase))
 
     return theSuite
 
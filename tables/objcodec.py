@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Codecs for serializing the objects kept in `ObjectAtom` rows.
+
+A codec is a pair of ``dumps(obj) -> bytes`` and ``loads(buffer) ->
+obj`` functions registered under a name with `register_codec()`.  The
+name of the codec used by an `ObjectAtom` is saved in the attributes of
+the ``VLArray`` node, so that reads always pick the right decoder.  The
+following codecs are registered by default:
+
+pickle
+    The pickle module with its highest protocol (the default).
+
+pickle5
+    The pickle protocol 5 where NumPy arrays (and other objects
+    supporting it) are stored out of band after the pickle stream, so
+    that they are neither copied during pickling nor during unpickling:
+    arrays returned by reads share memory with the row buffer.  Only
+    available in Python 3.8 and later.
+
+tagged
+    A fast binary codec for the ``None``, ``bool``, ``int``,
+    ``float``, ``str``, ``bytes``, ``list``, ``tuple`` and ``dict``
+    types, which are the bulk of many object stores.  Objects of other
+    types are pickled.
+
+Rows can also be compressed with the `compress()` and `decompress()`
+functions, using either the Blosc library included in PyTables or zlib.
+
+"""
+
+from __future__ import absolute_import
+
+import struct
+import zlib
+
+import six
+from six.moves import range
+import six.moves.cPickle as pickle
+
+
+complibs = ('blosc', 'zlib')
+"""The libraries supported for compressing rows."""
+
+_codecs = {}
+
+
+def register_codec(name, dumps, loads):
+    """Register a codec for serializing the objects in `ObjectAtom` rows.
+
+    `dumps` must convert an object into a bytes-like object and `loads`
+    must convert a bytes-like object (usually a NumPy array of
+    ``uint8``) back into the object.  Registering a codec with an
+    existing name replaces it.
+
+    """
+
+    if not isinstance(name, six.string_types):
+        raise TypeError("the name of a codec must be a string")
+    _codecs[name] = (dumps, loads)
+
+
+def get_codec(name):
+    """Return the ``(dumps, loads)`` pair registered for the `name` codec."""
+
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError("object codec ``%s`` is not known; available "
+                         "codecs are: %s" % (name, sorted(_codecs)))
+
+
+def compress(data, complib, complevel):
+    """Compress the bytes-like `data` with `complib` at `complevel`."""
+
+    if complib == 'blosc':
+        from .utilsextension import blosc_compress_
+        return blosc_compress_(data, complevel)
+    elif complib == 'zlib':
+        return zlib.compress(data, complevel)
+    raise ValueError("compression library ``%s`` is not supported for "
+                     "objects; use one of %s" % (complib, list(complibs)))
+
+
+def decompress(data, complib):
+    """Decompress the bytes-like `data` compressed with `complib`."""
+
+    if complib == 'blosc':
+        from .utilsextension import blosc_decompress_
+        return blosc_decompress_(data)
+    elif complib == 'zlib':
+        return zlib.decompress(memoryview(data).tobytes())
+    raise ValueError("compression library ``%s`` is not supported for "
+                     "objects; use one of %s" % (complib, list(complibs)))
+
+
+# The default pickle codec
+# ========================
+def _pickle_dumps(obj):
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def _pickle_loads(data):
+    return pickle.loads(memoryview(data).tobytes())
+
+
+register_codec('pickle', _pickle_dumps, _pickle_loads)
+
+
+# Pickle protocol 5 with out-of-band buffers
+# ==========================================
+# A row is laid out as: the number of buffers (uint32), the size of
+# every buffer (uint64), the size of the pickle stream (uint64), the
+# pickle stream and then the buffers, each one aligned to `_ALIGNMENT`
+# bytes from the start of the row.
+_uint32 = struct.Struct('<I')
+_uint64 = struct.Struct('<Q')
+_ALIGNMENT = 16
+
+
+def _padding(pos):
+    return -pos % _ALIGNMENT
+
+
+def _pickle5_dumps(obj):
+    buffers = []
+    stream = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [buf.raw() for buf in buffers]
+    parts = [_uint32.pack(len(raws))]
+    parts.extend(_uint64.pack(raw.nbytes) for raw in raws)
+    parts.append(_uint64.pack(len(stream)))
+    parts.append(stream)
+    pos = sum(len(part) for part in parts)
+    for raw in raws:
+        padding = _padding(pos)
+        parts.append(b'\0' * padding)
+        parts.append(raw)
+        pos += padding + raw.nbytes
+    return b''.join(parts)
+
+
+def _pickle5_loads(data):
+    view = memoryview(data).cast('B')
+    if view.readonly:
+        # Arrays sharing memory with the row should be writable
+        view = memoryview(bytearray(view))
+    nbuffers = _uint32.unpack_from(view, 0)[0]
+    pos = _uint32.size
+    sizes = [_uint64.unpack_from(view, pos + i * _uint64.size)[0]
+             for i in range(nbuffers)]
+    pos += nbuffers * _uint64.size
+    streamsize = _uint64.unpack_from(view, pos)[0]
+    pos += _uint64.size
+    stream = view[pos:pos + streamsize]
+    pos += streamsize
+    buffers = []
+    for size in sizes:
+        pos += _padding(pos)
+        buffers.append(view[pos:pos + size])
+        pos += size
+    return pickle.loads(stream, buffers=buffers)
+
+
+if pickle.HIGHEST_PROTOCOL >= 5:
+    register_codec('pickle5', _pickle5_dumps, _pickle5_loads)
+
+
+# The tagged binary codec
+# =======================
+_int64 = struct.Struct('<q')
+_float64 = struct.Struct('<d')
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _tagged_encode(obj, parts):
+    type_ = type(obj)
+    if obj is None:
+        parts.append(b'N')
+    elif obj is True:
+        parts.append(b'T')
+    elif obj is False:
+        parts.append(b'F')
+    elif type_ in six.integer_types:
+        if _INT64_MIN <= obj <= _INT64_MAX:
+            parts.append(b'i')
+            parts.append(_int64.pack(obj))
+        else:
+            digits = str(obj).encode('ascii')
+            parts.append(b'I')
+            parts.append(_uint32.pack(len(digits)))
+            parts.append(digits)
+    elif type_ is float:
+        parts.append(b'f')
+        parts.append(_float64.pack(obj))
+    elif type_ is six.text_type:
+        encoded = obj.encode('utf-8')
+        parts.append(b's')
+        parts.append(_uint32.pack(len(encoded)))
+        parts.append(encoded)
+    elif type_ is bytes:
+        parts.append(b'b')
+        parts.append(_uint32.pack(len(obj)))
+        parts.append(obj)
+    elif type_ is list or type_ is tuple:
+        parts.append(b'l' if type_ is list else b't')
+        parts.append(_uint32.pack(len(obj)))
+        for item in obj:
+            _tagged_encode(item, parts)
+    elif type_ is dict:
+        parts.append(b'd')
+        parts.append(_uint32.pack(len(obj)))
+        for key, value in six.iteritems(obj):
+            _tagged_encode(key, parts)
+            _tagged_encode(value, parts)
+    else:
+        pickled = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        parts.append(b'P')
+        parts.append(_uint32.pack(len(pickled)))
+        parts.append(pickled)
+
+
+def _tagged_decode(data, pos):
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b'i':
+        return _int64.unpack_from(data, pos)[0], pos + _int64.size
+    elif tag == b'f':
+        return _float64.unpack_from(data, pos)[0], pos + _float64.size
+    elif tag == b'N':
+        return None, pos
+    elif tag == b'T':
+        return True, pos
+    elif tag == b'F':
+        return False, pos
+    elif tag in (b'l', b't'):
+        count = _uint32.unpack_from(data, pos)[0]
+        pos += _uint32.size
+        items = []
+        for i in range(count):
+            item, pos = _tagged_decode(data, pos)
+            items.append(item)
+        return (items if tag == b'l' else tuple(items)), pos
+    elif tag == b'd':
+        count = _uint32.unpack_from(data, pos)[0]
+        pos += _uint32.size
+        obj = {}
+        for i in range(count):
+            key, pos = _tagged_decode(data, pos)
+            obj[key], pos = _tagged_decode(data, pos)
+        return obj, pos
+    # The remaining types are prefixed by the length of their data
+    size = _uint32.unpack_from(data, pos)[0]
+    pos += _uint32.size
+    chunk = data[pos:pos + size]
+    pos += size
+    if tag == b's':
+        return chunk.decode('utf-8'), pos
+    elif tag == b'b':
+        return chunk, pos
+    elif tag == b'I':
+        return int(chunk.decode('ascii')), pos
+    elif tag == b'P':
+        return pickle.loads(chunk), pos
+    raise ValueError("unknown tag %r in tagged object data" % (tag,))
+
+
+def _tagged_dumps(obj):
+    parts = []
+    _tagged_encode(obj, parts)
+    return b''.join(parts)
+
+
+def _tagged_loads(data):
+    obj, pos = _tagged_decode(memoryview(data).tobytes(), 0)
+    return obj
+
+
+register_codec('tagged', _tagged_dumps, _tagged_loads)
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
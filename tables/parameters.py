@@ -64,6 +64,84 @@ bytes)."""
 SORTEDLR_MAX_SLOTS = 1 * _KB
 """The maximum number of chunks for SORTEDLR cache."""
 
+INDEX_CACHE_DIR = None
+"""Directory for the persistent bounds caches of indexes.
+
+When set, the first level (ranges) and second level (bounds) caches of
+the indexes in files opened in read-only mode are saved to files in this
+directory the first time they are needed, and then memory-mapped by
+every later query, in this and in other processes.  This avoids reading
+them again from the HDF5 file after every restart, and the operating
+system shares their pages among processes.  The files are named after
+the identity and modification time of the HDF5 file, so an updated file
+gets new caches; removing the files in the directory is always safe.
+None disables the persistent caches.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CHUNK_CACHE_SIZE = 0
+"""Size (in bytes) of the chunk cache shared by all the open files.
+
+When positive, the decompressed chunks read from the tables, arrays and
+indexes in files opened in read-only mode are kept in a process-wide
+cache (see :mod:`tables.chunkcache`), so that they are reused by other
+nodes and other handles of the same file, even after the node has been
+closed.  Least recently used chunks are evicted when the cache grows
+beyond this size, which is the largest value among the open files.
+Zero disables the cache.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CHUNK_CACHE_COMPRESSED_SIZE = 0
+"""Size (in bytes) of the compressed tier of the shared chunk cache.
+
+When positive, the chunks evicted from the shared chunk cache (see
+:data:`SHARED_CHUNK_CACHE_SIZE`) are compressed with
+:data:`SHARED_CHUNK_CACHE_COMPLIB` and kept in memory up to this size,
+and they are decompressed when requested again.  For compressible data
+this keeps several times more chunks in memory, and decompressing them
+is usually much faster than reading them from disk.  Zero disables the
+compressed tier.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CHUNK_CACHE_COMPLIB = 'blosc:lz4'
+"""The Blosc compressor used by the compressed tier of the shared chunk
+cache (see :data:`SHARED_CHUNK_CACHE_COMPRESSED_SIZE`).  Blosc uses up to
+:data:`MAX_BLOSC_THREADS` threads.
+
+.. versionadded:: 3.3
+
+"""
+
+SHARED_CHUNK_CACHE_COMPLEVEL = 5
+"""The compression level used by the compressed tier of the shared chunk
+cache (see :data:`SHARED_CHUNK_CACHE_COMPRESSED_SIZE`).
+
+.. versionadded:: 3.3
+
+"""
+
+METADATA_SNAPSHOT = False
+"""Use the metadata snapshots of files opened in read-only mode.
+
+When true, opening a file in read-only mode reads its metadata snapshot
+(a sidecar file saved by :meth:`tables.File.save_snapshot`) if it exists
+and the file has not been modified since it was saved.  Then, nodes are
+looked up and :meth:`tables.File.walk_info` lists them without reading
+their metadata from HDF5, which makes opening files with many nodes much
+faster, especially on network filesystems.
+
+.. versionadded:: 3.3
+
+"""
+
 
 # Parameters for general cache behaviour
 # --------------------------------------
@@ -177,6 +255,34 @@ be warned when the number of loaded nodes will reach the
 Finally, a value of zero means that any cache mechanism is disabled.
 """
 
+NODE_CACHE_POLICY = 'lru'
+"""Replacement policy of the node cache.
+
+With ``'lru'`` the least recently used nodes are unloaded first.  With
+``'2q'`` the cache follows the scan-resistant 2Q policy: nodes touched
+only once (e.g. while walking over many nodes) are unloaded before the
+nodes which are requested over and over again, which stay loaded.
+
+Only used when :data:`NODE_CACHE_SLOTS` is positive.
+
+.. versionadded:: 3.3
+
+"""
+
+NODE_CACHE_MEMORY = None
+"""Memory budget (in bytes) of the node cache.
+
+When not None, nodes are also unloaded when the estimated memory used
+by the loaded nodes (including their I/O buffers) exceeds this value, so
+the number of cached nodes adapts to their size.  In this case
+:data:`NODE_CACHE_SLOTS` can be set to a large value so that the budget
+is the actual limit.  Only used by the ``'2q'``
+:data:`NODE_CACHE_POLICY`.
+
+.. versionadded:: 3.3
+
+"""
+
 
 # Parameters for the I/O buffer in `Leaf` objects
 # -----------------------------------------------
@@ -189,6 +295,18 @@ BUFFER_TIMES = 100
 """The maximum buffersize/rowsize ratio before issuing a
 :exc:`tables.PerformanceWarning`."""
 
+EXPR_PIPELINE = True
+"""Whether :class:`tables.Expr` should overlap I/O with computation.
+
+When true, and on-disk objects are involved in an expression, the input
+blocks are read in advance by a background thread and the outcome is
+written by another one while the current block is being computed.  HDF5
+calls from these threads are always serialized.
+
+.. versionadded:: 3.3
+
+"""
+
 
 # Miscellaneous
 # -------------
@@ -227,6 +345,63 @@ your machine. In general, it is a good idea to set this to the number of
 cores in your machine or, when your machine has many of them (e.g. > 8),
 perhaps stay at 8 at maximum.  In general, 2 threads is a good tradeoff."""
 
+MAX_REDUCTION_THREADS = 2
+"""The maximum number of threads that PyTables should use for computing
+the partial results of reductions over datasets (like
+:meth:`tables.Array.sum`).  If `None`, it is automatically set to the
+number of cores in your machine.  A value of 1 does every computation
+in the calling thread.
+
+.. versionadded:: 3.3
+
+"""
+
+CONCURRENT_READS = False
+"""Let several threads read from files opened in read-only mode.
+
+When true, a file opened in read-only mode may be shared by threads
+reading from it at the same time: looking nodes up, loading them and
+setting queries up is serialized by a lock of the file, while data is
+read without holding it.  This parameter has no effect on
+files opened in other modes, which must be used from a single thread.
+
+The GIL is released during the HDF5 calls only when HDF5 has been built
+in thread-safe mode (see
+``tables.hdf5extension.HAVE_THREADSAFE_LIBRARY``); otherwise the GIL
+is held during all HDF5 calls while such a file is open, so that they
+never run at the same time.  Iterators (like those returned by
+:meth:`tables.Table.where` or :meth:`tables.Table.iterrows`) and the
+:class:`tables.tableextension.Row` objects they yield must not be shared
+between threads.
+
+.. versionadded:: 3.3
+
+"""
+
+SWMR = False
+"""Open files in single-writer/multiple-reader (SWMR) mode.
+
+When true, a file opened in read-only mode can be read while a single
+writer process appends data to it.  Readers see the rows that the
+writer has flushed after calling :meth:`tables.Leaf.refresh` on a leaf,
+which updates its number of rows without reopening the file.
+
+Files opened in the other modes are written with the latest HDF5 format,
+which SWMR needs.  Writing in SWMR mode starts on opening existing files,
+and with :meth:`tables.File.start_swmr_write` on new files, once their
+nodes have been created.  After that, data can only be appended to or
+modified in existing datasets: new nodes and attributes can not be
+created, and rows appended to indexed tables are not added to their
+indexes (queries search them in-kernel).
+
+SWMR needs HDF5 1.10 or later and a filesystem with POSIX semantics (see
+``tables.hdf5extension.HAVE_SWMR_SUPPORT``).  Metadata snapshots and the
+caches shared between files are not used with SWMR files.
+
+.. versionadded:: 3.3
+
+"""
+
 USER_BLOCK_SIZE = 0
 """Sets the user block size of a file.
 
@@ -404,12 +579,23 @@ If this option is passed to the :func:`tables.open_file` function then the
 returned file object is set up using the specified image.
 
 A file image can be retrieved from an existing (and opened) file object
-using the :meth:`tables.File.get_file_image` method.
+using the :meth:`tables.File.get_file_image` method, and an image of a
+subtree with the :meth:`tables.Group._f_to_image` method.
+
+The image may also be any object supporting the buffer protocol (e.g. a
+``memoryview``, a ``bytearray``, a NumPy array or a shared memory
+segment).  Files opened in read-only mode use the image in place, without
+copying it, and the buffer is locked until the file is closed; in the
+other modes, HDF5 works on a copy of the image.
 
 .. note:: requires HDF5 >= 1.8.9.
 
 .. versionadded:: 3.0
 
+.. versionchanged:: 3.3
+   Objects supporting the buffer protocol are accepted, and they are not
+   copied in read-only mode.
+
 """
 
 DRIVER_SPLIT_META_EXT = '-m.h5'
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Here is defined the ReaderPool class.
+
+A `ReaderPool` keeps a file open in read-only mode in a pool of worker
+processes, so that their node caches, index bounds and chunk caches stay
+warm between requests.  Reads, queries and expressions on the file are
+split along the main dimension of the nodes among the workers, which
+work in parallel without competing for the GIL, and the partial results
+are put together in order.  The arrays computed by the workers are
+passed back through shared memory segments when
+`multiprocessing.shared_memory` is available (Python 3.8 or later), and
+pickled otherwise.
+
+"""
+
+from __future__ import absolute_import
+
+import multiprocessing
+import multiprocessing.util
+
+import numpy
+
+import six
+from six.moves import range
+
+from .exceptions import ClosedFileError
+from .utils import detect_number_of_cores, get_frame_vars
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:  # Python < 3.8
+    shared_memory = resource_tracker = None
+
+
+_file = None
+"""The file opened by the worker (only in worker processes)."""
+
+
+class _NodeRef(object):
+    """A reference to a leaf or a column of a table in the file.
+
+    References replace the nodes and columns given as variables of
+    conditions and expressions, which cannot be sent to the workers.
+
+    """
+
+    def __init__(self, path, colname=None):
+        self.path = path
+        self.colname = colname
+
+    def resolve(self, h5file):
+        node = h5file.get_node(self.path)
+        if self.colname is not None:
+            return node.cols._f_col(self.colname)
+        return node
+
+
+def _to_ref(value):
+    """Replace a node or a column `value` by a `_NodeRef`."""
+
+    from .leaf import Leaf
+    from .table import Column
+
+    if isinstance(value, Leaf):
+        return _NodeRef(value._v_pathname)
+    if isinstance(value, Column):
+        return _NodeRef(value.table._v_pathname, value.pathname)
+    return value
+
+
+def _init_worker(filename, kwargs):
+    """Open the file for the pool in a worker process."""
+
+    global _file
+
+    from .file import open_file
+
+    _file = open_file(filename, 'r', **kwargs)
+    # Close the file when the worker exits
+    multiprocessing.util.Finalize(None, _file.close, exitpriority=10)
+
+
+def _resolve_vars(uservars):
+    if uservars is None:
+        return None
+    return dict((name, value.resolve(_file)
+                 if isinstance(value, _NodeRef) else value)
+                for (name, value) in six.iteritems(uservars))
+
+
+def _export(result):
+    """Prepare the `result` of a request for sending it to the parent.
+
+    Arrays are copied to a new shared memory segment and a
+    ``(name, (dtype, shape))`` pair is returned, where `name` is the name
+    of the segment.  The segment is unlinked by the parent.  Other
+    results (and arrays when shared memory is not available) are
+    returned as ``(None, result)`` and pickled.
+
+    """
+
+    if (shared_memory is None or not isinstance(result, numpy.ndarray) or
+            result.dtype.hasobject or result.nbytes == 0):
+        return (None, result)
+    segment = shared_memory.SharedMemory(create=True, size=result.nbytes)
+    try:
+        view = numpy.ndarray(result.shape, result.dtype, buffer=segment.buf)
+        view[...] = result
+        del view
+    finally:
+        segment.close()
+    return (segment.name, (result.dtype, result.shape))
+
+
+def _describe(path):
+    node = _file.get_node(path)
+    if hasattr(node, 'colinstances'):
+        return (node.nrows, tuple(node.colinstances), node.maindim)
+    return (node.nrows, (), node.maindim)
+
+
+def _describe_expr(args):
+    from .expression import Expr
+
+    (expression, uservars) = args
+    expr = Expr(expression, _resolve_vars(uservars))
+    return (expr.shape, expr.maindim)
+
+
+def _read(args):
+    (path, start, stop, step, field) = args
+    node = _file.get_node(path)
+    if field is None:
+        return _export(node.read(start, stop, step))
+    return _export(node.read(start, stop, step, field))
+
+
+def _read_where(args):
+    (path, condition, condvars, field, start, stop, step) = args
+    node = _file.get_node(path)
+    return _export(node.read_where(condition, _resolve_vars(condvars),
+                                   field, start, stop, step))
+
+
+def _read_coordinates(args):
+    (path, coords, field) = args
+    node = _file.get_node(path)
+    if hasattr(node, 'read_coordinates'):
+        return _export(node.read_coordinates(coords, field))
+    return _export(node[coords])
+
+
+def _eval(args):
+    from .expression import Expr
+
+    (expression, uservars, start, stop, step) = args
+    expr = Expr(expression, _resolve_vars(uservars))
+    expr.set_inputs_range(start, stop, step)
+    return _export(expr.eval())
+
+
+class ReaderPool(object):
+    """A pool of processes reading a file in parallel.
+
+    The file in `filename` is opened in read-only mode in every one of
+    `processes` worker processes (by default, as many as cores), with
+    the additional keyword arguments in `kwargs` (see
+    :func:`open_file`).  The file is kept open in the workers, so their
+    node caches, index bounds and chunk caches stay warm between
+    requests.
+
+    Requests name nodes by their paths (or are given nodes from any
+    handle of the same file).  Their selections are split along the main
+    dimension of the nodes among the workers, and the partial results
+    are put together in order.  Arrays are passed back from the workers
+    through shared memory segments in Python 3.8 or later.
+
+    Variables of conditions and expressions are taken from the
+    `condvars` or `uservars` mappings or, when they are None, from the
+    namespace of the caller.  Their values are sent to the workers, so
+    they must be picklable, except for leaves and columns of tables in
+    the same file, which are replaced by references to them.
+
+    Reader pools can be used as context managers, which stop the workers
+    on exit.
+
+    Examples
+    --------
+
+    ::
+
+        with tables.ReaderPool('events.h5', processes=8) as pool:
+            hot = pool.read_where('/events', '(time > t0) & (energy > 100)')
+            image = pool.read('/images', 1000, 2000)
+
+    .. versionadded:: 3.3
+
+    """
+
+    def __init__(self, filename, processes=None, **kwargs):
+        if processes is None:
+            processes = detect_number_of_cores()
+        self.filename = filename
+        """The name of the file read by the pool."""
+        self.processes = processes
+        """The number of worker processes."""
+        if resource_tracker is not None:
+            # Make the workers share the tracker of shared memory
+            # segments with this process, which unlinks them
+            resource_tracker.ensure_running()
+        self._pool = multiprocessing.Pool(processes, _init_worker,
+                                          (filename, kwargs))
+        self._descrs = {}
+        """Maps the paths of nodes to their ``(nrows, colnames)``."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return "<%s for %r with %d processes>" % (
+            self.__class__.__name__, self.filename, self.processes)
+
+    def close(self):
+        """Close the file in the workers and stop them."""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            raise ClosedFileError("the reader pool is closed")
+        return self._pool
+
+    def _describe(self, path):
+        descr = self._descrs.get(path)
+        if descr is None:
+            descr = self._get_pool().apply(_describe, (path,))
+            self._descrs[path] = descr
+        return descr
+
+    def _split(self, nrows, start, stop, step):
+        """Split a selection of `nrows` rows among the workers.
+
+        A list of ``(start, stop, step)`` ranges is returned, with one
+        range at least (maybe empty) so that results have the right type.
+
+        """
+
+        (start, stop, step) = slice(start, stop, step).indices(nrows)
+        if step <= 0:
+            raise ValueError("the step of reader pool selections must be "
+                             "positive")
+        nselected = len(range(start, stop, step))
+        chunklen = max(-(-nselected // self.processes), 1)
+        ranges = []
+        for first in range(0, max(nselected, 1), chunklen):
+            lstart = start + first * step
+            lstop = min(stop, lstart + chunklen * step)
+            ranges.append((lstart, lstop, step))
+        return ranges
+
+    def _run(self, func, requests, axis=0):
+        """Run the `requests` in the workers and gather their results."""
+
+        exported = self._get_pool().map(func, requests, chunksize=1)
+        segments = []
+        results = []
+        try:
+            for (name, value) in exported:
+                if name is None:
+                    results.append(value)
+                    continue
+                segment = shared_memory.SharedMemory(name)
+                segments.append(segment)
+                (dtype, shape) = value
+                results.append(
+                    numpy.ndarray(shape, dtype, buffer=segment.buf))
+            if isinstance(results[0], list):
+                return [row for result in results for row in result]
+            if len(results) == 1:
+                # Copy it out of the shared memory segment (if any)
+                return numpy.array(results[0]) if segments else results[0]
+            return numpy.concatenate(results, axis)
+        finally:
+            # Views must be released before closing the segments
+            del results[:]
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def read(self, node, start=None, stop=None, step=None, field=None):
+        """Read data from the `node` (a path or a leaf).
+
+        This works like the ``read()`` method of the leaf (e.g.
+        :meth:`Table.read`), with a positive `step`.  The rows are read
+        by the workers in parallel.
+
+        """
+
+        path = getattr(node, '_v_pathname', node)
+        (nrows, colnames, maindim) = self._describe(path)
+        requests = [(path, lstart, lstop, lstep, field)
+                    for (lstart, lstop, lstep)
+                    in self._split(nrows, start, stop, step)]
+        return self._run(_read, requests, axis=maindim)
+
+    def read_where(self, node, condition, condvars=None, field=None,
+                   start=None, stop=None, step=None):
+        """Read the rows of the table `node` fulfilling the `condition`.
+
+        This works like :meth:`Table.read_where` on the table in `node`
+        (a path or a table), with a positive `step`.  The rows are
+        queried by the workers in parallel.
+
+        """
+
+        path = getattr(node, '_v_pathname', node)
+        (nrows, colnames, maindim) = self._describe(path)
+        if condvars is None:
+            condvars = get_frame_vars(condition, colnames, depth=1)
+        condvars = dict((name, _to_ref(value))
+                        for (name, value) in six.iteritems(condvars))
+        requests = [(path, condition, condvars, field, lstart, lstop, lstep)
+                    for (lstart, lstop, lstep)
+                    in self._split(nrows, start, stop, step)]
+        return self._run(_read_where, requests)
+
+    def read_coordinates(self, node, coords, field=None):
+        """Read the rows of `node` in the `coords` coordinates.
+
+        This works like :meth:`Table.read_coordinates` on the table in
+        `node` (a path or a leaf), and like point selections in other
+        leaves.  `coords` is a sequence of row coordinates or a boolean
+        mask of rows, and the coordinates are split among the workers.
+
+        """
+
+        path = getattr(node, '_v_pathname', node)
+        coords = numpy.asarray(coords)
+        if coords.dtype.kind == 'b':
+            coords = numpy.flatnonzero(coords)
+        coords = coords.astype(numpy.int64)
+        nchunks = max(min(self.processes, len(coords)), 1)
+        requests = [(path, chunk, field)
+                    for chunk in numpy.array_split(coords, nchunks)]
+        return self._run(_read_coordinates, requests)
+
+    def eval(self, expression, uservars=None, start=None, stop=None,
+             step=None):
+        """Evaluate the `expression` on nodes of the file.
+
+        This works like evaluating ``Expr(expression, uservars)`` (see
+        :class:`Expr`) on the range of its inputs given by `start`,
+        `stop` and a positive `step` (see :meth:`Expr.set_inputs_range`),
+        and the outcome is returned.  The range is split along the main
+        dimension of the inputs among the workers.
+
+        """
+
+        if uservars is None:
+            uservars = get_frame_vars(expression, depth=1)
+        uservars = dict((name, _to_ref(value))
+                        for (name, value) in six.iteritems(uservars))
+        (shape, maindim) = self._get_pool().apply(
+            _describe_expr, ((expression, uservars),))
+        if not shape:
+            return self._run(_eval, [(expression, uservars,
+                                      start, stop, step)])
+        requests = [(expression, uservars, lstart, lstop, lstep)
+                    for (lstart, lstop, lstep)
+                    in self._split(shape[maindim], start, stop, step)]
+        return self._run(_eval, requests, axis=maindim)
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Out-of-core reductions over homogeneous datasets.
+
+The machinery here streams blocks along the main dimension of a
+dataset, reduces every block in a pool of threads and combines the
+partial results *in order* in the calling thread, so the outcome does
+not depend on the number of threads in use.  Sums are accumulated in a
+compensated (Kahan) way across blocks and variances are merged with the
+pairwise algorithm by Chan et al., so that very long datasets do not
+suffer from the precision losses of naive accumulation.
+
+"""
+
+from __future__ import absolute_import
+
+import collections
+from multiprocessing.pool import ThreadPool
+
+import numpy
+
+
+# The reductions supported by `reduce_blocks()`
+reductions = ('sum', 'mean', 'var', 'std', 'min', 'max', 'argmin', 'argmax')
+
+
+def _check_axis(axis, ndim):
+    """Normalize `axis` for an array with `ndim` dimensions."""
+
+    if axis is None:
+        return None
+    axis = int(axis)
+    if axis < 0:
+        axis += ndim
+    if axis < 0 or axis >= ndim:
+        raise ValueError("axis %d is out of bounds for a dataset of "
+                         "dimension %d" % (axis, ndim))
+    return axis
+
+
+def _result_dtype(op, dtype):
+    """Get the type NumPy would give for `op` applied over `dtype`."""
+
+    return getattr(numpy.zeros(1, dtype=dtype), op)().dtype
+
+
+def _accum_dtype(dtype):
+    """Get the type used for accumulating sums over `dtype` values."""
+
+    if dtype.kind == 'f' and dtype.itemsize < 8:
+        return numpy.dtype('float64')
+    if dtype.kind == 'c' and dtype.itemsize < 16:
+        return numpy.dtype('complex128')
+    return _result_dtype('sum', dtype)
+
+
+def _kahan_add(total, comp, value):
+    """Add `value` to `total` with compensation term `comp`."""
+
+    y = value - comp
+    t = total + y
+    comp = (t - total) - y
+    return t, comp
+
+
+def _abs2(x):
+    """The squared modulus of `x` (real even for complex `x`)."""
+
+    if numpy.iscomplexobj(x):
+        return x.real ** 2 + x.imag ** 2
+    return x * x
+
+
+class _AlongReduction(object):
+    """Reduction over the main dimension (or over every dimension).
+
+    Blocks come in order and `offset` is the position of the first row
+    of the block in the selection being reduced.
+
+    """
+
+    def __init__(self, op, axis, maindim, shape, dtype, ddof=0):
+        self.op = op
+        self.axis = axis
+        self.maindim = maindim
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.ddof = ddof
+        if op == 'sum':
+            self.accum = _accum_dtype(dtype)
+        elif dtype.kind in 'biu':
+            # Means are always computed in floating point
+            self.accum = numpy.dtype('float64')
+        else:
+            self.accum = _accum_dtype(dtype)
+        self.isfloat = dtype.kind in 'fc'
+
+    def _count(self, block):
+        if self.axis is None:
+            return block.size
+        return block.shape[self.axis]
+
+    def partial(self, block, offset):
+        op, axis = self.op, self.axis
+        if op == 'sum':
+            return block.sum(axis=axis, dtype=self.accum)
+        elif op == 'mean':
+            return (block.sum(axis=axis, dtype=self.accum),
+                    self._count(block))
+        elif op in ('var', 'std'):
+            mean = block.mean(axis=axis, dtype=self.accum)
+            if axis is None:
+                dev = block - mean
+            else:
+                dev = block - numpy.expand_dims(mean, axis)
+            return (self._count(block), mean, _abs2(dev).sum(axis=axis))
+        elif op in ('min', 'max'):
+            return getattr(block, op)(axis=axis)
+        # argmin, argmax
+        idx = getattr(block, op)(axis=axis)
+        if axis is None:
+            val = block.flat[idx]
+            coords = list(numpy.unravel_index(idx, block.shape))
+            coords[self.maindim] += offset
+            idx = numpy.ravel_multi_index(coords, self.shape)
+            return (val, idx)
+        val = getattr(block, op[3:])(axis=axis)
+        return (val, idx + offset)
+
+    def _improves(self, new, old):
+        """Where `new` values should replace `old` ones in arg reductions."""
+
+        if self.op == 'argmin':
+            better = new < old
+        else:
+            better = new > old
+        if self.isfloat:
+            # The first NaN wins, as in NumPy
+            better = (better | numpy.isnan(new)) & ~numpy.isnan(old)
+        return better
+
+    def combine(self, acc, part):
+        if acc is None:
+            if self.op == 'sum':
+                return (part, numpy.zeros_like(part))
+            elif self.op == 'mean':
+                return (part[0], numpy.zeros_like(part[0]), part[1])
+            return part
+        op = self.op
+        if op == 'sum':
+            return _kahan_add(acc[0], acc[1], part)
+        elif op == 'mean':
+            total, comp = _kahan_add(acc[0], acc[1], part[0])
+            return (total, comp, acc[2] + part[1])
+        elif op in ('var', 'std'):
+            na, meana, m2a = acc
+            nb, meanb, m2b = part
+            n = na + nb
+            delta = meanb - meana
+            mean = meana + delta * (float(nb) / n)
+            m2 = m2a + m2b + _abs2(delta) * (float(na) * nb / n)
+            return (n, mean, m2)
+        elif op == 'min':
+            return numpy.minimum(acc, part)
+        elif op == 'max':
+            return numpy.maximum(acc, part)
+        # argmin, argmax
+        better = self._improves(part[0], acc[0])
+        if self.axis is None:
+            if not better and not self._improves(acc[0], part[0]):
+                # On ties the lowest flat index wins, as in NumPy, but
+                # blocks along a main dimension other than the first one
+                # are not in flat index order.
+                return part if part[1] < acc[1] else acc
+            return part if better else acc
+        return (numpy.where(better, part[0], acc[0]),
+                numpy.where(better, part[1], acc[1]))
+
+    def merge(self, acc, other):
+        """Merge the accumulators of two consecutive selections."""
+
+        if acc is None:
+            return other
+        elif other is None:
+            return acc
+        op = self.op
+        if op == 'sum':
+            # The exact value of a compensated sum is ``total - comp``
+            return _kahan_add(acc[0], acc[1], other[0] - other[1])
+        elif op == 'mean':
+            total, comp = _kahan_add(acc[0], acc[1], other[0] - other[1])
+            return (total, comp, acc[2] + other[2])
+        # Other accumulators have the same form as partial results
+        return self.combine(acc, other)
+
+    def finalize(self, acc):
+        op = self.op
+        rdtype = _result_dtype(op, self.dtype)
+        if op == 'sum':
+            result = numpy.asarray(acc[0]).astype(rdtype)
+        elif op == 'mean':
+            result = numpy.asarray(acc[0] / float(acc[2])).astype(rdtype)
+        elif op in ('var', 'std'):
+            n, mean, m2 = acc
+            result = m2 / float(max(n - self.ddof, 0))
+            if op == 'std':
+                result = numpy.sqrt(result)
+            result = numpy.asarray(result).astype(rdtype)
+        elif op in ('min', 'max'):
+            result = numpy.asarray(acc)
+        else:
+            result = numpy.asarray(acc[1]).astype(rdtype)
+        if result.shape == ():
+            result = result[()]
+        return result
+
+
+class _OrthogonalReduction(object):
+    """Reduction over a dimension other than the main one.
+
+    Every block holds complete lines along the reduced axis, so blocks
+    are reduced independently and the results are concatenated.
+
+    """
+
+    def __init__(self, op, axis, maindim, ddof=0):
+        self.op = op
+        self.axis = axis
+        # Position of the main dimension once `axis` has been removed
+        self.outdim = maindim - 1 if axis < maindim else maindim
+        self.kwargs = {'ddof': ddof} if op in ('var', 'std') else {}
+
+    def partial(self, block, offset):
+        return getattr(numpy, self.op)(block, axis=self.axis, **self.kwargs)
+
+    def combine(self, acc, part):
+        if acc is None:
+            acc = []
+        acc.append(part)
+        return acc
+
+    def merge(self, acc, other):
+        if acc is None:
+            return other
+        elif other is None:
+            return acc
+        return acc + other
+
+    def finalize(self, acc):
+        return numpy.concatenate(acc, axis=self.outdim)
+
+
+def _check_reduction(op, dtype):
+    """Check that the `op` reduction applies to `dtype` and return it."""
+
+    if op not in reductions:
+        raise ValueError("unsupported reduction: %r" % (op,))
+    dtype = numpy.dtype(dtype)
+    if op not in ('min', 'max', 'argmin', 'argmax') and \
+            dtype.kind not in 'biufc':
+        raise TypeError("cannot compute the %s of a dataset with type %s"
+                        % (op, dtype))
+    return dtype
+
+
+def make_reduction(op, shape, maindim, dtype, axis=None, ddof=0):
+    """Get an object computing the `op` reduction by blocks.
+
+    The arguments have the same meaning as in :func:`reduce_blocks`,
+    but `shape` must not be empty and `maindim` not None.  The object
+    has ``partial(block, offset)``, ``combine(acc, part)``, ``merge(acc,
+    other)`` and ``finalize(acc)`` methods: partial results of blocks
+    are combined into accumulators (see :func:`accumulate`), the
+    accumulators of consecutive selections can be merged, and the final
+    accumulator gives the result.
+
+    """
+
+    dtype = _check_reduction(op, dtype)
+    axis = _check_axis(axis, len(shape))
+    if axis is None or axis == maindim:
+        return _AlongReduction(op, axis, maindim, shape, dtype, ddof)
+    return _OrthogonalReduction(op, axis, maindim, ddof)
+
+
+def accumulate(reduction, blocks):
+    """Accumulate the partial results of `reduction` over `blocks`.
+
+    `blocks` is an iterable in the format expected by
+    :func:`reduce_blocks`.  None is returned if there are no blocks.
+
+    """
+
+    acc = None
+    for offset, block in blocks:
+        acc = reduction.combine(acc, reduction.partial(block, offset))
+    return acc
+
+
+def reduce_blocks(op, blocks, shape, maindim, dtype, axis=None,
+                  nthreads=1, ddof=0):
+    """Reduce a sequence of `blocks` with the `op` reduction.
+
+    `blocks` is an iterable of ``(offset, ndarray)`` pairs, where the
+    arrays are consecutive slices over the main dimension `maindim` of
+    a (virtual) array of the given `shape` and `dtype`, and `offset` is
+    the position of the first row of the slice.  `axis` has the same
+    meaning as in NumPy reductions.  When `nthreads` is greater than
+    one, blocks are reduced in a pool of threads while the next ones
+    are being produced.
+
+    """
+
+    dtype = _check_reduction(op, dtype)
+    axis = _check_axis(axis, len(shape))
+
+    if 0 in shape or maindim is None:
+        # Let NumPy decide what to return for empty or scalar selections
+        data = numpy.empty(shape, dtype=dtype)
+        for offset, block in blocks:
+            data = block
+        kwargs = {'ddof': ddof} if op in ('var', 'std') else {}
+        return getattr(numpy, op)(data, axis=axis, **kwargs)
+
+    reduction = make_reduction(op, shape, maindim, dtype, axis, ddof)
+    if nthreads is None or nthreads <= 1:
+        return reduction.finalize(accumulate(reduction, blocks))
+
+    # Blocks are produced (i.e. read) in the calling thread only, and
+    # the amount of in-flight blocks is bounded to limit memory usage.
+    acc = None
+    pool = ThreadPool(nthreads)
+    try:
+        pending = collections.deque()
+        for offset, block in blocks:
+            if len(pending) >= 2 * nthreads:
+                acc = reduction.combine(acc, pending.popleft().get())
+            pending.append(pool.apply_async(reduction.partial,
+                                            (block, offset)))
+        while pending:
+            acc = reduction.combine(acc, pending.popleft().get())
+    finally:
+        pool.terminate()
+        pool.join()
+    return reduction.finalize(acc)
+
+
+class Reducible(object):
+    """Mixin providing out-of-core reductions for homogeneous datasets.
+
+    Classes using it must implement a ``_g_reduction_blocks(start, stop,
+    step)`` method returning a ``(shape, maindim, dtype, blocks,
+    nthreads)`` tuple, where `blocks` is an iterable in the format
+    expected by :func:`reduce_blocks`.
+
+    All the reductions accept the *start*, *stop* and *step* parameters
+    with the same meaning as in the ``read()`` methods, so that only a
+    range of rows in the main dimension is considered.  The dataset is
+    read by blocks aligned with its chunkshape, so that the whole data
+    never needs to fit in memory.
+
+    """
+
+    def _reduce(self, op, axis, start, stop, step, ddof=0):
+        shape, maindim, dtype, blocks, nthreads = \
+            self._g_reduction_blocks(start, stop, step)
+        return reduce_blocks(op, blocks, shape, maindim, dtype, axis,
+                             nthreads, ddof)
+
+    def sum(self, axis=None, start=None, stop=None, step=None):
+        """Sum of the elements over the given *axis*.
+
+        The summation is done in a compensated way and with a wider
+        type for single precision floats, so that the result is
+        accurate even for very long datasets.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('sum', axis, start, stop, step)
+
+    def mean(self, axis=None, start=None, stop=None, step=None):
+        """Arithmetic mean of the elements over the given *axis*.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('mean', axis, start, stop, step)
+
+    def var(self, axis=None, start=None, stop=None, step=None, ddof=0):
+        """Variance of the elements over the given *axis*.
+
+        *ddof* means delta degrees of freedom, as in :func:`numpy.var`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('var', axis, start, stop, step, ddof)
+
+    def std(self, axis=None, start=None, stop=None, step=None, ddof=0):
+        """Standard deviation of the elements over the given *axis*.
+
+        *ddof* means delta degrees of freedom, as in :func:`numpy.std`.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('std', axis, start, stop, step, ddof)
+
+    def min(self, axis=None, start=None, stop=None, step=None):
+        """Minimum of the elements over the given *axis*.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('min', axis, start, stop, step)
+
+    def max(self, axis=None, start=None, stop=None, step=None):
+        """Maximum of the elements over the given *axis*.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('max', axis, start, stop, step)
+
+    def argmin(self, axis=None, start=None, stop=None, step=None):
+        """Indices of the minimum values over the given *axis*.
+
+        As in NumPy, when *axis* is None the index refers to the
+        flattened selection.  Indices are relative to *start*.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('argmin', axis, start, stop, step)
+
+    def argmax(self, axis=None, start=None, stop=None, step=None):
+        """Indices of the maximum values over the given *axis*.
+
+        As in NumPy, when *axis* is None the index refers to the
+        flattened selection.  Indices are relative to *start*.
+
+        .. versionadded:: 3.3
+
+        """
+
+        return self._reduce('argmax', axis, start, stop, step)
+
+
+def iter_blocks(read, plan, start, stop, step):
+    """Yield ``(offset, block)`` pairs by calling ``read(start, stop)``.
+
+    Block limits are taken from `plan` (a `BlockPlan` instance).
+
+    """
+
+    for start2, stop2 in plan.iter_slices(start, stop, step):
+        yield (start2 - start) // step, read(start2, stop2)
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
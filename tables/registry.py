@@ -31,11 +31,53 @@ Misc variables:
 # Important: no modules from PyTables should be imported here
 # (but standard modules are OK), since the main reason for this module
 # is avoiding circular imports!
+import importlib
 
 __docformat__ = 'reStructuredText'
 """The format of documentation strings in this module."""
 
-class_name_dict = {}
+
+class _LazyClassDict(dict):
+    """A mapping of classes loading the modules of missing classes.
+
+    Modules defining node classes which are seldom used (e.g. the
+    indexing machinery) are not imported with the package.  Looking up
+    one of their classes here imports the module of the class listed in
+    `lazy_modules`, which registers the class.
+
+    """
+
+    def __init__(self, lazy_modules):
+        super(_LazyClassDict, self).__init__()
+        self.lazy_modules = lazy_modules
+
+    def _load(self, key):
+        modname = self.lazy_modules.get(key)
+        if modname is None:
+            return False
+        importlib.import_module(modname)
+        return dict.__contains__(self, key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self._load(key)
+
+    def __missing__(self, key):
+        if self._load(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+
+class_name_dict = _LazyClassDict({
+    'Table': 'tables.table',
+    'Index': 'tables.index', 'IndexesDescG': 'tables.index',
+    'IndexesTableG': 'tables.index', 'OldIndex': 'tables.index',
+    'CacheArray': 'tables.indexes', 'LastRowArray': 'tables.indexes',
+    'IndexArray': 'tables.indexes'})
 """Node class name to class object mapping.
 
 This dictionary maps class names (e.g. ``'Group'``) to actual class
@@ -48,7 +90,12 @@ can be replaced when the module that defines them is reloaded.
 
 """
 
-class_id_dict = {}
+class_id_dict = _LazyClassDict({
+    'TABLE': 'tables.table',
+    'INDEX': 'tables.index', 'DINDEX': 'tables.index',
+    'TINDEX': 'tables.index', 'CINDEX': 'tables.index',
+    'CACHEARRAY': 'tables.indexes', 'LASTROWARRAY': 'tables.indexes',
+    'INDEXARRAY': 'tables.indexes'})
 """Class identifier to class object mapping.
 
 This dictionary maps class identifiers (e.g. ``'GROUP'``) to actual
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+########################################################################
+#
+# License: BSD
+# Created: October 19, 2026
+# Author: PyTables Developers
+#
+# $Id$
+#
+########################################################################
+
+"""Metadata snapshots of files for opening large hierarchies quickly.
+
+Looking nodes up in a file with many nodes takes many small metadata
+reads from HDF5 (links, object headers and the ``CLASS`` attributes
+which tell the class of every node), and every new process repeats
+them.  These reads are slow on network filesystems.
+
+A metadata snapshot is a compact sidecar file, saved next to the HDF5
+file by :meth:`File.save_snapshot`, with the :class:`NodeInfo` records
+of all the visible nodes in the file (their paths, classes, shapes,
+dtypes, chunkshapes, filters and storage sizes).  Files opened in
+read-only mode with :data:`tables.parameters.METADATA_SNAPSHOT` read the
+snapshot at once, and then resolve paths, tell the classes of nodes and
+walk the hierarchy with `File.walk_info()` without reading any of that
+metadata from HDF5.  A snapshot records the size and modification time
+of its file, and it is only used when they still match.
+
+Snapshots are stored as compressed JSON data, which can be read without
+running any code from the sidecar file: dtypes are stored as their type
+strings (or the fields of structured dtypes) and filters as the values
+of their parameters.
+
+"""
+
+from __future__ import absolute_import
+
+import os
+import json
+import zlib
+import tempfile
+
+import numpy
+
+import six
+
+from .filters import Filters
+from .path import join_path, split_path, isvisiblepath
+from .utils import file_identity, SizeType
+
+
+FORMAT_VERSION = 2
+"""The version of the format of snapshot files."""
+
+SUFFIX = '.ptsnap'
+"""The suffix added to the name of a file to name its snapshot."""
+
+
+def sidecar_path(filename):
+    """Return the path of the snapshot of the HDF5 file in `filename`."""
+
+    return filename + SUFFIX
+
+
+def dtype_to_data(dtype):
+    """Convert a NumPy `dtype` (or None) to data which JSON can store."""
+
+    if dtype is None:
+        return None
+    if dtype.fields is not None:
+        return {'names': list(dtype.names),
+                'formats': [dtype_to_data(dtype.fields[name][0])
+                            for name in dtype.names],
+                'offsets': [dtype.fields[name][1] for name in dtype.names],
+                'itemsize': dtype.itemsize}
+    if dtype.subdtype is not None:
+        (base, shape) = dtype.subdtype
+        return {'base': dtype_to_data(base), 'shape': list(shape)}
+    return dtype.str
+
+
+def dtype_from_data(data):
+    """Rebuild the NumPy dtype stored in `data` by `dtype_to_data()`."""
+
+    if data is None:
+        return None
+    if isinstance(data, six.string_types):
+        return numpy.dtype(str(data))
+    if 'base' in data:
+        return numpy.dtype((dtype_from_data(data['base']),
+                            tuple(data['shape'])))
+    return numpy.dtype({'names': [str(name) for name in data['names']],
+                        'formats': [dtype_from_data(fmt)
+                                    for fmt in data['formats']],
+                        'offsets': data['offsets'],
+                        'itemsize': data['itemsize']})
+
+
+def filters_to_data(filters):
+    """Convert a `Filters` instance (or None) to data which JSON can store."""
+
+    if filters is None:
+        return None
+    lsd = filters.least_significant_digit
+    return {'complevel': filters.complevel,
+            'complib': filters.complib,
+            'shuffle': filters.shuffle,
+            'fletcher32': filters.fletcher32,
+            'least_significant_digit': None if lsd is None else int(lsd)}
+
+
+def filters_from_data(data):
+    """Rebuild the `Filters` instance stored in `data`."""
+
+    if data is None:
+        return None
+    kwargs = dict((str(key), value) for (key, value) in six.iteritems(data))
+    if kwargs['complevel'] < 0:
+        # Unsupported libraries get a meaningless level (see `Filters`)
+        kwargs['complevel'] = 1
+    return Filters(_new=False, **kwargs)
+
+
+def _int_or_none(value):
+    if value is None:
+        return None
+    return int(value)
+
+
+def _shape_to_data(shape):
+    if shape is None:
+        return None
+    return [int(length) for length in shape]
+
+
+def _shape_from_data(data):
+    if data is None:
+        return None
+    return tuple(SizeType(length) for length in data)
+
+
+def file_stamp(filename, mode, params):
+    """Return the stamp of a file which snapshots are validated with.
+
+    The stamp is made of the size and modification time of the file.
+    None is returned when snapshots can not be used with the file (see
+    `tables.utils.file_identity()`).
+
+    """
+
+    identity = file_identity(filename, mode, params)
+    if identity is None:
+        return None
+    return identity[2:]
+
+
+class MetadataSnapshot(object):
+    """The metadata of the visible nodes in a file.
+
+    `entries` is a sequence of ``(kind, info)`` pairs, where `info` is
+    the `NodeInfo` record of a node with its HDF5 path (i.e. not
+    relative to a user entry point) and `kind` the type of node as
+    returned by `Group._g_check_has_child()`.  The snapshot covers the
+    visible nodes under the `root` HDF5 path, taken from a file with
+    the `stamp` and the `sys_attrs` value of the
+    :data:`tables.parameters.PYTABLES_SYS_ATTRS` parameter.
+
+    """
+
+    def __init__(self, entries, stamp, root='/', sys_attrs=True):
+        self.stamp = stamp
+        self.root = root
+        self.sys_attrs = sys_attrs
+        self._entries = dict((info.path, (kind, info))
+                             for (kind, info) in entries)
+        self._children = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def get_node_type(self, path):
+        """Return the type of the node in the HDF5 `path`.
+
+        The type is one of those returned by
+        `Group._g_check_has_child()`, and ``'NoSuchNode'`` if the path
+        is visible and its parent is a group in the snapshot.  None is
+        returned when the snapshot does not know (e.g. for hidden nodes
+        or paths through links), and HDF5 must be asked instead.
+
+        """
+
+        entry = self._entries.get(path)
+        if entry is not None:
+            return entry[0]
+        if isvisiblepath(path):
+            parent = self._entries.get(split_path(path)[0])
+            if parent is not None and parent[0] == 'Group':
+                return 'NoSuchNode'
+        return None
+
+    def get_info(self, path):
+        """Return the `NodeInfo` of the node in the HDF5 `path` or None."""
+
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def get_children(self, path):
+        """Return the records of the children of the group in `path`.
+
+        The `NodeInfo` records are returned in alphanumerical order of
+        their names.  None is returned if the group is not in the
+        snapshot.
+
+        """
+
+        if self._children is None:
+            children = {}
+            for (kind, info) in six.itervalues(self._entries):
+                if info.path != self.root:
+                    parent = split_path(info.path)[0]
+                    children.setdefault(parent, []).append(info)
+            for infos in children.values():
+                infos.sort()
+            self._children = children
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != 'Group':
+            return None
+        return self._children.get(path, [])
+
+    def save(self, filename):
+        """Save the snapshot to the `filename` sidecar atomically."""
+
+        entries = []
+        for (kind, info) in six.itervalues(self._entries):
+            entries.append([kind, info.path, info.classname,
+                            _shape_to_data(info.shape),
+                            dtype_to_data(info.dtype),
+                            _shape_to_data(info.chunkshape),
+                            filters_to_data(info.filters),
+                            _int_or_none(info.size)])
+        data = {'version': FORMAT_VERSION,
+                'stamp': self.stamp,
+                'root': self.root,
+                'sys_attrs': self.sys_attrs,
+                'entries': entries}
+        blob = zlib.compress(json.dumps(data).encode('utf-8'))
+        dirname = os.path.dirname(os.path.abspath(filename))
+        fd, tmppath = tempfile.mkstemp(suffix='.tmp', dir=dirname)
+        try:
+            with os.fdopen(fd, 'wb') as tmpfile:
+                tmpfile.write(blob)
+            os.rename(tmppath, filename)
+        except Exception:
+            os.remove(tmppath)
+            raise
+
+
+def create(h5file):
+    """Return a snapshot of the visible nodes in the open `h5file`.
+
+    The file must be opened in read-only mode, since the snapshot would
+    become stale as soon as the file was modified.
+
+    """
+
+    from .group import Group
+    from .leaf import Leaf
+    from .registry import get_class_by_name
+
+    stamp = file_stamp(h5file.filename, h5file.mode, h5file.params)
+    if stamp is None:
+        return None
+
+    root_uep = h5file.root_uep
+    entries = []
+    for info in h5file.walk_info('/'):
+        if info.path == '/':
+            kind = 'Group'  # the root group
+        else:
+            class_ = get_class_by_name(info.classname)
+            if issubclass(class_, Group):
+                kind = 'Group'
+            elif issubclass(class_, Leaf):
+                kind = 'Leaf'
+            else:
+                # ``SoftLink``, ``ExternalLink`` or ``Unknown``
+                kind = class_.__name__
+        if root_uep != '/':
+            info = info._replace(path=join_path(root_uep, info.path))
+        entries.append((kind, info))
+    return MetadataSnapshot(entries, stamp, root_uep,
+                            h5file.params['PYTABLES_SYS_ATTRS'])
+
+
+def load(filename, mode, params):
+    """Load the snapshot of the HDF5 file in `filename` if it is fresh.
+
+    None is returned if the file has no snapshot, if it is stale (the
+    HDF5 file has been modified after taking it) or if it can not be
+    used with the `mode` and `params` of the file.
+
+    """
+
+    from .file import NodeInfo
+
+    stamp = file_stamp(filename, mode, params)
+    if stamp is None:
+        return None
+    try:
+        with open(sidecar_path(filename), 'rb') as snapfile:
+            data = json.loads(zlib.decompress(snapfile.read()).decode('utf-8'))
+        if (data.get('version') != FORMAT_VERSION or
+                tuple(data.get('stamp') or ()) != tuple(stamp) or
+                data.get('sys_attrs') != params['PYTABLES_SYS_ATTRS']):
+            return None
+        entries = []
+        for (kind, path, classname, shape, dtype, chunkshape, filters,
+             size) in data['entries']:
+            info = NodeInfo(path, classname, _shape_from_data(shape),
+                            dtype_from_data(dtype),
+                            _shape_from_data(chunkshape),
+                            filters_from_data(filters), size)
+            entries.append((kind, info))
+    except Exception:
+        # A missing or broken snapshot just makes HDF5 be asked
+        return None
+    return MetadataSnapshot(entries, stamp, data['root'], data['sys_attrs'])
+
+
+## Local Variables:
+## mode: python
+## py-indent-offset: 4
+## tab-width: 4
+## fill-column: 72
+## End:
@@ -23,18 +23,16 @@ from functools import reduce as _reduce
 from time import time
 
 import numpy
-import numexpr
 
 from . import tableextension
+from . import chunkcache
 from .lrucacheextension import ObjectCache, NumCache
 from .atom import Atom
-from .conditions import compile_condition
-from numexpr.necompiler import (
-    getType as numexpr_getType, double, is_cpu_amd_intel)
-from numexpr.expressions import functions as numexpr_functions
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .utils import is_idx, lazyattr, SizeType, NailedDict as CacheDict
-from .leaf import Leaf
+from .idxutils import compact_coords, expand_coords
+from .leaf import Leaf, plan_blocks
+from .reduction import Reducible, iter_blocks
 from .description import (IsDescription, Description, Col, descr_from_dtype)
 from .exceptions import (
     NodeError, HDF5ExtError, PerformanceWarning, OldIndexWarning,
@@ -42,9 +40,6 @@ from .exceptions import (
 from .utilsextension import get_nested_field
 
 from .path import join_path, split_path
-from .index import (
-    OldIndex, default_index_filters, default_auto_index, Index, IndexesDescG,
-    IndexesTableG)
 
 import six
 from six.moves import range
@@ -66,46 +61,6 @@ if profile:
 obversion = "2.7"  # The Table VERSION number
 
 
-try:
-    # int_, long_ are only available in numexpr >= 2.1
-    from numexpr.necompiler import int_, long_
-except ImportError:
-    int_ = int
-    long_ = int
-
-# Maps NumPy types to the types used by Numexpr.
-_nxtype_from_nptype = {
-    numpy.bool_: bool,
-    numpy.int8: int_,
-    numpy.int16: int_,
-    numpy.int32: int_,
-    numpy.int64: long_,
-    numpy.uint8: int_,
-    numpy.uint16: int_,
-    numpy.uint32: long_,
-    numpy.uint64: long_,
-    numpy.float32: float,
-    numpy.float64: double,
-    numpy.complex64: complex,
-    numpy.complex128: complex,
-    numpy.bytes_: bytes,
-}
-
-if sys.version_info[0] > 2:
-    _nxtype_from_nptype[numpy.str_] = str
-
-if hasattr(numpy, 'float16'):
-    _nxtype_from_nptype[numpy.float16] = float    # XXX: check
-if hasattr(numpy, 'float96'):
-    _nxtype_from_nptype[numpy.float96] = double   # XXX: check
-if hasattr(numpy, 'float128'):
-    _nxtype_from_nptype[numpy.float128] = double  # XXX: check
-if hasattr(numpy, 'complec192'):
-    _nxtype_from_nptype[numpy.complex192] = complex  # XXX: check
-if hasattr(numpy, 'complex256'):
-    _nxtype_from_nptype[numpy.complex256] = complex  # XXX: check
-
-
 # The NumPy scalar type corresponding to `SizeType`.
 _npsizetype = numpy.array(SizeType(0)).dtype.type
 
@@ -141,19 +96,77 @@ def _index_pathname_of_column_(tablePath, colpathname):
     return join_path(_index_pathname_of_(tablePath), colpathname)
 
 
-def restorecache(self):
+_empty_coords = numpy.empty(0, dtype='int64')
+
+# The parameters that can be overridden for a single table with
+# `Table.set_cache_params()`
+_cache_param_names = frozenset([
+    'TABLE_MAX_SIZE', 'ITERSEQ_MAX_SLOTS', 'ITERSEQ_MAX_SIZE',
+    'BOUNDS_MAX_SLOTS', 'BOUNDS_MAX_SIZE', 'LIMBOUNDS_MAX_SLOTS',
+    'LIMBOUNDS_MAX_SIZE', 'SORTEDLR_MAX_SLOTS', 'SORTEDLR_MAX_SIZE',
+    'SORTED_MAX_SIZE', 'DISABLE_EVERY_CYCLES', 'ENABLE_EVERY_CYCLES',
+    'LOWEST_HIT_RATIO'])
+
+
+def restorechunkcache(self):
     # Define a cache for sparse table reads
-    params = self._v_file.params
+    params = self._get_cache_params()
     chunksize = self._v_chunkshape[0]
     nslots = params['TABLE_MAX_SIZE'] / (chunksize * self._v_dtype.itemsize)
     self._chunkcache = NumCache((nslots, chunksize), self._v_dtype,
                                 'table chunk cache')
+    self._chunkcache.setpolicy(params)
+    self._dirtychunkcache = False
+
+
+def restorecache(self):
+    restorechunkcache(self)
+    params = self._get_cache_params()
     self._seqcache = ObjectCache(params['ITERSEQ_MAX_SLOTS'],
                                  params['ITERSEQ_MAX_SIZE'],
                                  'Iter sequence cache')
+    self._seqcache.setpolicy(params)
     self._dirtycache = False
 
 
+def _table__extend_seq(self, compiled, condvars, seq, nrows,
+                       start, stop, step):
+    """Extend the cached `seq` result of a query to the appended rows.
+
+    The condition is only evaluated (in-kernel) on the rows from `nrows`
+    (the rows evaluated by the cached query) to `stop`.
+
+    """
+
+    # The first row after the ones evaluated which is in the range
+    start = start + max(0, -(-(nrows - start) // step)) * step
+    if start >= stop:
+        return seq
+    args = [condvars[param] for param in compiled.parameters]
+    self._where_condition = (compiled.function, args)
+    self._use_index = False
+    row = tableextension.Row(self)
+    newseq = numpy.array([r.nrow for r in row._iter(start, stop, step)],
+                         dtype='int64')
+    return numpy.concatenate((seq, newseq))
+
+
+def _table__pad_chunkmap(self, chunkmap):
+    """Extend the `chunkmap` of indexes to the chunks of unindexed rows.
+
+    The chunks from the one with the first unindexed row on are always
+    selected, so that the condition is evaluated on all their rows.
+
+    """
+
+    nrowsinchunk = self.chunkshape[0]
+    nchunks = -(-self.nrows // nrowsinchunk)
+    first = self._indexedrows // nrowsinchunk
+    padded = numpy.ones(shape=nchunks, dtype="bool")
+    padded[:first] = chunkmap[:first]
+    return padded
+
+
 def _table__where_indexed(self, compiled, condition, condvars,
                           start, stop, step):
     if profile:
@@ -164,32 +177,37 @@ def _table__where_indexed(self, compiled, condition, condvars,
     # Clean the table caches for indexed queries if needed
     if self._dirtycache:
         restorecache(self)
+    elif self._dirtychunkcache:
+        # Only appends since the last query: the results in the
+        # sequence cache can be extended to the new rows
+        restorechunkcache(self)
 
     # Get the values in expression that are not columns
     values = []
     for key, value in six.iteritems(condvars):
         if isinstance(value, numpy.ndarray):
             values.append((key, value.item()))
-    # Build a key for the sequence cache
-    seqkey = (condition, tuple(values), (start, stop, step))
+    # Build a key for the sequence cache.  Queries up to the end of the
+    # table share the key after appends.
+    seqkey = (condition, tuple(values),
+              (start, None if stop == self.nrows else stop, step))
     # Do a lookup in sequential cache for this query
     nslot = self._seqcache.getslot(seqkey)
     if nslot >= 0:
-        # Get the row sequence from the cache
-        seq = self._seqcache.getitem(nslot)
+        # Get the row sequence from the cache, along with the number
+        # of rows evaluated for getting it
+        nrows, data = self._seqcache.getitem(nslot)
+        seq = expand_coords(data)
+        if nrows < stop:
+            # Rows have been appended since, so evaluate just them
+            seq = _table__extend_seq(self, compiled, condvars, seq, nrows,
+                                     start, stop, step)
+            if len(seq) < self._v_file.params['ITERSEQ_MAX_ELEMENTS']:
+                data = compact_coords(seq)
+                self._seqcache.setitem(seqkey, (stop, data), data.nbytes)
         if len(seq) == 0:
             return iter([])
-        # seq is a list.
-        seq = numpy.array(seq, dtype='int64')
-        # Correct the ranges in cached sequence
-        if (start, stop, step) != (0, self.nrows, 1):
-            seq = seq[(seq >= start) & (
-                seq < stop) & ((seq - start) % step == 0)]
         return self.itersequence(seq)
-    else:
-        # No luck.  self._seqcache will be populated
-        # in the iterator if possible. (Row._finish_riterator)
-        self._seqcache_key = seqkey
 
     # Compute the chunkmap for every index in indexed expression
     idxexprs = compiled.index_expressions
@@ -218,24 +236,34 @@ def _table__where_indexed(self, compiled, condition, condvars,
         # Assign the chunkmap to the cmvars dictionary
         cmvars["e%d" % i] = chunkmap
 
-    if index.reduction == 1 and tcoords == 0:
+    # Rows appended after the last indexing (e.g. by a SWMR writer) are
+    # not in the indexes
+    unindexed = self._indexedrows < self.nrows
+    if index.reduction == 1 and tcoords == 0 and not unindexed:
         # No candidates found in any indexed expression component, so leave now
-        self._seqcache.setitem(seqkey, [], 1)
+        self._seqcache.setitem(seqkey, (stop, _empty_coords), 1)
         return iter([])
 
     # Compute the final chunkmap
+    import numexpr
     chunkmap = numexpr.evaluate(strexpr, cmvars)
+    if unindexed:
+        chunkmap = _table__pad_chunkmap(self, chunkmap)
     if not chunkmap.any():
         # The chunkmap is all False, so the result is empty
-        self._seqcache.setitem(seqkey, [], 1)
+        self._seqcache.setitem(seqkey, (stop, _empty_coords), 1)
         return iter([])
 
+    # No luck with the sequence cache.  self._seqcache will be populated
+    # in the iterator if possible. (Row._finish_riterator)
+    self._seqcache_key = seqkey
     if profile:
         show_stats("Exiting table_whereIndexed", tref)
     return chunkmap
 
 
 def create_indexes_table(table):
+    from .index import IndexesTableG
     itgroup = IndexesTableG(
         table._v_parent, _index_name_of(table),
         "Indexes container for table " + table._v_pathname, new=True)
@@ -243,6 +271,7 @@ def create_indexes_table(table):
 
 
 def create_indexes_descr(igroup, dname, iname, filters):
+    from .index import IndexesDescG
     idgroup = IndexesDescG(
         igroup, iname,
         "Indexes container for sub-description " + dname,
@@ -308,6 +337,7 @@ def _column__create_index(self, optlevel, kind, filters, tmp_dir,
         expectedrows = table.nrows
 
     # Create the index itself
+    from .index import Index
     index = Index(
         idgroup, name, atom=atom,
         title="Index for %s column" % name,
@@ -622,6 +652,7 @@ class Table(tableextension.Table, Leaf):
             try:
                 indexgroup = self._v_file._get_node(_index_pathname_of(self))
             except NoSuchNodeError:
+                from .index import default_auto_index
                 self._autoindex = default_auto_index  # update cache
                 return self._autoindex
             else:
@@ -745,6 +776,8 @@ class Table(tableextension.Table, Leaf):
         max_slots = parentnode._v_file.params['COND_CACHE_SLOTS']
         self._condition_cache = CacheDict(max_slots)
         """Cache of already compiled conditions."""
+        self._cache_params = {}
+        """Parameters overriding those of the file for the table caches."""
         self._exprvars_cache = {}
         """Cache of variables participating in numexpr expressions."""
         self._enabled_indexing_in_queries = True
@@ -762,6 +795,8 @@ class Table(tableextension.Table, Leaf):
         """
         self._dirtycache = True
         """Whether the data caches are dirty or not. Initially set to yes."""
+        self._dirtychunkcache = True
+        """Whether the chunk cache is dirty (e.g. after appending rows)."""
         self._descflavor = None
         """Temporarily keeps the flavor of a description with data."""
 
@@ -871,6 +906,7 @@ class Table(tableextension.Table, Leaf):
                 if indexed:
                     column = self.cols._g_col(colname)
                     indexobj = column.index
+                    from .index import OldIndex
                     if isinstance(indexobj, OldIndex):
                         indexed = False  # Not a vaild index
                         oldindexes = True
@@ -1092,6 +1128,17 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return self._v_objectid
 
+    def _g_set_refreshed_shape(self, shape):
+        nrows = shape[0]
+        if nrows < self.nrows:
+            # Rows have been removed, so cached results are not valid
+            self._dirtycache = True
+        elif nrows > self.nrows:
+            # Only appends: results of previous indexed queries can be
+            # extended to the new rows, and the last chunk may have grown
+            self._dirtychunkcache = True
+        self.nrows = nrows
+
     def _cache_description_data(self):
         """Cache some data which is already in the description.
 
@@ -1208,6 +1255,7 @@ very small/large chunksize, you may want to increase/decrease it."""
                 # Remove 10 (arbitrary) elements from the cache
                 for k in list(exprvarscache.keys())[:10]:
                     del exprvarscache[k]
+            from numexpr.expressions import functions as numexpr_functions
             cexpr = compile(expression, '<string>', 'eval')
             exprvars = [var for var in cexpr.co_names
                         if var not in ['None', 'False', 'True']
@@ -1290,6 +1338,8 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         """
 
+        from numexpr.necompiler import getType as numexpr_getType
+
         # Variable names for column and normal variables.
         colnames, varnames = [], []
         # Column paths and types for each of the previous variable.
@@ -1323,6 +1373,8 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         """
 
+        from .conditions import compile_condition, _nxtype_from_nptype
+
         # Look up the condition in the condition cache.
         condcache = self._condition_cache
         condkey = self._get_condition_key(condition, condvars)
@@ -1334,6 +1386,11 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Fortunately, the key provides some valuable information. ;)
         (condition, colnames, varnames, colpaths, vartypes) = condkey
 
+        # Numexpr may have been imported just now
+        import numexpr
+        numexpr.set_vml_num_threads(
+            self._v_file.params['MAX_NUMEXPR_THREADS'])
+
         # Extract more information from referenced columns.
 
         # start with normal variables
@@ -1498,28 +1555,39 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         # Compile the condition and extract usable index conditions.
         condvars = self._required_expr_vars(condition, condvars, depth=3)
-        compiled = self._compile_condition(condition, condvars)
-
-        # Can we use indexes?
-        if compiled.index_expressions:
-            chunkmap = _table__where_indexed(
-                self, compiled, condition, condvars, start, stop, step)
-            if not isinstance(chunkmap, numpy.ndarray):
-                # If it is not a NumPy array it should be an iterator
-                # Reset conditions
-                self._use_index = False
-                self._where_condition = None
-                # ...and return the iterator
-                return chunkmap
-        else:
-            chunkmap = None  # default to an in-kernel query
 
-        args = [condvars[param] for param in compiled.parameters]
-        self._where_condition = (compiled.function, args)
-        row = tableextension.Row(self)
-        if profile:
-            show_stats("Exiting table._where", tref)
-        return row._iter(start, stop, step, chunkmap=chunkmap)
+        # The state of the query is kept in the table (and its indexes)
+        # until the row iterator takes it, so concurrent readers of the
+        # file must not set queries up at the same time.
+        lock = self._v_file._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            compiled = self._compile_condition(condition, condvars)
+
+            # Can we use indexes?
+            if compiled.index_expressions:
+                chunkmap = _table__where_indexed(
+                    self, compiled, condition, condvars, start, stop, step)
+                if not isinstance(chunkmap, numpy.ndarray):
+                    # If it is not a NumPy array it should be an iterator
+                    # Reset conditions
+                    self._use_index = False
+                    self._where_condition = None
+                    # ...and return the iterator
+                    return chunkmap
+            else:
+                chunkmap = None  # default to an in-kernel query
+
+            args = [condvars[param] for param in compiled.parameters]
+            self._where_condition = (compiled.function, args)
+            row = tableextension.Row(self)
+            if profile:
+                show_stats("Exiting table._where", tref)
+            return row._iter(start, stop, step, chunkmap=chunkmap)
+        finally:
+            if lock is not None:
+                lock.release()
 
     def read_where(self, condition, condvars=None, field=None,
                    start=None, stop=None, step=None):
@@ -1537,7 +1605,6 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._g_check_open()
         coords = [p.nrow for p in
                   self._where(condition, condvars, start, stop, step)]
-        self._where_condition = None  # reset the conditions
         if len(coords) > 1:
             cstart, cstop = coords[0], coords[-1] + 1
             if cstop - cstart == len(coords):
@@ -1605,8 +1672,6 @@ very small/large chunksize, you may want to increase/decrease it."""
         coords = [p.nrow for p in
                   self._where(condition, condvars, start, stop, step)]
         coords = numpy.array(coords, dtype=SizeType)
-        # Reset the conditions
-        self._where_condition = None
         if sort:
             coords = numpy.sort(coords)
         return internal_to_flavor(coords, self.flavor)
@@ -1781,6 +1846,31 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return self.iterrows()
 
+    def _read_records(self, start, nrecords, recarr):
+        """Read `nrecords` rows from `start` into `recarr`.
+
+        The chunks of the rows are taken from the shared chunk cache when
+        the table can use it.  Returns the number of rows read.
+
+        """
+
+        prefix = self._v_chunk_cache_key
+        if prefix is None or recarr.dtype != self._v_dtype:
+            return super(Table, self)._read_records(start, nrecords, recarr)
+
+        nrecords = max(0, min(nrecords, self.nrows - start))
+        if nrecords == 0:
+            return 0
+
+        def read_chunk(origin, end, chunk):
+            super(Table, self)._read_records(origin[0], end[0] - origin[0],
+                                             chunk)
+
+        chunkcache.read_slice(prefix, (self.nrows,), self.chunkshape,
+                              [start], [start + nrecords], [1],
+                              recarr[:nrecords], read_chunk)
+        return nrecords
+
     def _read(self, start, stop, step, field=None, out=None):
         """Read a range of rows and return an in-memory object."""
 
@@ -2155,10 +2245,13 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._open_append(wbufRA)
         self._append_records(lenrows)
         self._close_append()
-        if self.indexed:
+        # Indexes are frozen in SWMR writers (their rows are appended
+        # and their attributes set), so new rows are searched in-kernel
+        if self.indexed and not self._v_file._swmr_write:
             self._unsaved_indexedrows += lenrows
-            # The table caches for indexed queries are dirty now
-            self._dirtycache = True
+            # The chunk cache for indexed queries is dirty now (results
+            # of previous queries are extended to the new rows instead)
+            self._dirtychunkcache = True
             if self.autoindex:
                 # Flush the unindexed rows
                 self.flush_rows_to_index(_lastrow=False)
@@ -2764,6 +2857,84 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         self._do_reindex(dirty=True)
 
+    def _get_cache_params(self):
+        """Return the parameters of the file updated with the cache ones."""
+
+        params = self._v_file.params
+        if self._cache_params:
+            params = dict(params)
+            params.update(self._cache_params)
+        return params
+
+    def set_cache_params(self, **kwargs):
+        """Override the parameters of the caches used by this table.
+
+        The keyword arguments are the names (in any case) of the
+        parameters for the caches of tables and their indexes (see
+        :ref:`parameter_files`), e.g. ``table_max_size``,
+        ``iterseq_max_slots``, ``bounds_max_size`` or
+        ``lowest_hit_ratio``.  They take precedence over the values
+        given when opening the file while the table is open.  A None
+        value removes the override.  The caches are rebuilt (and emptied)
+        the next time they are used.
+
+        Example::
+
+            table.set_cache_params(iterseq_max_slots=1024,
+                                   lowest_hit_ratio=0.3)
+
+        .. versionadded:: 3.3
+
+        """
+
+        kwargs = dict((k.upper(), v) for k, v in six.iteritems(kwargs))
+        unknown = sorted(set(kwargs) - _cache_param_names)
+        if unknown:
+            raise ValueError("not a table cache parameter: %s; valid "
+                             "parameters are: %s"
+                             % (unknown, sorted(_cache_param_names)))
+
+        for name, value in six.iteritems(kwargs):
+            if value is None:
+                self._cache_params.pop(name, None)
+            else:
+                self._cache_params[name] = value
+
+        self._dirtycache = True
+        for index in self.colindexes.values():
+            index.dirtycache = True
+
+    def cache_stats(self):
+        """Return the statistics of the caches used by this table.
+
+        The result is a dictionary with the ``chunk`` (chunks read by
+        indexed queries) and ``iterseq`` (row coordinates of previous
+        queries) caches of the table and, under ``indexes``, a dictionary
+        with the caches of every index keyed by the column pathname.
+        Every cache is described by a dictionary with its size
+        (``nslots``, ``nused`` and ``nbytes``), the ``lookups`` and
+        ``hits`` since it was built and their ``hit_ratio``, whether it
+        is ``disabled`` because of a low hit ratio and how many times it
+        has been disabled (``disable_events``) or enabled again
+        (``enable_events``).
+
+        Caches which have not been built yet are not included.
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        stats = {}
+        for key, attr in (('chunk', '_chunkcache'), ('iterseq', '_seqcache')):
+            cache = getattr(self, attr, None)
+            if cache is not None:
+                stats[key] = cache.stats()
+        stats['indexes'] = dict(
+            (colpathname, index._g_cache_stats())
+            for colpathname, index in six.iteritems(self.colindexes))
+        return stats
+
     def _g_copy_rows(self, object, start, stop, step, sortby, checkCSI):
         "Copy rows from self to object"
         if sortby is None:
@@ -2889,7 +3060,7 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Flush rows that remains to be appended
         if 'row' in self.__dict__:
             self.row._flush_buffered_rows()
-        if self.indexed and self.autoindex:
+        if self.indexed and self.autoindex and not self._v_file._swmr_write:
             # Flush any unindexed row
             rowsadded = self.flush_rows_to_index(_lastrow=True)
             assert rowsadded <= 0 or self._indexedrows == self.nrows, \
@@ -3265,7 +3436,7 @@ class Cols(object):
         return out
 
 
-class Column(object):
+class Column(Reducible):
     """Accessor for a non-nested column in a table.
 
     Each instance of this class is associated with one *non-nested* column of a
@@ -3470,6 +3641,26 @@ class Column(object):
             for row in buf_slice:
                 yield row
 
+    def _g_reduction_blocks(self, start, stop, step):
+        """Get the blocks to be processed by reductions (see `Reducible`)."""
+
+        table = self.table
+        params = table._v_file.params
+        (start, stop, step) = table._process_range(start, stop, step)
+        itemtype = self._itemtype
+        shape = (len(range(start, stop, step)),) + itemtype.shape
+        # Size the buffer after the column, not after the whole record
+        rowsize = max(itemtype.itemsize, 1)
+        chunkshape = table.chunkshape
+        plan = plan_blocks(params['IO_BUFFER_SIZE'] // rowsize, [rowsize],
+                           [chunkshape[0] if chunkshape else None])
+
+        def read(bstart, bstop):
+            return table._read(bstart, bstop, step, self.pathname)
+        blocks = iter_blocks(read, plan, start, stop, step)
+        return (shape, 0, self.dtype, blocks,
+                params['MAX_REDUCTION_THREADS'])
+
     def __setitem__(self, key, value):
         """Set a row or a range of rows in a column.
 
@@ -3583,6 +3774,7 @@ class Column(object):
             raise ValueError("Optimization level must be an integer in the "
                              "range 0-9")
         if filters is None:
+            from .index import default_index_filters
             filters = default_index_filters
         if tmp_dir is None:
             tmp_dir = os.path.dirname(self._table_file.filename)
@@ -35,12 +35,15 @@ from .utilsextension import (get_nested_field, atom_from_hdf5_type,
   pttype_to_hdf5, pt_special_kinds, npext_prefixes_to_ptkinds, hdf5_class_to_string,
   H5T_STD_I64)
 from .utils import SizeType
+from .idxutils import compact_coords
 
 from utilsextension cimport get_native_type, cstr_to_pystr
+from utilsextension cimport release_gil_for_hdf5, reacquire_gil
 
 # numpy functions & objects
 from hdf5extension cimport Leaf
 from cpython cimport PY_MAJOR_VERSION, PyErr_Clear
+from cpython.pystate cimport PyThreadState
 from libc.stdio cimport snprintf
 from libc.stdlib cimport malloc, free
 from libc.string cimport memcpy, strdup, strcmp, strlen
@@ -471,16 +474,18 @@ cdef class Table(Leaf):
   def _append_records(self, hsize_t nrecords):
     cdef int ret
     cdef hsize_t nrows
+    cdef PyThreadState *state
 
     # Convert some NumPy types to HDF5 before storing.
     self._convert_types(self._v_recarray, nrecords, 0)
 
     nrows = self.nrows
-    # release GIL (allow other threads to use the Python interpreter)
-    with nogil:
-        # Append the records:
-        ret = H5TBOappend_records(self.dataset_id, self.type_id,
-                                  nrecords, nrows, self.wbuf)
+    # release GIL if allowed (let other threads use the Python interpreter)
+    state = release_gil_for_hdf5()
+    # Append the records:
+    ret = H5TBOappend_records(self.dataset_id, self.type_id,
+                              nrecords, nrows, self.wbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the records.")
@@ -490,16 +495,19 @@ cdef class Table(Leaf):
   def _close_append(self):
     cdef hsize_t nrows
 
-    if self._v_file.params['PYTABLES_SYS_ATTRS']:
+    # SWMR writers can not modify attributes (and readers do not need
+    # NROWS, which is always taken from the dataspace)
+    if (self._v_file.params['PYTABLES_SYS_ATTRS'] and
+        not self._v_file._swmr_write):
       # Update the NROWS attribute
       nrows = self.nrows
       if (H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
                               0, NULL, <char *>&nrows) < 0):
         raise HDF5ExtError("Problems setting the NROWS attribute.")
 
-    # Set the caches to dirty (in fact, and for the append case,
-    # it should be only the caches based on limits, but anyway)
-    self._dirtycache = True
+    # Set the chunk cache to dirty (results of previous indexed queries
+    # can be extended to the appended rows instead)
+    self._dirtychunkcache = True
     # Delete the reference to recarray as we doesn't need it anymore
     self._v_recarray = None
 
@@ -508,6 +516,7 @@ cdef class Table(Leaf):
     cdef herr_t ret
     cdef void *rbuf
     cdef hsize_t nrecords, nrows
+    cdef PyThreadState *state
 
     # Get the pointer to the buffer data area
     rbuf = recarr.data
@@ -521,9 +530,10 @@ cdef class Table(Leaf):
     # Convert some NumPy types to HDF5 before storing.
     self._convert_types(recarr, nrecords, 0)
     # Update the records:
-    with nogil:
-        ret = H5TBOwrite_records(self.dataset_id, self.type_id,
-                                 start, nrecords, step, rbuf )
+    state = release_gil_for_hdf5()
+    ret = H5TBOwrite_records(self.dataset_id, self.type_id,
+                             start, nrecords, step, rbuf )
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems updating the records.")
@@ -536,6 +546,7 @@ cdef class Table(Leaf):
     cdef herr_t ret
     cdef void *rbuf
     cdef void *rcoords
+    cdef PyThreadState *state
 
     # Get the chunk of the coords that correspond to a buffer
     rcoords = coords.data
@@ -547,9 +558,10 @@ cdef class Table(Leaf):
     self._convert_types(recarr, nrecords, 0)
 
     # Update the records:
-    with nogil:
-        ret = H5TBOwrite_elements(self.dataset_id, self.type_id,
-                                  nrecords, rcoords, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5TBOwrite_elements(self.dataset_id, self.type_id,
+                              nrecords, rcoords, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems updating the records.")
@@ -560,6 +572,7 @@ cdef class Table(Leaf):
   def _read_records(self, hsize_t start, hsize_t nrecords, ndarray recarr):
     cdef void *rbuf
     cdef int ret
+    cdef PyThreadState *state
 
     # Correct the number of records to read, if needed
     if (start + nrecords) > self.nrows:
@@ -569,9 +582,10 @@ cdef class Table(Leaf):
     rbuf = recarr.data
 
     # Read the records from disk
-    with nogil:
-        ret = H5TBOread_records(self.dataset_id, self.type_id, start,
-                                nrecords, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5TBOread_records(self.dataset_id, self.type_id, start,
+                            nrecords, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading records.")
@@ -587,6 +601,7 @@ cdef class Table(Leaf):
     cdef int ret
     cdef void *rbuf
     cdef NumCache chunkcache
+    cdef PyThreadState *state
 
     chunkcache = self._chunkcache
     chunkshape = chunkcache.slotsize
@@ -602,12 +617,21 @@ cdef class Table(Leaf):
       chunkcache.getitem_(nslot, rbuf, 0)
     else:
       # Chunk is not in cache. Read it and put it in the LRU cache.
-      with nogil:
-          ret = H5TBOread_records(self.dataset_id, self.type_id,
-                                  start, nrecords, rbuf)
+      if (self._v_chunk_cache_key is not None and
+          'time32' not in self.coltypes.values() and
+          'time64' not in self.coltypes.values()):
+        # Take it from the shared chunk cache (columns needing a
+        # conversion are left out since the caller converts the chunk)
+        self._read_records(start, nrecords,
+                           iobuf[cstart:cstart + nrecords])
+      else:
+        state = release_gil_for_hdf5()
+        ret = H5TBOread_records(self.dataset_id, self.type_id,
+                                start, nrecords, rbuf)
+        reacquire_gil(state)
 
-      if ret < 0:
-        raise HDF5ExtError("Problems reading chunk records.")
+        if ret < 0:
+          raise HDF5ExtError("Problems reading chunk records.")
       nslot = chunkcache.setitem_(nchunk, rbuf, 0)
     return nrecords
 
@@ -616,6 +640,7 @@ cdef class Table(Leaf):
     cdef void *rbuf
     cdef void *rbuf2
     cdef int ret
+    cdef PyThreadState *state
 
     # Get the chunk of the coords that correspond to a buffer
     nrecords = coords.size
@@ -624,9 +649,10 @@ cdef class Table(Leaf):
     # Get the pointer to the buffer coords area
     rbuf2 = coords.data
 
-    with nogil:
-        ret = H5TBOread_elements(self.dataset_id, self.type_id,
-                                 nrecords, rbuf2, rbuf)
+    state = release_gil_for_hdf5()
+    ret = H5TBOread_elements(self.dataset_id, self.type_id,
+                             nrecords, rbuf2, rbuf)
+    reacquire_gil(state)
 
     if ret < 0:
       raise HDF5ExtError("Problems reading records.")
@@ -714,6 +740,7 @@ cdef class Row:
   cdef int     ro_filemode, chunked
   cdef int     _bufferinfo_done, sss_on
   cdef int     iterseq_max_elements
+  cdef long    iterseq_nelements
   cdef ndarray bufcoords, indexvalid, indexvalues, chunkmap
   cdef hsize_t *bufcoords_data
   cdef hsize_t *index_values_data
@@ -883,7 +910,10 @@ cdef class Row:
     if self.seqcache_key is not None:
       self._write_to_seqcache = 1
       self.iterseq_max_elements = table._v_file.params['ITERSEQ_MAX_ELEMENTS']
-      self.iterseq = [] # all the row indexes, unless it would be longer than ITERSEQ_MAX_ELEMENTS
+      # all the row indexes (as arrays), unless they would be more than
+      # ITERSEQ_MAX_ELEMENTS
+      self.iterseq = []
+      self.iterseq_nelements = 0
     else:
       self._write_to_seqcache = 0
       self.iterseq = None
@@ -914,7 +944,6 @@ cdef class Row:
     cdef void *IObufData
     cdef long nslot
     cdef object seq
-    cdef object seqcache
 
     assert self.nrowsinbuf >= self.chunksize
     while self.nextelement < self.stop:
@@ -971,9 +1000,9 @@ cdef class Row:
 
         if self._write_to_seqcache:
           # Feed the indexvalues into the seqcache
-          seqcache = self.iterseq
-          if self.lenbuf + len(seqcache) < self.iterseq_max_elements:
-            seqcache.extend(self.indexvalues)
+          if self.lenbuf + self.iterseq_nelements < self.iterseq_max_elements:
+            self.iterseq.append(self.indexvalues)
+            self.iterseq_nelements = self.iterseq_nelements + self.lenbuf
           else:
             self.iterseq = None
             self._write_to_seqcache = 0
@@ -1178,8 +1207,15 @@ cdef class Row:
       self.wrec[:] = self.iobuf[self._row]
     if self._write_to_seqcache:
       seqcache = self.table._seqcache
-      # Guessing iterseq size: Each element in self.iterseq should take at least 8 bytes
-      seqcache.setitem_(self.seqcache_key, self.iterseq, len(self.iterseq) * 8)
+      # Keep only the rows in the range of the query, in compact form and
+      # along with the number of rows evaluated, so that the result can be
+      # extended after appends
+      coords = numpy.concatenate(self.iterseq + [numpy.empty(0, 'int64')])
+      if self.sss_on:
+        coords = coords[(coords >= self.start) & (coords < self.stop) &
+                        ((coords - self.start) % self.step == 0)]
+      coords = compact_coords(coords)
+      seqcache.setitem_(self.seqcache_key, (self.stop, coords), coords.nbytes)
     self._riterator = 0        # out of iterator
     self.iterseq = None        # empty seqcache-related things
     self.seqcache_key = None
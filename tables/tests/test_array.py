@@ -2466,6 +2466,100 @@ class BroadcastTest(common.TempFileMixin, TestCase):
         self.assertTrue(numpy.all(h5arr[0] == nparr))
 
 
+class ReductionTestCase(common.TempFileMixin, TestCase):
+    shape = (100, 7, 3)
+    chunkshape = (8, 7, 3)
+    dtype = 'float32'
+
+    def setUp(self):
+        super(ReductionTestCase, self).setUp()
+        numpy.random.seed(1)
+        self.nparr = numpy.random.randn(*self.shape).astype(self.dtype)
+        self.array = self.h5file.create_carray(
+            '/', 'array', obj=self.nparr, chunkshape=self.chunkshape)
+        # Force several blocks per reduction
+        self.array.nrowsinbuf = 16
+
+    def check(self, op, axis=None, start=None, stop=None, step=None,
+              **kwargs):
+        for nthreads in (1, 3):
+            self.h5file.params['MAX_REDUCTION_THREADS'] = nthreads
+            result = getattr(self.array, op)(axis=axis, start=start,
+                                             stop=stop, step=step, **kwargs)
+            npres = getattr(self.nparr[start:stop:step], op)(axis=axis,
+                                                             **kwargs)
+            if op.startswith('arg'):
+                self.assertTrue(numpy.all(result == npres))
+            else:
+                self.assertTrue(numpy.allclose(result, npres, rtol=1e-5),
+                                "%s(axis=%s): %r != %r" % (op, axis, result,
+                                                           npres))
+            self.assertEqual(numpy.shape(result), numpy.shape(npres))
+
+    def test_reductions(self):
+        for op in ('sum', 'mean', 'var', 'std', 'min', 'max',
+                   'argmin', 'argmax'):
+            for axis in (None, 0, 1, -1):
+                self.check(op, axis)
+
+    def test_range(self):
+        for op in ('sum', 'mean', 'min', 'argmax'):
+            for axis in (None, 0, len(self.shape) - 1):
+                self.check(op, axis, start=3, stop=91)
+                self.check(op, axis, start=3, stop=91, step=5)
+
+    def test_ddof(self):
+        self.check('std', 0, ddof=1)
+        self.check('var', None, ddof=1)
+
+    def test_sum_accuracy(self):
+        # Single precision data is accumulated in double precision
+        self.assertEqual(self.array.sum().dtype, self.nparr.sum().dtype)
+        total = self.nparr.astype('float64').sum()
+        self.assertAlmostEqual(float(self.array.sum()), total, places=3)
+
+    def test_empty(self):
+        self.assertEqual(self.array.sum(start=10, stop=10), 0)
+        self.assertRaises(ValueError, self.array.max, None, 10, 10)
+
+    def test_bad_axis(self):
+        self.assertRaises(ValueError, self.array.sum, 3)
+
+    def test_closed(self):
+        self.h5file.close()
+        self.assertRaises(ClosedNodeError, self.array.sum)
+
+
+class IntReductionTestCase(ReductionTestCase):
+    shape = (50, 4)
+    chunkshape = (3, 4)
+    dtype = 'int16'
+
+
+class MainDimReductionTestCase(common.TempFileMixin, TestCase):
+    """Arg reductions on an array extendable along its second dimension."""
+
+    def check_ties(self, op, nparr):
+        array = self.h5file.create_earray('/', op, tables.UInt8Atom(),
+                                          (4, 0))
+        array.append(nparr)
+        self.assertEqual(array.maindim, 1)
+        array.nrowsinbuf = 4
+        for nthreads in (1, 3):
+            self.h5file.params['MAX_REDUCTION_THREADS'] = nthreads
+            self.assertEqual(getattr(array, op)(), getattr(nparr, op)())
+
+    def test_argmax_ties(self):
+        nparr = numpy.zeros((4, 37), dtype='uint8')
+        nparr[3, 5] = nparr[1, 7] = nparr[0, 33] = 9
+        self.check_ties('argmax', nparr)
+
+    def test_argmin_ties(self):
+        nparr = numpy.ones((4, 37), dtype='uint8')
+        nparr[3, 5] = nparr[1, 7] = nparr[0, 33] = 0
+        self.check_ties('argmin', nparr)
+
+
 class TestCreateArrayArgs(common.TempFileMixin, TestCase):
     where = '/'
     name = 'array'
@@ -2732,6 +2826,9 @@ def suite():
         theSuite.addTest(unittest.makeSuite(AccessClosedTestCase))
         theSuite.addTest(unittest.makeSuite(TestCreateArrayArgs))
         theSuite.addTest(unittest.makeSuite(BroadcastTest))
+        theSuite.addTest(unittest.makeSuite(ReductionTestCase))
+        theSuite.addTest(unittest.makeSuite(IntReductionTestCase))
+        theSuite.addTest(unittest.makeSuite(MainDimReductionTestCase))
 
     return theSuite
 
@@ -1692,7 +1692,12 @@ class UnsupportedAttrTypeTestCase(common.TestFileMixin, TestCase):
     def test00_unsupportedType(self):
         """Checking file with unsupported type."""
 
-        self.assertWarns(DataTypeWarning, repr, self.h5file)
+        # Attributes are only read (and warned about) when accessed
+        def read_attrs():
+            for node in self.h5file:
+                repr(node._v_attrs)
+
+        self.assertWarns(DataTypeWarning, read_attrs)
 
 
 # Test for specific system attributes
@@ -1731,6 +1736,47 @@ class SpecificAttrsTestCase(common.TempFileMixin, TestCase):
         self._reopen()
         self.assertEqual(self.h5file.root._v_title, title)
 
+    def test04_lazy_getmany(self):
+        """Testing lazy reading of attributes and _f_getmany()."""
+
+        attrs = self.h5file.root._v_attrs
+        attrs.attr1 = 'value1'
+        attrs.attr2 = [1, (2, 3)]
+        attrs.attr3 = numpy.arange(3)
+        self._reopen('r')
+        attrs = self.h5file.root._v_attrs
+        self.assertFalse('attr2' in attrs.__dict__)
+        self.assertTrue('attr2' in dir(attrs))
+        values = attrs._f_getmany(['attr1', 'attr2', 'attr3'])
+        self.assertEqual(sorted(values), ['attr1', 'attr2', 'attr3'])
+        self.assertEqual(values['attr1'], 'value1')
+        self.assertEqual(values['attr2'], [1, (2, 3)])
+        assert_array_equal(values['attr3'], numpy.arange(3))
+        self.assertTrue('attr2' in attrs.__dict__)
+        self.assertRaises(AttributeError, attrs._f_getmany, ['attr1', 'x'])
+
+    def test05_getmany_types(self):
+        """Checking that _f_getmany() reads the same values as getattr."""
+
+        attrs = self.h5file.root._v_attrs
+        attrs.int = 3
+        attrs.float = numpy.float32(1.5)
+        attrs.bytes = b'bytes'
+        attrs.text = u'text \N{MINUS SIGN}'
+        attrs.empty = ''
+        attrs.matrix = numpy.arange(6, dtype='int16').reshape(2, 3)
+        attrs.strings = numpy.array([b'a', b'bc'])
+        self._reopen('r')
+        names = self.h5file.root._v_attrs._f_list('all')
+        values = self.h5file.root._v_attrs._f_getmany(names)
+        self._reopen('r')
+        attrs = self.h5file.root._v_attrs
+        self.assertEqual(sorted(values), sorted(names))
+        for name in names:
+            expected = getattr(attrs, name)
+            assert_array_equal(values[name], expected)
+            self.assertEqual(type(values[name]), type(expected))
+
 
 def suite():
     theSuite = unittest.TestSuite()
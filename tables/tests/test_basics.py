@@ -1193,6 +1193,165 @@ class DictNodeCacheOpenFile(OpenFileTestCase):
     open_kwargs = dict(node_cache_slots=node_cache_slots)
 
 
+class TwoQueueNodeCacheOpenFile(OpenFileTestCase):
+    node_cache_slots = 4
+    open_kwargs = dict(node_cache_slots=node_cache_slots,
+                       node_cache_policy='2q')
+
+    def _reopen(self, mode='r', **kwargs):
+        kwargs.setdefault('node_cache_policy', '2q')
+        return super(TwoQueueNodeCacheOpenFile, self)._reopen(mode, **kwargs)
+
+
+class NodeCachePolicyTestCase(common.TempFileMixin, TestCase):
+    nnodes = 50
+
+    def setUp(self):
+        super(NodeCachePolicyTestCase, self).setUp()
+        for i in range(self.nnodes):
+            self.h5file.create_array('/', 'array%02d' % i, [i])
+
+    def _reopen_with(self, **kwargs):
+        self._reopen(node_cache_slots=8, **kwargs)
+        self.node_manager = self.h5file._node_manager
+
+    def _scan(self, hot):
+        # Touch the hot nodes many times in between a scan over all nodes
+        for i in range(self.nnodes):
+            for name in hot:
+                self.h5file.get_node('/' + name)
+            self.h5file.get_node('/array%02d' % i)
+
+    def test00_invalid_policy(self):
+        self.assertRaises(ValueError, self._reopen_with,
+                          node_cache_policy='random')
+
+    def test01_stats(self):
+        self._reopen_with()
+        self.h5file.get_node('/array00')
+        self.h5file.get_node('/array00')
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['policy'], 'lru')
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['evictions'], 0)
+        self.assertTrue(stats['reload_time'] >= 0)
+
+        self.node_manager.reset_stats()
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['hits'], 0)
+        self.assertEqual(stats['misses'], 0)
+
+    def test02_lru_scan(self):
+        self._reopen_with(node_cache_policy='lru')
+        hot = ['array00', 'array01']
+        self._scan(hot)
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['misses'], self.nnodes)
+        self.assertTrue(stats['evictions'] > 0)
+
+    def test03_2q_scan(self):
+        self._reopen_with(node_cache_policy='2q')
+        hot = ['array00', 'array01']
+        self._scan(hot)
+        self._scan(hot)
+        # After the first scan, hot nodes are never loaded again
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['policy'], '2q')
+        self.assertTrue(stats['misses'] < 2 * self.nnodes + len(hot))
+        self.node_manager.reset_stats()
+        self._scan(hot)
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['misses'], self.nnodes - len(hot))
+        for name in hot:
+            self.assertTrue('/' + name in self.node_manager.cache)
+
+    def test04_memory_budget(self):
+        self._reopen_with(node_cache_policy='2q', node_cache_memory=1)
+        for i in range(self.nnodes):
+            self.h5file.get_node('/array%02d' % i)
+        stats = self.node_manager.cache_stats()
+        self.assertEqual(stats['nnodes'], 1)
+        self.assertEqual(stats['evictions'], self.nnodes - 1)
+
+
+class SharedChunkCacheTestCase(common.TempFileMixin, TestCase):
+    cache_size = 1024 * 1024
+
+    def setUp(self):
+        super(SharedChunkCacheTestCase, self).setUp()
+        self.rows = numpy.array([(i, i * 2.) for i in range(1000)],
+                                dtype=[('a', 'i4'), ('b', 'f8')])
+        self.data = numpy.arange(100 * 30).reshape(100, 30)
+        self.h5file.create_table('/', 'table', self.rows, chunkshape=(64,))
+        self.h5file.create_carray('/', 'carray', obj=self.data,
+                                  chunkshape=(8, 8))
+        self._reopen(shared_chunk_cache_size=self.cache_size)
+        tables.chunkcache.shared_cache.clear()
+
+    def tearDown(self):
+        tables.chunkcache.shared_cache.clear()
+        super(SharedChunkCacheTestCase, self).tearDown()
+
+    def test00_read(self):
+        table = self.h5file.root.table
+        carray = self.h5file.root.carray
+        self.assertTrue(table._v_chunk_cache_key is not None)
+        numpy.testing.assert_array_equal(table[10:300], self.rows[10:300])
+        numpy.testing.assert_array_equal(table.read(5, 900, 7),
+                                         self.rows[5:900:7])
+        numpy.testing.assert_array_equal(
+            [row['a'] for row in table.where('a > 990')], range(991, 1000))
+        numpy.testing.assert_array_equal(carray[3:77:3, 5:],
+                                         self.data[3:77:3, 5:])
+        stats = self.h5file.cache_stats()['chunks']
+        self.assertTrue(stats['nchunks'] > 0)
+        self.assertTrue(stats['nbytes'] <= self.cache_size)
+
+    def test01_shared(self):
+        self.h5file.root.carray[:]
+        misses = tables.chunkcache.shared_cache.misses
+
+        # Another handle of the same file reuses the chunks
+        h5file2 = tables.open_file(self.h5fname, 'r',
+                                   shared_chunk_cache_size=self.cache_size)
+        try:
+            numpy.testing.assert_array_equal(h5file2.root.carray[:],
+                                             self.data)
+        finally:
+            h5file2.close()
+        self.assertEqual(tables.chunkcache.shared_cache.misses, misses)
+
+    def test02_writable(self):
+        self._reopen('a', shared_chunk_cache_size=self.cache_size)
+        carray = self.h5file.root.carray
+        self.assertTrue(carray._v_chunk_cache_key is None)
+        carray[0] = 0
+        self.assertEqual(carray[0].sum(), 0)
+        self.assertEqual(len(tables.chunkcache.shared_cache), 0)
+
+    @unittest.skipIf(not common.blosc_avail,
+                     'BLOSC compression library not available')
+    def test03_compressed(self):
+        cache = tables.chunkcache.shared_cache
+        maxsize, compressed_maxsize = cache.maxsize, cache.compressed_maxsize
+        # Only a couple of chunks fit uncompressed
+        cache.resize(2 * 8 * 8 * self.data.itemsize)
+        cache.resize_compressed(self.cache_size)
+        try:
+            carray = self.h5file.root.carray
+            numpy.testing.assert_array_equal(carray[:], self.data)
+            self.assertTrue(len(cache._cchunks) > 0)
+            self.assertTrue(cache.compressed_nbytes <= self.cache_size)
+            misses = cache.misses
+            numpy.testing.assert_array_equal(carray[:], self.data)
+            self.assertEqual(cache.misses, misses)
+            self.assertTrue(cache.compressed_hits > 0)
+        finally:
+            cache.resize(maxsize)
+            cache.resize_compressed(compressed_maxsize)
+
+
 class CheckFileTestCase(common.TempFileMixin, TestCase):
     def setUp(self):
         super(CheckFileTestCase, self).setUp()
@@ -1319,6 +1478,10 @@ class CheckFileTestCase(common.TempFileMixin, TestCase):
             with self.assertWarns(UserWarning):
                 node = h5file.get_node('/CompoundChunked')
             self.assertTrue(isinstance(node, UnImplemented))
+            if tables.hdf5extension.HAVE_SWMR_SUPPORT:
+                shape = node.shape
+                self.assertEqual(node.refresh(), node.nrows)
+                self.assertEqual(node.shape, shape)
 
     def test04c_UnImplementedScalar(self):
         """Checking opening of HDF5 files containing scalar dataset of
@@ -1419,6 +1582,222 @@ class ThreadingTestCase(common.TempFileMixin, TestCase):
             t.join()
 
 
+class ConcurrentReadsTestCase(common.TempFileMixin, TestCase):
+    """Test threads sharing a file opened for concurrent reads."""
+
+    def setUp(self):
+        super(ConcurrentReadsTestCase, self).setUp()
+        for i in range(8):
+            self.h5file.create_array('/', 'array%d' % i,
+                                     numpy.arange(1000) * i)
+        table = self.h5file.create_table('/', 'table',
+                                         {'var1': tables.Int32Col()})
+        table.append([(i,) for i in range(1000)])
+        table.cols.var1.create_index()
+        self._reopen(concurrent_reads=True)
+
+    def test00_lock(self):
+        """Only read-only files opened for concurrent reads get a lock."""
+
+        # Without a thread-safe HDF5, the GIL is held while the file is open
+        threadsafe = tables.hdf5extension.HAVE_THREADSAFE_LIBRARY
+        self.assertIsNotNone(self.h5file._lock)
+        self.assertEqual(tables.file._nconcurrent_files, 0 if threadsafe else 1)
+        self._reopen(mode='a', concurrent_reads=True)
+        self.assertIsNone(self.h5file._lock)
+        self.assertEqual(tables.file._nconcurrent_files, 0)
+        self._reopen()
+        self.assertIsNone(self.h5file._lock)
+
+    def test01_read(self):
+        """Threads reading nodes and querying the same file."""
+
+        h5file = self.h5file
+
+        def run(i, q):
+            try:
+                for j in range(20):
+                    array = h5file.get_node('/array%d' % i)
+                    assert (array[10:20] == numpy.arange(10, 20) * i).all()
+                    coords = h5file.root.table.get_where_list(
+                        '(var1 >= i) & (var1 < i + 10)')
+                    assert (coords == numpy.arange(i, i + 10)).all()
+            except Exception:
+                q.put(sys.exc_info())
+            else:
+                q.put('OK')
+
+        q = six.moves.queue.Queue()
+        threads = [threading.Thread(target=run, args=(i, q))
+                   for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            self.assertEqual(q.get(), 'OK')
+        for t in threads:
+            t.join()
+
+
+@unittest.skipIf(not tables.hdf5extension.HAVE_SWMR_SUPPORT,
+                 "SWMR needs HDF5 1.10")
+class SWMRTestCase(common.TempFileMixin, TestCase):
+    """Test appending to a file in SWMR mode while reading it."""
+
+    open_kwargs = {'swmr': True}
+
+    reader = (
+        "import sys, tables\n"
+        "with tables.open_file(%r, swmr=True) as h5file:\n"
+        "    table = h5file.root.table\n"
+        "    for line in iter(sys.stdin.readline, ''):\n"
+        "        nrows = table.refresh()\n"
+        "        nhits = len(table.read_where('var1 >= 50'))\n"
+        "        print(nrows, h5file.root.earray.refresh(), nhits)\n"
+        "        sys.stdout.flush()\n")
+
+    def setUp(self):
+        super(SWMRTestCase, self).setUp()
+        table = self.h5file.create_table('/', 'table',
+                                         {'var1': tables.Int32Col()})
+        table.append([(i,) for i in range(100)])
+        table.cols.var1.create_index()
+        self.h5file.create_earray('/', 'earray', tables.Float64Atom(), (0,))
+        self.h5file.start_swmr_write()
+
+    def append(self, nrows):
+        table = self.h5file.root.table
+        start = table.nrows
+        table.append([(i,) for i in range(start, start + nrows)])
+        self.h5file.root.earray.append(numpy.arange(nrows, dtype='float64'))
+        self.h5file.flush()
+
+    def test00_start(self):
+        self.assertTrue(self.h5file._swmr_write)
+        self._reopen(mode='a')
+        self.assertRaises(ValueError, self.h5file.start_swmr_write)
+        self._reopen(mode='a', swmr=True)
+        self.assertTrue(self.h5file._swmr_write)
+        self._reopen(swmr=True)
+        self.assertFalse(self.h5file._swmr_write)
+        self.assertRaises(FileModeError, self.h5file.start_swmr_write)
+
+    def test01_query_appended(self):
+        """Rows appended in SWMR mode are searched in-kernel."""
+
+        self.append(100)
+        table = self.h5file.root.table
+        self.assertEqual(table._indexedrows, 100)
+        self.assertTrue(table.will_query_use_indexing('var1 >= 50'))
+        self.assertTrue(common.areArraysEqual(
+            table.get_where_list('var1 >= 50'), numpy.arange(50, 200)))
+        # No indexed row fulfills this one
+        self.assertTrue(common.areArraysEqual(
+            table.get_where_list('var1 >= 150'), numpy.arange(150, 200)))
+
+    def test02_refresh(self):
+        """Readers see the rows appended by the writer after refreshing."""
+
+        reader = subprocess.Popen(
+            [sys.executable, '-c', self.reader % self.h5fname],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            universal_newlines=True)
+        results = []
+        try:
+            for nrows in (0, 10, 1000):
+                if nrows:
+                    self.append(nrows)
+                reader.stdin.write('\n')
+                reader.stdin.flush()
+                results.append(reader.stdout.readline().split())
+        finally:
+            reader.stdin.close()
+            reader.wait()
+        self.assertEqual(results, [['100', '0', '50'],
+                                   ['110', '10', '60'],
+                                   ['1110', '1010', '1060']])
+
+
+class ReaderPoolTestCase(common.TempFileMixin, TestCase):
+    """Test reading a file from a pool of processes."""
+
+    def setUp(self):
+        super(ReaderPoolTestCase, self).setUp()
+        self.h5file.create_array('/', 'array', numpy.arange(100.))
+        self.h5file.create_array('/', 'array2', numpy.arange(100.) * 2)
+        table = self.h5file.create_table('/', 'table',
+                                         {'var1': tables.Int32Col(pos=0),
+                                          'var2': tables.Float64Col(pos=1)})
+        table.append([(i, i / 2.) for i in range(1000)])
+        # Extendable along its second dimension
+        earray = self.h5file.create_earray('/', 'earray',
+                                           tables.Float64Atom(), (3, 0))
+        earray.append(numpy.arange(300.).reshape(3, 100))
+        self._reopen()
+        self.pool = tables.ReaderPool(self.h5fname, processes=3)
+
+    def tearDown(self):
+        self.pool.close()
+        super(ReaderPoolTestCase, self).tearDown()
+
+    def test00_read(self):
+        table = self.h5file.root.table
+        self.assertTrue(common.areArraysEqual(self.pool.read('/table'),
+                                              table.read()))
+        self.assertTrue(common.areArraysEqual(
+            self.pool.read(table, 5, 900, 7, field='var2'),
+            table.read(5, 900, 7, field='var2')))
+        self.assertTrue(common.areArraysEqual(
+            self.pool.read('/array', 10), numpy.arange(10., 100.)))
+        self.assertEqual(len(self.pool.read('/table', 10, 10)), 0)
+
+    def test00_read_maindim(self):
+        """Leaves are split along their main dimension."""
+
+        earray = self.h5file.root.earray
+        self.assertTrue(common.areArraysEqual(self.pool.read('/earray'),
+                                              earray.read()))
+        self.assertTrue(common.areArraysEqual(
+            self.pool.read(earray, 5, 90, 7), earray.read(5, 90, 7)))
+        self.assertEqual(self.pool.read('/earray', 10, 10).shape, (3, 0))
+
+    def test01_read_where(self):
+        result = self.pool.read_where('/table',
+                                      '(var1 > limit) & (var2 < 400)',
+                                      {'limit': 500})
+        self.assertTrue(common.areArraysEqual(result['var1'],
+                                              numpy.arange(501, 800)))
+        result = self.pool.read_where('/table', 'var1 < 0', field='var2')
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result.dtype, numpy.float64)
+
+    def test02_read_coordinates(self):
+        coords = [3, 999, 4, 5, 6]
+        result = self.pool.read_coordinates('/table', coords)
+        self.assertTrue(common.areArraysEqual(result['var1'], coords))
+        result = self.pool.read_coordinates('/array', [1, 2, 50])
+        self.assertTrue(common.areArraysEqual(result, [1., 2., 50.]))
+
+    def test03_eval(self):
+        uservars = {'a': self.h5file.root.array, 'b': self.h5file.root.array2}
+        result = self.pool.eval('a + b + 1', uservars, start=10, stop=100,
+                                step=3)
+        self.assertTrue(common.areArraysEqual(
+            result, numpy.arange(10., 100., 3) * 3 + 1))
+
+    def test04_frame_vars(self):
+        """Variables are taken from the caller when not given."""
+
+        limit = 990
+        result = self.pool.read_where('/table', 'var1 > limit')
+        self.assertTrue(common.areArraysEqual(
+            result, self.h5file.root.table.read_where('var1 > limit',
+                                                      {'limit': limit})))
+
+    def test05_close(self):
+        self.pool.close()
+        self.assertRaises(ClosedFileError, self.pool.read, '/array')
+
+
 class PythonAttrsTestCase(common.TempFileMixin, TestCase):
     """Test interactions of Python attributes and child nodes."""
 
@@ -2464,6 +2843,41 @@ class TestCol(TestCase):
         self.assertEqual(cc._v_pos, 2)
 
 
+@unittest.skipIf(sys.version_info < (3, 7),
+                 "lazy module attributes need Python 3.7")
+class LazyImportTestCase(common.TempFileMixin, TestCase):
+    """Modules for queries and indexes are imported on first use."""
+
+    lazy_modules = ('numexpr', 'tables.table', 'tables.index',
+                    'tables.expression', 'tables.readerpool', 'tables.tests')
+
+    def test00_read_array(self):
+        self.h5file.create_array('/', 'array', [1, 2, 3])
+        self.h5file.close()
+
+        code = (
+            "import sys, tables\n"
+            "with tables.open_file(%r) as h5file:\n"
+            "    assert h5file.root.array.read() == [1, 2, 3]\n"
+            "print(' '.join(sorted(sys.modules)))\n" % self.h5fname)
+        out = subprocess.check_output([sys.executable, '-c', code])
+        modules = set(out.decode('ascii').split())
+        for name in self.lazy_modules:
+            self.assertFalse(name in modules, name)
+
+    def test01_lazy_objects(self):
+        from tables import registry
+
+        self.assertTrue(tables.Table is registry.class_name_dict['Table'])
+        self.assertTrue(tables.Column is sys.modules['tables.table'].Column)
+        self.assertTrue(tables.Expr is sys.modules['tables.expression'].Expr)
+        self.assertTrue(
+            tables.ReaderPool is sys.modules['tables.readerpool'].ReaderPool)
+        self.assertTrue('INDEX' in registry.class_id_dict)
+        self.assertTrue('Table' in dir(tables))
+        self.assertRaises(AttributeError, getattr, tables, 'NoSuchObject')
+
+
 class TestSysattrCompatibility(TestCase):
     def test_open_python2(self):
         h5fname = test_filename("python2.h5")
@@ -2485,8 +2899,14 @@ def suite():
         theSuite.addTest(unittest.makeSuite(NodeCacheOpenFile))
         theSuite.addTest(unittest.makeSuite(NoNodeCacheOpenFile))
         theSuite.addTest(unittest.makeSuite(DictNodeCacheOpenFile))
+        theSuite.addTest(unittest.makeSuite(TwoQueueNodeCacheOpenFile))
+        theSuite.addTest(unittest.makeSuite(NodeCachePolicyTestCase))
+        theSuite.addTest(unittest.makeSuite(SharedChunkCacheTestCase))
         theSuite.addTest(unittest.makeSuite(CheckFileTestCase))
         theSuite.addTest(unittest.makeSuite(ThreadingTestCase))
+        theSuite.addTest(unittest.makeSuite(ConcurrentReadsTestCase))
+        theSuite.addTest(unittest.makeSuite(SWMRTestCase))
+        theSuite.addTest(unittest.makeSuite(ReaderPoolTestCase))
         theSuite.addTest(unittest.makeSuite(PythonAttrsTestCase))
         theSuite.addTest(unittest.makeSuite(StateTestCase))
         theSuite.addTest(unittest.makeSuite(FlavorTestCase))
@@ -2498,6 +2918,7 @@ def suite():
         theSuite.addTest(unittest.makeSuite(TestDescription))
         theSuite.addTest(unittest.makeSuite(TestAtom))
         theSuite.addTest(unittest.makeSuite(TestCol))
+        theSuite.addTest(unittest.makeSuite(LazyImportTestCase))
         theSuite.addTest(unittest.makeSuite(TestSysattrCompatibility))
 
     return theSuite
@@ -2420,6 +2420,112 @@ class InMemoryCoreDriverTestCase(TestCase):
         self.h5file.close()
         self.assertFalse(os.path.exists(self.h5fname))
 
+    def test_get_file_image_out(self):
+        image = self._create_image(self.h5fname)
+        self.h5file = tables.open_file(self.h5fname, mode="r",
+                                       driver=self.DRIVER,
+                                       driver_core_image=image,
+                                       driver_core_backing_store=0)
+
+        size = self.h5file.get_file_image_size()
+        self.assertEqual(size, len(image))
+        out = bytearray(size + 10)
+        self.assertEqual(self.h5file.get_file_image(out), size)
+        self.assertEqual(bytes(out[:size]), image)
+        out = numpy.zeros(size, dtype='uint8')
+        self.assertEqual(self.h5file.get_file_image(out), size)
+        self.assertEqual(out.tostring(), image)
+        self.assertRaises(ValueError, self.h5file.get_file_image,
+                          bytearray(size - 1))
+        self.assertRaises((TypeError, BufferError),
+                          self.h5file.get_file_image, image)
+
+    def test_openFileR_buffer(self):
+        image = bytearray(self._create_image(self.h5fname))
+
+        # Open the image in place
+        self.h5file = tables.open_file(self.h5fname, mode="r",
+                                       driver=self.DRIVER,
+                                       driver_core_image=memoryview(image),
+                                       driver_core_backing_store=0)
+        self.assertEqual(self.h5file.get_node_attr("/", "testattr"), 41)
+        self.assertEqual(self.h5file.root.array.read(), [1, 2])
+        # The image is locked while the file is open
+        self.assertRaises(BufferError, image.extend, b'\0')
+        self.h5file.close()
+        image.extend(b'\0')
+
+        # Writable files use a copy of the image
+        self.h5file = tables.open_file(self.h5fname, mode="r+",
+                                       driver=self.DRIVER,
+                                       driver_core_image=image,
+                                       driver_core_backing_store=0)
+        self.h5file.root._v_attrs.testattr = 42
+        image.extend(b'\0')
+        self.h5file.close()
+        self.assertFalse(os.path.exists(self.h5fname))
+
+    def test_group_to_image(self):
+        self.h5file = tables.open_file(self.h5fname, mode="w",
+                                       driver=self.DRIVER,
+                                       driver_core_backing_store=0)
+        group = self.h5file.create_group('/', 'group', title="Group")
+        group._v_attrs.testattr = 41
+        self.h5file.create_array(group, 'array', [1, 2], title="Array")
+        subgroup = self.h5file.create_group(group, 'subgroup')
+        self.h5file.create_table(subgroup, 'table', {'var1': IntCol()},
+                                 "Table")
+        self.h5file.create_array('/', 'other', [3, 4])
+
+        image = group._f_to_image()
+        out = bytearray(len(image))
+        self.assertEqual(group._f_to_image(out), len(image))
+        self.h5file.close()
+
+        self.h5file = tables.open_file(self.h5fname, mode="r",
+                                       driver=self.DRIVER,
+                                       driver_core_image=out,
+                                       driver_core_backing_store=0)
+        root = self.h5file.root
+        self.assertEqual(root._v_title, "Group")
+        self.assertEqual(root._v_attrs.testattr, 41)
+        self.assertEqual(sorted(root._v_children), ['array', 'subgroup'])
+        self.assertEqual(root.array.read(), [1, 2])
+        self.assertEqual(root.subgroup.table.title, "Table")
+        self.h5file.close()
+        self.assertFalse(os.path.exists(self.h5fname))
+
+    def test_group_to_image_kwargs(self):
+        self.h5file = tables.open_file(self.h5fname, mode="w",
+                                       driver=self.DRIVER,
+                                       driver_core_backing_store=0)
+        group = self.h5file.create_group('/', 'group')
+        group._v_attrs.testattr = 41
+        self.h5file.create_array(group, 'array', [1, 2])
+        subgroup = self.h5file.create_group(group, 'subgroup')
+        self.h5file.create_table(subgroup, 'table', {'var1': IntCol()})
+
+        stats = {}
+        image = group._f_to_image(copyuserattrs=False, stats=stats,
+                                  title="Image")
+        self.assertEqual(stats['groups'], 1)
+        self.assertEqual(stats['leaves'], 2)
+        self.assertRaises(ValueError, group._f_to_image, driver='H5FD_SEC2')
+        self.assertRaises(ValueError, group._f_to_image,
+                          driver_core_backing_store=1)
+        self.h5file.close()
+
+        self.h5file = tables.open_file(self.h5fname, mode="r",
+                                       driver=self.DRIVER,
+                                       driver_core_image=image,
+                                       driver_core_backing_store=0)
+        root = self.h5file.root
+        self.assertEqual(root._v_title, "Image")
+        self.assertFalse('testattr' in root._v_attrs)
+        self.assertEqual(sorted(root._v_children), ['array', 'subgroup'])
+        self.assertEqual(root.array.read(), [1, 2])
+        self.h5file.close()
+
 
 class QuantizeTestCase(common.TempFileMixin, TestCase):
     mode = "w"
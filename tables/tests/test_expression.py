@@ -1492,6 +1492,254 @@ class VeryLargeInputs2(VeryLargeInputsTestCase):
     shape = (2**32 + 1,)    # check that arrays > 32-bit are supported
 
 
+class PipelineTestCase(common.TempFileMixin, TestCase):
+    shape = (2**18, 3)    # several internal I/O buffers
+
+    def setUp(self):
+        super(PipelineTestCase, self).setUp()
+        root = self.h5file.root
+        self.npa = np.arange(np.prod(self.shape)).reshape(self.shape)
+        self.a = self.h5file.create_carray(root, "a", obj=self.npa)
+        self.out = self.h5file.create_carray(
+            root, "out", atom=tables.Int64Atom(), shape=self.shape)
+
+    def test_eval(self):
+        """Pipelined and sequential evaluations give the same results."""
+
+        for pipeline in (True, False):
+            tables.expression.EXPR_PIPELINE = pipeline
+            try:
+                expr = tables.Expr("2 * a + 1", {"a": self.a})
+                expr.set_output(self.out)
+                expr.eval()
+                self.assertTrue(common.areArraysEqual(
+                    self.out[:], 2 * self.npa + 1))
+            finally:
+                tables.expression.EXPR_PIPELINE = True
+
+    def test_eval_broadcast(self):
+        """On-disk inputs broadcast to every block are read beforehand."""
+
+        npb = np.arange(self.shape[1])
+        b = self.h5file.create_array(self.h5file.root, "b", npb)
+        expr = tables.Expr("a * b", {"a": self.a, "b": b})
+        expr.set_output(self.out)
+        expr.eval()
+        self.assertTrue(common.areArraysEqual(self.out[:], self.npa * npb))
+
+    def test_iter_early_exit(self):
+        """Leaving an iteration early stops the background reads."""
+
+        import threading
+        nthreads = threading.active_count()
+        expr = tables.Expr("a - 1", {"a": self.a})
+        for i, row in enumerate(expr):
+            if i == 10:
+                break
+        self.assertTrue(common.areArraysEqual(row, self.npa[10] - 1))
+        del expr, row
+        self.assertEqual(threading.active_count(), nthreads)
+
+    def test_prefetch_error(self):
+        """Errors while prefetching are raised in the calling thread."""
+
+        def blocks():
+            yield 1
+            raise ValueError("bad block")
+
+        prefetched = tables.utils.prefetch_blocks(blocks())
+        self.assertEqual(next(prefetched), 1)
+        self.assertRaises(ValueError, next, prefetched)
+
+
+class BlockPlanTestCase(common.TempFileMixin, TestCase):
+    shape = (100000,)
+
+    def setUp(self):
+        super(BlockPlanTestCase, self).setUp()
+        root = self.h5file.root
+        self.npa = np.arange(self.shape[0], dtype='f8')
+        self.a = self.h5file.create_carray(root, "a", obj=self.npa,
+                                           chunkshape=(1000,))
+        self.b = self.h5file.create_carray(root, "b", obj=self.npa,
+                                           chunkshape=(300,))
+
+    def test_plan(self):
+        """Blocks are aligned with the chunks of every input."""
+
+        expr = tables.Expr("a + b", {"a": self.a, "b": self.b})
+        plan = expr.get_block_plan()
+        self.assertEqual(plan.chunkrows, (1000, 300))
+        self.assertEqual(plan.lcm, 3000)
+        self.assertTrue(plan.aligned)
+        self.assertEqual(plan.nrowsinbuf % 3000, 0)
+        # Every chunk is read just once
+        self.assertEqual(plan.chunk_reads(0, self.shape[0]), [100, 334])
+
+    def test_eval(self):
+        """Evaluation with aligned blocks and an unaligned range."""
+
+        expr = tables.Expr("a + b", {"a": self.a, "b": self.b})
+        expr.set_inputs_range(123, 99001)
+        out = np.zeros(99001 - 123)
+        expr.set_output(out)
+        expr.eval()
+        self.assertTrue(common.areArraysEqual(out, 2 * self.npa[123:99001]))
+
+    def test_plan_blocks(self):
+        """Chunks larger than blocks are split in equal parts."""
+
+        plan = tables.leaf.plan_blocks(500, [8], [1000])
+        self.assertEqual(plan.nrowsinbuf, 500)
+        plan = tables.leaf.plan_blocks(400, [8], [1000])
+        self.assertEqual(plan.nrowsinbuf, 250)
+        plan = tables.leaf.plan_blocks(4096, [8, 8], [1000, 300],
+                                       cachesize=16 * 800)
+        self.assertEqual(plan.nrowsinbuf, 500)
+
+    def test_leaf_nrowsinbuf(self):
+        """Leaf buffers are aligned with chunks."""
+
+        self.assertEqual(self.a.nrowsinbuf % 1000, 0)
+        self.assertEqual(self.b.nrowsinbuf % 300, 0)
+
+
+class MultiExprTestCase(common.TempFileMixin, TestCase):
+    shape = (100000, 2)
+
+    def setUp(self):
+        super(MultiExprTestCase, self).setUp()
+        root = self.h5file.root
+        self.npa = np.arange(np.prod(self.shape), dtype='f8').reshape(
+            self.shape)
+        self.npb = self.npa[::-1].copy()
+        self.a = self.h5file.create_carray(root, "a", obj=self.npa)
+        self.b = self.h5file.create_carray(root, "b", obj=self.npb)
+
+    def test_eval(self):
+        """Several expressions are evaluated over the same inputs."""
+
+        expr = tables.Expr(["a * b", "a + b", "sqrt(a**2 + b**2)"],
+                           {"a": self.a, "b": self.b})
+        self.assertEqual(expr.names, ["a", "b"])
+        prod, sum_, hypot = expr.eval()
+        self.assertTrue(common.areArraysEqual(prod, self.npa * self.npb))
+        self.assertTrue(common.areArraysEqual(sum_, self.npa + self.npb))
+        self.assertTrue(np.allclose(
+            hypot, np.sqrt(self.npa**2 + self.npb**2)))
+
+    def test_outputs(self):
+        """Every expression can have its own output container."""
+
+        root = self.h5file.root
+        atom = tables.Float64Atom()
+        out0 = self.h5file.create_carray(root, "out0", atom=atom,
+                                         shape=self.shape)
+        out1 = self.h5file.create_earray(root, "out1", atom=atom,
+                                         shape=(0, 2))
+        expr = tables.Expr(["a - b", "2 * a", "b + 1"],
+                           {"a": self.a, "b": self.b})
+        expr.set_inputs_range(10, 20010, 2)
+        expr.set_output(out0, index=0)
+        expr.set_output_range(100, None, 3, index=0)
+        expr.set_output(out1, append_mode=True, index=1)
+        res = expr.eval()
+        self.assertTrue(res[0] is out0)
+        self.assertTrue(res[1] is out1)
+        self.assertTrue(common.areArraysEqual(
+            out0[100:30100:3], (self.npa - self.npb)[10:20010:2]))
+        self.assertTrue(common.areArraysEqual(
+            out1[:], 2 * self.npa[10:20010:2]))
+        self.assertTrue(common.areArraysEqual(
+            res[2], self.npb[10:20010:2] + 1))
+
+    def test_iter(self):
+        """Iteration yields a row of every outcome."""
+
+        expr = tables.Expr(["a * 2", "b"], {"a": self.a, "b": self.b})
+        for i, (row0, row1) in enumerate(expr):
+            if i == 3:
+                break
+        self.assertTrue(common.areArraysEqual(row0, 2 * self.npa[3]))
+        self.assertTrue(common.areArraysEqual(row1, self.npb[3]))
+
+    def test_scalar_expression(self):
+        """All the expressions must depend on the main dimension."""
+
+        self.assertRaises(ValueError, tables.Expr, ["a * 2", "c + 1"],
+                          {"a": self.a, "c": 1})
+
+
+class ExprReductionTestCase(common.TempFileMixin, TestCase):
+    shape = (100000, 3)
+
+    def setUp(self):
+        super(ExprReductionTestCase, self).setUp()
+        root = self.h5file.root
+        self.npa = np.arange(np.prod(self.shape), dtype='f8').reshape(
+            self.shape) % 1001
+        self.npb = np.arange(self.shape[1], dtype='f8') * 300
+        self.a = self.h5file.create_carray(root, "a", obj=self.npa,
+                                           chunkshape=(1000, 3))
+        self.b = self.h5file.create_array(root, "b", obj=self.npb)
+
+    def test_reductions(self):
+        """Reductions of an outcome are computed by blocks."""
+
+        expr = tables.Expr("a - b", {"a": self.a, "b": self.b})
+        npr = self.npa - self.npb
+        self.assertTrue(np.allclose(expr.sum(), npr.sum()))
+        self.assertTrue(np.allclose(expr.sum(axis=0), npr.sum(axis=0)))
+        self.assertTrue(np.allclose(expr.sum(axis=1), npr.sum(axis=1)))
+        self.assertEqual(expr.min(), npr.min())
+        self.assertTrue(common.areArraysEqual(expr.max(axis=0),
+                                              npr.max(axis=0)))
+
+    def test_reductions_range(self):
+        """Reductions honor the range of inputs."""
+
+        expr = tables.Expr("a - b", {"a": self.a, "b": self.b})
+        expr.set_inputs_range(13, 90000, 7)
+        npr = (self.npa - self.npb)[13:90000:7]
+        self.assertTrue(np.allclose(expr.sum(), npr.sum()))
+        self.assertEqual(expr.max(), npr.max())
+
+    def test_count_nonzero(self):
+        """True elements of a boolean outcome are counted by blocks."""
+
+        expr = tables.Expr("a > b", {"a": self.a, "b": self.b})
+        npr = self.npa > self.npb
+        self.assertEqual(expr.count_nonzero(), np.count_nonzero(npr))
+        self.assertTrue(common.areArraysEqual(
+            expr.count_nonzero(axis=0), npr.sum(axis=0)))
+
+    def test_where(self):
+        """Coordinates of true elements are computed by blocks."""
+
+        expr = tables.Expr("(a > b) & (a < b + 2)", {"a": self.a,
+                                                     "b": self.b})
+        npr = (self.npa > self.npb) & (self.npa < self.npb + 2)
+        coords = expr.where()
+        self.assertEqual(coords.dtype, np.int64)
+        self.assertTrue(common.areArraysEqual(coords, np.argwhere(npr)))
+
+    def test_where_range(self):
+        """Coordinates refer to positions in inputs."""
+
+        a = self.a[:, 0]
+        expr = tables.Expr("a % 10 == 0", {"a": a})
+        expr.set_inputs_range(5, None, 3)
+        rows = np.arange(len(a))[5::3]
+        self.assertTrue(common.areArraysEqual(
+            expr.where(), rows[a[5::3] % 10 == 0]))
+
+    def test_where_not_boolean(self):
+        """Only boolean expressions can be used for getting coordinates."""
+
+        expr = tables.Expr("a * 2", {"a": self.a})
+        self.assertRaises(TypeError, expr.where)
+
+
 def suite():
     """Return a test suite consisting of all the test cases in the module."""
 
@@ -1548,6 +1796,10 @@ def suite():
         theSuite.addTest(unittest.makeSuite(setOutputRange8))
         theSuite.addTest(unittest.makeSuite(setOutputRange9))
         theSuite.addTest(unittest.makeSuite(VeryLargeInputs1))
+        theSuite.addTest(unittest.makeSuite(PipelineTestCase))
+        theSuite.addTest(unittest.makeSuite(BlockPlanTestCase))
+        theSuite.addTest(unittest.makeSuite(MultiExprTestCase))
+        theSuite.addTest(unittest.makeSuite(ExprReductionTestCase))
         if common.heavy:
             theSuite.addTest(unittest.makeSuite(VeryLargeInputs2))
     return theSuite
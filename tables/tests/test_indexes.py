@@ -2657,6 +2657,160 @@ class TestIndexingNans(TempFileMixin, TestCase):
         self.assertEqual(len(results), 100*2)
 
 
+class CacheStatsTestCase(TempFileMixin, TestCase):
+    nrows = 1000
+
+    def setUp(self):
+        super(CacheStatsTestCase, self).setUp()
+        table = self.h5file.create_table('/', 'table', {'var1': Int32Col()})
+        table.append([(i,) for i in range(self.nrows)])
+        table.cols.var1.create_index()
+        self.table = table
+
+    def test00_stats(self):
+        table = self.table
+        for i in range(3):
+            self.assertEqual(len(table.get_where_list('var1 < 10')), 10)
+
+        stats = table.cache_stats()
+        self.assertEqual(sorted(stats['indexes']), ['var1'])
+        for name in ('bounds', 'limbounds', 'sortedLR'):
+            self.assertTrue(name in stats['indexes']['var1'])
+        seqstats = stats['iterseq']
+        self.assertEqual(seqstats['type'], 'ObjectCache')
+        self.assertEqual(seqstats['lookups'], 3)
+        self.assertEqual(seqstats['hits'], 2)
+        self.assertAlmostEqual(seqstats['hit_ratio'], 2. / 3)
+        self.assertFalse(seqstats['disabled'])
+
+        filestats = self.h5file.cache_stats()
+        self.assertTrue('/table' in filestats['tables'])
+        self.assertTrue('hits' in filestats['nodes'])
+
+    def test01_set_cache_params(self):
+        table = self.table
+        table.get_where_list('var1 < 10')
+        table.set_cache_params(iterseq_max_slots=7, LIMBOUNDS_MAX_SLOTS=5)
+        table.get_where_list('var1 < 10')
+        stats = table.cache_stats()
+        self.assertEqual(stats['iterseq']['nslots'], 7)
+        self.assertEqual(stats['iterseq']['lookups'], 1)
+        self.assertEqual(stats['indexes']['var1']['limbounds']['nslots'], 5)
+
+        # A None value restores the parameter of the file
+        table.set_cache_params(iterseq_max_slots=None)
+        table.get_where_list('var1 < 10')
+        self.assertEqual(table.cache_stats()['iterseq']['nslots'],
+                         self.h5file.params['ITERSEQ_MAX_SLOTS'])
+
+    def test02_unknown_param(self):
+        self.assertRaises(ValueError, self.table.set_cache_params,
+                          node_cache_slots=10)
+
+
+class AppendSeqCacheTestCase(TempFileMixin, TestCase):
+    nrows = 1000
+
+    def setUp(self):
+        super(AppendSeqCacheTestCase, self).setUp()
+        table = self.h5file.create_table('/', 'table', {'var1': Int32Col()})
+        table.append([(i % 100,) for i in range(self.nrows)])
+        table.cols.var1.create_index()
+        self.table = table
+
+    def expected(self, condition, start=0, stop=None, step=1):
+        var1 = self.table.col('var1')
+        coords = numpy.arange(len(var1))
+        cond = eval(condition, {'var1': var1})
+        return coords[start:stop:step][cond[start:stop:step]].tolist()
+
+    def test00_append(self):
+        table = self.table
+        for condition in ('var1 < 10', '(var1 >= 10) & (var1 < 12)'):
+            for i in range(2):
+                self.assertEqual(table.get_where_list(condition).tolist(),
+                                 self.expected(condition))
+            table.append([(i % 10,) for i in range(50)])
+            lookups = table.cache_stats()['iterseq']['lookups']
+            hits = table.cache_stats()['iterseq']['hits']
+            self.assertEqual(table.get_where_list(condition).tolist(),
+                             self.expected(condition))
+            # The cached result has been extended to the appended rows
+            stats = table.cache_stats()['iterseq']
+            self.assertEqual(stats['lookups'], lookups + 1)
+            self.assertEqual(stats['hits'], hits + 1)
+
+    def test01_ranges(self):
+        table = self.table
+        condition = 'var1 < 3'
+        ranges = [(5, None, 7), (0, 500, 1)]
+        for start, stop, step in ranges:
+            table.get_where_list(condition, start=start, stop=stop, step=step)
+        table.append([(i % 10,) for i in range(123)])
+        for start, stop, step in ranges:
+            self.assertEqual(
+                table.get_where_list(condition, start=start, stop=stop,
+                                     step=step).tolist(),
+                self.expected(condition, start, stop, step))
+
+    def test02_modify(self):
+        table = self.table
+        table.get_where_list('var1 < 10')
+        table.append([(5,)])
+        table.get_where_list('var1 < 10')
+        table.modify_column(0, 10, colname='var1', column=[99] * 10)
+        self.assertEqual(table.get_where_list('var1 < 10').tolist(),
+                         self.expected('var1 < 10'))
+
+
+class IndexCacheDirTestCase(TempFileMixin, TestCase):
+    nrows = 1000
+
+    def setUp(self):
+        super(IndexCacheDirTestCase, self).setUp()
+        table = self.h5file.create_table('/', 'table', {'var1': Int32Col(),
+                                                        'var2': StringCol(4)})
+        table.append([(i, str(i)) for i in range(self.nrows)])
+        table.cols.var1.create_index(_blocksizes=small_blocksizes)
+        table.cols.var2.create_index(_blocksizes=small_blocksizes)
+        self.cachedir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(IndexCacheDirTestCase, self).tearDown()
+        for name in os.listdir(self.cachedir):
+            os.remove(os.path.join(self.cachedir, name))
+        os.rmdir(self.cachedir)
+
+    def check_queries(self):
+        table = self.h5file.root.table
+        self.assertEqual(table.get_where_list('(var1 >= 100) & (var1 < 110)'
+                                              ).tolist(), list(range(100, 110)))
+        self.assertEqual(table.get_where_list('var2 == b"123"').tolist(),
+                         [123])
+        for colname in ('var1', 'var2'):
+            index = table.colindexes[colname]
+            self.assertTrue(isinstance(index.rvcache, numpy.memmap))
+            self.assertTrue(isinstance(index.boundsmap, numpy.memmap))
+
+    def test00_persistent(self):
+        self._reopen(index_cache_dir=self.cachedir)
+        self.check_queries()
+        names = os.listdir(self.cachedir)
+        self.assertEqual(len(names), 4)
+
+        # The caches are reused by other handles of the file
+        self._reopen(index_cache_dir=self.cachedir)
+        self.check_queries()
+        self.assertEqual(sorted(os.listdir(self.cachedir)), sorted(names))
+
+    def test01_writable(self):
+        self._reopen('a', index_cache_dir=self.cachedir)
+        table = self.h5file.root.table
+        self.assertEqual(len(table.get_where_list('var1 < 10')), 10)
+        self.assertTrue(table.colindexes['var1'].boundsmap is None)
+        self.assertEqual(os.listdir(self.cachedir), [])
+
+
 def suite():
     theSuite = unittest.TestSuite()
 
@@ -2693,6 +2847,9 @@ def suite():
         theSuite.addTest(unittest.makeSuite(Issue119Time32ColTestCase))
         theSuite.addTest(unittest.makeSuite(Issue119Time64ColTestCase))
         theSuite.addTest(unittest.makeSuite(TestIndexingNans))
+        theSuite.addTest(unittest.makeSuite(CacheStatsTestCase))
+        theSuite.addTest(unittest.makeSuite(AppendSeqCacheTestCase))
+        theSuite.addTest(unittest.makeSuite(IndexCacheDirTestCase))
     if heavy:
         # These are too heavy for normal testing
         theSuite.addTest(unittest.makeSuite(AI4bTestCase))
@@ -6214,6 +6214,173 @@ class ColumnIterationTestCase(common.TempFileMixin, TestCase):
         self.iterate(array, table)
 
 
+class ColumnReductionTestCase(common.TempFileMixin, TestCase):
+    nrows = 1000
+
+    def setUp(self):
+        super(ColumnReductionTestCase, self).setUp()
+        self.array = np.empty(self.nrows, dtype=[('f0', 'i4'),
+                                                 ('f1', 'f8', (3,))])
+        self.array['f0'] = np.random.randint(-100, 100, self.nrows)
+        self.array['f1'] = np.random.randn(self.nrows, 3)
+        self.table = self.h5file.create_table('/', 'table', self.array,
+                                              chunkshape=64)
+        self.h5file.params['IO_BUFFER_SIZE'] = 1024
+
+    def test_reductions(self):
+        for name in ('f0', 'f1'):
+            col = self.table.cols._f_col(name)
+            for op in ('sum', 'mean', 'std', 'min', 'max', 'argmin'):
+                for axis in (None, 0):
+                    result = getattr(col, op)(axis=axis)
+                    npres = getattr(self.array[name], op)(axis=axis)
+                    self.assertTrue(np.allclose(result, npres),
+                                    "%s.%s(axis=%s)" % (name, op, axis))
+
+    def test_range(self):
+        col = self.table.cols.f0
+        self.assertEqual(col.sum(start=10, stop=500, step=3),
+                         self.array['f0'][10:500:3].sum())
+        self.assertEqual(col.argmax(start=10, stop=500),
+                         self.array['f0'][10:500].argmax())
+
+
+class MultiTableTestCase(TestCase):
+    shard_nrows = [100, 150, 0, 120]
+    dtype = np.dtype([('time', 'f8'), ('energy', 'i4'), ('pos', 'f4', (2,))])
+
+    def setUp(self):
+        super(MultiTableTestCase, self).setUp()
+        self.fnames = []
+        arrays = []
+        for (i, nrows) in enumerate(self.shard_nrows):
+            array = np.zeros(nrows, dtype=self.dtype)
+            array['time'] = i * 1000 + np.arange(nrows)
+            array['energy'] = np.random.randint(0, 100, nrows)
+            array['pos'] = np.random.randn(nrows, 2)
+            arrays.append(array)
+            fname = tempfile.mktemp(prefix=self._getName(), suffix='.h5')
+            self.fnames.append(fname)
+            with tables.open_file(fname, 'w') as h5file:
+                table = h5file.create_table('/', 'events', self.dtype,
+                                            chunkshape=16)
+                if nrows:
+                    table.append(array)
+        self.array = np.concatenate(arrays)
+        self.mtable = tables.MultiTable(self.fnames, '/events',
+                                        bounds=['time'], nthreads=3)
+
+    def tearDown(self):
+        self.mtable.close()
+        for fname in self.fnames:
+            os.remove(fname)
+        super(MultiTableTestCase, self).tearDown()
+
+    def test00_read(self):
+        mtable = self.mtable
+        self.assertEqual(len(mtable), len(self.array))
+        self.assertEqual(mtable.nshards, len(self.shard_nrows))
+        self.assertTrue(allequal(mtable.read(), self.array))
+        self.assertTrue(allequal(mtable.read(5, 350, 7),
+                                 self.array[5:350:7]))
+        self.assertTrue(allequal(mtable.read(field='energy'),
+                                 self.array['energy']))
+        self.assertTrue(allequal(mtable.read(100, 100), self.array[:0]))
+        self.assertEqual(mtable[-1]['time'], self.array[-1]['time'])
+        self.assertEqual(mtable[100]['time'], self.array[100]['time'])
+        self.assertRaises(IndexError, mtable.__getitem__, len(self.array))
+
+    def test01_where(self):
+        mtable = self.mtable
+        limit = 50
+        result = mtable.read_where('energy > limit')
+        self.assertTrue(allequal(result,
+                                 self.array[self.array['energy'] > 50]))
+        coords = mtable.get_where_list('energy > limit', start=20, step=3)
+        expected = np.nonzero(self.array['energy'] > 50)[0]
+        expected = expected[(expected >= 20) & ((expected - 20) % 3 == 0)]
+        self.assertTrue(allequal(coords, expected))
+        rows = [row['energy'] for row in
+                mtable.where('energy > l', {'l': limit})]
+        self.assertEqual(rows, [energy for energy in self.array['energy']
+                                if energy > 50])
+
+    def test02_bounds(self):
+        mtable = self.mtable
+        mins, maxs = mtable.get_bounds('time')
+        self.assertEqual((mins[1], maxs[1]), (1000, 1149))
+        mask = mtable._get_shard_mask('(time >= 3000) & (energy > 10)', {})
+        self.assertEqual(mask.tolist(), [False, False, False, True])
+        mask = mtable._get_shard_mask('(time < 50) | (time == 1010)', {})
+        self.assertEqual(mask.tolist(), [True, True, False, False])
+        # Empty shards are always discarded
+        mask = mtable._get_shard_mask('energy > 10', {})
+        self.assertEqual(mask.tolist(), [True, True, False, True])
+        result = mtable.read_where('(time >= 3000) & (energy > 10)')
+        array = self.array
+        self.assertTrue(allequal(
+            result, array[(array['time'] >= 3000) & (array['energy'] > 10)]))
+
+        # Bounds given as a mapping
+        mtable2 = tables.MultiTable(
+            self.fnames, '/events', bounds={'time': (mins, maxs)})
+        try:
+            self.assertTrue(allequal(
+                mtable2.read_where('time > 1100'),
+                array[array['time'] > 1100]))
+        finally:
+            mtable2.close()
+
+    def test03_reductions(self):
+        for name in ('energy', 'pos'):
+            col = self.mtable.cols._f_col(name)
+            for op in ('sum', 'mean', 'std', 'min', 'max', 'argmax'):
+                for axis in (None, 0):
+                    result = getattr(col, op)(axis=axis)
+                    npres = getattr(self.array[name], op)(axis=axis)
+                    self.assertTrue(np.allclose(result, npres),
+                                    "%s.%s(axis=%s)" % (name, op, axis))
+        self.assertEqual(self.mtable.cols.energy.sum(start=30, step=3),
+                         self.array['energy'][30::3].sum())
+
+    def test04_file_pool(self):
+        mtable = tables.MultiTable(self.fnames, '/events', max_open_files=1)
+        try:
+            self.assertTrue(allequal(mtable.read(), self.array))
+            self.assertTrue(len(mtable._pool._files) <= 1)
+        finally:
+            mtable.close()
+        self.assertRaises(tables.ClosedFileError, mtable.read)
+
+    def test05_different_descriptions(self):
+        fname = tempfile.mktemp(prefix=self._getName(), suffix='.h5')
+        try:
+            with tables.open_file(fname, 'w') as h5file:
+                h5file.create_table('/', 'events', {'time': tables.IntCol()})
+            self.assertRaises(ValueError, tables.MultiTable,
+                              self.fnames + [fname], '/events')
+        finally:
+            os.remove(fname)
+
+    def test06_threads(self):
+        # More threads than open files, so that files are opened and
+        # closed while other shards are being read.
+        mtable = tables.MultiTable(self.fnames, '/events', nthreads=4,
+                                   max_open_files=2)
+        try:
+            for i in range(5):
+                self.assertTrue(allequal(mtable.read(), self.array))
+                self.assertEqual(mtable.cols.energy.sum(),
+                                 self.array['energy'].sum())
+            locks = set(id(entry[1])
+                        for entry in mtable._pool._files.values())
+            if not tables.hdf5extension.HAVE_THREADSAFE_LIBRARY:
+                # HDF5 is entered by one thread at a time
+                self.assertEqual(len(locks), 1)
+        finally:
+            mtable.close()
+
+
 class TestCreateTableArgs(common.TempFileMixin, TestCase):
     obj = np.array(
         [('aaaa', 1, 2.1), ('bbbb', 2, 3.2)],
@@ -6457,6 +6624,8 @@ def suite():
         theSuite.addTest(unittest.makeSuite(RowContainsTestCase))
         theSuite.addTest(unittest.makeSuite(AccessClosedTestCase))
         theSuite.addTest(unittest.makeSuite(ColumnIterationTestCase))
+        theSuite.addTest(unittest.makeSuite(ColumnReductionTestCase))
+        theSuite.addTest(unittest.makeSuite(MultiTableTestCase))
         theSuite.addTest(unittest.makeSuite(TestCreateTableArgs))
 
     if common.heavy:
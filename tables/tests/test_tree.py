@@ -4,7 +4,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 import os
 import sys
+import json
 import time
+import zlib
 import tempfile
 import warnings
 
@@ -16,6 +18,7 @@ from tables.tests import common
 from tables.tests.common import unittest
 from tables.tests.common import PyTablesTestCase as TestCase
 from six.moves import range
+import six.moves.cPickle as pickle
 
 
 # Test Record class
@@ -499,6 +502,109 @@ class TreeTestCase(common.TempFileMixin, TestCase):
         if common.verbose:
             print("walk_nodes(pathname, classname) test passed")
 
+    def test05_walkInfo(self):
+        """Checking the File.walk_info() method"""
+
+        self.h5file = tables.open_file(self.h5fname, "r")
+
+        self.assertRaises(TypeError, next,
+                          self.h5file.walk_info('/', 'NoSuchClass'))
+
+        infos = list(self.h5file.walk_info())
+        self.assertEqual([info.path for info in infos],
+                         ['/', '/group0', '/group0/group1',
+                          '/group0/group1/group2', '/group0/group1/table2',
+                          '/group0/group1/var1', '/group0/group1/var4',
+                          '/group0/table1', '/group0/var1', '/group0/var4',
+                          '/table0', '/var1', '/var4'])
+        # Nodes have not been loaded
+        self.assertFalse(
+            '/group0/table1' in self.h5file._node_manager.registry)
+
+        for info in infos:
+            node = self.h5file.get_node(info.path)
+            self.assertEqual(info.classname, node.__class__.__name__)
+            if isinstance(node, Leaf):
+                self.assertEqual(info.shape, node.shape)
+                self.assertEqual(info.dtype, node.dtype)
+                self.assertEqual(info.chunkshape, node.chunkshape)
+                self.assertEqual(info.filters, node.filters)
+                self.assertEqual(info.size, node.size_on_disk)
+            else:
+                self.assertEqual(info.shape, None)
+                self.assertEqual(info.size, None)
+
+        self.assertEqual(
+            [info.path for info in self.h5file.walk_info('/group0/group1',
+                                                         'Table')],
+            ['/group0/group1/table2'])
+        self.assertEqual(
+            [info.path for info in self.h5file.walk_info(classname='Group')],
+            ['/', '/group0', '/group0/group1', '/group0/group1/group2'])
+
+    def test06_snapshot(self):
+        """Checking metadata snapshots of files"""
+
+        self.h5file = tables.open_file(self.h5fname, "a")
+        self.assertRaises(tables.FileModeError, self.h5file.save_snapshot)
+        self._reopen(mode="r")
+        infos = list(self.h5file.walk_info())
+        snapname = self.h5fname + '.ptsnap'
+        self.h5file.save_snapshot()
+        try:
+            self.assertTrue(os.path.exists(snapname))
+            # Snapshots are stored as data only
+            with open(snapname, 'rb') as snapfile:
+                data = json.loads(
+                    zlib.decompress(snapfile.read()).decode('utf-8'))
+            self.assertEqual(len(data['entries']), len(infos))
+            self._reopen(mode="r", metadata_snapshot=True)
+            self.assertTrue(self.h5file._snapshot is not None)
+            self.assertEqual(list(self.h5file.walk_info()), infos)
+            for info in infos:
+                node = self.h5file.get_node(info.path)
+                self.assertEqual(info.classname, node.__class__.__name__)
+            self.assertTrue('/group0/group1' in self.h5file)
+            self.assertFalse('/group0/nosuchnode' in self.h5file)
+            self.assertRaises(tables.NoSuchNodeError,
+                              self.h5file.get_node, '/group0/nosuchnode')
+
+            # Snapshots are not used after files are modified
+            self._reopen(mode="a")
+            self.h5file.create_group('/', 'newgroup')
+            self._reopen(mode="r", metadata_snapshot=True)
+            self.assertTrue(self.h5file._snapshot is None)
+            self.assertTrue('/newgroup' in self.h5file)
+        finally:
+            os.remove(snapname)
+
+    def test07_snapshotNoPickle(self):
+        """Checking that snapshot files are never unpickled"""
+
+        self.h5file = tables.open_file(self.h5fname, "r")
+        snapname = self.h5fname + '.ptsnap'
+        marker = self.h5fname + '.unpickled'
+        with open(snapname, 'wb') as snapfile:
+            snapfile.write(zlib.compress(pickle.dumps(_Unpickled(marker))))
+        try:
+            self._reopen(mode="r", metadata_snapshot=True)
+            self.assertTrue(self.h5file._snapshot is None)
+            self.assertFalse(os.path.exists(marker))
+        finally:
+            os.remove(snapname)
+            if os.path.exists(marker):
+                os.rmdir(marker)
+
+
+class _Unpickled(object):
+    """An object which creates the `path` directory when unpickled."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (os.mkdir, (self.path,))
+
 
 class DeepTreeTestCase(common.TempFileMixin, TestCase):
     """Checks for deep hierarchy levels in PyTables trees."""
@@ -769,6 +875,109 @@ class WideTreeTestCase(common.TempFileMixin, TestCase):
         if common.verbose:
             print()  # This flush the stdout buffer
 
+    def test02_pagedChildren(self):
+        """Iterating over children of a wide group without loading them."""
+
+        group = self.h5file.create_group('/', 'wide')
+        names = []
+        for child in range(50):
+            if child % 3:
+                self.h5file.create_array(group, 'array%d' % child, [child])
+                names.append('array%d' % child)
+            else:
+                self.h5file.create_group(group, 'group%d' % child)
+                names.append('group%d' % child)
+        self.h5file.create_array(group, '_hidden', [0])
+        self.h5file.create_soft_link(group, 'link', '/wide/group0')
+        names.append('link')
+
+        self._reopen()
+        group = self.h5file.root.wide
+        group._c_children_page_size = 7
+
+        self.assertEqual([node._v_name for node in group], sorted(names))
+        self.assertEqual(
+            [node._v_name for node in group._f_iter_nodes('Group')],
+            sorted(name for name in names if name.startswith('group')))
+        self.assertEqual(
+            [node._v_name for node in group._f_iter_nodes('Array')],
+            sorted(name for name in names if name.startswith('array')))
+        self.assertEqual(
+            [node._v_name for node in group._f_iter_nodes('Link')], ['link'])
+        self.assertEqual(
+            [node._v_pathname for node in group._f_walk_groups()],
+            ['/wide'] + sorted('/wide/' + name for name in names
+                               if name.startswith('group')))
+        self.assertTrue('array1' in group)
+        self.assertFalse('array0' in group)
+        # Children were neither loaded to iterate nor to check them
+        self.assertFalse('_v_children' in group.__dict__)
+
+        # Adding children does not load them either
+        self._reopen(mode='a')
+        group = self.h5file.root.wide
+        self.h5file.create_array(group, 'array0', [0])
+        self.assertFalse('_v_children' in group.__dict__)
+        self.assertTrue('array0' in group._v_children)
+        self.assertEqual(group._v_nchildren, len(names) + 1)
+
+    def _create_wide_group(self):
+        group = self.h5file.create_group('/', 'wide')
+        names = ['array%04d' % child
+                 for child in range(group._c_children_page_size + 100)]
+        for name in names:
+            self.h5file.create_array(group, name, [0])
+        self._reopen(mode='a')
+        return names
+
+    def _check_iter_modified(self, load):
+        names = self._create_wide_group()
+        group = self.h5file.root.wide
+        if load:
+            group._v_children
+        removed = set()
+        seen = []
+        for node in group._f_iter_nodes():
+            name = node._v_name
+            seen.append(name)
+            if name.startswith('new'):
+                continue
+            # Remove this child and one not reached yet, and create a
+            # child before this one and another one after it.
+            node._f_remove()
+            ahead = 'array%04d' % (int(name[5:]) + 5)
+            if int(name[5:]) % 10 == 0 and ahead in group:
+                group._f_get_child(ahead)._f_remove()
+                removed.add(ahead)
+            self.h5file.create_array(group, 'a' + name, [0])
+            self.h5file.create_array(group, 'new' + name, [0])
+
+        self.assertEqual(seen, sorted(set(seen)))
+        self.assertEqual([name for name in seen if name.startswith('array')],
+                         [name for name in names if name not in removed])
+        self.assertEqual(len(removed), len(names) // 10)
+
+    def test03_pagedChildrenModified(self):
+        """Creating and removing children while iterating by pages."""
+
+        self._check_iter_modified(load=False)
+
+    def test04_loadedChildrenModified(self):
+        """Creating and removing children while iterating over them."""
+
+        self._check_iter_modified(load=True)
+
+    def test05_walkNodesRemoving(self):
+        """Removing leaves of a wide group while walking the tree."""
+
+        names = self._create_wide_group()
+        seen = []
+        for leaf in self.h5file.root._f_walknodes('Leaf'):
+            seen.append(leaf._v_name)
+            leaf._f_remove()
+        self.assertEqual(seen, names)
+        self.assertEqual(self.h5file.root.wide._v_nchildren, 0)
+
 
 class HiddenTreeTestCase(common.TempFileMixin, TestCase):
     """Check for hidden groups, leaves and hierarchies."""
@@ -4332,6 +4332,141 @@ class TestCreateVLArrayArgs(common.TempFileMixin, TestCase):
                           atom=atom)
 
 
+class RaggedTestCase(common.TempFileMixin, TestCase):
+
+    def setUp(self):
+        super(RaggedTestCase, self).setUp()
+        self.vlarray = self.h5file.create_vlarray(
+            '/', 'vlarray', atom=Int32Atom(shape=(2,)))
+        self.rows = [numpy.arange(2 * n, dtype='int32').reshape(n, 2)
+                     for n in (3, 0, 1, 5, 2)]
+
+    def test_append_ragged(self):
+        """Appending several rows at once in ragged form."""
+
+        values = numpy.concatenate(self.rows)
+        offsets = numpy.cumsum([0] + [len(row) for row in self.rows])
+        self.vlarray.append(self.rows[0])
+        self.vlarray.append_ragged(values, offsets)
+        self._reopen()
+        vlarray = self.h5file.root.vlarray
+        self.assertEqual(vlarray.nrows, 1 + len(self.rows))
+        rows = vlarray.read()
+        for row, expected in zip(rows, self.rows[:1] + self.rows):
+            npt.assert_array_equal(row, expected)
+
+    def test_read_ragged(self):
+        """Reading rows in ragged form."""
+
+        for row in self.rows:
+            self.vlarray.append(row)
+        values, offsets = self.vlarray.read_ragged()
+        self.assertEqual(offsets.dtype, numpy.int64)
+        npt.assert_array_equal(offsets, [0, 3, 3, 4, 9, 11])
+        npt.assert_array_equal(values, numpy.concatenate(self.rows))
+
+        values, offsets = self.vlarray.read_ragged(1, 5, 2)
+        npt.assert_array_equal(offsets, [0, 0, 5])
+        npt.assert_array_equal(values, self.rows[3])
+
+        values, offsets = self.vlarray.read_ragged(2, 2)
+        self.assertEqual(values.shape, (0, 2))
+        npt.assert_array_equal(offsets, [0])
+
+    def test_bad_offsets(self):
+        """Offsets must be consistent with values."""
+
+        values = numpy.zeros((4, 2), dtype='int32')
+        self.assertRaises(ValueError, self.vlarray.append_ragged,
+                          values, [0, 3, 2])
+        self.assertRaises(ValueError, self.vlarray.append_ragged,
+                          values, [0, 5])
+        self.assertRaises(ValueError, self.vlarray.append_ragged,
+                          numpy.zeros((4, 3)), [0, 4])
+        self.assertEqual(self.vlarray.nrows, 0)
+
+
+class ObjectCodecTestCase(common.TempFileMixin, TestCase):
+    objects = [{'a': 1, 'b': [2.5, None, True]}, u"text", b"bytes",
+               (1, 2 ** 70, [C.c]), numpy.arange(10)]
+
+    def _check_codec(self, **kwargs):
+        atom = ObjectAtom(**kwargs)
+        vlarray = self.h5file.create_vlarray('/', 'objects', atom=atom)
+        for obj in self.objects:
+            vlarray.append(obj)
+        self._reopen()
+        vlarray = self.h5file.root.objects
+        self.assertEqual(vlarray.atom.codec, atom.codec)
+        self.assertEqual(vlarray.atom.complevel, atom.complevel)
+        self.assertEqual(vlarray.atom.complib, atom.complib)
+        rows = vlarray.read()
+        self.assertEqual(rows[:-1], self.objects[:-1])
+        npt.assert_array_equal(rows[-1], self.objects[-1])
+
+    def test_pickle(self):
+        """The default codec is not recorded in attributes."""
+
+        self._check_codec()
+        self.assertFalse('OBJECT_CODEC' in self.h5file.root.objects.attrs)
+
+    @unittest.skipIf('pickle5' not in tables.objcodec._codecs,
+                     'pickle protocol 5 not available')
+    def test_pickle5(self):
+        """Objects are serialized with pickle protocol 5."""
+
+        self._check_codec(codec='pickle5')
+
+    @unittest.skipIf('pickle5' not in tables.objcodec._codecs,
+                     'pickle protocol 5 not available')
+    def test_pickle5_arrays(self):
+        """Arrays are stored out of band with pickle protocol 5."""
+
+        vlarray = self.h5file.create_vlarray(
+            '/', 'objects', atom=ObjectAtom(codec='pickle5'))
+        arr = numpy.arange(1000.).reshape(10, 100)
+        vlarray.append({'arr': arr, 'col': arr[:, 0]})
+        row = vlarray[0]
+        npt.assert_array_equal(row['arr'], arr)
+        npt.assert_array_equal(row['col'], arr[:, 0])
+        self.assertTrue(row['arr'].flags.writeable)
+
+    def test_tagged(self):
+        """Objects are serialized with the tagged codec."""
+
+        self._check_codec(codec='tagged')
+
+    def test_tagged_zlib(self):
+        """Rows are compressed with zlib."""
+
+        self._check_codec(codec='tagged', complevel=5, complib='zlib')
+
+    @unittest.skipIf(not common.blosc_avail,
+                     'BLOSC compression library not available')
+    def test_pickle_blosc(self):
+        """Rows are compressed with Blosc."""
+
+        self._check_codec(complevel=5, complib='blosc')
+
+    def test_register_codec(self):
+        """User-defined codecs can be registered."""
+
+        tables.objcodec.register_codec(
+            'repr', lambda obj: repr(obj).encode('ascii'),
+            lambda data: eval(memoryview(data).tobytes().decode('ascii')))
+        try:
+            self.objects = self.objects[:-1] + [[1, 2]]
+            self._check_codec(codec='repr')
+        finally:
+            del tables.objcodec._codecs['repr']
+
+    def test_unknown_codec(self):
+        """Unknown codecs and compression libraries are rejected."""
+
+        self.assertRaises(ValueError, ObjectAtom, codec='unknown')
+        self.assertRaises(ValueError, ObjectAtom, complib='lzo')
+
+
 def suite():
     theSuite = unittest.TestSuite()
     niter = 1
@@ -4385,6 +4520,8 @@ def suite():
         theSuite.addTest(unittest.makeSuite(SizeOnDiskPropertyTestCase))
         theSuite.addTest(unittest.makeSuite(AccessClosedTestCase))
         theSuite.addTest(unittest.makeSuite(TestCreateVLArrayArgs))
+        theSuite.addTest(unittest.makeSuite(RaggedTestCase))
+        theSuite.addTest(unittest.makeSuite(ObjectCodecTestCase))
 
     return theSuite
 
@@ -18,12 +18,14 @@ import os
 import sys
 import warnings
 import subprocess
+import threading
 from time import time
 
 import numpy
 
 from .flavor import array_of_flavor
 import six
+from six.moves import queue
 
 # The map between byteorders in NumPy and PyTables
 byteorders = {
@@ -191,6 +193,30 @@ def check_file_access(filename, mode='r'):
         raise ValueError("invalid mode: %r" % (mode,))
 
 
+def file_identity(filename, mode, params):
+    """Return a key identifying the contents of a file on disk.
+
+    The key is made of the device, inode, size and modification time of
+    the file, so that it changes when the file is rewritten.  None is
+    returned when the file is not opened in read-only `mode` or it is
+    opened in SWMR mode (so that data derived from it can never get
+    stale while it is open) or when, according to the `params` of the
+    file, it is not a regular file accessed through the default drivers.
+
+    """
+
+    if mode != 'r' or params['SWMR']:
+        return None
+    if params['DRIVER'] not in (None, 'H5FD_SEC2', 'H5FD_CORE'):
+        return None
+    if params['DRIVER_CORE_IMAGE'] is not None:
+        return None
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime)
+
 
 def lazyattr(fget):
     """Create a *lazy attribute* from the result of `fget`.
@@ -434,6 +460,34 @@ class NailedDict(object):
         cache[key] = value
 
 
+def get_frame_vars(expression, exclude=(), depth=1):
+    """Get the values of the variables of `expression` from a frame.
+
+    The variables in the `expression` string which are not constants,
+    numexpr functions or names in `exclude` (e.g. columns of a table)
+    are looked up in the local and then in the global namespace of the
+    frame at `depth` in the stack (the caller of this function being at
+    depth 0).  A dictionary with the variables found is returned.
+
+    """
+
+    from numexpr.expressions import functions as numexpr_functions
+
+    user_frame = sys._getframe(depth + 1)
+    user_locals = user_frame.f_locals
+    user_globals = user_frame.f_globals
+    uservars = {}
+    for var in compile(expression, '<string>', 'eval').co_names:
+        if (var in ('None', 'False', 'True') or
+                var in numexpr_functions or var in exclude):
+            continue
+        if var in user_locals:
+            uservars[var] = user_locals[var]
+        elif var in user_globals:
+            uservars[var] = user_globals[var]
+    return uservars
+
+
 def detect_number_of_cores():
     """Detects the number of cores on a system.
 
@@ -458,6 +512,139 @@ def detect_number_of_cores():
     return 1  # Default
 
 
+_cache_size = []
+
+
+def detect_cache_size():
+    """Detect the size (in bytes) of the last level CPU cache.
+
+    Only data and unified caches are considered.  None is returned when
+    the size cannot be determined in this platform.  The result is
+    cached after the first call.
+
+    """
+
+    if _cache_size:
+        return _cache_size[0]
+    units = {'K': 1024, 'M': 1024 * 1024, 'G': 1024 * 1024 * 1024}
+    size = None
+    cachedir = "/sys/devices/system/cpu/cpu0/cache"
+    try:
+        entries = os.listdir(cachedir)
+    except OSError:
+        entries = []
+    for entry in entries:
+        if not entry.startswith("index"):
+            continue
+        try:
+            with open(os.path.join(cachedir, entry, "type")) as f:
+                type_ = f.read().strip()
+            with open(os.path.join(cachedir, entry, "size")) as f:
+                value = f.read().strip()
+        except (IOError, OSError):
+            continue
+        if type_ == "Instruction" or not value:
+            continue
+        if value[-1] in units:
+            value = int(value[:-1]) * units[value[-1]]
+        else:
+            value = int(value)
+        if size is None or value > size:
+            size = value
+    _cache_size.append(size)
+    return size
+
+
+def prefetch_blocks(blocks, depth=1, name=None):
+    """Iterate over `blocks`, producing them in a background thread.
+
+    At most `depth` blocks are produced in advance of the one being
+    consumed.  Exceptions raised while producing blocks are re-raised
+    in the consumer thread.
+
+    """
+
+    stopped = threading.Event()
+    q = queue.Queue(depth)
+    done = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for block in blocks:
+                if not put((block, None)):
+                    return
+        except BaseException:
+            put((None, sys.exc_info()))
+            return
+        put((done, None))
+
+    thread = threading.Thread(target=produce, name=name)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            block, exc_info = q.get()
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            if block is done:
+                break
+            yield block
+    finally:
+        # Unblock the producer in case the consumer leaves early
+        stopped.set()
+        thread.join()
+
+
+class BackgroundWriter(object):
+    """Run `write` calls in a background thread, in order."""
+
+    def __init__(self, write, depth=1, name=None):
+        self._write = write
+        self._queue = queue.Queue(depth)
+        self._exc_info = None
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            args = self._queue.get()
+            if args is None:
+                break
+            if self._exc_info is None:
+                try:
+                    self._write(*args)
+                except BaseException:
+                    self._exc_info = sys.exc_info()
+
+    def _check(self):
+        # The error is kept so that later calls (e.g. ``close()``) report
+        # it too; writes scheduled after it are dropped by ``_run()``.
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+
+    def put(self, *args):
+        """Schedule a ``write(*args)`` call."""
+
+        self._check()
+        self._queue.put(args)
+
+    def close(self):
+        """Wait for pending writes to finish."""
+
+        self._queue.put(None)
+        self._thread.join()
+        self._check()
+
 
 # Main part
 # =========
@@ -17,8 +17,11 @@ be shared with other extensions.
 
 from definitions cimport hsize_t, hid_t, const_char, hobj_ref_t
 from numpy cimport ndarray
+from cpython.pystate cimport PyThreadState
 
 cdef hsize_t *malloc_dims(object)
 cdef hid_t get_native_type(hid_t) nogil
+cdef PyThreadState *release_gil_for_hdf5() nogil
+cdef void reacquire_gil(PyThreadState *) nogil
 cdef str cstr_to_pystr(const_char*)
 cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size, ndarray nparr) except -1
@@ -34,8 +34,13 @@ from cpython cimport PY_MAJOR_VERSION
 from libc.stdio cimport stderr
 from libc.stdlib cimport malloc, free
 from libc.string cimport strchr, strcmp, strncmp, strlen
-from cpython.bytes cimport PyBytes_Check, PyBytes_FromStringAndSize
+from cpython.bytes cimport (PyBytes_Check, PyBytes_FromStringAndSize,
+  PyBytes_AS_STRING)
+from cpython.bytearray cimport (PyByteArray_FromStringAndSize,
+  PyByteArray_AS_STRING)
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_SIMPLE
 from cpython.unicode cimport PyUnicode_DecodeUTF8, PyUnicode_Check
+from cpython.pystate cimport PyThreadState
 
 from numpy cimport (import_array, ndarray, dtype,
   npy_int64, PyArray_GETPTR1, PyArray_DescrFromType, npy_intp,
@@ -190,9 +195,21 @@ cdef extern from "utils.h":
 cdef extern from "blosc.h" nogil:
   void blosc_init()
   int blosc_set_nthreads(int nthreads)
+  int blosc_set_compressor(char *compname)
   char* blosc_list_compressors()
   int blosc_compcode_to_compname(int compcode, char **compname)
   int blosc_get_complib_info(char *compname, char **complib, char **version)
+  int blosc_compress(int clevel, int doshuffle, size_t typesize,
+                     size_t nbytes, void *src, void *dest, size_t destsize)
+  int blosc_decompress(void *src, void *dest, size_t destsize)
+  void blosc_cbuffer_sizes(void *cbuffer, size_t *nbytes, size_t *cbytes,
+                           size_t *blocksize)
+  int BLOSC_MAX_OVERHEAD
+
+# Functions for releasing the GIL conditionally
+cdef extern from "Python.h" nogil:
+  PyThreadState *PyEval_SaveThread()
+  void PyEval_RestoreThread(PyThreadState *tstate)
 
 cdef extern from "H5ARRAY.h" nogil:
   herr_t H5ARRAYread(hid_t dataset_id, hid_t type_id,
@@ -315,6 +332,49 @@ def set_blosc_max_threads(nthreads):
   return blosc_set_nthreads(nthreads)
 
 
+# Whether HDF5 calls are made without holding the GIL.  Only HDF5
+# libraries built in thread-safe mode may be entered by several threads
+# at once, so otherwise the GIL must serialize all the HDF5 calls while
+# files are being read from several threads.
+cdef bint _release_gil_in_hdf5 = 1
+
+
+cdef PyThreadState *release_gil_for_hdf5() nogil:
+  """Release the GIL for making HDF5 calls if it is allowed.
+
+  The returned state must be passed to `reacquire_gil()` after the calls,
+  which may only involve C data.
+
+  """
+
+  if _release_gil_in_hdf5:
+    return PyEval_SaveThread()
+  return NULL
+
+
+cdef void reacquire_gil(PyThreadState *state) nogil:
+  """Reacquire the GIL released by `release_gil_for_hdf5()`."""
+
+  if state != NULL:
+    PyEval_RestoreThread(state)
+
+
+def set_release_gil_in_hdf5(flag):
+  """set_release_gil_in_hdf5(flag)
+
+  Set whether the GIL is released during HDF5 reads and writes.
+
+  Returns the previous setting.
+
+  """
+
+  global _release_gil_in_hdf5
+
+  previous = bool(_release_gil_in_hdf5)
+  _release_gil_in_hdf5 = bool(flag)
+  return previous
+
+
 
 
 if sys.platform == "win32":
@@ -790,6 +850,80 @@ def blosc_compcode_to_compname_(compcode):
   return compname.decode()
 
 
+def blosc_compress_(object buf, int clevel=5, int shuffle=0,
+                    size_t typesize=1, object cname=None):
+  """blosc_compress_(buf, clevel=5, shuffle=0, typesize=1, cname=None)
+
+  Compress the bytes-like object `buf` with Blosc and return the
+  compressed data as a bytes object.  `cname` is the name of the
+  compressor used by Blosc (e.g. 'lz4'); if None, the current one is
+  kept.
+
+  """
+
+  cdef Py_buffer view
+  cdef size_t destsize
+  cdef int cbytes
+  cdef char *cdest
+  cdef object dest
+
+  if not blosc_version:
+    raise ValueError("Blosc is not available in this build")
+  if cname is not None:
+    if not isinstance(cname, bytes):
+      cname = cname.encode('ascii')
+    if blosc_set_compressor(cname) < 0:
+      raise ValueError("Blosc compressor ``%s`` is not available"
+                       % cname.decode('ascii'))
+  PyObject_GetBuffer(buf, &view, PyBUF_SIMPLE)
+  try:
+    destsize = <size_t>view.len + BLOSC_MAX_OVERHEAD
+    dest = PyBytes_FromStringAndSize(NULL, destsize)
+    cdest = PyBytes_AS_STRING(dest)
+    with nogil:
+      cbytes = blosc_compress(clevel, shuffle, typesize, view.len, view.buf,
+                              cdest, destsize)
+  finally:
+    PyBuffer_Release(&view)
+  if cbytes <= 0:
+    raise ValueError("Blosc compression failed (error code %d)" % cbytes)
+  return dest[:cbytes]
+
+
+def blosc_decompress_(object buf):
+  """blosc_decompress_(buf)
+
+  Decompress the Blosc data in the bytes-like object `buf` and return it
+  as a (writable) bytearray object.
+
+  """
+
+  cdef Py_buffer view
+  cdef size_t nbytes, cbytes, blocksize
+  cdef int ret
+  cdef char *cdest
+  cdef object dest
+
+  if not blosc_version:
+    raise ValueError("Blosc is not available in this build")
+  PyObject_GetBuffer(buf, &view, PyBUF_SIMPLE)
+  try:
+    if view.len < BLOSC_MAX_OVERHEAD:
+      raise ValueError("the buffer is too short for holding Blosc data")
+    blosc_cbuffer_sizes(view.buf, &nbytes, &cbytes, &blocksize)
+    if cbytes != <size_t>view.len:
+      raise ValueError("the buffer does not hold valid Blosc data")
+    dest = PyByteArray_FromStringAndSize(NULL, nbytes)
+    cdest = PyByteArray_AS_STRING(dest)
+    with nogil:
+      ret = blosc_decompress(view.buf, cdest, nbytes)
+  finally:
+    PyBuffer_Release(&view)
+  if ret < 0 or <size_t>ret != nbytes:
+    raise ValueError("Blosc decompression failed (error code %d)" % ret)
+  return dest
+
+
 def blosc_get_complib_info_():
   """Get info from compression libraries included in the current build
   of blosc.
@@ -1465,6 +1599,7 @@ cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size,
   cdef ndarray nprefarr
   cdef int extdim
   cdef hobj_ref_t *newrefbuf = NULL
+  cdef PyThreadState *state
 
 
   if refbuf == NULL:
@@ -1522,8 +1657,9 @@ cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size,
         rbuf = nprefarr.data
 
       # Do the physical read
-      with nogil:
-          ret = H5ARRAYread(refobj_id, reftype_id, 0, nrows, 1, extdim, rbuf)
+      state = release_gil_for_hdf5()
+      ret = H5ARRAYread(refobj_id, reftype_id, 0, nrows, 1, extdim, rbuf)
+      reacquire_gil(state)
       if ret < 0:
         raise HDF5ExtError("Problems reading the array data.")
 
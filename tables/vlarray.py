@@ -416,6 +416,13 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
         # can retrieve the proper class after a re-opening operation.
         if not hasattr(atom, 'size'):  # it is a pseudo-atom
             self.attrs.PSEUDOATOM = atom.kind
+            # Record the serialization of objects, unless it is the
+            # default one (so that older versions can read the array)
+            if atom.kind == 'object' and (atom.codec != 'pickle' or
+                                          atom.complevel):
+                self.attrs.OBJECT_CODEC = atom.codec
+                self.attrs.OBJECT_COMPLIB = atom.complib
+                self.attrs.OBJECT_COMPLEVEL = atom.complevel
 
         return self._v_objectid
 
@@ -433,7 +440,11 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
             elif kind == 'vlunicode':
                 atom = VLUnicodeAtom()
             elif kind == 'object':
-                atom = ObjectAtom()
+                attrs = self.attrs
+                atom = ObjectAtom(
+                    codec=str(getattr(attrs, 'OBJECT_CODEC', 'pickle')),
+                    complevel=int(getattr(attrs, 'OBJECT_COMPLEVEL', 0)),
+                    complib=str(getattr(attrs, 'OBJECT_COMPLIB', 'blosc')))
             else:
                 raise ValueError(
                     "pseudo-atom name ``%s`` not known." % kind)
@@ -447,6 +458,9 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
         self.atom = atom
         return self._v_objectid
 
+    def _g_set_refreshed_shape(self, shape):
+        self.nrows = shape[0]
+
     def _getnobjects(self, nparr):
         """Return the number of objects in a NumPy array."""
 
@@ -537,6 +551,52 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
         self._append(nparr, nobjects)
         self.nrows += 1
 
+    def append_ragged(self, values, offsets):
+        """Add several rows, given in ragged form, to the end of the dataset.
+
+        The rows are taken from values, a flat sequence with the objects of
+        all the rows one after the other, and offsets, a sequence of
+        integers where row i is made of the objects in
+        ``values[offsets[i]:offsets[i+1]]``.  Hence, ``len(offsets) - 1``
+        rows are added, using a single HDF5 write.  This is the layout
+        returned by :meth:`VLArray.read_ragged`.
+
+        The type and shape of objects in values must be compliant with
+        the atom of the array.  For pseudo-atoms, values must be given in
+        their base atom (e.g. the encoded bytes for a
+        :class:`VLStringAtom`).
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+
+        atom = self.atom
+        statom = atom.base if not hasattr(atom, 'size') else atom
+        nparr = numpy.ascontiguousarray(convert_to_np_atom2(values, statom))
+        if nparr.shape[1:] != statom.shape:
+            if statom.shape == (1,) and nparr.ndim == 1:
+                nparr = nparr.reshape((-1, 1))
+            else:
+                raise ValueError(
+                    "The values are composed of elements with shape '%s', "
+                    "which is not compatible with the atom shape ('%s')."
+                    % (nparr.shape[1:], statom.shape))
+
+        offsets = numpy.array(offsets, dtype=numpy.int64)
+        if offsets.ndim != 1 or len(offsets) == 0:
+            raise ValueError("offsets must be a non-empty unidimensional "
+                             "sequence of integers")
+        if (offsets[0] < 0 or offsets[-1] > len(nparr) or
+                numpy.any(offsets[1:] < offsets[:-1])):
+            raise ValueError("offsets must be non-decreasing and within "
+                             "the bounds of values")
+
+        self._append_ragged(nparr, offsets)
+        self.nrows += len(offsets) - 1
+
     def iterrows(self, start=None, stop=None, step=None):
         """Iterate over the rows of the array.
 
@@ -819,6 +879,36 @@ class VLArray(hdf5extension.VLArray, Leaf, six.Iterator):
             outlistarr = [internal_to_flavor(arr, flavor) for arr in listarr]
         return outlistarr
 
+    def read_ragged(self, start=None, stop=None, step=1):
+        """Get rows in the array as a pair of flat values and offsets.
+
+        Instead of a list with an object per row (see :meth:`VLArray.read`),
+        a tuple ``(values, offsets)`` of contiguous NumPy arrays is returned:
+        values has the objects of all the selected rows one after the other,
+        and row i is made of ``values[offsets[i]:offsets[i+1]]``, offsets
+        having one entry more than selected rows.  This avoids creating a
+        small array per row, which is much faster for arrays with many
+        short rows.
+
+        The start, stop and step parameters have the same meaning as in
+        :meth:`VLArray.read`.  The flavor of the array is not taken into
+        account, and for pseudo-atoms the values are returned in their
+        base atom (e.g. the encoded bytes for a :class:`VLStringAtom`).
+
+        .. versionadded:: 3.3
+
+        """
+
+        self._g_check_open()
+        start, stop, step = self._process_range_read(start, stop, step)
+        if start == stop:
+            atom = self.atom
+            statom = atom.base if not hasattr(atom, 'size') else atom
+            values = numpy.empty((0,) + statom.shape,
+                                 dtype=statom.dtype.base)
+            return values, numpy.zeros(1, dtype=numpy.int64)
+        return self._read_ragged(start, stop, step)
+
     def _read_coordinates(self, coords):
         """Read rows specified in `coords`."""
         rows = []